@@ -5,7 +5,7 @@ celery_app = Celery(
     "ismail_dogan_elektrik",
     broker=settings.redis_url,
     backend=settings.redis_url,
-    include=["app.tasks.notifications", "app.tasks.reports"],
+    include=["app.tasks.notifications", "app.tasks.reports", "app.tasks.dispatch"],
 )
 
 celery_app.conf.update(
@@ -35,5 +35,9 @@ celery_app.conf.update(
             "task": "app.tasks.notifications.send_booking_reminders",
             "schedule": 1800.0,  # Her 30 dakika
         },
+        "dispatch-pending-bookings": {
+            "task": "app.tasks.dispatch.dispatch_pending_bookings",
+            "schedule": settings.DISPATCH_INTERVAL_SECONDS,  # Varsayılan her 5 dakika
+        },
     },
 )
@@ -30,6 +30,8 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     WORKERS: int = 4
+    # Host/container number (0-31) for booking codes; unique per deployment node
+    NODE_ID: int = 0
     RELOAD: bool = False
 
     # Security
@@ -37,6 +39,8 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     ALGORITHM: str = "HS256"
+    # X-Admin-Key for /admin endpoints; admin endpoints are off when unset
+    ADMIN_API_KEY: Optional[str] = None
 
     # CORS
     CORS_ORIGINS: List[str] = [
@@ -55,9 +59,39 @@ class Settings(BaseSettings):
     DATABASE_MAX_OVERFLOW: int = 10
     DATABASE_POOL_TIMEOUT: int = 30
 
+    # Booking storage backend: "memory" (single process) or "postgres"
+    BOOKING_BACKEND: str = "memory"
+    # Write-ahead journal for the memory backend; disabled when unset
+    BOOKING_JOURNAL_DIR: Optional[str] = None
+    BOOKING_JOURNAL_SNAPSHOT_EVERY: int = 100_000  # events between snapshots
+    BOOKING_JOURNAL_FSYNC: bool = True
+    # Postgres backend: serve bookings from memory and write them in the
+    # background (one API process only); off commits every write in the request
+    BOOKING_WRITE_BEHIND: bool = False
+    WRITE_BEHIND_BATCH_SIZE: int = 500  # bookings per flush transaction
+    WRITE_BEHIND_INTERVAL_SECONDS: float = 0.2  # longest wait before a partial batch
+    WRITE_BEHIND_MAX_PENDING: int = 50_000  # writes wait for the database beyond this
+
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_CACHE_TTL: int = 3600  # 1 hour
+    # Browser/CDN cache lifetime of the services catalog responses
+    CATALOG_MAX_AGE_SECONDS: int = 300
+
+    # Idempotency-Key replay for POST /bookings and /contact
+    # (shared through Redis when REDIS_URL answers at startup, else per process)
+    IDEMPOTENCY_TTL_SECONDS: float = 86400.0  # how long a response is replayed
+    IDEMPOTENCY_MAX_ENTRIES: int = 100_000  # per-process cache only
+    IDEMPOTENCY_WAIT_SECONDS: float = 30.0  # longest wait on an in-flight duplicate
+    IDEMPOTENCY_LEASE_SECONDS: float = 10.0  # Redis claim lifetime, renewed while the request runs
+
+    # Server-Sent Events of booking status changes (per process)
+    SSE_HEARTBEAT_SECONDS: float = 15.0  # keepalive comment on idle streams
+    SSE_MAX_STREAM_SECONDS: float = 300.0  # clients reconnect after this
+    SSE_RETRY_MS: int = 3000  # client reconnect delay
+    SSE_MAX_SUBSCRIBERS: int = 20_000
+    SSE_MAX_PENDING: int = 256  # queued events before a slow stream is closed
+    SSE_HISTORY: int = 1024  # recent events replayed after Last-Event-ID
 
     # Email
     SMTP_HOST: str = "smtp.gmail.com"
@@ -83,13 +117,35 @@ class Settings(BaseSettings):
 
     # Rust Engine
     RUST_ENGINE_ENABLED: bool = True
-    RUST_LIB_PATH: str = "./rust-engine/target/release/libelektrik_engine.so"
 
     # Pricing
     BASE_LABOR_RATE: float = 500.0  # TRY per hour
     EMERGENCY_MULTIPLIER: float = 2.0
     URGENT_MULTIPLIER: float = 1.5
     ELECTRICITY_PRICE_PER_KWH: float = 2.5  # TRY
+    # JSON pricing rules (district tiers, labor, materials, per-service overrides);
+    # checked for changes at most this often and swapped in without a restart
+    PRICING_RULES_PATH: Optional[str] = None
+    PRICING_RULES_CHECK_SECONDS: float = 5.0
+    # Demand pricing: district occupancy is measured over the next days,
+    # and the postgres backend recounts bookings at most this often
+    DEMAND_WINDOW_DAYS: int = 14
+    DEMAND_REFRESH_SECONDS: float = 30.0
+
+    # Search: least share of a query's trigrams a field must contain
+    SEARCH_MIN_SIMILARITY: float = 0.5
+
+    # Scheduling
+    # Active bookings per date, district and time slot when no technician shifts are set
+    SLOT_CAPACITY: int = 1
+    BOOKING_HORIZON_DAYS: int = 180  # days ahead covered by the capacity matrix
+    # JSON list of technician shifts for the memory backend (postgres reads technician_shifts)
+    TECHNICIAN_ROSTER_PATH: Optional[str] = None
+    # Technician dispatch (Celery beat task, postgres backend)
+    DISPATCH_INTERVAL_SECONDS: float = 300.0
+    DISPATCH_BATCH_SIZE: int = 1000  # pending bookings planned per run
+    # Slot holds keep a place free while the booking form is filled in
+    SLOT_HOLD_TTL_SECONDS: float = 600.0
 
     # Service Area
     SERVICE_CITY: str = "İstanbul"
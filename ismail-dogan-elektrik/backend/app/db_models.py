@@ -1,9 +1,15 @@
-from sqlalchemy import Column, String, Text, Integer, Float, Boolean, DateTime, Enum, ForeignKey, func
+from sqlalchemy import Column, String, Text, Integer, SmallInteger, Float, Boolean, Date, DateTime, Enum, ForeignKey, func
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 import uuid
 import enum
 from app.database import Base
+from app.models import (
+    BookingStatus,
+    ServiceCategory as BookingServiceCategory,
+    TimeSlot,
+    UrgencyLevel,
+)
 
 
 class ServiceCategory(str, enum.Enum):
@@ -13,32 +19,16 @@ class ServiceCategory(str, enum.Enum):
     PROJECT = "proje"
 
 
-class UrgencyLevel(str, enum.Enum):
-    LOW = "dusuk"
-    NORMAL = "normal"
-    HIGH = "yuksek"
-    EMERGENCY = "acil"
-
-
-class TimeSlot(str, enum.Enum):
-    MORNING = "sabah"
-    AFTERNOON = "ogle"
-    EVENING = "aksam"
-
-
-class BookingStatus(str, enum.Enum):
-    PENDING = "beklemede"
-    CONFIRMED = "onaylandi"
-    IN_PROGRESS = "devam_ediyor"
-    COMPLETED = "tamamlandi"
-    CANCELLED = "iptal_edildi"
+def _pg_enum(enum_cls: type[enum.Enum], name: str) -> Enum:
+    """Map an API enum onto the PostgreSQL enum type of the same values"""
+    return Enum(enum_cls, name=name, values_callable=lambda e: [m.value for m in e])
 
 
 class Customer(Base):
     __tablename__ = "customers"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    full_name = Column(String(100), nullable=False)
+    full_name = Column("name", String(100), nullable=False)
     email = Column(String(255), unique=True, index=True)
     phone = Column(String(20), nullable=False, index=True)
     address = Column(Text)
@@ -70,7 +60,6 @@ class Service(Base):
 
     # Relationships
     features = relationship("ServiceFeature", back_populates="service", cascade="all, delete-orphan")
-    bookings = relationship("Booking", back_populates="service")
 
 
 class ServiceFeature(Base):
@@ -86,45 +75,56 @@ class ServiceFeature(Base):
 
 
 class Booking(Base):
+    """Mirrors the bookings table in database/init/01-schema.sql"""
     __tablename__ = "bookings"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     booking_code = Column(String(20), unique=True, nullable=False, index=True)
-    customer_id = Column(UUID(as_uuid=True), ForeignKey("customers.id"), nullable=False)
-    service_id = Column(UUID(as_uuid=True), ForeignKey("services.id"), nullable=False)
-    technician_id = Column(UUID(as_uuid=True), ForeignKey("technicians.id"))
-    
-    # Details
+    customer_id = Column(UUID(as_uuid=True), ForeignKey("customers.id", ondelete="SET NULL"), index=True)
+
+    # Service details
+    service_category = Column(_pg_enum(BookingServiceCategory, "service_category"), nullable=False)
+    problem_description = Column(Text, nullable=False)
+    urgency_level = Column(_pg_enum(UrgencyLevel, "urgency_level"), default=UrgencyLevel.NORMAL)
+
+    # Location
+    district = Column(String(50), nullable=False, index=True)
     address = Column(Text, nullable=False)
-    district = Column(String(50), nullable=False)
-    description = Column(Text)
-    urgency = Column(Enum(UrgencyLevel), default=UrgencyLevel.NORMAL)
-    
+
     # Scheduling
-    preferred_date = Column(DateTime(timezone=True), nullable=False)
-    time_slot = Column(Enum(TimeSlot), default=TimeSlot.MORNING)
-    estimated_duration = Column(Integer)  # minutes
-    
+    preferred_date = Column(Date, nullable=False, index=True)
+    preferred_time_slot = Column(_pg_enum(TimeSlot, "time_slot"), nullable=False)
+    confirmed_datetime = Column(DateTime(timezone=True))
+
     # Status
-    status = Column(Enum(BookingStatus), default=BookingStatus.PENDING)
-    
-    # Pricing
-    estimated_price = Column(Float)
-    final_price = Column(Float)
-    
+    status = Column(_pg_enum(BookingStatus, "booking_status"), default=BookingStatus.PENDING, index=True)
+    assigned_technician = Column(String(100))
+
+    # Notes
+    additional_notes = Column(Text)
+    internal_notes = Column(Text)
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    confirmed_at = Column(DateTime(timezone=True))
     completed_at = Column(DateTime(timezone=True))
 
     # Relationships
     customer = relationship("Customer", back_populates="bookings")
-    service = relationship("Service", back_populates="bookings")
-    technician = relationship("Technician", back_populates="bookings")
     photos = relationship("BookingPhoto", back_populates="booking", cascade="all, delete-orphan")
 
 
+class HeldSlot(Base):
+    """Mirrors the slot_holds table in database/init/01-schema.sql"""
+    __tablename__ = "slot_holds"
+
+    token = Column(UUID(as_uuid=True), primary_key=True)
+    preferred_date = Column(Date, nullable=False)
+    district = Column(String(50), nullable=False)
+    preferred_time_slot = Column(_pg_enum(TimeSlot, "time_slot"), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
 class BookingPhoto(Base):
     __tablename__ = "booking_photos"
 
@@ -147,14 +147,27 @@ class Technician(Base):
     name = Column(String(100), nullable=False)
     phone = Column(String(20), nullable=False)
     email = Column(String(255))
-    specializations = Column(ARRAY(String(50)))
+    specializations = Column("specialization", ARRAY(_pg_enum(BookingServiceCategory, "service_category")))
     is_active = Column(Boolean, default=True)
     rating = Column(Float, default=5.0)
     total_jobs = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    bookings = relationship("Booking", back_populates="technician")
+    shifts = relationship("TechnicianShiftSlot", back_populates="technician", cascade="all, delete-orphan")
+
+
+class TechnicianShiftSlot(Base):
+    __tablename__ = "technician_shifts"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    technician_id = Column(UUID(as_uuid=True), ForeignKey("technicians.id", ondelete="CASCADE"), nullable=False, index=True)
+    district = Column(String(50), nullable=False)
+    weekday = Column(SmallInteger, nullable=False)  # 0 = Monday
+    time_slot = Column(_pg_enum(TimeSlot, "time_slot"), nullable=False)
+
+    # Relationships
+    technician = relationship("Technician", back_populates="shifts")
 
 
 class ContactMessage(Base):
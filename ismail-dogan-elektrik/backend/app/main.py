@@ -6,21 +6,34 @@ Author: İsmail Doğan Elektrik
 Version: 1.0.0
 """
 
+import asyncio
 import time
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from loguru import logger
 
 from app.config import settings
-from app.routers import bookings_router, services_router
+from app.responses import EventStreamAwareGZipMiddleware
+from app.routers import bookings_router, services_router, admin_router, search_router
+from app.repositories import (
+    open_booking_journal,
+    close_booking_journal,
+    open_write_behind,
+    close_write_behind,
+    load_technician_capacity,
+)
 from app.services import is_rust_engine_available, get_engine_info
+from app.services.idempotency import (
+    IdempotencyMiddleware,
+    open_idempotency_cache,
+    close_idempotency_cache,
+)
 
 
 # ============================================
@@ -53,17 +66,43 @@ async def lifespan(app: FastAPI):
     logger.info(f"Debug Mode: {settings.DEBUG}")
     logger.info(f"API Version: {settings.API_VERSION}")
     logger.info(f"Rust Engine Available: {is_rust_engine_available()}")
+    logger.info(f"Booking Backend: {settings.BOOKING_BACKEND}")
     logger.info("=" * 60)
     
     # Initialize database connections, caches, etc.
     # await init_database()
     # await init_redis()
     
+    # Restore in-memory bookings from the journal (when configured)
+    await open_booking_journal()
+    
+    # Serve Postgres bookings from memory, written in the background (when configured)
+    write_behind = await open_write_behind()
+    
+    # Slot capacity from technician shifts (when configured)
+    await load_technician_capacity()
+    
+    # The process owning the bookings dispatches technicians itself
+    dispatcher = None
+    if write_behind is not None:
+        from app.tasks.dispatch import dispatch_loop
+        dispatcher = asyncio.create_task(dispatch_loop(write_behind))
+    
+    # Idempotency keys in Redis when reachable, else per process
+    await open_idempotency_cache()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down API...")
-    # await close_database()
+    if dispatcher is not None:
+        dispatcher.cancel()
+    await close_booking_journal()
+    await close_write_behind()
+    await close_idempotency_cache()
+    if settings.BOOKING_BACKEND == "postgres":
+        from app.database import close_database
+        await close_database()
     # await close_redis()
     logger.info("API shutdown complete")
 
@@ -126,6 +165,12 @@ def create_application() -> FastAPI:
     # MIDDLEWARE
     # ============================================
     
+    # Replay retried POSTs carrying an Idempotency-Key (innermost, uncompressed)
+    app.add_middleware(
+        IdempotencyMiddleware,
+        paths=("/api/v1/bookings", "/api/v1/contact"),
+    )
+    
     # CORS Middleware
     app.add_middleware(
         CORSMiddleware,
@@ -133,11 +178,11 @@ def create_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-        expose_headers=["X-Request-ID", "X-Process-Time"],
+        expose_headers=["X-Request-ID", "X-Process-Time", "Idempotent-Replayed"],
     )
     
-    # Gzip Compression
-    app.add_middleware(GZipMiddleware, minimum_size=500)
+    # Gzip Compression (event streams are sent as written)
+    app.add_middleware(EventStreamAwareGZipMiddleware, minimum_size=500)
     
     # ============================================
     # CUSTOM MIDDLEWARE
@@ -281,6 +326,8 @@ def create_application() -> FastAPI:
     # Include routers with API prefix
     app.include_router(bookings_router, prefix="/api/v1")
     app.include_router(services_router, prefix="/api/v1")
+    app.include_router(admin_router, prefix="/api/v1")
+    app.include_router(search_router, prefix="/api/v1")
     
     return app
 
@@ -4,15 +4,40 @@
 
 from .booking import (
     BookingCreate,
+    BookingBatchCreate,
     BookingUpdate,
     BookingResponse,
     BookingListResponse,
+    BookingBatchItemResult,
+    BookingBatchResponse,
     BookingStatus,
     UrgencyLevel,
     TimeSlot,
     ServiceCategory,
     IstanbulDistrict,
+    ExportFormat,
     AvailableSlotsResponse,
+    DayAvailability,
+    AvailabilityResponse,
+    BookingStatusEvent,
+    SlotHoldCreate,
+    SlotHoldResponse,
+)
+
+from .record import BookingRecord, BOOKING_RECORD_FIELDS
+
+from .technician import TechnicianShift
+
+from .pricing import DistrictTier, DemandStep, ServicePricingRule, PricingRules
+
+from .search import SearchHitKind, SearchHit, SearchResponse
+
+from .routing import (
+    RouteStopInput,
+    TechnicianRouteInput,
+    RouteOptimizationRequest,
+    TechnicianRoute,
+    RouteOptimizationResponse,
 )
 
 from .service import (
@@ -21,6 +46,10 @@ from .service import (
     ServiceListResponse,
     PriceQuoteRequest,
     PriceQuoteResponse,
+    PriceQuoteBatchRequest,
+    PriceQuoteBatchResponse,
+    PriceMatrixResponse,
+    DemandSurfaceResponse,
     ElectricDevice,
     LoadCalculationRequest,
     LoadCalculationResult,
@@ -34,21 +63,53 @@ from .service import (
 __all__ = [
     # Booking Models
     "BookingCreate",
+    "BookingBatchCreate",
     "BookingUpdate",
     "BookingResponse",
     "BookingListResponse",
+    "BookingBatchItemResult",
+    "BookingBatchResponse",
     "BookingStatus",
     "UrgencyLevel",
     "TimeSlot",
     "ServiceCategory",
     "IstanbulDistrict",
+    "ExportFormat",
     "AvailableSlotsResponse",
+    "DayAvailability",
+    "AvailabilityResponse",
+    "BookingStatusEvent",
+    "SlotHoldCreate",
+    "SlotHoldResponse",
+    "BookingRecord",
+    "BOOKING_RECORD_FIELDS",
+    # Technician Models
+    "TechnicianShift",
+    # Pricing Rule Models
+    "DistrictTier",
+    "DemandStep",
+    "ServicePricingRule",
+    "PricingRules",
+    # Search Models
+    "SearchHitKind",
+    "SearchHit",
+    "SearchResponse",
+    # Routing Models
+    "RouteStopInput",
+    "TechnicianRouteInput",
+    "RouteOptimizationRequest",
+    "TechnicianRoute",
+    "RouteOptimizationResponse",
     # Service Models
     "ServiceBase",
     "ServiceResponse",
     "ServiceListResponse",
     "PriceQuoteRequest",
     "PriceQuoteResponse",
+    "PriceQuoteBatchRequest",
+    "PriceQuoteBatchResponse",
+    "PriceMatrixResponse",
+    "DemandSurfaceResponse",
     "ElectricDevice",
     "LoadCalculationRequest",
     "LoadCalculationResult",
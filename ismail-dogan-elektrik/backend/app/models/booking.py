@@ -4,7 +4,7 @@ Pydantic models for booking requests and responses
 """
 
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from enum import Enum
 from pydantic import BaseModel, Field, EmailStr, field_validator
 import re
@@ -43,6 +43,12 @@ class BookingStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class ExportFormat(str, Enum):
+    """Booking export file formats"""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
 class IstanbulDistrict(str, Enum):
     """Istanbul districts for service area"""
     ADALAR = "Adalar"
@@ -166,6 +172,12 @@ class BookingCreate(BaseModel):
         None,
         description="List of photo URLs"
     )
+    hold_token: Optional[str] = Field(
+        None,
+        alias="holdToken",
+        max_length=64,
+        description="Token of a slot hold for the chosen date and time slot"
+    )
 
     @field_validator("customer_phone")
     @classmethod
@@ -209,6 +221,36 @@ class BookingCreate(BaseModel):
         }
 
 
+class BookingBatchCreate(BaseModel):
+    """Request model for creating many bookings at once"""
+    
+    items: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="Booking requests, each in the same shape as a single booking"
+    )
+
+
+class SlotHoldCreate(BaseModel):
+    """Request model for holding a slot while the booking form is filled in"""
+    
+    district: str = Field(..., description="Istanbul district")
+    preferred_date: date = Field(..., alias="preferredDate")
+    preferred_time_slot: TimeSlot = Field(..., alias="preferredTimeSlot")
+
+    @field_validator("preferred_date")
+    @classmethod
+    def validate_date(cls, v: date) -> date:
+        """Ensure date is not in the past"""
+        if v < date.today():
+            raise ValueError("Geçmiş bir tarih seçilemez")
+        return v
+
+    class Config:
+        populate_by_name = True
+
+
 class BookingUpdate(BaseModel):
     """Request model for updating a booking"""
     
@@ -263,6 +305,19 @@ class BookingResponse(BaseModel):
         from_attributes = True
 
 
+class SlotHoldResponse(BaseModel):
+    """A held place in a slot; send holdToken with the booking"""
+    
+    hold_token: str = Field(..., alias="holdToken")
+    district: str
+    preferred_date: date = Field(..., alias="preferredDate")
+    preferred_time_slot: TimeSlot = Field(..., alias="preferredTimeSlot")
+    expires_at: datetime = Field(..., alias="expiresAt")
+
+    class Config:
+        populate_by_name = True
+
+
 class BookingListResponse(BaseModel):
     """Response model for list of bookings"""
     
@@ -271,11 +326,33 @@ class BookingListResponse(BaseModel):
     page: int
     page_size: int = Field(..., alias="pageSize")
     total_pages: int = Field(..., alias="totalPages")
+    next_cursor: Optional[str] = Field(
+        None,
+        alias="nextCursor",
+        description="Opaque cursor for the next page, null on the last page"
+    )
 
     class Config:
         populate_by_name = True
 
 
+class BookingBatchItemResult(BaseModel):
+    """Outcome of one item in a batch booking request"""
+    
+    index: int = Field(..., description="Position of the item in the request")
+    success: bool
+    booking: Optional[BookingResponse] = None
+    errors: List[Dict[str, Any]] = Field(default=[], description="Validation errors")
+
+
+class BookingBatchResponse(BaseModel):
+    """Response model for batch booking creation"""
+    
+    items: List[BookingBatchItemResult]
+    created: int
+    failed: int
+
+
 class AvailableSlotsResponse(BaseModel):
     """Response model for available time slots"""
     
@@ -285,3 +362,39 @@ class AvailableSlotsResponse(BaseModel):
     
     class Config:
         populate_by_name = True
+
+
+class DayAvailability(BaseModel):
+    """Free capacity of one day in a district"""
+    
+    date: date
+    available_slots: List[TimeSlot] = Field(..., alias="availableSlots")
+    remaining: Dict[TimeSlot, int] = Field(..., description="Bookings still possible per time slot")
+    
+    class Config:
+        populate_by_name = True
+
+
+class AvailabilityResponse(BaseModel):
+    """Response model for availability over a date range"""
+    
+    district: str
+    date_from: date = Field(..., alias="dateFrom")
+    date_to: date = Field(..., alias="dateTo")
+    days: List[DayAvailability]
+    
+    class Config:
+        populate_by_name = True
+
+
+class BookingStatusEvent(BaseModel):
+    """Status of a booking as pushed on its event stream"""
+    
+    booking_code: str = Field(..., alias="bookingCode")
+    status: BookingStatus
+    assigned_technician: Optional[str] = Field(None, alias="assignedTechnician")
+    estimated_arrival: Optional[datetime] = Field(None, alias="estimatedArrival")
+    updated_at: Optional[datetime] = Field(None, alias="updatedAt")
+    
+    class Config:
+        populate_by_name = True
@@ -0,0 +1,97 @@
+"""
+İsmail Doğan Elektrik API - Pricing Rule Models
+Declarative pricing rules, loaded from PRICING_RULES_PATH
+"""
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from .booking import UrgencyLevel
+
+
+class DistrictTier(BaseModel):
+    """Districts sharing one distance multiplier"""
+
+    multiplier: float = Field(..., gt=0)
+    districts: List[str] = Field(..., min_length=1)
+
+
+class DemandStep(BaseModel):
+    """Demand multiplier applied from an occupancy level upwards"""
+
+    occupancy: float = Field(..., ge=0, description="Booked share of slot capacity")
+    multiplier: float = Field(..., gt=0)
+
+
+class ServicePricingRule(BaseModel):
+    """Per-service overrides of the general pricing rules"""
+
+    labor_hours: Optional[float] = Field(None, alias="laborHours", ge=0)
+    materials_ratio: Optional[float] = Field(None, alias="materialsRatio", ge=0)
+    urgency_multipliers: Dict[UrgencyLevel, float] = Field(
+        default={},
+        alias="urgencyMultipliers",
+        description="Replaces the general multiplier of the listed urgency levels",
+    )
+
+    class Config:
+        populate_by_name = True
+
+
+class PricingRules(BaseModel):
+    """
+    How quotes are priced.
+
+    A quote is ``(base price + labor rate x labor hours + base price x
+    materials ratio) x urgency multiplier x district multiplier x demand
+    multiplier``. The demand multiplier is the one of the highest step
+    whose occupancy the district or slot has reached (1.0 below all, and
+    always without steps, the default). Fields left out keep the built-in
+    value: the labor rate and urgency multipliers come from the pricing
+    settings, the district tiers from the central/far district lists.
+    """
+
+    labor_rate: Optional[float] = Field(None, alias="laborRate", ge=0, description="TRY per hour")
+    labor_hours: float = Field(2, alias="laborHours", ge=0)
+    materials_ratio: float = Field(0.3, alias="materialsRatio", ge=0)
+    quote_valid_days: int = Field(7, alias="quoteValidDays", ge=1)
+    urgency_multipliers: Dict[UrgencyLevel, float] = Field(default={}, alias="urgencyMultipliers")
+    district_tiers: Optional[List[DistrictTier]] = Field(None, alias="districtTiers")
+    default_district_multiplier: float = Field(1.2, alias="defaultDistrictMultiplier", gt=0)
+    demand_steps: List[DemandStep] = Field(
+        default=[], alias="demandSteps", description="Empty (the default) to price without demand"
+    )
+    services: Dict[str, ServicePricingRule] = Field(default={}, description="Overrides by service ID")
+
+    @model_validator(mode="after")
+    def validate_tiers(self) -> "PricingRules":
+        """A district belongs to at most one tier"""
+        seen = set()
+        for tier in self.district_tiers or []:
+            for district in tier.districts:
+                if district in seen:
+                    raise ValueError(f"District listed in two tiers: {district}")
+                seen.add(district)
+        return self
+
+    class Config:
+        populate_by_name = True
+        json_schema_extra = {
+            "example": {
+                "laborRate": 500,
+                "laborHours": 2,
+                "materialsRatio": 0.3,
+                "urgencyMultipliers": {"urgent": 1.5, "emergency": 2.0},
+                "districtTiers": [
+                    {"multiplier": 1.0, "districts": ["Beşiktaş", "Kadıköy"]},
+                    {"multiplier": 1.5, "districts": ["Silivri", "Şile"]},
+                ],
+                "defaultDistrictMultiplier": 1.2,
+                "demandSteps": [
+                    {"occupancy": 0.5, "multiplier": 1.1},
+                    {"occupancy": 0.8, "multiplier": 1.25},
+                ],
+                "services": {"proje": {"laborHours": 6, "materialsRatio": 0.05}},
+            }
+        }
@@ -0,0 +1,74 @@
+"""
+İsmail Doğan Elektrik API - Booking Record
+Compact internal representation of a stored booking
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional, Tuple
+
+from .booking import (
+    BookingResponse,
+    BookingStatus,
+    ServiceCategory,
+    TimeSlot,
+    UrgencyLevel,
+)
+
+
+@dataclass(slots=True, eq=False)
+class BookingRecord:
+    """
+    A booking as held by the repositories.
+
+    Slotted, so each booking costs one fixed-size object instead of a
+    19-key dict. Records compare by identity; the store indexes them by id.
+    """
+
+    id: str
+    booking_code: str
+    status: BookingStatus
+
+    # Service details
+    service_category: ServiceCategory
+    problem_description: str
+    urgency_level: UrgencyLevel
+
+    # Location
+    district: str
+    address: str
+
+    # Scheduling
+    preferred_date: date
+    preferred_time_slot: TimeSlot
+
+    # Customer
+    customer_name: str
+    customer_phone: str
+    customer_email: str
+
+    created_at: datetime
+
+    estimated_arrival: Optional[datetime] = None
+    additional_notes: Optional[str] = None
+    photos: Tuple[str, ...] = ()
+    assigned_technician: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+    def to_response(self) -> BookingResponse:
+        """
+        Convert to the public response model.
+
+        Records are built from validated input or typed database rows, so
+        the model is constructed without running validation again.
+        """
+        return BookingResponse.model_construct(
+            **{name: getattr(self, name) for name in _RESPONSE_FIELDS}
+        )
+
+
+_RESPONSE_FIELDS = tuple(BookingResponse.model_fields)
+
+
+# Field names accepted by BookingStore.update and record constructors
+BOOKING_RECORD_FIELDS = frozenset(BookingRecord.__slots__)
@@ -0,0 +1,99 @@
+"""
+İsmail Doğan Elektrik API - Routing Models
+Technician route optimization requests and planned routes
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from .booking import TimeSlot
+
+
+# ============================================
+# REQUEST MODELS
+# ============================================
+
+class RouteStopInput(BaseModel):
+    """One visit to be placed in a technician's day"""
+
+    id: str = Field(..., description="Booking id or any caller reference")
+    district: str
+    time_slot: TimeSlot = Field(..., alias="timeSlot")
+
+    class Config:
+        populate_by_name = True
+
+
+class TechnicianRouteInput(BaseModel):
+    """The visits of one technician on one day"""
+
+    technician_id: str = Field(..., alias="technicianId")
+    start_district: Optional[str] = Field(
+        None,
+        alias="startDistrict",
+        description="Where the day starts; the first visit when omitted",
+    )
+    stops: List[RouteStopInput] = Field(..., min_length=1, max_length=50)
+
+    class Config:
+        populate_by_name = True
+
+
+class RouteOptimizationRequest(BaseModel):
+    """Request model for ordering technicians' visits"""
+
+    routes: List[TechnicianRouteInput] = Field(..., min_length=1, max_length=500)
+    return_to_start: bool = Field(False, alias="returnToStart")
+
+    class Config:
+        populate_by_name = True
+        json_schema_extra = {
+            "example": {
+                "routes": [
+                    {
+                        "technicianId": "t-01",
+                        "startDistrict": "Kadıköy",
+                        "stops": [
+                            {"id": "b-1", "district": "Beşiktaş", "timeSlot": "morning"},
+                            {"id": "b-2", "district": "Üsküdar", "timeSlot": "morning"},
+                            {"id": "b-3", "district": "Maltepe", "timeSlot": "afternoon"},
+                        ],
+                    }
+                ],
+                "returnToStart": False,
+            }
+        }
+
+
+# ============================================
+# RESPONSE MODELS
+# ============================================
+
+class TechnicianRoute(BaseModel):
+    """One technician's visits in travel order"""
+
+    technician_id: str = Field(..., alias="technicianId")
+    start_district: Optional[str] = Field(None, alias="startDistrict")
+    stops: List[RouteStopInput]
+    travel_minutes: int = Field(..., alias="travelMinutes")
+    baseline_minutes: int = Field(
+        ...,
+        alias="baselineMinutes",
+        description="Travel time in the order the stops were given",
+    )
+
+    class Config:
+        populate_by_name = True
+
+
+class RouteOptimizationResponse(BaseModel):
+    """Response model for optimized technician routes"""
+
+    routes: List[TechnicianRoute]
+    travel_minutes: int = Field(..., alias="travelMinutes")
+    baseline_minutes: int = Field(..., alias="baselineMinutes")
+    engine: str = Field(..., description="rust or python")
+
+    class Config:
+        populate_by_name = True
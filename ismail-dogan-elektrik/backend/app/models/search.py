@@ -0,0 +1,37 @@
+"""
+İsmail Doğan Elektrik API - Search Models
+Fuzzy search results over bookings and services
+"""
+
+from enum import Enum
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class SearchHitKind(str, Enum):
+    """What a search result points to"""
+    BOOKING = "booking"
+    SERVICE = "service"
+
+
+class SearchHit(BaseModel):
+    """One search result"""
+
+    kind: SearchHitKind
+    id: str = Field(..., description="Booking id or service ID")
+    title: str = Field(..., description="Booking code or service name")
+    subtitle: str = Field(..., description="Customer and district, or service category")
+    matched_field: str = Field(..., alias="matchedField", description="Field the query matched best")
+    score: float = Field(..., ge=0, le=1, description="Share of the query's trigrams found in that field")
+
+    class Config:
+        populate_by_name = True
+
+
+class SearchResponse(BaseModel):
+    """Search results, best first"""
+
+    query: str
+    items: List[SearchHit]
+    total: int
@@ -3,10 +3,13 @@
 Pydantic models for services and pricing
 """
 
+from datetime import date
 from typing import Optional, List
 from enum import Enum
 from pydantic import BaseModel, Field
 
+from .booking import TimeSlot
+
 
 class ServiceCategory(str, Enum):
     """Service category identifiers"""
@@ -73,6 +76,12 @@ class PriceQuoteRequest(BaseModel):
     service_id: str = Field(..., alias="serviceId", description="Service identifier")
     district: str = Field(..., description="Istanbul district")
     urgency: str = Field(..., description="Urgency level")
+    preferred_date: Optional[date] = Field(
+        None, alias="preferredDate", description="Visit date, for slot demand pricing"
+    )
+    preferred_time_slot: Optional[TimeSlot] = Field(
+        None, alias="preferredTimeSlot", description="Visit time slot, for slot demand pricing"
+    )
     
     class Config:
         populate_by_name = True
@@ -86,6 +95,7 @@ class PriceQuoteResponse(BaseModel):
     materials_cost: float = Field(..., alias="materialsCost", description="Estimated materials cost")
     urgency_multiplier: float = Field(..., alias="urgencyMultiplier", description="Urgency price multiplier")
     distance_multiplier: float = Field(..., alias="distanceMultiplier", description="Distance price multiplier")
+    demand_multiplier: float = Field(default=1.0, alias="demandMultiplier", description="Booking demand multiplier")
     total_price: float = Field(..., alias="totalPrice", description="Total estimated price")
     currency: str = Field(default="TRY", description="Currency code")
     valid_until: str = Field(..., alias="validUntil", description="Quote validity date")
@@ -94,6 +104,68 @@ class PriceQuoteResponse(BaseModel):
         populate_by_name = True
 
 
+class PriceQuoteBatchRequest(BaseModel):
+    """Request model for pricing many quotes at once"""
+    
+    items: List[PriceQuoteRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="Quote requests, each in the same shape as a single quote",
+    )
+
+
+class PriceQuoteBatchResponse(BaseModel):
+    """Response model for batch price quotes, in request order"""
+    
+    items: List[PriceQuoteResponse]
+    total: int
+
+
+class PriceMatrixResponse(BaseModel):
+    """Every service priced in every district at every urgency, before demand"""
+    
+    services: List[str] = Field(..., description="Service identifiers (first axis)")
+    districts: List[str] = Field(..., description="Service districts (second axis)")
+    urgencies: List[str] = Field(..., description="Urgency levels (third axis)")
+    base_prices: List[float] = Field(..., alias="basePrices", description="Base price per service")
+    materials_costs: List[float] = Field(..., alias="materialsCosts", description="Materials cost per service")
+    labor_costs: List[float] = Field(..., alias="laborCosts", description="Estimated labor cost per service")
+    distance_multipliers: List[float] = Field(..., alias="distanceMultipliers", description="Multiplier per district")
+    urgency_multipliers: List[List[float]] = Field(
+        ..., alias="urgencyMultipliers", description="Multiplier by [service][urgency]"
+    )
+    total_prices: List[List[List[float]]] = Field(
+        ..., alias="totalPrices", description="Total price by [service][district][urgency]"
+    )
+    currency: str = Field(default="TRY", description="Currency code")
+    valid_until: str = Field(..., alias="validUntil", description="Quote validity date")
+    
+    class Config:
+        populate_by_name = True
+
+
+class DemandSurfaceResponse(BaseModel):
+    """Slot occupancy and the demand multipliers it sets, per district"""
+    
+    window_start: date = Field(..., alias="windowStart", description="First date of the window")
+    demand_days: int = Field(..., alias="demandDays", description="Dates district occupancy covers")
+    days: int = Field(..., description="Dates the slot arrays cover")
+    districts: List[str] = Field(..., description="Service districts (district axis)")
+    slots: List[TimeSlot] = Field(..., description="Time slots (slot axis)")
+    occupancy: List[float] = Field(..., description="Booked share of the window's capacity per district")
+    multipliers: List[float] = Field(..., description="Demand multiplier per district")
+    slot_occupancy: List[List[List[float]]] = Field(
+        ..., alias="slotOccupancy", description="Booked share of capacity by [day][district][slot]"
+    )
+    slot_multipliers: List[List[List[float]]] = Field(
+        ..., alias="slotMultipliers", description="Demand multiplier by [day][district][slot]"
+    )
+    
+    class Config:
+        populate_by_name = True
+
+
 # ============================================
 # LOAD CALCULATION MODELS (for Rust Engine)
 # ============================================
@@ -169,6 +241,7 @@ class LoadCalculationResult(BaseModel):
     safety_status: SafetyStatus = Field(..., alias="safetyStatus", description="Safety assessment")
     warnings: List[str] = Field(default=[], description="Warning messages")
     recommendations: List[str] = Field(default=[], description="Recommendations")
+    engine: str = Field(..., description="rust or python")
     
     class Config:
         populate_by_name = True
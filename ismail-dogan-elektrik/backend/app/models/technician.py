@@ -0,0 +1,43 @@
+"""
+İsmail Doğan Elektrik API - Technician Models
+Technician working shifts used for slot capacity
+"""
+
+from typing import List
+
+from pydantic import BaseModel, Field, field_validator
+
+from .booking import TimeSlot
+
+
+class TechnicianShift(BaseModel):
+    """
+    Weekly shift of one technician in one district.
+
+    The technician takes one booking per listed time slot on each listed
+    weekday (0 = Monday).
+    """
+
+    technician_id: str = Field(..., alias="technicianId")
+    district: str
+    weekdays: List[int] = Field(..., min_length=1)
+    time_slots: List[TimeSlot] = Field(..., alias="timeSlots", min_length=1)
+
+    @field_validator("weekdays")
+    @classmethod
+    def validate_weekdays(cls, v: List[int]) -> List[int]:
+        """Weekdays are 0 (Monday) to 6 (Sunday)"""
+        if any(not 0 <= day <= 6 for day in v):
+            raise ValueError("Weekdays must be between 0 (Monday) and 6 (Sunday)")
+        return v
+
+    class Config:
+        populate_by_name = True
+        json_schema_extra = {
+            "example": {
+                "technicianId": "t-01",
+                "district": "Kadıköy",
+                "weekdays": [0, 1, 2, 3, 4],
+                "timeSlots": ["morning", "afternoon"],
+            }
+        }
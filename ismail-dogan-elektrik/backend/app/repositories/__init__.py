@@ -0,0 +1,29 @@
+"""
+İsmail Doğan Elektrik API - Repositories Package
+"""
+
+from .bookings import (
+    BookingRepository,
+    InMemoryBookingRepository,
+    SqlAlchemyBookingRepository,
+    WriteBehindBookingRepository,
+    get_booking_repository,
+    open_booking_journal,
+    close_booking_journal,
+    open_write_behind,
+    close_write_behind,
+    load_technician_capacity,
+)
+
+__all__ = [
+    "BookingRepository",
+    "InMemoryBookingRepository",
+    "SqlAlchemyBookingRepository",
+    "WriteBehindBookingRepository",
+    "get_booking_repository",
+    "open_booking_journal",
+    "close_booking_journal",
+    "open_write_behind",
+    "close_write_behind",
+    "load_technician_capacity",
+]
@@ -0,0 +1,1469 @@
+"""
+İsmail Doğan Elektrik API - Booking Repository
+Storage abstraction for bookings with in-memory and PostgreSQL backends
+"""
+
+import asyncio
+import hashlib
+import itertools
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+from sqlalchemy import (
+    String,
+    bindparam,
+    column,
+    delete,
+    func,
+    literal,
+    select,
+    tuple_,
+    union,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database import async_session_maker
+from app.db_models import Booking, Customer, HeldSlot, Technician, TechnicianShiftSlot
+from app.models import BookingRecord, BookingStatus, TechnicianShift, TimeSlot
+from app.services.booking_store import (
+    BookingStore,
+    FINAL_STATUSES,
+    OrderKey,
+    SLOT_RELEASING_STATUSES,
+    SlotKey,
+)
+from app.services.booking_journal import BookingJournal
+from app.services.capacity import SLOTS, CapacityMatrix, load_roster
+from app.services.dispatch import BusyKey, DispatchTechnician
+from app.services.events import EVENT_FIELDS, EventBus, get_event_bus
+from app.services.holds import SlotHold, SlotHolds
+from app.services.locks import ShardedLocks
+from app.services.search import BOOKING_SEARCH_FIELDS, BookingMatch, fold, phone_query
+from app.services.write_behind import Changed, WriteBehindQueue
+
+
+# ============================================
+# INTERFACE
+# ============================================
+
+class BookingRepository(ABC):
+    """
+    Booking persistence interface used by the bookings router.
+
+    Bookings cross this boundary as BookingRecord instances. Slot capacity
+    comes from the repository's CapacityMatrix.
+    """
+
+    capacity: CapacityMatrix
+    # Status changes are published here when set
+    events: Optional[EventBus] = None
+
+    @abstractmethod
+    async def add(self, booking: BookingRecord) -> BookingRecord:
+        """Persist a new booking"""
+
+    async def add_many(self, bookings: List[BookingRecord]) -> List[BookingRecord]:
+        """Persist several new bookings; backends override this to batch writes"""
+        return [await self.add(booking) for booking in bookings]
+
+    async def reserve(
+        self,
+        booking: BookingRecord,
+        capacity: Optional[int] = None,
+        hold_token: Optional[str] = None,
+    ) -> bool:
+        """
+        Persist a booking only if its slot holds fewer active bookings and
+        live holds than its capacity. The check and the insert are atomic.
+        """
+        return (await self.reserve_many([booking], capacity, [hold_token]))[0]
+
+    @abstractmethod
+    async def reserve_many(
+        self,
+        bookings: List[BookingRecord],
+        capacity: Optional[int] = None,
+        hold_tokens: Optional[List[Optional[str]]] = None,
+    ) -> List[bool]:
+        """
+        Atomically check-and-insert several bookings, in order.
+
+        Returns one flag per booking; bookings whose slot is full are not
+        stored. Earlier bookings of the same call count against later ones.
+        Slots hold ``capacity`` bookings when given, otherwise what the
+        capacity matrix allows; live slot holds take places too.
+
+        ``hold_tokens`` pairs bookings with holds. A booking takes the
+        place of its hold when the hold is live and on the booking's slot,
+        and the hold is consumed; otherwise the booking is checked as if
+        it had none.
+        """
+
+    @abstractmethod
+    async def hold_slot(self, slot: SlotKey, capacity: Optional[int] = None) -> Optional[SlotHold]:
+        """
+        Keep one place in a slot free for a while (the repository's hold TTL).
+
+        Only succeeds while the slot's active bookings and live holds are
+        below its capacity; returns None when it is full.
+        """
+
+    @abstractmethod
+    async def release_hold(self, token: str) -> bool:
+        """Drop a live hold; False when it is unknown or already expired"""
+
+    @abstractmethod
+    async def get_by_code(self, booking_code: str) -> Optional[BookingRecord]:
+        """Get a booking by its booking code"""
+
+    @abstractmethod
+    async def update(self, booking_id: str, **changes: Any) -> BookingRecord:
+        """Apply field changes to a booking and return it"""
+
+    @abstractmethod
+    async def cancel(self, booking_id: str, updated_at: datetime) -> Optional[BookingRecord]:
+        """
+        Cancel a booking and release its slot.
+
+        Returns None, changing nothing, when the booking is already in a
+        final state; concurrent cancels therefore succeed exactly once.
+        """
+
+    @abstractmethod
+    async def unassigned(self, date_from: date, limit: int) -> List[BookingRecord]:
+        """Pending bookings without a technician from ``date_from`` on, oldest first"""
+
+    @abstractmethod
+    async def technician_commitments(self, date_from: date) -> List[BusyKey]:
+        """(technician, date, time slot) of every active assigned booking from ``date_from`` on"""
+
+    @abstractmethod
+    async def assign_technicians(
+        self,
+        assignments: Dict[str, str],
+        updated_at: datetime,
+    ) -> List[BookingRecord]:
+        """
+        Assign technicians by booking id and confirm the bookings.
+
+        Only bookings still pending and unassigned are changed, so a booking
+        cancelled or assigned by hand meanwhile is left alone. Returns the
+        bookings changed.
+        """
+
+    @abstractmethod
+    async def booked_slots(self, day: date, district: str) -> List[TimeSlot]:
+        """Time slots held by active bookings for a date and district"""
+
+    @abstractmethod
+    async def remaining_capacity(
+        self,
+        district: str,
+        date_from: date,
+        date_to: date,
+    ) -> np.ndarray:
+        """
+        Bookings still possible in a district, as a ``(days, slots)`` array
+        with rows from ``date_from`` to ``date_to`` and columns in SLOTS order
+        """
+
+    @abstractmethod
+    async def occupancy_counters(self) -> CapacityMatrix:
+        """
+        The capacity matrix with committed bookings and holds counted
+        recently enough for demand pricing
+        """
+
+    @abstractmethod
+    async def search(self, query: str, limit: int, threshold: float) -> List[BookingMatch]:
+        """
+        Up to ``limit`` bookings whose code, customer name, phone or address
+        is similar to the query by at least ``threshold``, best first
+        """
+
+    @abstractmethod
+    async def page(
+        self,
+        limit: int,
+        before: Optional[OrderKey] = None,
+        offset: int = 0,
+        status: Optional[BookingStatus] = None,
+        district: Optional[str] = None,
+    ) -> List[BookingRecord]:
+        """Up to ``limit`` bookings matching the filters, newest first"""
+
+    @abstractmethod
+    async def count(
+        self,
+        status: Optional[BookingStatus] = None,
+        district: Optional[str] = None,
+    ) -> int:
+        """Number of bookings matching the filters"""
+
+    @abstractmethod
+    def stream(
+        self,
+        status: Optional[BookingStatus] = None,
+        district: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[BookingRecord]:
+        """
+        Yield every matching booking, oldest first, holding at most
+        ``chunk_size`` bookings in memory at a time
+        """
+
+
+def default_capacity_matrix() -> CapacityMatrix:
+    """Capacity matrix over the service districts and booking horizon"""
+    return CapacityMatrix(
+        settings.SERVICE_DISTRICTS,
+        settings.BOOKING_HORIZON_DAYS,
+        default_capacity=settings.SLOT_CAPACITY,
+        demand_days=settings.DEMAND_WINDOW_DAYS,
+    )
+
+
+# Bookings indexed for search per event loop turn
+_SEARCH_INDEX_SLICE = 2000
+
+
+def _date_predicate(date_from: Optional[date], date_to: Optional[date]):
+    if date_from is None and date_to is None:
+        return None
+
+    def predicate(booking: BookingRecord) -> bool:
+        day = booking.preferred_date
+        return (date_from is None or day >= date_from) and (date_to is None or day <= date_to)
+
+    return predicate
+
+
+# ============================================
+# IN-MEMORY IMPLEMENTATION
+# ============================================
+
+class InMemoryBookingRepository(BookingRepository):
+    """
+    Process-local repository backed by the indexed BookingStore.
+
+    Writes that check state first run under striped locks keyed by slot, so
+    they stay atomic even if the critical section awaits (e.g. on a write
+    to durable storage) while unrelated slots proceed in parallel.
+
+    With a journal attached, every change is applied to the store and then
+    written to the journal before the call returns; a failed journal write
+    reverts the change.
+
+    The capacity matrix follows the store's slot counts as they change, so
+    availability reads never touch the bookings themselves.
+    """
+
+    def __init__(
+        self,
+        store: Optional[BookingStore] = None,
+        lock_shards: int = 64,
+        journal: Optional[BookingJournal] = None,
+        capacity: Optional[CapacityMatrix] = None,
+        events: Optional[EventBus] = None,
+        hold_ttl: float = 600.0,
+    ) -> None:
+        self.store = store if store is not None else BookingStore()
+        self.slot_locks = ShardedLocks(lock_shards)
+        self.journal = journal
+        self.events = events
+        self.capacity = capacity if capacity is not None else default_capacity_matrix()
+        self.capacity.sync(self.store.slot_counts())
+        self.store.slot_listener = self.capacity.track
+        # Held places count as taken in the capacity matrix too
+        self.holds = SlotHolds(hold_ttl, listener=self.capacity.track)
+
+    async def add(self, booking: BookingRecord) -> BookingRecord:
+        return (await self.add_many([booking]))[0]
+
+    async def add_many(self, bookings: List[BookingRecord]) -> List[BookingRecord]:
+        added = [self.store.add(booking) for booking in bookings]
+        await self._persist_added(added)
+        return added
+
+    async def reserve_many(
+        self,
+        bookings: List[BookingRecord],
+        capacity: Optional[int] = None,
+        hold_tokens: Optional[List[Optional[str]]] = None,
+    ) -> List[bool]:
+        tokens = hold_tokens or [None] * len(bookings)
+        async with self.slot_locks.hold(BookingStore.slot_of(b) for b in bookings):
+            results = []
+            added = []
+            # Holds taken up by bookings in this batch; released only once
+            # the bookings are persisted, so a failed write keeps them
+            consumed: Dict[str, SlotKey] = {}
+            for booking, token in zip(bookings, tokens):
+                slot = BookingStore.slot_of(booking)
+                limit = capacity if capacity is not None else self.capacity.capacity_at(slot)
+                hold = self.holds.get(token) if token and token not in consumed else None
+                own = hold is not None and hold.slot == slot
+                taken = (
+                    self.store.slot_count(*slot)
+                    + self.holds.count(slot)
+                    - sum(held == slot for held in consumed.values())
+                    - own
+                )
+                available = taken < limit
+                if available:
+                    if own:
+                        consumed[token] = slot
+                    added.append(self.store.add(booking))
+                results.append(available)
+            await self._persist_added(added)
+            for token in consumed:
+                self.holds.release(token)
+            return results
+
+    async def hold_slot(self, slot: SlotKey, capacity: Optional[int] = None) -> Optional[SlotHold]:
+        async with self.slot_locks.hold([slot]):
+            limit = capacity if capacity is not None else self.capacity.capacity_at(slot)
+            if self.store.slot_count(*slot) + self.holds.count(slot) >= limit:
+                return None
+            return self.holds.place(slot)
+
+    async def release_hold(self, token: str) -> bool:
+        hold = self.holds.get(token)
+        if hold is None:
+            return False
+        async with self.slot_locks.hold([hold.slot]):
+            return self.holds.release(token) is not None
+
+    async def get_by_code(self, booking_code: str) -> Optional[BookingRecord]:
+        return self.store.get_by_code(booking_code)
+
+    async def update(self, booking_id: str, **changes: Any) -> BookingRecord:
+        return await self._apply_changes(booking_id, changes)
+
+    async def cancel(self, booking_id: str, updated_at: datetime) -> Optional[BookingRecord]:
+        booking = self.store.get(booking_id)
+        if booking is None:
+            raise KeyError(booking_id)
+
+        async with self.slot_locks.hold([BookingStore.slot_of(booking)]):
+            if booking.status in FINAL_STATUSES:
+                return None
+            return await self._apply_changes(
+                booking_id, {"status": BookingStatus.CANCELLED, "updated_at": updated_at}
+            )
+
+    async def _persist_added(self, added: List[BookingRecord]) -> None:
+        if self.journal is None or not added:
+            return
+        try:
+            await self.journal.append_put(added)
+        except Exception:
+            for booking in added:
+                self.store.delete(booking.id)
+            raise
+
+    async def _apply_changes(self, booking_id: str, changes: Dict[str, Any]) -> BookingRecord:
+        booking = self.store.get(booking_id)
+        if booking is None:
+            raise KeyError(booking_id)
+        previous = {field: getattr(booking, field) for field in changes if hasattr(booking, field)}
+
+        booking = self.store.update(booking_id, **changes)
+        if self.journal is not None:
+            try:
+                await self.journal.append_patch(booking_id, changes)
+            except Exception:
+                self.store.update(booking_id, **previous)
+                raise
+        if self.events is not None and not EVENT_FIELDS.isdisjoint(changes):
+            self.events.publish_status([booking])
+        return booking
+
+    async def unassigned(self, date_from: date, limit: int) -> List[BookingRecord]:
+        ids = self.store.matching_ids(status=BookingStatus.PENDING) or ()
+        bookings = (self.store.get(booking_id) for booking_id in ids)
+        waiting = [
+            b for b in bookings
+            if b.assigned_technician is None and b.preferred_date >= date_from
+        ]
+        waiting.sort(key=BookingStore.order_key)
+        return waiting[:limit]
+
+    async def technician_commitments(self, date_from: date) -> List[BusyKey]:
+        return [
+            (b.assigned_technician, b.preferred_date, b.preferred_time_slot)
+            for b in self.store.values()
+            if b.assigned_technician is not None
+            and b.status not in FINAL_STATUSES
+            and b.preferred_date >= date_from
+        ]
+
+    async def assign_technicians(
+        self,
+        assignments: Dict[str, str],
+        updated_at: datetime,
+    ) -> List[BookingRecord]:
+        assigned = []
+        for booking_id, technician_id in assignments.items():
+            booking = self.store.get(booking_id)
+            if booking is None:
+                continue
+            async with self.slot_locks.hold([BookingStore.slot_of(booking)]):
+                if booking.status != BookingStatus.PENDING or booking.assigned_technician is not None:
+                    continue
+                assigned.append(await self._apply_changes(booking_id, {
+                    "assigned_technician": technician_id,
+                    "status": BookingStatus.CONFIRMED,
+                    "updated_at": updated_at,
+                }))
+        return assigned
+
+    async def booked_slots(self, day: date, district: str) -> List[TimeSlot]:
+        return self.store.booked_slots(day, district)
+
+    async def occupancy_counters(self) -> CapacityMatrix:
+        capacity = self.capacity
+        # Reclaim expired holds before they are counted
+        self.holds.expire()
+        if capacity.rebase(date.today()):
+            capacity.sync(itertools.chain(self.store.slot_counts(), self.holds.counts()))
+        return capacity
+
+    async def remaining_capacity(
+        self,
+        district: str,
+        date_from: date,
+        date_to: date,
+    ) -> np.ndarray:
+        capacity = await self.occupancy_counters()
+        if capacity.tracks(district, date_from, date_to):
+            return capacity.remaining(district, date_from, date_to)
+
+        # Outside the matrix window: subtract the slot index cell by cell
+        free = capacity.capacity_between(district, date_from, date_to).copy()
+        for row in range(len(free)):
+            day = date_from + timedelta(days=row)
+            for i, slot in enumerate(SLOTS):
+                key = (day, district, slot)
+                free[row, i] -= self.store.slot_count(*key) + self.holds.count(key)
+        return np.maximum(free, 0)
+
+    async def search(self, query: str, limit: int, threshold: float) -> List[BookingMatch]:
+        # The first search indexes the stored bookings in slices, so the
+        # event loop keeps serving other requests meanwhile
+        while not self.store.index_for_search(_SEARCH_INDEX_SLICE):
+            await asyncio.sleep(0)
+        return self.store.search(query, limit, threshold)
+
+    async def page(
+        self,
+        limit: int,
+        before: Optional[OrderKey] = None,
+        offset: int = 0,
+        status: Optional[BookingStatus] = None,
+        district: Optional[str] = None,
+    ) -> List[BookingRecord]:
+        return self.store.page(
+            limit, before=before, offset=offset, status=status, district=district
+        )
+
+    async def count(
+        self,
+        status: Optional[BookingStatus] = None,
+        district: Optional[str] = None,
+    ) -> int:
+        return self.store.count(status=status, district=district)
+
+    async def stream(
+        self,
+        status: Optional[BookingStatus] = None,
+        district: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[BookingRecord]:
+        predicate = _date_predicate(date_from, date_to)
+        after = None
+        while True:
+            # Bounded scans keep the event loop responsive on sparse filters
+            chunk, after = self.store.scan(
+                after,
+                limit=chunk_size,
+                max_scan=chunk_size * 20,
+                status=status,
+                district=district,
+                predicate=predicate,
+            )
+            for booking in chunk:
+                yield booking
+            if after is None:
+                return
+            await asyncio.sleep(0)
+
+
+# ============================================
+# POSTGRESQL IMPLEMENTATION
+# ============================================
+
+# Booking record fields that map to a differently named column
+_COLUMN_FOR_KEY = {
+    "estimated_arrival": "confirmed_datetime",
+}
+
+_UPDATABLE_KEYS = {
+    "status",
+    "assigned_technician",
+    "estimated_arrival",
+    "preferred_date",
+    "preferred_time_slot",
+    "additional_notes",
+    "updated_at",
+}
+
+
+def _slot_lock_id(slot: SlotKey) -> int:
+    """Stable signed 64-bit advisory lock id for a slot, equal in every worker"""
+    day, district, time_slot = slot
+    digest = hashlib.blake2b(
+        f"{day.isoformat()}|{district}|{time_slot.value}".encode("utf-8"),
+        digest_size=8,
+    ).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _hold_uuid(token: Optional[str]) -> Optional[uuid.UUID]:
+    """The hold token as stored, or None for a malformed token"""
+    if not token:
+        return None
+    try:
+        return uuid.UUID(token)
+    except ValueError:
+        return None
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """asyncpg needs aware datetimes for TIMESTAMPTZ; the API uses naive UTC"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class SqlAlchemyBookingRepository(BookingRepository):
+    """
+    Repository backed by the PostgreSQL bookings table.
+
+    Customer details live in the customers table and are upserted by email
+    on insert. Every method uses its own short transaction so the
+    repository is safe to share across requests and workers.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        capacity: Optional[CapacityMatrix] = None,
+        events: Optional[EventBus] = None,
+        hold_ttl: float = 600.0,
+    ) -> None:
+        self._session_maker = session_maker
+        self.events = events
+        self.hold_ttl = hold_ttl
+        self.capacity = capacity if capacity is not None else default_capacity_matrix()
+        self._occupancy_due = 0.0
+
+    @staticmethod
+    def _select():
+        return (
+            select(
+                Booking,
+                Customer.full_name,
+                Customer.phone,
+                Customer.email,
+            )
+            .outerjoin(Customer, Booking.customer_id == Customer.id)
+        )
+
+    @staticmethod
+    def _to_record(row) -> BookingRecord:
+        booking, name, phone, email = row
+        return BookingRecord(
+            id=str(booking.id),
+            booking_code=booking.booking_code,
+            status=booking.status,
+            service_category=booking.service_category,
+            problem_description=booking.problem_description,
+            urgency_level=booking.urgency_level,
+            district=booking.district,
+            address=booking.address,
+            preferred_date=booking.preferred_date,
+            preferred_time_slot=booking.preferred_time_slot,
+            estimated_arrival=booking.confirmed_datetime,
+            customer_name=name,
+            customer_phone=phone,
+            customer_email=email,
+            additional_notes=booking.additional_notes,
+            assigned_technician=booking.assigned_technician,
+            created_at=booking.created_at,
+            updated_at=booking.updated_at,
+        )
+
+    @staticmethod
+    def _filters(status: Optional[BookingStatus], district: Optional[str]) -> list:
+        clauses = []
+        if status is not None:
+            clauses.append(Booking.status == status)
+        if district is not None:
+            clauses.append(Booking.district == district)
+        return clauses
+
+    async def add(self, booking: BookingRecord) -> BookingRecord:
+        return (await self.add_many([booking]))[0]
+
+    async def add_many(self, bookings: List[BookingRecord]) -> List[BookingRecord]:
+        """Insert bookings in one transaction"""
+        if not bookings:
+            return []
+
+        async with self._session_maker() as session, session.begin():
+            await self._insert(session, bookings)
+        return bookings
+
+    async def reserve_many(
+        self,
+        bookings: List[BookingRecord],
+        capacity: Optional[int] = None,
+        hold_tokens: Optional[List[Optional[str]]] = None,
+    ) -> List[bool]:
+        """
+        Check-and-insert under transaction-scoped advisory locks.
+
+        Every slot touched is locked (in a fixed order) before its active
+        bookings and live holds are counted, so concurrent reservations from
+        any worker serialise per slot while different slots proceed in
+        parallel.
+        """
+        if not bookings:
+            return []
+
+        tokens = [_hold_uuid(t) for t in hold_tokens or [None] * len(bookings)]
+        slots = sorted({BookingStore.slot_of(b) for b in bookings}, key=_slot_lock_id)
+        async with self._session_maker() as session, session.begin():
+            await self._lock_slots(session, slots)
+            taken = await self._taken(session, slots)
+
+            # Live holds presented by these bookings, by token
+            presented = [t for t in tokens if t is not None]
+            owned: Dict[uuid.UUID, SlotKey] = {}
+            if presented:
+                result = await session.execute(
+                    select(
+                        HeldSlot.token,
+                        HeldSlot.preferred_date,
+                        HeldSlot.district,
+                        HeldSlot.preferred_time_slot,
+                    ).where(HeldSlot.token.in_(presented), HeldSlot.expires_at > func.now())
+                )
+                owned = {token: (day, district, slot) for token, day, district, slot in result}
+
+            results = []
+            accepted = []
+            consumed = []
+            for booking, token in zip(bookings, tokens):
+                slot = BookingStore.slot_of(booking)
+                limit = capacity if capacity is not None else self.capacity.capacity_at(slot)
+                own = owned.get(token) == slot
+                available = taken.get(slot, 0) - own < limit
+                if available:
+                    if own:
+                        del owned[token]
+                        consumed.append(token)
+                    else:
+                        taken[slot] = taken.get(slot, 0) + 1
+                    accepted.append(booking)
+                results.append(available)
+
+            if consumed:
+                await session.execute(delete(HeldSlot).where(HeldSlot.token.in_(consumed)))
+            if accepted:
+                await self._insert(session, accepted)
+        return results
+
+    async def hold_slot(self, slot: SlotKey, capacity: Optional[int] = None) -> Optional[SlotHold]:
+        async with self._session_maker() as session, session.begin():
+            await self._lock_slots(session, [slot])
+            # Served by idx_slot_holds_expires: only expired rows are visited
+            await session.execute(delete(HeldSlot).where(HeldSlot.expires_at <= func.now()))
+
+            taken = await self._taken(session, [slot])
+            limit = capacity if capacity is not None else self.capacity.capacity_at(slot)
+            if taken.get(slot, 0) >= limit:
+                return None
+
+            token = uuid.uuid4()
+            day, district, time_slot = slot
+            expires_at = await session.scalar(
+                pg_insert(HeldSlot)
+                .values(
+                    token=token,
+                    preferred_date=day,
+                    district=district,
+                    preferred_time_slot=time_slot,
+                    expires_at=func.now() + timedelta(seconds=self.hold_ttl),
+                )
+                .returning(HeldSlot.expires_at)
+            )
+        return SlotHold(token=token.hex, slot=slot, expires_at=expires_at)
+
+    async def release_hold(self, token: str) -> bool:
+        held = _hold_uuid(token)
+        if held is None:
+            return False
+        async with self._session_maker() as session, session.begin():
+            released = await session.scalar(
+                delete(HeldSlot)
+                .where(HeldSlot.token == held, HeldSlot.expires_at > func.now())
+                .returning(HeldSlot.token)
+            )
+        return released is not None
+
+    @staticmethod
+    async def _lock_slots(session: AsyncSession, slots: List[SlotKey]) -> None:
+        """Take the advisory locks of ``slots``, sorted by lock id"""
+        for slot in slots:
+            await session.execute(select(func.pg_advisory_xact_lock(_slot_lock_id(slot))))
+
+    @staticmethod
+    async def _taken(session: AsyncSession, slots: List[SlotKey]) -> Dict[SlotKey, int]:
+        """Active bookings plus live holds of each slot"""
+        taken: Dict[SlotKey, int] = {}
+        for table, slot_columns, live in (
+            (
+                Booking,
+                (Booking.preferred_date, Booking.district, Booking.preferred_time_slot),
+                Booking.status.not_in(SLOT_RELEASING_STATUSES),
+            ),
+            (
+                HeldSlot,
+                (HeldSlot.preferred_date, HeldSlot.district, HeldSlot.preferred_time_slot),
+                HeldSlot.expires_at > func.now(),
+            ),
+        ):
+            result = await session.execute(
+                select(*slot_columns, func.count())
+                .where(tuple_(*slot_columns).in_(slots), live)
+                .group_by(*slot_columns)
+            )
+            for day, district, slot, n in result:
+                key = (day, district, slot)
+                taken[key] = taken.get(key, 0) + n
+        return taken
+
+    async def write_back(self, new: List[BookingRecord], changed: List[Changed]) -> None:
+        """
+        Write bookings held elsewhere (the write-behind store) in one
+        transaction: insert ``new`` ones, skipping any already present, and
+        set the listed fields of ``changed`` ones from their current values.
+        Safe to repeat after a failure.
+        """
+        async with self._session_maker() as session, session.begin():
+            if new:
+                await self._insert(session, new, skip_existing=True)
+
+            # One executemany per distinct set of changed fields
+            groups: Dict[tuple, List[Dict[str, Any]]] = {}
+            for booking, fields in changed:
+                keys = tuple(sorted(fields & _UPDATABLE_KEYS))
+                if not keys:
+                    continue
+                params = {"b_id": uuid.UUID(booking.id)}
+                for key in keys:
+                    value = getattr(booking, key)
+                    params[f"v_{key}"] = _as_utc(value) if isinstance(value, datetime) else value
+                groups.setdefault(keys, []).append(params)
+
+            for keys, rows in groups.items():
+                await session.execute(
+                    update(Booking)
+                    .where(Booking.id == bindparam("b_id"))
+                    .values({_COLUMN_FOR_KEY.get(k, k): bindparam(f"v_{k}") for k in keys}),
+                    rows,
+                )
+
+    async def _insert(
+        self,
+        session: AsyncSession,
+        bookings: List[BookingRecord],
+        skip_existing: bool = False,
+    ) -> None:
+        """
+        Insert bookings within the caller's transaction.
+
+        Customers are upserted with a single multi-row statement (one row per
+        email, last details win) and the bookings are sent as one executemany,
+        which SQLAlchemy batches into multi-row INSERT ... VALUES statements.
+        With ``skip_existing``, bookings whose id is already stored are left
+        as they are.
+        """
+        customers = {
+            b.customer_email: {
+                "id": uuid.uuid4(),
+                "full_name": b.customer_name,
+                "email": b.customer_email,
+                "phone": b.customer_phone,
+            }
+            for b in bookings
+        }
+
+        customer_stmt = pg_insert(Customer).values(list(customers.values()))
+        result = await session.execute(
+            customer_stmt.on_conflict_do_update(
+                index_elements=[Customer.email],
+                set_={
+                    Customer.full_name: customer_stmt.excluded.name,
+                    Customer.phone: customer_stmt.excluded.phone,
+                },
+            ).returning(Customer.email, Customer.id)
+        )
+        customer_ids = dict(result.all())
+
+        booking_stmt = pg_insert(Booking)
+        if skip_existing:
+            booking_stmt = booking_stmt.on_conflict_do_nothing(index_elements=[Booking.id])
+        await session.execute(
+            booking_stmt,
+            [
+                {
+                    "id": uuid.UUID(b.id),
+                    "booking_code": b.booking_code,
+                    "customer_id": customer_ids[b.customer_email],
+                    "service_category": b.service_category,
+                    "problem_description": b.problem_description,
+                    "urgency_level": b.urgency_level,
+                    "district": b.district,
+                    "address": b.address,
+                    "preferred_date": b.preferred_date,
+                    "preferred_time_slot": b.preferred_time_slot,
+                    "confirmed_datetime": _as_utc(b.estimated_arrival),
+                    "status": b.status,
+                    "assigned_technician": b.assigned_technician,
+                    "additional_notes": b.additional_notes,
+                    "created_at": _as_utc(b.created_at),
+                }
+                for b in bookings
+            ],
+        )
+
+        for b in bookings:
+            b.created_at = _as_utc(b.created_at)
+
+    async def get_by_code(self, booking_code: str) -> Optional[BookingRecord]:
+        async with self._session_maker() as session:
+            result = await session.execute(
+                self._select().where(Booking.booking_code == booking_code)
+            )
+            row = result.one_or_none()
+        return self._to_record(row) if row is not None else None
+
+    async def update(self, booking_id: str, **changes: Any) -> BookingRecord:
+        unknown = set(changes) - _UPDATABLE_KEYS
+        if unknown:
+            raise ValueError(f"Fields cannot be updated: {sorted(unknown)}")
+
+        values: Dict[str, Any] = {}
+        for key, value in changes.items():
+            if isinstance(value, datetime):
+                value = _as_utc(value)
+            values[_COLUMN_FOR_KEY.get(key, key)] = value
+
+        async with self._session_maker() as session, session.begin():
+            result = await session.execute(
+                update(Booking)
+                .where(Booking.id == uuid.UUID(booking_id))
+                .values(**values)
+                .returning(Booking.id)
+            )
+            if result.scalar_one_or_none() is None:
+                raise KeyError(booking_id)
+            row = (
+                await session.execute(
+                    self._select().where(Booking.id == uuid.UUID(booking_id))
+                )
+            ).one()
+        booking = self._to_record(row)
+        if self.events is not None and not EVENT_FIELDS.isdisjoint(changes):
+            self.events.publish_status([booking])
+        return booking
+
+    async def cancel(self, booking_id: str, updated_at: datetime) -> Optional[BookingRecord]:
+        # The status condition makes check-and-cancel a single atomic statement
+        async with self._session_maker() as session, session.begin():
+            result = await session.execute(
+                update(Booking)
+                .where(
+                    Booking.id == uuid.UUID(booking_id),
+                    Booking.status.not_in(FINAL_STATUSES),
+                )
+                .values(status=BookingStatus.CANCELLED, updated_at=_as_utc(updated_at))
+                .returning(Booking.id)
+            )
+            if result.scalar_one_or_none() is None:
+                exists = await session.scalar(
+                    select(Booking.id).where(Booking.id == uuid.UUID(booking_id))
+                )
+                if exists is None:
+                    raise KeyError(booking_id)
+                return None
+            row = (
+                await session.execute(
+                    self._select().where(Booking.id == uuid.UUID(booking_id))
+                )
+            ).one()
+        booking = self._to_record(row)
+        if self.events is not None:
+            self.events.publish_status([booking])
+        return booking
+
+    async def unassigned(self, date_from: date, limit: int) -> List[BookingRecord]:
+        # Served by the partial idx_bookings_unassigned index
+        async with self._session_maker() as session:
+            result = await session.execute(
+                self._select()
+                .where(
+                    Booking.status == BookingStatus.PENDING,
+                    Booking.assigned_technician.is_(None),
+                    Booking.preferred_date >= date_from,
+                )
+                .order_by(Booking.created_at, Booking.id)
+                .limit(limit)
+            )
+            return [self._to_record(row) for row in result]
+
+    async def technician_commitments(self, date_from: date) -> List[BusyKey]:
+        async with self._session_maker() as session:
+            result = await session.execute(
+                select(
+                    Booking.assigned_technician,
+                    Booking.preferred_date,
+                    Booking.preferred_time_slot,
+                ).where(
+                    Booking.assigned_technician.is_not(None),
+                    Booking.status.not_in(FINAL_STATUSES),
+                    Booking.preferred_date >= date_from,
+                )
+            )
+            return [tuple(row) for row in result]
+
+    async def assign_technicians(
+        self,
+        assignments: Dict[str, str],
+        updated_at: datetime,
+    ) -> List[BookingRecord]:
+        if not assignments:
+            return []
+
+        # One UPDATE ... FROM (VALUES ...) applies the whole plan
+        plan = values(
+            column("booking_id", UUID(as_uuid=True)),
+            column("technician_id", String(100)),
+            name="plan",
+        ).data([
+            (uuid.UUID(booking_id), technician_id)
+            for booking_id, technician_id in assignments.items()
+        ])
+        async with self._session_maker() as session, session.begin():
+            result = await session.execute(
+                update(Booking)
+                .where(
+                    Booking.id == plan.c.booking_id,
+                    Booking.status == BookingStatus.PENDING,
+                    Booking.assigned_technician.is_(None),
+                )
+                .values(
+                    assigned_technician=plan.c.technician_id,
+                    status=BookingStatus.CONFIRMED,
+                    updated_at=_as_utc(updated_at),
+                )
+                .returning(Booking.id)
+            )
+            ids = list(result.scalars())
+            if not ids:
+                return []
+            rows = await session.execute(self._select().where(Booking.id.in_(ids)))
+            assigned = [self._to_record(row) for row in rows]
+        if self.events is not None:
+            self.events.publish_status(assigned)
+        return assigned
+
+    async def dispatch_technicians(self) -> List[DispatchTechnician]:
+        """Active technicians with their specializations, rating and shifts"""
+        async with self._session_maker() as session:
+            result = await session.execute(
+                select(
+                    Technician.id,
+                    Technician.phone,
+                    Technician.rating,
+                    Technician.specializations,
+                ).where(Technician.is_active.is_(True))
+            )
+            technicians = {
+                str(technician_id): DispatchTechnician(
+                    id=str(technician_id),
+                    phone=phone,
+                    rating=rating if rating is not None else 5.0,
+                    specializations=frozenset(specializations or ()),
+                )
+                for technician_id, phone, rating, specializations in result
+            }
+
+        for shift in await self.technician_shifts():
+            technician = technicians.get(shift.technician_id)
+            if technician is not None:
+                for weekday in shift.weekdays:
+                    for slot in shift.time_slots:
+                        technician.shifts[weekday, slot] = shift.district
+        return list(technicians.values())
+
+    async def booked_slots(self, day: date, district: str) -> List[TimeSlot]:
+        async with self._session_maker() as session:
+            result = await session.scalars(
+                select(Booking.preferred_time_slot)
+                .where(
+                    Booking.preferred_date == day,
+                    Booking.district == district,
+                    Booking.status.not_in(SLOT_RELEASING_STATUSES),
+                )
+                .distinct()
+            )
+            taken = set(result)
+        return [slot for slot in TimeSlot if slot in taken]
+
+    async def remaining_capacity(
+        self,
+        district: str,
+        date_from: date,
+        date_to: date,
+    ) -> np.ndarray:
+        # Committed bookings and holds are counted per call since other workers write too
+        async with self._session_maker() as session:
+            result = await session.execute(
+                select(Booking.preferred_date, Booking.preferred_time_slot, func.count())
+                .where(
+                    Booking.district == district,
+                    Booking.preferred_date.between(date_from, date_to),
+                    Booking.status.not_in(SLOT_RELEASING_STATUSES),
+                )
+                .group_by(Booking.preferred_date, Booking.preferred_time_slot)
+            )
+            rows = result.all()
+            result = await session.execute(
+                select(HeldSlot.preferred_date, HeldSlot.preferred_time_slot, func.count())
+                .where(
+                    HeldSlot.district == district,
+                    HeldSlot.preferred_date.between(date_from, date_to),
+                    HeldSlot.expires_at > func.now(),
+                )
+                .group_by(HeldSlot.preferred_date, HeldSlot.preferred_time_slot)
+            )
+            rows += result.all()
+
+        free = self.capacity.capacity_between(district, date_from, date_to).copy()
+        for day, slot, n in rows:
+            free[(day - date_from).days, SLOTS.index(slot)] -= n
+        return np.maximum(free, 0)
+
+    async def occupancy_counters(self) -> CapacityMatrix:
+        # Other workers book too, so the counts are refreshed from the
+        # database (one grouped count over the window) instead of tracked
+        now = time.monotonic()
+        if now >= self._occupancy_due:
+            self._occupancy_due = now + settings.DEMAND_REFRESH_SECONDS
+            try:
+                await self._recount_occupancy()
+            except Exception as e:
+                logger.warning(f"Slot occupancy recount failed, keeping previous counts: {e}")
+        return self.capacity
+
+    async def _recount_occupancy(self) -> None:
+        capacity = self.capacity
+        start = date.today()
+        end = start + timedelta(days=capacity.days - 1)
+        async with self._session_maker() as session:
+            result = await session.execute(
+                select(
+                    Booking.preferred_date,
+                    Booking.district,
+                    Booking.preferred_time_slot,
+                    func.count(),
+                )
+                .where(
+                    Booking.preferred_date.between(start, end),
+                    Booking.status.not_in(SLOT_RELEASING_STATUSES),
+                )
+                .group_by(Booking.preferred_date, Booking.district, Booking.preferred_time_slot)
+            )
+            rows = result.all()
+            result = await session.execute(
+                select(
+                    HeldSlot.preferred_date,
+                    HeldSlot.district,
+                    HeldSlot.preferred_time_slot,
+                    func.count(),
+                )
+                .where(
+                    HeldSlot.preferred_date.between(start, end),
+                    HeldSlot.expires_at > func.now(),
+                )
+                .group_by(HeldSlot.preferred_date, HeldSlot.district, HeldSlot.preferred_time_slot)
+            )
+            rows += result.all()
+
+        capacity.rebase(start)
+        capacity.sync(((day, district, slot), n) for day, district, slot, n in rows)
+
+    async def technician_shifts(self) -> List[TechnicianShift]:
+        """Shifts of active technicians, one per district, weekday and slot"""
+        async with self._session_maker() as session:
+            result = await session.execute(
+                select(
+                    TechnicianShiftSlot.technician_id,
+                    TechnicianShiftSlot.district,
+                    TechnicianShiftSlot.weekday,
+                    TechnicianShiftSlot.time_slot,
+                )
+                .join(Technician, Technician.id == TechnicianShiftSlot.technician_id)
+                .where(Technician.is_active.is_(True))
+            )
+            return [
+                TechnicianShift(
+                    technician_id=str(technician_id),
+                    district=district,
+                    weekdays=[weekday],
+                    time_slots=[slot],
+                )
+                for technician_id, district, weekday, slot in result
+            ]
+
+    async def search(self, query: str, limit: int, threshold: float) -> List[BookingMatch]:
+        folded = fold(query)
+        digits = phone_query(query)
+        # Matched like the in-memory index: folded text and phone digits,
+        # with word_similarity (<%) served by the GIN trigram indexes
+        columns = (
+            (folded, func.search_fold(Booking.booking_code)),
+            (folded, func.search_fold(Customer.full_name)),
+            (digits, func.search_digits(Customer.phone)),
+            (folded, func.search_fold(Booking.address)),
+        )
+        searched = [(literal(term, String), expr) for term, expr in columns if term]
+        if not searched:
+            return []
+
+        # One index scan per column; an OR across the join could not use them
+        candidates = union(*(
+            select(Booking.id)
+            .outerjoin(Customer, Booking.customer_id == Customer.id)
+            .where(term.op("<%")(expr))
+            for term, expr in searched
+        )).subquery()
+        scores = [
+            func.word_similarity(literal(term, String), expr) if term else literal(0.0)
+            for term, expr in columns
+        ]
+        stmt = (
+            self._select()
+            .add_columns(*scores)
+            .where(Booking.id.in_(select(candidates.c.id)))
+            .order_by(func.greatest(*scores).desc(), Booking.created_at.desc())
+            .limit(limit)
+        )
+
+        async with self._session_maker() as session:
+            await session.execute(
+                select(func.set_config("pg_trgm.word_similarity_threshold", str(threshold), True))
+            )
+            result = await session.execute(stmt)
+            matches = []
+            for row in result:
+                field_scores = [score or 0.0 for score in row[4:]]
+                best = max(range(len(field_scores)), key=field_scores.__getitem__)
+                matches.append(BookingMatch(
+                    self._to_record(row[:4]), BOOKING_SEARCH_FIELDS[best], field_scores[best]
+                ))
+            return matches
+
+    async def page(
+        self,
+        limit: int,
+        before: Optional[OrderKey] = None,
+        offset: int = 0,
+        status: Optional[BookingStatus] = None,
+        district: Optional[str] = None,
+    ) -> List[BookingRecord]:
+        stmt = self._select().where(*self._filters(status, district))
+        if before is not None:
+            # Keyset condition served by idx_bookings_created
+            created_at, booking_id = before
+            stmt = stmt.where(
+                tuple_(Booking.created_at, Booking.id)
+                < tuple_(_as_utc(created_at), uuid.UUID(booking_id))
+            )
+        stmt = (
+            stmt.order_by(Booking.created_at.desc(), Booking.id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+
+        async with self._session_maker() as session:
+            result = await session.execute(stmt)
+            return [self._to_record(row) for row in result]
+
+    async def count(
+        self,
+        status: Optional[BookingStatus] = None,
+        district: Optional[str] = None,
+    ) -> int:
+        async with self._session_maker() as session:
+            return await session.scalar(
+                select(func.count())
+                .select_from(Booking)
+                .where(*self._filters(status, district))
+            )
+
+    async def stream(
+        self,
+        status: Optional[BookingStatus] = None,
+        district: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[BookingRecord]:
+        stmt = self._select().where(*self._filters(status, district))
+        if date_from is not None:
+            stmt = stmt.where(Booking.preferred_date >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(Booking.preferred_date <= date_to)
+        stmt = stmt.order_by(Booking.created_at, Booking.id).execution_options(
+            yield_per=chunk_size
+        )
+
+        # session.stream() runs on a server-side cursor
+        async with self._session_maker() as session:
+            result = await session.stream(stmt)
+            async for partition in result.partitions():
+                for row in partition:
+                    yield self._to_record(row)
+
+
+# ============================================
+# WRITE-BEHIND IMPLEMENTATION
+# ============================================
+
+class WriteBehindBookingRepository(InMemoryBookingRepository):
+    """
+    In-memory repository whose changes reach PostgreSQL in the background.
+
+    Requests are served from the BookingStore exactly as with the memory
+    backend, so their latency does not include a database commit; every
+    accepted change is queued in a WriteBehindQueue and written in batches
+    by ``database``. The database stays the durable copy and fills the
+    store at startup (``load``).
+
+    Slot checks only see this process's store, so one API process must own
+    the bookings; deployments with several writers use the synchronous
+    SqlAlchemyBookingRepository. Changes accepted but not yet flushed are
+    lost if the process dies; when more than ``max_pending`` are queued,
+    writes wait for the database.
+    """
+
+    def __init__(
+        self,
+        database: SqlAlchemyBookingRepository,
+        batch_size: int = 500,
+        interval: float = 0.2,
+        max_pending: int = 50_000,
+        lock_shards: int = 64,
+        events: Optional[EventBus] = None,
+        hold_ttl: float = 600.0,
+    ) -> None:
+        super().__init__(
+            lock_shards=lock_shards,
+            capacity=database.capacity,
+            events=events,
+            hold_ttl=hold_ttl,
+        )
+        self.database = database
+        self.max_pending = max_pending
+        self.queue = WriteBehindQueue(database.write_back, batch_size, interval)
+
+    async def load(self) -> int:
+        """Fill the empty store from the database; returns the bookings loaded"""
+        bookings = [booking async for booking in self.database.stream(chunk_size=10_000)]
+        self._prepare(bookings)
+        self.store.load(bookings)
+        return len(bookings)
+
+    async def start(self) -> None:
+        await self.queue.start()
+
+    async def close(self) -> None:
+        """Write every queued change and stop"""
+        await self.queue.close()
+
+    async def add_many(self, bookings: List[BookingRecord]) -> List[BookingRecord]:
+        self._prepare(bookings)
+        await self.queue.wait_below(self.max_pending)
+        return await super().add_many(bookings)
+
+    async def reserve_many(
+        self,
+        bookings: List[BookingRecord],
+        capacity: Optional[int] = None,
+        hold_tokens: Optional[List[Optional[str]]] = None,
+    ) -> List[bool]:
+        self._prepare(bookings)
+        await self.queue.wait_below(self.max_pending)
+        return await super().reserve_many(bookings, capacity, hold_tokens)
+
+    async def _persist_added(self, added: List[BookingRecord]) -> None:
+        await super()._persist_added(added)
+        self.queue.mark_new(added)
+
+    async def _apply_changes(self, booking_id: str, changes: Dict[str, Any]) -> BookingRecord:
+        booking = await super()._apply_changes(booking_id, changes)
+        self.queue.mark_changed(booking, changes)
+        return booking
+
+    async def dispatch_technicians(self) -> List[DispatchTechnician]:
+        return await self.database.dispatch_technicians()
+
+    async def technician_shifts(self) -> List[TechnicianShift]:
+        return await self.database.technician_shifts()
+
+    def flush_metrics(self) -> Dict[str, Any]:
+        """Write-behind backlog and flush statistics"""
+        return self.queue.metrics()
+
+    @staticmethod
+    def _prepare(bookings: List[BookingRecord]) -> None:
+        # Loaded bookings carry aware timestamps; the order index must not mix both
+        for booking in bookings:
+            booking.created_at = _as_utc(booking.created_at)
+
+
+# ============================================
+# DEPENDENCY
+# ============================================
+
+memory_booking_repository = InMemoryBookingRepository(
+    events=get_event_bus(), hold_ttl=settings.SLOT_HOLD_TTL_SECONDS
+)
+_sql_booking_repository: Optional[SqlAlchemyBookingRepository] = None
+_write_behind_repository: Optional[WriteBehindBookingRepository] = None
+
+
+def get_booking_repository() -> BookingRepository:
+    """
+    Dependency returning the configured booking repository.
+    Use in FastAPI endpoints with Depends(get_booking_repository)
+    """
+    global _sql_booking_repository, _write_behind_repository
+
+    if settings.BOOKING_BACKEND == "postgres":
+        if _sql_booking_repository is None:
+            _sql_booking_repository = SqlAlchemyBookingRepository(
+                async_session_maker,
+                events=get_event_bus(),
+                hold_ttl=settings.SLOT_HOLD_TTL_SECONDS,
+            )
+        if settings.BOOKING_WRITE_BEHIND:
+            if _write_behind_repository is None:
+                _write_behind_repository = WriteBehindBookingRepository(
+                    _sql_booking_repository,
+                    batch_size=settings.WRITE_BEHIND_BATCH_SIZE,
+                    interval=settings.WRITE_BEHIND_INTERVAL_SECONDS,
+                    max_pending=settings.WRITE_BEHIND_MAX_PENDING,
+                    events=get_event_bus(),
+                    hold_ttl=settings.SLOT_HOLD_TTL_SECONDS,
+                )
+            return _write_behind_repository
+        return _sql_booking_repository
+
+    return memory_booking_repository
+
+
+async def open_write_behind() -> Optional[WriteBehindBookingRepository]:
+    """
+    Load bookings from PostgreSQL into the write-behind repository and start
+    flushing. Does nothing unless BOOKING_WRITE_BEHIND is set.
+    """
+    repo = get_booking_repository()
+    if not isinstance(repo, WriteBehindBookingRepository):
+        return None
+    loaded = await repo.load()
+    await repo.start()
+    logger.info(f"Write-behind booking store loaded {loaded} bookings")
+    return repo
+
+
+async def close_write_behind() -> None:
+    """Write queued booking changes to PostgreSQL before shutdown"""
+    if _write_behind_repository is not None:
+        await _write_behind_repository.close()
+
+
+async def open_booking_journal() -> Optional[BookingJournal]:
+    """
+    Replay the configured journal into the in-memory repository and start
+    journaling its writes. Does nothing unless BOOKING_JOURNAL_DIR is set.
+    """
+    if settings.BOOKING_BACKEND != "memory" or not settings.BOOKING_JOURNAL_DIR:
+        return None
+
+    journal = BookingJournal(
+        settings.BOOKING_JOURNAL_DIR,
+        snapshot_every=settings.BOOKING_JOURNAL_SNAPSHOT_EVERY,
+        fsync=settings.BOOKING_JOURNAL_FSYNC,
+    )
+    memory_booking_repository.store.clear()
+    journal.replay(memory_booking_repository.store)
+    await journal.start()
+    memory_booking_repository.journal = journal
+    return journal
+
+
+async def close_booking_journal() -> None:
+    """Flush and snapshot the in-memory repository's journal"""
+    journal = memory_booking_repository.journal
+    if journal is not None:
+        memory_booking_repository.journal = None
+        await journal.close(snapshot=True)
+
+
+async def load_technician_capacity() -> None:
+    """
+    Derive slot capacity of the configured repository from technician
+    shifts. Without any shifts, every slot keeps SLOT_CAPACITY.
+    """
+    repo = get_booking_repository()
+    if isinstance(repo, (SqlAlchemyBookingRepository, WriteBehindBookingRepository)):
+        shifts = await repo.technician_shifts()
+    elif settings.TECHNICIAN_ROSTER_PATH:
+        shifts = load_roster(settings.TECHNICIAN_ROSTER_PATH)
+    else:
+        shifts = []
+
+    if not shifts:
+        logger.info(f"No technician shifts; slot capacity is {settings.SLOT_CAPACITY}")
+        return
+    repo.capacity.set_shifts(shifts)
+    logger.info(f"Slot capacity loaded from {len(shifts)} technician shifts")
@@ -0,0 +1,161 @@
+"""
+İsmail Doğan Elektrik API - Fast JSON Responses
+Serialization helpers for hot read endpoints
+"""
+
+import gzip
+import hashlib
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel, TypeAdapter
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import Receive, Scope, Send
+
+# Paths of Server-Sent Events streams end with this
+EVENT_STREAM_SUFFIX = "/events"
+
+
+class PreEncodedJSONResponse(Response):
+    """
+    JSON response whose body is already encoded.
+
+    Returning a Response from an endpoint bypasses FastAPI's response_model
+    re-validation and jsonable_encoder pass, so endpoints using this class
+    must hand over data that already matches their response_model.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: bytes) -> bytes:
+        return content
+
+
+def model_json_response(model: BaseModel, status_code: int = 200) -> PreEncodedJSONResponse:
+    """Encode a model with its compiled pydantic-core serializer"""
+    return PreEncodedJSONResponse(
+        model.__pydantic_serializer__.to_json(model, by_alias=True),
+        status_code=status_code,
+    )
+
+
+class CachedJSON:
+    """
+    Encoded bytes of an immutable value, built on first use.
+
+    ``build`` returns the value to encode, and ``adapter`` is the TypeAdapter
+    for its type. Only use this for data that never changes while the
+    process is running.
+    """
+
+    def __init__(self, adapter: TypeAdapter, build: Callable[[], Any]) -> None:
+        self._adapter = adapter
+        self._build = build
+        self._body: Optional[bytes] = None
+
+    @property
+    def body(self) -> bytes:
+        if self._body is None:
+            self._body = self._adapter.dump_json(self._build(), by_alias=True)
+        return self._body
+
+    def response(self) -> PreEncodedJSONResponse:
+        return PreEncodedJSONResponse(self.body)
+
+
+class StaticJSON:
+    """
+    Encoded bytes, gzipped copy and strong ETag of an immutable value.
+
+    Everything is computed once, so serving a request is a header lookup.
+    Conditional GETs whose If-None-Match holds the ETag get 304 without a
+    body; clients accepting gzip get the pre-compressed bytes, which the
+    GZip middleware passes through untouched.
+    """
+
+    # Bodies smaller than this are not worth compressing (as GZipMiddleware)
+    GZIP_MINIMUM_SIZE = 500
+
+    def __init__(self, body: bytes, max_age: int = 0) -> None:
+        self.body = body
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.etag = f'"{digest}"'
+        self.cache_control = f"public, max-age={max_age}"
+
+        self.gzipped: Optional[bytes] = None
+        self.gzip_etag: Optional[str] = None
+        if len(body) >= self.GZIP_MINIMUM_SIZE:
+            # mtime=0 keeps the compressed bytes identical across restarts
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                self.gzipped = compressed
+                # Strong ETags differ per content coding
+                self.gzip_etag = f'"{digest}-gz"'
+
+    @classmethod
+    def from_model(cls, model: BaseModel, max_age: int = 0) -> "StaticJSON":
+        """Encode a model with its compiled pydantic-core serializer"""
+        return cls(model.__pydantic_serializer__.to_json(model, by_alias=True), max_age)
+
+    def response(self, request: Request) -> Response:
+        """The 304, gzipped or plain response for ``request``"""
+        gzipped = self.gzipped is not None and _accepts_gzip(
+            request.headers.get("accept-encoding", "")
+        )
+        headers: Dict[str, str] = {
+            "ETag": self.gzip_etag if gzipped else self.etag,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None and self._matches(if_none_match):
+            return Response(status_code=304, headers=headers)
+
+        if gzipped:
+            headers["Content-Encoding"] = "gzip"
+            return PreEncodedJSONResponse(self.gzipped, headers=headers)
+        return PreEncodedJSONResponse(self.body, headers=headers)
+
+    def _matches(self, if_none_match: str) -> bool:
+        # If-None-Match uses the weak comparison: W/ prefixes are ignored
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag == self.etag or tag == self.gzip_etag:
+                return True
+        return False
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip"""
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip() not in ("gzip", "*"):
+            continue
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+class EventStreamAwareGZipMiddleware(GZipMiddleware):
+    """
+    GZip compression that leaves event streams uncompressed.
+
+    The compressor holds small writes back until it has a full block, which
+    would delay Server-Sent Events (and heartbeats) indefinitely.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].endswith(EVENT_STREAM_SUFFIX):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
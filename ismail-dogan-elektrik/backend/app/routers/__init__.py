@@ -4,5 +4,7 @@
 
 from .bookings import router as bookings_router
 from .services import router as services_router
+from .admin import router as admin_router
+from .search import router as search_router
 
-__all__ = ["bookings_router", "services_router"]
+__all__ = ["bookings_router", "services_router", "admin_router", "search_router"]
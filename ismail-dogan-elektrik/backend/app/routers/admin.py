@@ -0,0 +1,260 @@
+"""
+İsmail Doğan Elektrik API - Admin Router
+Operator endpoints behind the admin API key
+"""
+
+import asyncio
+import secrets
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from loguru import logger
+
+from app.config import settings
+from app.models import (
+    DemandSurfaceResponse,
+    RouteOptimizationRequest,
+    RouteOptimizationResponse,
+    RouteStopInput,
+    TechnicianRoute,
+    TechnicianRouteInput,
+)
+from app.repositories import (
+    BookingRepository,
+    WriteBehindBookingRepository,
+    get_booking_repository,
+)
+from app.services.booking_store import FINAL_STATUSES
+from app.services.capacity import SLOTS
+from app.services.events import (
+    TooManySubscribers,
+    event_stream_response,
+    get_event_bus,
+    parse_last_event_id,
+)
+from app.services.pricing import demand_surface
+from app.services.routing import (
+    RouteRequest,
+    district_index,
+    optimize_routes,
+    route_minutes,
+)
+
+# Visits are kept in time slot order
+_SLOT_RANK = {slot: i for i, slot in enumerate(SLOTS)}
+
+
+async def require_admin_key(
+    x_admin_key: Optional[str] = Header(None, alias="X-Admin-Key"),
+) -> None:
+    """Reject requests without the configured admin key"""
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Yönetici erişimi yapılandırılmamış",
+        )
+    if x_admin_key is None or not secrets.compare_digest(
+        x_admin_key.encode(), settings.ADMIN_API_KEY.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Geçersiz yönetici anahtarı",
+        )
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin_key)],
+)
+
+
+# ============================================
+# ROUTE PLANNING
+# ============================================
+
+def _location(district: str) -> int:
+    try:
+        return district_index(district)
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Hizmet bölgesi dışında ilçe: {district}",
+        )
+
+
+async def _plan(
+    inputs: List[TechnicianRouteInput],
+    return_to_start: bool,
+) -> RouteOptimizationResponse:
+    """Order every technician's stops and compare with the given order"""
+    requests = [
+        RouteRequest(
+            depot=_location(route.start_district) if route.start_district else None,
+            stops=[_location(stop.district) for stop in route.stops],
+            blocks=[_SLOT_RANK[stop.time_slot] for stop in route.stops],
+        )
+        for route in inputs
+    ]
+
+    # The solver is CPU-bound; keep it off the event loop
+    solved, engine = await asyncio.to_thread(optimize_routes, requests, return_to_start)
+
+    routes = []
+    for route, request, result in zip(inputs, requests, solved):
+        baseline = route_minutes(request, range(len(request.stops)), return_to_start)
+        routes.append(TechnicianRoute(
+            technician_id=route.technician_id,
+            start_district=route.start_district,
+            stops=[route.stops[i] for i in result.order],
+            travel_minutes=result.travel_minutes,
+            baseline_minutes=baseline,
+        ))
+
+    return RouteOptimizationResponse(
+        routes=routes,
+        travel_minutes=sum(r.travel_minutes for r in routes),
+        baseline_minutes=sum(r.baseline_minutes for r in routes),
+        engine=engine,
+    )
+
+
+@router.post(
+    "/routes/optimize",
+    response_model=RouteOptimizationResponse,
+    summary="Optimize technician routes",
+    description="Order each technician's visits to minimise travel between districts",
+)
+async def optimize_technician_routes(request: RouteOptimizationRequest):
+    """
+    Order visits per technician.
+
+    Visits keep their time slot order; within a slot they are ordered by
+    travel time between district centres.
+    """
+    return await _plan(request.routes, request.return_to_start)
+
+
+@router.get(
+    "/routes",
+    response_model=RouteOptimizationResponse,
+    summary="Get the day's technician routes",
+    description="Optimized visit order of every technician's assigned bookings on a date",
+)
+async def get_technician_routes(
+    date: date = Query(..., description="Service date"),
+    repo: BookingRepository = Depends(get_booking_repository),
+):
+    """Routes for the active bookings assigned to technicians on a date"""
+    stops: Dict[str, List[RouteStopInput]] = {}
+    async for booking in repo.stream(date_from=date, date_to=date):
+        if booking.assigned_technician is None or booking.status in FINAL_STATUSES:
+            continue
+        try:
+            district_index(booking.district)
+        except KeyError:
+            logger.warning(f"Booking {booking.id} is outside the service area, not routed")
+            continue
+        stops.setdefault(booking.assigned_technician, []).append(RouteStopInput(
+            id=booking.id,
+            district=booking.district,
+            time_slot=booking.preferred_time_slot,
+        ))
+
+    if not stops:
+        return RouteOptimizationResponse(
+            routes=[], travel_minutes=0, baseline_minutes=0, engine="none"
+        )
+
+    # The baseline is each technician's visits in slot order, as booked
+    inputs = [
+        TechnicianRouteInput(
+            technician_id=technician,
+            stops=sorted(visits, key=lambda stop: _SLOT_RANK[stop.time_slot]),
+        )
+        for technician, visits in sorted(stops.items())
+    ]
+    return await _plan(inputs, return_to_start=False)
+
+
+# ============================================
+# PERSISTENCE
+# ============================================
+
+@router.get(
+    "/write-behind",
+    summary="Write-behind flush metrics",
+    description="Backlog and flush lag of bookings waiting to be written to the database",
+)
+async def get_write_behind_metrics(
+    repo: BookingRepository = Depends(get_booking_repository),
+) -> Dict[str, Any]:
+    """Flush lag of the write-behind repository"""
+    if not isinstance(repo, WriteBehindBookingRepository):
+        return {"enabled": False}
+    return {"enabled": True, **repo.flush_metrics()}
+
+
+# ============================================
+# DEMAND
+# ============================================
+
+@router.get(
+    "/demand",
+    response_model=DemandSurfaceResponse,
+    summary="Booking demand surface",
+    description="Slot occupancy per district and slot, and the demand multipliers quotes get from it",
+)
+async def get_demand_surface(
+    days: int = Query(
+        settings.DEMAND_WINDOW_DAYS,
+        ge=1,
+        le=settings.BOOKING_HORIZON_DAYS,
+        description="Dates covered by the per-slot arrays",
+    ),
+    repo: BookingRepository = Depends(get_booking_repository),
+) -> DemandSurfaceResponse:
+    """Current occupancy and demand multipliers, read from the rolling counters"""
+    return demand_surface(await repo.occupancy_counters(), days)
+
+
+# ============================================
+# EVENTS
+# ============================================
+
+@router.get(
+    "/events",
+    summary="Stream all booking events",
+    description="Server-Sent Events stream of every booking status change in this process",
+    response_class=StreamingResponse,
+)
+async def stream_all_booking_events(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Firehose of booking status changes.
+
+    A reconnecting client's Last-Event-ID resumes the stream from the
+    recent events the bus keeps.
+    """
+    bus = get_event_bus()
+    try:
+        subscription = bus.subscribe(None, parse_last_event_id(last_event_id))
+    except TooManySubscribers:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Canlı bağlantı sınırına ulaşıldı, lütfen daha sonra tekrar deneyin",
+        )
+    return event_stream_response(bus, subscription)
+
+
+@router.get(
+    "/events/metrics",
+    summary="Event stream metrics",
+    description="Open event streams and events published by this process",
+)
+async def get_event_metrics() -> Dict[str, Any]:
+    """Subscriber and publish counters of the event bus"""
+    return get_event_bus().metrics()
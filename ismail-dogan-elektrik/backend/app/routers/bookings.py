@@ -3,34 +3,175 @@
 Handles all booking-related endpoints
 """
 
+import base64
+import binascii
+import csv
+import io
+import json
+import sys
 from datetime import datetime, date, timedelta
-from typing import List, Optional
-from uuid import uuid4
-from fastapi import APIRouter, HTTPException, Query, status, BackgroundTasks
+from enum import Enum
+from typing import Any, AsyncIterator, List, Optional
+from uuid import UUID, uuid4
+from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from loguru import logger
+from pydantic import ValidationError
 
 from app.models import (
     BookingCreate,
+    BookingBatchCreate,
+    BookingBatchItemResult,
+    BookingBatchResponse,
     BookingUpdate,
     BookingResponse,
     BookingListResponse,
     AvailableSlotsResponse,
+    AvailabilityResponse,
+    DayAvailability,
+    BookingRecord,
     BookingStatus,
+    ExportFormat,
+    SlotHoldCreate,
+    SlotHoldResponse,
     TimeSlot,
 )
 from app.config import settings
+from app.repositories import BookingRepository, get_booking_repository
+from app.responses import model_json_response
+from app.services.booking_codes import get_booking_code_generator
+from app.services.capacity import SLOTS, slots_from_row
+from app.services.events import TooManySubscribers, event_stream_response, get_event_bus
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
 
-# In-memory storage for demo (replace with database in production)
-bookings_db: dict[str, dict] = {}
+SLOT_TAKEN_DETAIL = "Seçilen tarih ve saat dilimi dolu"
+
+# Longest date range answered by one availability request
+MAX_AVAILABILITY_DAYS = 92
 
 
 def generate_booking_code() -> str:
     """Generate a unique booking code"""
-    timestamp = datetime.now().strftime("%y%m%d")
-    unique_id = uuid4().hex[:6].upper()
-    return f"ELK-{timestamp}-{unique_id}"
+    return get_booking_code_generator().next()
+
+
+def generate_booking_codes(count: int) -> List[str]:
+    """Reserve ``count`` unique booking codes in one step"""
+    return get_booking_code_generator().reserve(count)
+
+
+def encode_cursor(booking: BookingRecord) -> str:
+    """Encode a booking's position in the created_at order as an opaque cursor"""
+    raw = f"{booking.created_at.isoformat()}|{booking.id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, booking_id = raw.split("|", 1)
+        # Booking ids are UUIDs; the PostgreSQL backend compares them as such
+        UUID(booking_id)
+        return datetime.fromisoformat(created_at), booking_id
+    except (ValueError, UnicodeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Geçersiz sayfa imleci",
+        )
+
+
+def build_booking(
+    booking_data: BookingCreate,
+    booking_id: str,
+    booking_code: str,
+    created_at: Optional[datetime] = None,
+) -> BookingRecord:
+    """Build the stored booking record for a validated request"""
+    return BookingRecord(
+        id=booking_id,
+        booking_code=booking_code,
+        status=BookingStatus.PENDING,
+        
+        # Service details
+        service_category=booking_data.service_category,
+        problem_description=booking_data.problem_description,
+        urgency_level=booking_data.urgency_level,
+        
+        # Location (district names repeat across bookings; share one string)
+        district=sys.intern(booking_data.district),
+        address=booking_data.address,
+        
+        # Scheduling
+        preferred_date=booking_data.preferred_date,
+        preferred_time_slot=booking_data.preferred_time_slot,
+        
+        # Customer
+        customer_name=booking_data.customer_name,
+        customer_phone=booking_data.customer_phone,
+        customer_email=booking_data.customer_email,
+        
+        # Additional
+        additional_notes=booking_data.additional_notes,
+        photos=tuple(booking_data.photos or ()),
+        
+        created_at=created_at or datetime.utcnow(),
+    )
+
+
+# Export columns use the same names as the JSON API
+EXPORT_FIELDS = [
+    (name, field.alias or name) for name, field in BookingResponse.model_fields.items()
+]
+
+# Rows buffered per chunk written to the response stream
+EXPORT_CHUNK_ROWS = 500
+
+
+def _export_value(value: Any) -> Any:
+    """Convert a booking value to its JSON/CSV representation"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+async def _export_csv(bookings: AsyncIterator[BookingRecord]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([alias for _, alias in EXPORT_FIELDS])
+    
+    rows = 0
+    async for booking in bookings:
+        writer.writerow([
+            "" if (value := getattr(booking, name)) is None else _export_value(value)
+            for name, _ in EXPORT_FIELDS
+        ])
+        rows += 1
+        if rows % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    yield buffer.getvalue()
+
+
+async def _export_ndjson(bookings: AsyncIterator[BookingRecord]) -> AsyncIterator[str]:
+    lines: List[str] = []
+    async for booking in bookings:
+        lines.append(json.dumps(
+            {alias: _export_value(getattr(booking, name)) for name, alias in EXPORT_FIELDS},
+            ensure_ascii=False,
+        ))
+        if len(lines) == EXPORT_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    
+    if lines:
+        yield "\n".join(lines) + "\n"
 
 
 def get_time_slot_display(slot: TimeSlot) -> str:
@@ -43,20 +184,28 @@ def get_time_slot_display(slot: TimeSlot) -> str:
     return slots.get(slot, str(slot))
 
 
-async def send_booking_confirmation_email(booking: dict):
+async def send_booking_confirmation_email(booking: BookingRecord):
     """Send booking confirmation email (background task)"""
-    logger.info(f"Sending confirmation email for booking {booking['booking_code']}")
+    logger.info(f"Sending confirmation email for booking {booking.booking_code}")
     # TODO: Implement email sending
     pass
 
 
-async def send_booking_confirmation_sms(booking: dict):
+async def send_booking_confirmation_sms(booking: BookingRecord):
     """Send booking confirmation SMS (background task)"""
-    logger.info(f"Sending confirmation SMS for booking {booking['booking_code']}")
+    logger.info(f"Sending confirmation SMS for booking {booking.booking_code}")
     # TODO: Implement SMS sending
     pass
 
 
+async def send_booking_confirmations_batch(bookings: List[BookingRecord]):
+    """Send confirmations for a batch of bookings (single background task)"""
+    logger.info(f"Sending confirmations for {len(bookings)} batch bookings")
+    for booking in bookings:
+        await send_booking_confirmation_email(booking)
+        await send_booking_confirmation_sms(booking)
+
+
 # ============================================
 # ENDPOINTS
 # ============================================
@@ -71,6 +220,7 @@ async def send_booking_confirmation_sms(booking: dict):
 async def create_booking(
     booking_data: BookingCreate,
     background_tasks: BackgroundTasks,
+    repo: BookingRepository = Depends(get_booking_repository),
 ):
     """
     Create a new booking with the following information:
@@ -84,6 +234,8 @@ async def create_booking(
     - **customerName**: Customer's full name
     - **customerPhone**: Customer's phone number
     - **customerEmail**: Customer's email address
+    - **holdToken**: Optional token from `POST /bookings/holds`; the booking
+      takes the held place instead of competing for a free one
     """
     try:
         # Generate unique identifiers
@@ -91,70 +243,10 @@ async def create_booking(
         booking_code = generate_booking_code()
         
         # Create booking record
-        booking = {
-            "id": booking_id,
-            "booking_code": booking_code,
-            "status": BookingStatus.PENDING,
-            
-            # Service details
-            "service_category": booking_data.service_category,
-            "problem_description": booking_data.problem_description,
-            "urgency_level": booking_data.urgency_level,
-            
-            # Location
-            "district": booking_data.district,
-            "address": booking_data.address,
-            
-            # Scheduling
-            "preferred_date": booking_data.preferred_date,
-            "preferred_time_slot": booking_data.preferred_time_slot,
-            "estimated_arrival": None,
-            
-            # Customer
-            "customer_name": booking_data.customer_name,
-            "customer_phone": booking_data.customer_phone,
-            "customer_email": booking_data.customer_email,
-            
-            # Additional
-            "additional_notes": booking_data.additional_notes,
-            "photos": booking_data.photos or [],
-            
-            # Assignment
-            "assigned_technician": None,
-            
-            # Timestamps
-            "created_at": datetime.utcnow(),
-            "updated_at": None,
-        }
-        
-        # Store in database
-        bookings_db[booking_id] = booking
+        booking = build_booking(booking_data, booking_id, booking_code)
         
-        # Schedule background tasks
-        background_tasks.add_task(send_booking_confirmation_email, booking)
-        background_tasks.add_task(send_booking_confirmation_sms, booking)
-        
-        logger.info(f"Created booking {booking_code} for {booking_data.customer_name}")
-        
-        return BookingResponse(
-            id=booking["id"],
-            booking_code=booking["booking_code"],
-            status=booking["status"],
-            service_category=booking["service_category"],
-            problem_description=booking["problem_description"],
-            urgency_level=booking["urgency_level"],
-            district=booking["district"],
-            address=booking["address"],
-            preferred_date=booking["preferred_date"],
-            preferred_time_slot=booking["preferred_time_slot"],
-            estimated_arrival=booking["estimated_arrival"],
-            customer_name=booking["customer_name"],
-            customer_phone=booking["customer_phone"],
-            customer_email=booking["customer_email"],
-            assigned_technician=booking["assigned_technician"],
-            created_at=booking["created_at"],
-            updated_at=booking["updated_at"],
-        )
+        # Store in database; the slot check and insert are atomic
+        reserved = await repo.reserve(booking, hold_token=booking_data.hold_token)
         
     except Exception as e:
         logger.error(f"Error creating booking: {e}")
@@ -162,88 +254,214 @@ async def create_booking(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Randevu oluşturulurken bir hata oluştu",
         )
+    
+    if not reserved:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=SLOT_TAKEN_DETAIL,
+        )
+    
+    # Schedule background tasks
+    background_tasks.add_task(send_booking_confirmation_email, booking)
+    background_tasks.add_task(send_booking_confirmation_sms, booking)
+    
+    logger.info(f"Created booking {booking_code} for {booking_data.customer_name}")
+    
+    return booking.to_response()
 
 
-@router.get(
-    "/{booking_code}",
-    response_model=BookingResponse,
-    summary="Get booking by code",
-    description="Retrieve booking details by booking code",
+@router.post(
+    "/batch",
+    response_model=BookingBatchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Create bookings in bulk",
+    description="Validate and create many bookings in one request with per-item results",
 )
-async def get_booking(booking_code: str):
-    """Get booking details by booking code"""
+async def create_bookings_batch(
+    batch: BookingBatchCreate,
+    background_tasks: BackgroundTasks,
+    repo: BookingRepository = Depends(get_booking_repository),
+):
+    """
+    Create up to 500 bookings at once.
     
-    # Search for booking by code
-    booking = None
-    for b in bookings_db.values():
-        if b["booking_code"] == booking_code:
-            booking = b
-            break
+    Each item is validated on its own, so invalid items are reported with
+    their errors while the valid ones are created. Valid items are inserted
+    in a single batch and confirmations are scheduled as one task. Items
+    whose time slot is already full fail with type `slot_unavailable`.
+    """
+    results: List[BookingBatchItemResult] = []
+    valid: List[tuple[int, BookingCreate]] = []
+    created: List[BookingRecord] = []
     
-    if not booking:
+    # Validate every item independently
+    for index, item in enumerate(batch.items):
+        try:
+            valid.append((index, BookingCreate.model_validate(item)))
+        except ValidationError as e:
+            results.append(BookingBatchItemResult(
+                index=index,
+                success=False,
+                errors=[
+                    {
+                        "field": ".".join(str(loc) for loc in error["loc"]),
+                        "message": error["msg"],
+                        "type": error["type"],
+                    }
+                    for error in e.errors()
+                ],
+            ))
+    
+    if valid:
+        try:
+            codes = generate_booking_codes(len(valid))
+            created_at = datetime.utcnow()
+            bookings = [
+                build_booking(data, str(uuid4()), code, created_at)
+                for (_, data), code in zip(valid, codes)
+            ]
+            
+            # Check slots and store in one atomic step (single round trip on the DB path)
+            reserved = await repo.reserve_many(
+                bookings, hold_tokens=[data.hold_token for _, data in valid]
+            )
+            
+        except Exception as e:
+            logger.error(f"Error creating booking batch: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Randevular oluşturulurken bir hata oluştu",
+            )
+        
+        for (index, _), booking, ok in zip(valid, bookings, reserved):
+            if ok:
+                created.append(booking)
+                results.append(BookingBatchItemResult(
+                    index=index,
+                    success=True,
+                    booking=booking.to_response(),
+                ))
+            else:
+                results.append(BookingBatchItemResult(
+                    index=index,
+                    success=False,
+                    errors=[{
+                        "field": "preferredTimeSlot",
+                        "message": SLOT_TAKEN_DETAIL,
+                        "type": "slot_unavailable",
+                    }],
+                ))
+        
+        if created:
+            background_tasks.add_task(send_booking_confirmations_batch, created)
+        logger.info(f"Created {len(created)} bookings in batch")
+    
+    results.sort(key=lambda r: r.index)
+    
+    return BookingBatchResponse(
+        items=results,
+        created=len(created),
+        failed=len(batch.items) - len(created),
+    )
+
+
+@router.post(
+    "/holds",
+    response_model=SlotHoldResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Hold a time slot",
+    description="Keep a place in a slot free while the customer completes the booking",
+)
+async def create_slot_hold(
+    hold_data: SlotHoldCreate,
+    repo: BookingRepository = Depends(get_booking_repository),
+):
+    """
+    Hold a place in a slot for SLOT_HOLD_TTL_SECONDS.
+    
+    Held places count as taken for everyone else until the hold is used by
+    a booking (send its `holdToken` with the booking), released, or expires.
+    """
+    slot = (
+        hold_data.preferred_date,
+        sys.intern(hold_data.district),
+        hold_data.preferred_time_slot,
+    )
+    hold = await repo.hold_slot(slot)
+    
+    if hold is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Randevu bulunamadı",
+            status_code=status.HTTP_409_CONFLICT,
+            detail=SLOT_TAKEN_DETAIL,
         )
     
-    return BookingResponse(
-        id=booking["id"],
-        booking_code=booking["booking_code"],
-        status=booking["status"],
-        service_category=booking["service_category"],
-        problem_description=booking["problem_description"],
-        urgency_level=booking["urgency_level"],
-        district=booking["district"],
-        address=booking["address"],
-        preferred_date=booking["preferred_date"],
-        preferred_time_slot=booking["preferred_time_slot"],
-        estimated_arrival=booking["estimated_arrival"],
-        customer_name=booking["customer_name"],
-        customer_phone=booking["customer_phone"],
-        customer_email=booking["customer_email"],
-        assigned_technician=booking["assigned_technician"],
-        created_at=booking["created_at"],
-        updated_at=booking["updated_at"],
+    return SlotHoldResponse(
+        hold_token=hold.token,
+        district=hold_data.district,
+        preferred_date=hold_data.preferred_date,
+        preferred_time_slot=hold_data.preferred_time_slot,
+        expires_at=hold.expires_at,
     )
 
 
 @router.delete(
-    "/{booking_code}",
+    "/holds/{hold_token}",
     status_code=status.HTTP_200_OK,
-    summary="Cancel booking",
-    description="Cancel a booking by booking code",
+    summary="Release a slot hold",
+    description="Give a held place back, e.g. when the customer leaves the booking form",
 )
-async def cancel_booking(booking_code: str):
-    """Cancel a booking"""
-    
-    # Find booking
-    booking_id = None
-    for bid, b in bookings_db.items():
-        if b["booking_code"] == booking_code:
-            booking_id = bid
-            break
-    
-    if not booking_id:
+async def release_slot_hold(
+    hold_token: str,
+    repo: BookingRepository = Depends(get_booking_repository),
+):
+    """Release a hold before it expires"""
+    if not await repo.release_hold(hold_token):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Randevu bulunamadı",
+            detail="Tutulan saat dilimi bulunamadı veya süresi doldu",
         )
     
-    # Check if booking can be cancelled
-    booking = bookings_db[booking_id]
-    if booking["status"] in [BookingStatus.COMPLETED, BookingStatus.CANCELLED]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Bu randevu iptal edilemez",
-        )
+    return {"success": True, "message": "Saat dilimi serbest bırakıldı"}
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export bookings",
+    description="Stream all matching bookings as CSV or NDJSON",
+)
+async def export_bookings(
+    format: ExportFormat = Query(ExportFormat.CSV, description="Export file format"),
+    status: Optional[BookingStatus] = Query(None, description="Filter by status"),
+    district: Optional[str] = Query(None, description="Filter by district"),
+    date_from: Optional[date] = Query(None, alias="dateFrom", description="Earliest preferred date"),
+    date_to: Optional[date] = Query(None, alias="dateTo", description="Latest preferred date"),
+    repo: BookingRepository = Depends(get_booking_repository),
+):
+    """
+    Export bookings, oldest first.
     
-    # Update status
-    bookings_db[booking_id]["status"] = BookingStatus.CANCELLED
-    bookings_db[booking_id]["updated_at"] = datetime.utcnow()
+    Rows are produced by a generator over the repository (a server-side
+    cursor on PostgreSQL), so memory stays flat regardless of export size.
+    """
+    bookings = repo.stream(
+        status=status,
+        district=district,
+        date_from=date_from,
+        date_to=date_to,
+    )
     
-    logger.info(f"Cancelled booking {booking_code}")
+    if format == ExportFormat.NDJSON:
+        body, media_type = _export_ndjson(bookings), "application/x-ndjson"
+    else:
+        body, media_type = _export_csv(bookings), "text/csv; charset=utf-8"
     
-    return {"success": True, "message": "Randevu başarıyla iptal edildi"}
+    filename = f"bookings-{datetime.now().strftime('%Y%m%d')}.{format.value}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get(
@@ -255,6 +473,7 @@ async def cancel_booking(booking_code: str):
 async def get_available_slots(
     date: date = Query(..., description="Date to check availability"),
     district: str = Query(..., description="Istanbul district"),
+    repo: BookingRepository = Depends(get_booking_repository),
 ):
     """Get available time slots for booking"""
     
@@ -265,29 +484,169 @@ async def get_available_slots(
             detail="Geçmiş tarih için müsaitlik sorgulanamaz",
         )
     
-    # For demo, return all slots as available
-    # In production, this would check against existing bookings and technician availability
-    available = [TimeSlot.MORNING, TimeSlot.AFTERNOON, TimeSlot.EVENING]
-    
-    # Simulate some slots being taken
-    booked_slots = []
-    for booking in bookings_db.values():
-        if (
-            booking["preferred_date"] == date
-            and booking["district"] == district
-            and booking["status"] not in [BookingStatus.CANCELLED]
-        ):
-            booked_slots.append(booking["preferred_time_slot"])
-    
-    available = [slot for slot in available if slot not in booked_slots]
+    # Free technician capacity comes from the capacity matrix
+    remaining = await repo.remaining_capacity(district, date, date)
     
     return AvailableSlotsResponse(
         date=date,
         district=district,
-        available_slots=available,
+        available_slots=slots_from_row(remaining[0]),
+    )
+
+
+@router.get(
+    "/availability",
+    response_model=AvailabilityResponse,
+    summary="Get availability for a date range",
+    description="Free technician capacity per day and time slot for a district",
+)
+async def get_availability(
+    district: str = Query(..., description="Istanbul district"),
+    date_from: date = Query(..., alias="dateFrom", description="First date"),
+    date_to: Optional[date] = Query(None, alias="dateTo", description="Last date (default: 30 days on)"),
+    repo: BookingRepository = Depends(get_booking_repository),
+):
+    """
+    Availability of every day in a range, up to 92 days.
+    
+    The whole range is answered with one slice of the capacity matrix.
+    """
+    if date_to is None:
+        date_to = date_from + timedelta(days=30)
+    
+    if date_from < datetime.now().date():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Geçmiş tarih için müsaitlik sorgulanamaz",
+        )
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bitiş tarihi başlangıç tarihinden önce olamaz",
+        )
+    if (date_to - date_from).days >= MAX_AVAILABILITY_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tarih aralığı en fazla {MAX_AVAILABILITY_DAYS} gün olabilir",
+        )
+    
+    remaining = await repo.remaining_capacity(district, date_from, date_to)
+    
+    days = [
+        DayAvailability(
+            date=date_from + timedelta(days=i),
+            available_slots=[slot for slot, n in zip(SLOTS, row) if n > 0],
+            remaining=dict(zip(SLOTS, row)),
+        )
+        for i, row in enumerate(remaining.tolist())
+    ]
+    
+    return AvailabilityResponse(
+        district=district,
+        date_from=date_from,
+        date_to=date_to,
+        days=days,
     )
 
 
+@router.get(
+    "/{booking_code}",
+    response_model=BookingResponse,
+    summary="Get booking by code",
+    description="Retrieve booking details by booking code",
+)
+async def get_booking(
+    booking_code: str,
+    repo: BookingRepository = Depends(get_booking_repository),
+):
+    """Get booking details by booking code"""
+    
+    # Look up booking by code (hash index)
+    booking = await repo.get_by_code(booking_code)
+    
+    if not booking:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Randevu bulunamadı",
+        )
+    
+    return model_json_response(booking.to_response())
+
+
+@router.get(
+    "/{booking_code}/events",
+    summary="Stream booking status",
+    description="Server-Sent Events stream of a booking's status and estimated arrival",
+    response_class=StreamingResponse,
+)
+async def stream_booking_events(
+    booking_code: str,
+    repo: BookingRepository = Depends(get_booking_repository),
+):
+    """
+    Follow a booking's status instead of polling it.
+
+    The first `status` event is the current state; another follows every
+    change. The server ends the stream after a few minutes and the browser's
+    EventSource reconnects on its own.
+    """
+    bus = get_event_bus()
+    try:
+        # Subscribe before reading, so no change falls between the two
+        subscription = bus.subscribe(booking_code)
+    except TooManySubscribers:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Canlı bağlantı sınırına ulaşıldı, lütfen daha sonra tekrar deneyin",
+        )
+    
+    booking = await repo.get_by_code(booking_code)
+    
+    if not booking:
+        bus.unsubscribe(subscription)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Randevu bulunamadı",
+        )
+    
+    return event_stream_response(bus, subscription, bus.status_frame(booking))
+
+
+@router.delete(
+    "/{booking_code}",
+    status_code=status.HTTP_200_OK,
+    summary="Cancel booking",
+    description="Cancel a booking by booking code",
+)
+async def cancel_booking(
+    booking_code: str,
+    repo: BookingRepository = Depends(get_booking_repository),
+):
+    """Cancel a booking"""
+    
+    # Find booking
+    booking = await repo.get_by_code(booking_code)
+    
+    if not booking:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Randevu bulunamadı",
+        )
+    
+    # Cancel unless already final (checked atomically with the update)
+    cancelled = await repo.cancel(booking.id, updated_at=datetime.utcnow())
+    
+    if cancelled is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bu randevu iptal edilemez",
+        )
+    
+    logger.info(f"Cancelled booking {booking_code}")
+    
+    return {"success": True, "message": "Randevu başarıyla iptal edildi"}
+
+
 @router.get(
     "",
     response_model=BookingListResponse,
@@ -297,55 +656,43 @@ async def get_available_slots(
 async def list_bookings(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, alias="pageSize", description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's nextCursor"),
     status: Optional[BookingStatus] = Query(None, description="Filter by status"),
     district: Optional[str] = Query(None, description="Filter by district"),
+    repo: BookingRepository = Depends(get_booking_repository),
 ):
-    """List bookings with pagination"""
-    
-    # Filter bookings
-    filtered = list(bookings_db.values())
+    """
+    List bookings, newest first.
     
-    if status:
-        filtered = [b for b in filtered if b["status"] == status]
+    Pass the previous response's `nextCursor` as `cursor` to page through
+    results at constant cost per page. `page` is ignored when a cursor is given.
+    """
     
-    if district:
-        filtered = [b for b in filtered if b["district"] == district]
+    # Resume below the cursor (keyset) or skip to the requested page (offset)
+    before = decode_cursor(cursor) if cursor else None
+    offset = 0 if cursor else (page - 1) * page_size
     
-    # Sort by created_at descending
-    filtered.sort(key=lambda x: x["created_at"], reverse=True)
+    # Fetch one extra item to know whether another page exists
+    window = await repo.page(
+        page_size + 1,
+        before=before,
+        offset=offset,
+        status=status,
+        district=district,
+    )
+    items = window[:page_size]
+    next_cursor = encode_cursor(items[-1]) if len(window) > page_size else None
     
-    # Pagination
-    total = len(filtered)
+    # Pagination (counts come from the filter indexes)
+    total = await repo.count(status=status, district=district)
     total_pages = (total + page_size - 1) // page_size
-    start = (page - 1) * page_size
-    end = start + page_size
-    items = filtered[start:end]
-    
-    return BookingListResponse(
-        items=[
-            BookingResponse(
-                id=b["id"],
-                booking_code=b["booking_code"],
-                status=b["status"],
-                service_category=b["service_category"],
-                problem_description=b["problem_description"],
-                urgency_level=b["urgency_level"],
-                district=b["district"],
-                address=b["address"],
-                preferred_date=b["preferred_date"],
-                preferred_time_slot=b["preferred_time_slot"],
-                estimated_arrival=b["estimated_arrival"],
-                customer_name=b["customer_name"],
-                customer_phone=b["customer_phone"],
-                customer_email=b["customer_email"],
-                assigned_technician=b["assigned_technician"],
-                created_at=b["created_at"],
-                updated_at=b["updated_at"],
-            )
-            for b in items
-        ],
+    
+    # Items are already typed, so build and encode without re-validation
+    return model_json_response(BookingListResponse.model_construct(
+        items=[b.to_response() for b in items],
         total=total,
         page=page,
         page_size=page_size,
         total_pages=total_pages,
-    )
+        next_cursor=next_cursor,
+    ))
@@ -0,0 +1,64 @@
+"""
+İsmail Doğan Elektrik API - Search Router
+Typo-tolerant search over bookings and services for operators
+"""
+
+from fastapi import APIRouter, Depends, Query
+
+from app.config import settings
+from app.models import SearchHit, SearchHitKind, SearchResponse
+from app.repositories import BookingRepository, get_booking_repository
+from app.routers.admin import require_admin_key
+from app.routers.services import SERVICE_CATALOG
+
+# Results carry customer names and phones, so search is for operators only
+router = APIRouter(
+    prefix="/search",
+    tags=["Search"],
+    dependencies=[Depends(require_admin_key)],
+)
+
+
+@router.get(
+    "",
+    response_model=SearchResponse,
+    summary="Search bookings and services",
+    description="Fuzzy match on booking codes, customer names and phones, addresses and service names",
+)
+async def search(
+    q: str = Query(..., min_length=2, max_length=100, description="Search text"),
+    limit: int = Query(20, ge=1, le=100, description="Most results returned"),
+    repo: BookingRepository = Depends(get_booking_repository),
+) -> SearchResponse:
+    """
+    Search everything an operator looks things up by.
+
+    Matching is on trigrams with Turkish letters folded (İ/ı, ş, ğ, ...),
+    so "isik" finds "IŞIK" and a mistyped name or partial phone number
+    still matches. Results are ordered by similarity.
+    """
+    threshold = settings.SEARCH_MIN_SIMILARITY
+    hits = [
+        SearchHit(
+            kind=SearchHitKind.SERVICE,
+            id=service.id,
+            title=service.name,
+            subtitle=service.category.value,
+            matched_field="name",
+            score=round(score, 3),
+        )
+        for service, score in SERVICE_CATALOG.search(q, threshold)
+    ]
+    for booking, field, score in await repo.search(q, limit, threshold):
+        hits.append(SearchHit(
+            kind=SearchHitKind.BOOKING,
+            id=booking.id,
+            title=booking.booking_code,
+            subtitle=f"{booking.customer_name} - {booking.district}",
+            matched_field=field,
+            score=round(score, 3),
+        ))
+
+    hits.sort(key=lambda hit: hit.score, reverse=True)
+    hits = hits[:limit]
+    return SearchResponse(query=q, items=hits, total=len(hits))
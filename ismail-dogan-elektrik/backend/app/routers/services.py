@@ -3,16 +3,19 @@
 Handles service listing, pricing, and calculations
 """
 
-from datetime import datetime, timedelta
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from loguru import logger
+from pydantic import TypeAdapter
 
 from app.models import (
     ServiceResponse,
     ServiceListResponse,
     PriceQuoteRequest,
     PriceQuoteResponse,
+    PriceQuoteBatchRequest,
+    PriceQuoteBatchResponse,
+    PriceMatrixResponse,
     LoadCalculationRequest,
     LoadCalculationResult,
     ContactFormRequest,
@@ -22,6 +25,10 @@ from app.models import (
     CircuitType,
 )
 from app.config import settings
+from app.repositories import BookingRepository, get_booking_repository
+from app.responses import CachedJSON, PreEncodedJSONResponse
+from app.services.catalog import ServiceCatalog
+from app.services.pricing import UnknownService, get_pricing_table
 from app.services.rust_binding import calculate_electrical_load
 
 router = APIRouter(tags=["Services"])
@@ -157,33 +164,14 @@ TESTIMONIALS_DATA = [
     },
 ]
 
+# The catalog is validated, indexed and encoded once, at import
+SERVICE_CATALOG = ServiceCatalog(SERVICES_DATA, max_age=settings.CATALOG_MAX_AGE_SECONDS)
 
-def get_district_multiplier(district: str) -> float:
-    """Calculate distance multiplier based on district"""
-    central_districts = [
-        "Beşiktaş", "Şişli", "Kadıköy", "Üsküdar", "Fatih",
-        "Beyoğlu", "Bakırköy", "Ataşehir",
-    ]
-    far_districts = [
-        "Silivri", "Çatalca", "Şile", "Adalar", "Arnavutköy", "Büyükçekmece",
-    ]
-    
-    if district in central_districts:
-        return 1.0
-    elif district in far_districts:
-        return 1.5
-    else:
-        return 1.2
-
-
-def get_urgency_multiplier(urgency: str) -> float:
-    """Get urgency price multiplier"""
-    multipliers = {
-        "normal": 1.0,
-        "urgent": settings.URGENT_MULTIPLIER,
-        "emergency": settings.EMERGENCY_MULTIPLIER,
-    }
-    return multipliers.get(urgency, 1.0)
+# Static data is validated and encoded once, on first request
+TESTIMONIALS_JSON = CachedJSON(
+    TypeAdapter(List[TestimonialResponse]),
+    lambda: [TestimonialResponse(**t) for t in TESTIMONIALS_DATA],
+)
 
 
 # ============================================
@@ -196,12 +184,9 @@ def get_urgency_multiplier(urgency: str) -> float:
     summary="List all services",
     description="Get list of all available services",
 )
-async def list_services():
+async def list_services(request: Request):
     """Get all available services"""
-    return ServiceListResponse(
-        items=[ServiceResponse(**s) for s in SERVICES_DATA],
-        total=len(SERVICES_DATA),
-    )
+    return SERVICE_CATALOG.list_json.response(request)
 
 
 @router.get(
@@ -210,17 +195,17 @@ async def list_services():
     summary="Get service by ID",
     description="Get detailed information about a specific service",
 )
-async def get_service(service_id: str):
+async def get_service(service_id: str, request: Request):
     """Get service details by ID"""
-    service = next((s for s in SERVICES_DATA if s["id"] == service_id), None)
+    service = SERVICE_CATALOG.service_json(service_id)
     
-    if not service:
+    if service is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Hizmet bulunamadı",
         )
     
-    return ServiceResponse(**service)
+    return service.response(request)
 
 
 @router.get(
@@ -229,13 +214,9 @@ async def get_service(service_id: str):
     summary="Get services by category",
     description="Get services filtered by category",
 )
-async def get_services_by_category(category: str):
+async def get_services_by_category(category: str, request: Request):
     """Get services by category"""
-    filtered = [s for s in SERVICES_DATA if s["category"] == category]
-    return ServiceListResponse(
-        items=[ServiceResponse(**s) for s in filtered],
-        total=len(filtered),
-    )
+    return SERVICE_CATALOG.category_json(category).response(request)
 
 
 # ============================================
@@ -248,44 +229,58 @@ async def get_services_by_category(category: str):
     summary="Get price quote",
     description="Calculate price quote for a service",
 )
-async def get_price_quote(request: PriceQuoteRequest):
+async def get_price_quote(
+    request: PriceQuoteRequest,
+    repo: BookingRepository = Depends(get_booking_repository),
+):
     """Calculate price quote for a service"""
-    
-    # Find service
-    service = next((s for s in SERVICES_DATA if s["id"] == request.service_id), None)
-    
-    if not service:
+    counters = await repo.occupancy_counters()
+    try:
+        return get_pricing_table(SERVICES_DATA).quote(request, counters)
+    except UnknownService:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Hizmet bulunamadı",
         )
+
+
+@router.post(
+    "/quotes/batch",
+    response_model=PriceQuoteBatchResponse,
+    summary="Get price quotes in bulk",
+    description="Calculate up to 500 price quotes in one request",
+)
+async def get_price_quotes_batch(
+    batch: PriceQuoteBatchRequest,
+    repo: BookingRepository = Depends(get_booking_repository),
+):
+    """
+    Calculate many price quotes at once.
     
-    # Calculate multipliers
-    urgency_mult = get_urgency_multiplier(request.urgency)
-    distance_mult = get_district_multiplier(request.district)
-    
-    # Calculate costs
-    base_price = service["base_price"]
-    labor_cost = settings.BASE_LABOR_RATE * 2  # Estimate 2 hours
-    materials_cost = base_price * 0.3  # 30% of base price for materials
-    
-    # Total with multipliers
-    subtotal = base_price + labor_cost + materials_cost
-    total = subtotal * urgency_mult * distance_mult
-    
-    # Quote validity (7 days)
-    valid_until = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+    Quotes are priced together with array operations and returned in
+    request order. An unknown service fails the whole batch with 404.
+    """
+    counters = await repo.occupancy_counters()
+    try:
+        body = get_pricing_table(SERVICES_DATA).batch_json(batch.items, counters)
+    except UnknownService as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Hizmet bulunamadı: {e.service_id}",
+        )
     
-    return PriceQuoteResponse(
-        base_price=base_price,
-        labor_cost=labor_cost,
-        materials_cost=materials_cost,
-        urgency_multiplier=urgency_mult,
-        distance_multiplier=distance_mult,
-        total_price=round(total, 2),
-        currency="TRY",
-        valid_until=valid_until,
-    )
+    return PreEncodedJSONResponse(body)
+
+
+@router.get(
+    "/quotes/matrix",
+    response_model=PriceMatrixResponse,
+    summary="Get price matrix",
+    description="Prices of every service in every district at every urgency level, before demand",
+)
+async def get_price_matrix(request: Request):
+    """Get the full service x district x urgency price matrix"""
+    return get_pricing_table(SERVICES_DATA).matrix_json.response(request)
 
 
 # ============================================
@@ -305,7 +300,7 @@ async def calculate_load(request: LoadCalculationRequest):
     """
     try:
         # Call Rust engine through binding
-        result = calculate_electrical_load(
+        result, engine = calculate_electrical_load(
             devices=[
                 {
                     "name": d.name,
@@ -321,7 +316,7 @@ async def calculate_load(request: LoadCalculationRequest):
             safety_factor=request.safety_factor,
         )
         
-        return LoadCalculationResult(**result)
+        return LoadCalculationResult(**result, engine=engine)
         
     except Exception as e:
         logger.error(f"Load calculation error: {e}")
@@ -373,4 +368,4 @@ async def submit_contact_form(request: ContactFormRequest):
 )
 async def get_testimonials():
     """Get customer testimonials"""
-    return [TestimonialResponse(**t) for t in TESTIMONIALS_DATA]
+    return TESTIMONIALS_JSON.response()
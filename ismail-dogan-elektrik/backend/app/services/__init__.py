@@ -7,9 +7,21 @@ from .rust_binding import (
     is_rust_engine_available,
     get_engine_info,
 )
+from .booking_store import BookingStore
+from .booking_codes import BookingCodeGenerator, get_booking_code_generator
+from .booking_journal import BookingJournal
+from .capacity import CapacityMatrix
+from .routing import optimize_routes, get_travel_matrix
 
 __all__ = [
     "calculate_electrical_load",
     "is_rust_engine_available",
     "get_engine_info",
+    "BookingStore",
+    "BookingCodeGenerator",
+    "get_booking_code_generator",
+    "BookingJournal",
+    "CapacityMatrix",
+    "optimize_routes",
+    "get_travel_matrix",
 ]
@@ -0,0 +1,150 @@
+"""
+İsmail Doğan Elektrik API - Booking Codes
+Coordination-free booking code generation partitioned by worker
+"""
+
+import fcntl
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from typing import IO, Callable, List, Optional, Tuple
+
+from loguru import logger
+
+from app.config import settings
+
+
+# Crockford base32: no I, L, O or U, so codes read back unambiguously
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+WORKER_DIGITS = 2
+TICK_DIGITS = 6
+
+MAX_WORKERS = len(ALPHABET) ** WORKER_DIGITS
+MAX_TICKS = len(ALPHABET) ** TICK_DIGITS
+
+# Worker ids are node * SLOTS_PER_NODE + slot
+SLOTS_PER_NODE = 32
+NODES = MAX_WORKERS // SLOTS_PER_NODE
+
+# Worker id used by the database's generate_booking_code() function
+DATABASE_WORKER_ID = MAX_WORKERS - 1
+
+# Clock resolution of the tick part; a day has 864M ticks, under MAX_TICKS
+TICK = timedelta(microseconds=100)
+TICKS_PER_DAY = 864_000_000
+
+
+def encode_base32(value: int, digits: int) -> str:
+    """Fixed-width Crockford base32 encoding"""
+    chars = []
+    for _ in range(digits):
+        value, rem = divmod(value, 32)
+        chars.append(ALPHABET[rem])
+    if value:
+        raise ValueError(f"Value does not fit in {digits} base32 digits")
+    return "".join(reversed(chars))
+
+
+class BookingCodeGenerator:
+    """
+    Generates booking codes of the form ``ELK-YYMMDD-WWTTTTTT``.
+
+    ``WW`` is the worker id and ``TTTTTT`` a per-worker tick counter for the
+    day, both base32. The counter follows the clock at 100 µs resolution and
+    never repeats: each code takes ``max(last + 1, now)``. Codes are unique
+    without a database check as long as every running process has its own
+    worker id (see claim_worker_id), including across restarts, since the
+    clock has passed the last issued tick by the time a worker comes back.
+    """
+
+    def __init__(
+        self,
+        worker_id: int,
+        clock: Callable[[], datetime] = datetime.now,
+    ) -> None:
+        if not 0 <= worker_id < DATABASE_WORKER_ID:
+            raise ValueError(f"Worker id must be in [0, {DATABASE_WORKER_ID})")
+
+        self.worker_id = worker_id
+        self._worker = encode_base32(worker_id, WORKER_DIGITS)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._day: Optional[str] = None
+        self._last = -1
+
+    def next(self) -> str:
+        """Generate one booking code"""
+        return self.reserve(1)[0]
+
+    def reserve(self, count: int) -> List[str]:
+        """Reserve ``count`` consecutive codes in one step"""
+        if count < 1:
+            return []
+        day, start = self._advance(count)
+        prefix = f"ELK-{day}-{self._worker}"
+        return [prefix + encode_base32(tick, TICK_DIGITS) for tick in range(start, start + count)]
+
+    def _advance(self, count: int) -> Tuple[str, int]:
+        now = self._clock()
+        day = now.strftime("%y%m%d")
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        tick = (now - midnight) // TICK
+
+        with self._lock:
+            if day != self._day:
+                self._day = day
+                self._last = -1
+            start = max(self._last + 1, tick)
+            if start + count > MAX_TICKS:
+                raise RuntimeError("Booking code space exhausted for today")
+            self._last = start + count - 1
+            return day, start
+
+
+def claim_worker_id(node_id: int, lock_dir: Optional[str] = None) -> Tuple[int, IO]:
+    """
+    Claim a worker id for this process.
+
+    ``node_id`` tells hosts apart (set per host or container). Processes on
+    the same node take the first free slot by holding an exclusive lock
+    file, so server workers forked from one master get distinct ids. The
+    returned file must stay open for as long as the id is used.
+    """
+    if not 0 <= node_id < NODES:
+        raise ValueError(f"Node id must be in [0, {NODES})")
+
+    lock_dir = lock_dir or tempfile.gettempdir()
+    for slot in range(SLOTS_PER_NODE):
+        worker_id = node_id * SLOTS_PER_NODE + slot
+        if worker_id == DATABASE_WORKER_ID:
+            break
+        lock = open(os.path.join(lock_dir, f"elk-booking-codes-{worker_id}.lock"), "w")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()
+            continue
+        return worker_id, lock
+
+    raise RuntimeError(f"No free booking code slot on node {node_id}")
+
+
+_generator: Optional[BookingCodeGenerator] = None
+_worker_lock: Optional[IO] = None
+
+
+def get_booking_code_generator() -> BookingCodeGenerator:
+    """
+    Process-wide generator, created on first use.
+
+    Created lazily so forked server workers each claim their own id.
+    """
+    global _generator, _worker_lock
+
+    if _generator is None:
+        worker_id, _worker_lock = claim_worker_id(settings.NODE_ID)
+        logger.info(f"Booking codes use worker id {worker_id}")
+        _generator = BookingCodeGenerator(worker_id)
+    return _generator
@@ -0,0 +1,537 @@
+"""
+İsmail Doğan Elektrik API - Booking Journal
+Append-only write-ahead log and snapshots for the in-memory booking store
+"""
+
+import asyncio
+import fcntl
+import gc
+import marshal
+import mmap
+import os
+import re
+import struct
+import sys
+import zlib
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from app.models import (
+    BookingRecord,
+    BookingStatus,
+    ServiceCategory,
+    TimeSlot,
+    UrgencyLevel,
+)
+from app.services.booking_store import BookingStore
+
+
+# ============================================
+# FILE FORMAT
+# ============================================
+#
+# Segment and snapshot files start with an 8-byte magic and continue with
+# frames: <u32 payload length><u32 crc32(payload)><payload>, where the
+# payload is marshal((op, body)). A segment holds the events written after
+# the snapshot with the same number; snapshot N is the store state at the
+# moment segment N was opened.
+
+SEGMENT_MAGIC = b"ELKWAL01"
+SNAPSHOT_MAGIC = b"ELKSNP01"
+
+FRAME_HEADER = struct.Struct("<II")
+
+OP_PUT = 1  # body: list of encoded records (insert or replace)
+OP_PATCH = 2  # body: (booking id, ((field, encoded value), ...))
+
+SNAPSHOT_CHUNK = 10_000
+
+_SEGMENT_RE = re.compile(r"journal-(\d{8})\.log$")
+_SNAPSHOT_RE = re.compile(r"snapshot-(\d{8})\.bin$")
+
+
+def _segment_name(n: int) -> str:
+    return f"journal-{n:08d}.log"
+
+
+def _snapshot_name(n: int) -> str:
+    return f"snapshot-{n:08d}.bin"
+
+
+# ============================================
+# RECORD ENCODING
+# ============================================
+
+_STATUS = {m.value: m for m in BookingStatus}
+_CATEGORY = {m.value: m for m in ServiceCategory}
+_URGENCY = {m.value: m for m in UrgencyLevel}
+_SLOT = {m.value: m for m in TimeSlot}
+
+_FIELD_DECODERS = {
+    "status": _STATUS.__getitem__,
+    "service_category": _CATEGORY.__getitem__,
+    "urgency_level": _URGENCY.__getitem__,
+    "preferred_time_slot": _SLOT.__getitem__,
+    "preferred_date": date.fromordinal,
+    "created_at": datetime.fromisoformat,
+    "estimated_arrival": datetime.fromisoformat,
+    "updated_at": datetime.fromisoformat,
+}
+
+
+def _encode_value(value: Any) -> Any:
+    """Reduce a field value to types marshal can store"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.toordinal()
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def _decode_value(field: str, value: Any) -> Any:
+    if value is None:
+        return None
+    decode = _FIELD_DECODERS.get(field)
+    return decode(value) if decode is not None else value
+
+
+def _dt(value: Optional[str]) -> Optional[datetime]:
+    return None if value is None else datetime.fromisoformat(value)
+
+
+def encode_record(b: BookingRecord) -> tuple:
+    """Encode a record as a flat tuple in BookingRecord field order"""
+    return (
+        b.id,
+        b.booking_code,
+        b.status.value,
+        b.service_category.value,
+        b.problem_description,
+        b.urgency_level.value,
+        b.district,
+        b.address,
+        b.preferred_date.toordinal(),
+        b.preferred_time_slot.value,
+        b.customer_name,
+        b.customer_phone,
+        b.customer_email,
+        b.created_at.isoformat(),
+        None if b.estimated_arrival is None else b.estimated_arrival.isoformat(),
+        b.additional_notes,
+        tuple(b.photos),
+        b.assigned_technician,
+        None if b.updated_at is None else b.updated_at.isoformat(),
+    )
+
+
+def decode_record(t: tuple) -> BookingRecord:
+    """Inverse of encode_record"""
+    return BookingRecord(
+        t[0],
+        t[1],
+        _STATUS[t[2]],
+        _CATEGORY[t[3]],
+        t[4],
+        _URGENCY[t[5]],
+        sys.intern(t[6]),
+        t[7],
+        date.fromordinal(t[8]),
+        _SLOT[t[9]],
+        t[10],
+        t[11],
+        t[12],
+        datetime.fromisoformat(t[13]),
+        _dt(t[14]),
+        t[15],
+        t[16],
+        t[17],
+        _dt(t[18]),
+    )
+
+
+def _frame(op: int, body: Any) -> bytes:
+    payload = marshal.dumps((op, body))
+    return FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _read_frames(path: str, magic: bytes) -> Iterator[Tuple[int, Any, int]]:
+    """
+    Yield (op, body, end offset) for every intact frame of a file.
+
+    The file is memory-mapped, so frames are decoded straight from the page
+    cache without an intermediate read buffer. Iteration stops at the first
+    torn or corrupt frame.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < len(magic):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(magic)] != magic:
+                raise ValueError(f"Not a booking journal file: {path}")
+            view = memoryview(mm)
+            try:
+                offset = len(magic)
+                while offset + FRAME_HEADER.size <= size:
+                    length, crc = FRAME_HEADER.unpack_from(mm, offset)
+                    start = offset + FRAME_HEADER.size
+                    end = start + length
+                    if end > size:
+                        break
+                    payload = view[start:end]
+                    valid = zlib.crc32(payload) == crc
+                    if valid:
+                        op, body = marshal.loads(payload)
+                    payload.release()
+                    if not valid:
+                        break
+                    yield op, body, end
+                    offset = end
+            finally:
+                view.release()
+
+
+# ============================================
+# JOURNAL
+# ============================================
+
+class BookingJournal:
+    """
+    Durable log of BookingStore changes.
+
+    Writers call append_put/append_patch after applying a change in memory;
+    the call returns once the change is on disk. A single flush task writes
+    every event queued while the previous fsync was running in one write
+    and one fsync (group commit), so throughput grows with concurrency
+    instead of being capped by fsync latency.
+
+    Every ``snapshot_every`` events the flush task opens a new segment and
+    writes the store state as a snapshot; older segments and snapshots are
+    then deleted. Because changes are applied before they are journaled,
+    the state captured when a segment opens contains every event of the
+    previous segments. Events that were applied but not yet written end up
+    in the new segment as well, which is harmless because replay is
+    idempotent.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        snapshot_every: int = 100_000,
+        fsync: bool = True,
+    ) -> None:
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+
+        self._store: Optional[BookingStore] = None
+        self._dir_lock = None
+        self._segment = 0
+        self._file = None
+        self._pending: List[Tuple[bytes, int, asyncio.Future]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._snapshot_task: Optional[asyncio.Task] = None
+        self._snapshot_waiters: List[asyncio.Future] = []
+        self._since_snapshot = 0
+        self._closing = False
+
+        # Counters exposed for monitoring and benchmarks
+        self.events_written = 0
+        self.batches_written = 0
+
+    # ============================================
+    # STARTUP
+    # ============================================
+
+    def replay(self, store: BookingStore) -> int:
+        """
+        Load the newest snapshot and every later segment into ``store``.
+
+        Returns the number of events replayed. A torn tail left by a crash
+        is cut off. Appends then go to a fresh segment.
+        """
+        if len(store):
+            raise ValueError("Replay requires an empty store")
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock_directory()
+        self._store = store
+
+        snapshots = self._numbered(_SNAPSHOT_RE)
+        segments = self._numbered(_SEGMENT_RE)
+        base = snapshots[-1] if snapshots else 0
+
+        # Replay only allocates long-lived objects; cyclic GC passes over
+        # them would just add time
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            if snapshots:
+                self._load_snapshot(store, os.path.join(self.directory, _snapshot_name(base)))
+
+            events = 0
+            for n in segments:
+                if n >= base:
+                    events += self._replay_segment(
+                        store, os.path.join(self.directory, _segment_name(n))
+                    )
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        self._segment = max([base, *segments]) + 1
+        self._open_segment()
+        self._since_snapshot = events
+        logger.info(
+            f"Booking journal replayed {len(store)} bookings "
+            f"(snapshot {base}, {events} log events)"
+        )
+        return events
+
+    def _lock_directory(self) -> None:
+        # One process owns a journal; a second writer would interleave frames
+        self._dir_lock = open(os.path.join(self.directory, "journal.lock"), "w")
+        try:
+            fcntl.flock(self._dir_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._dir_lock.close()
+            raise RuntimeError(f"Booking journal {self.directory} is used by another process")
+
+    def _numbered(self, pattern: "re.Pattern") -> List[int]:
+        found = []
+        for name in os.listdir(self.directory):
+            match = pattern.match(name)
+            if match:
+                found.append(int(match.group(1)))
+        return sorted(found)
+
+    @staticmethod
+    def _load_snapshot(store: BookingStore, path: str) -> None:
+        def records() -> Iterator[BookingRecord]:
+            for op, body, _ in _read_frames(path, SNAPSHOT_MAGIC):
+                if op != OP_PUT:
+                    raise ValueError(f"Unexpected snapshot frame {op} in {path}")
+                for t in body:
+                    yield decode_record(t)
+
+        store.load(records())
+
+    @staticmethod
+    def _replay_segment(store: BookingStore, path: str) -> int:
+        events = 0
+        good_end = len(SEGMENT_MAGIC)
+        for op, body, end in _read_frames(path, SEGMENT_MAGIC):
+            if op == OP_PUT:
+                for t in body:
+                    booking = decode_record(t)
+                    if booking.id in store:
+                        store.delete(booking.id)
+                    store.add(booking)
+                    events += 1
+            elif op == OP_PATCH:
+                booking_id, changes = body
+                if booking_id in store:
+                    store.update(
+                        booking_id,
+                        **{field: _decode_value(field, value) for field, value in changes},
+                    )
+                events += 1
+            good_end = end
+
+        if os.path.getsize(path) > good_end:
+            logger.warning(f"Truncating torn tail of {path} at byte {good_end}")
+            with open(path, "r+b") as f:
+                f.truncate(good_end)
+        return events
+
+    def _open_segment(self) -> None:
+        path = os.path.join(self.directory, _segment_name(self._segment))
+        self._file = open(path, "ab", buffering=0)
+        if self._file.tell() == 0:
+            self._file.write(SEGMENT_MAGIC)
+            self._sync(self._file)
+        self._sync_directory()
+
+    # ============================================
+    # WRITING
+    # ============================================
+
+    async def start(self) -> None:
+        """Start the group-commit flush task"""
+        if self._file is None:
+            raise RuntimeError("Replay the journal before starting it")
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def append_put(self, bookings: Sequence[BookingRecord]) -> None:
+        """Durably record inserted (or fully replaced) bookings"""
+        if bookings:
+            await self._append(
+                _frame(OP_PUT, [encode_record(b) for b in bookings]), len(bookings)
+            )
+
+    async def append_patch(self, booking_id: str, changes: Dict[str, Any]) -> None:
+        """Durably record field changes of one booking"""
+        encoded = tuple((field, _encode_value(value)) for field, value in changes.items())
+        await self._append(_frame(OP_PATCH, (booking_id, encoded)), 1)
+
+    async def snapshot(self) -> None:
+        """Write a snapshot now and wait for it"""
+        waiter = asyncio.get_running_loop().create_future()
+        self._snapshot_waiters.append(waiter)
+        self._wakeup.set()
+        await waiter
+
+    async def close(self, snapshot: bool = False) -> None:
+        """Flush queued events, optionally snapshot, and stop"""
+        if self._flusher is None:
+            return
+        if snapshot:
+            await self.snapshot()
+        self._closing = True
+        self._wakeup.set()
+        await self._flusher
+        self._flusher = None
+        if self._snapshot_task is not None:
+            await self._snapshot_task
+        self._file.close()
+        self._dir_lock.close()
+
+    async def _append(self, frame: bytes, events: int) -> None:
+        if self._flusher is None or self._closing:
+            raise RuntimeError("Booking journal is not running")
+        done = asyncio.get_running_loop().create_future()
+        self._pending.append((frame, events, done))
+        self._wakeup.set()
+        await done
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            if self._pending:
+                batch, self._pending = self._pending, []
+                data = b"".join(frame for frame, _, _ in batch)
+                try:
+                    await asyncio.to_thread(self._write, data)
+                except Exception as e:
+                    logger.error(f"Booking journal write failed: {e}")
+                    for _, _, done in batch:
+                        if not done.done():
+                            done.set_exception(e)
+                    self._abandon_segment()
+                else:
+                    events = sum(n for _, n, _ in batch)
+                    self.events_written += events
+                    self.batches_written += 1
+                    self._since_snapshot += events
+                    for _, _, done in batch:
+                        if not done.done():
+                            done.set_result(None)
+
+                # Appends queued during the write form the next batch
+                if self._pending:
+                    self._wakeup.set()
+
+            wants_snapshot = self._snapshot_waiters or self._since_snapshot >= self.snapshot_every
+            if wants_snapshot and (self._snapshot_task is None or self._snapshot_task.done()):
+                self._begin_snapshot()
+
+            if self._closing and not self._pending:
+                return
+
+    def _abandon_segment(self) -> None:
+        # A failed write may leave a partial frame; later events go to a new
+        # segment so replay, which stops at the damage, does not lose them
+        try:
+            self._file.close()
+            self._segment += 1
+            self._open_segment()
+        except Exception as e:
+            logger.error(f"Booking journal cannot open a new segment: {e}")
+
+    def _write(self, data: bytes) -> None:
+        self._file.write(data)
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    # ============================================
+    # SNAPSHOTS
+    # ============================================
+
+    def _begin_snapshot(self) -> None:
+        # Runs between batches, so no write is in flight: switch segments
+        # and capture the records without yielding to other tasks
+        self._file.close()
+        self._segment += 1
+        self._open_segment()
+        records = list(self._store.values())
+        self._since_snapshot = 0
+
+        waiters, self._snapshot_waiters = self._snapshot_waiters, []
+        self._snapshot_task = asyncio.create_task(
+            self._finish_snapshot(self._segment, records, waiters)
+        )
+
+    async def _finish_snapshot(
+        self,
+        n: int,
+        records: List[BookingRecord],
+        waiters: List[asyncio.Future],
+    ) -> None:
+        try:
+            await asyncio.to_thread(self._write_snapshot, n, records)
+        except Exception as e:
+            logger.error(f"Booking snapshot {n} failed: {e}")
+            for waiter in waiters:
+                waiter.set_exception(e)
+            return
+
+        logger.info(f"Booking snapshot {n} written ({len(records)} bookings)")
+        for waiter in waiters:
+            waiter.set_result(None)
+        # Requests that arrived while this snapshot was running
+        if self._snapshot_waiters:
+            self._wakeup.set()
+
+    def _write_snapshot(self, n: int, records: List[BookingRecord]) -> None:
+        final = os.path.join(self.directory, _snapshot_name(n))
+        tmp = final + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            for i in range(0, len(records), SNAPSHOT_CHUNK):
+                chunk = records[i:i + SNAPSHOT_CHUNK]
+                f.write(_frame(OP_PUT, [encode_record(b) for b in chunk]))
+            f.flush()
+            self._sync(f)
+        os.replace(tmp, final)
+        self._sync_directory()
+
+        # Everything before segment n is now covered by the snapshot
+        for m in self._numbered(_SNAPSHOT_RE):
+            if m < n:
+                os.remove(os.path.join(self.directory, _snapshot_name(m)))
+        for m in self._numbered(_SEGMENT_RE):
+            if m < n:
+                os.remove(os.path.join(self.directory, _segment_name(m)))
+
+    def _sync(self, f) -> None:
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    def _sync_directory(self) -> None:
+        if self.fsync:
+            fd = os.open(self.directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
@@ -0,0 +1,519 @@
+"""
+İsmail Doğan Elektrik API - Booking Store
+In-memory booking storage with hash indexes for constant-time lookups
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Set, Tuple
+
+from app.models import BOOKING_RECORD_FIELDS, BookingRecord, BookingStatus, TimeSlot
+from app.services.search import (
+    BookingMatch,
+    TrigramIndex,
+    best_field,
+    booking_search_texts,
+    booking_trigrams,
+    query_trigrams,
+    required_shared,
+)
+
+
+# Bookings in these states no longer hold their time slot
+SLOT_RELEASING_STATUSES = frozenset({BookingStatus.CANCELLED})
+
+# Bookings in these states can no longer be cancelled
+FINAL_STATUSES = frozenset({BookingStatus.COMPLETED, BookingStatus.CANCELLED})
+
+# Changing any of these re-indexes a booking for search
+SEARCHED_FIELDS = frozenset({"booking_code", "customer_name", "customer_phone", "address"})
+
+SlotKey = Tuple[date, str, TimeSlot]
+OrderKey = Tuple[datetime, str]
+
+
+class BookingStore:
+    """
+    In-memory booking store.
+
+    Bookings are kept in a primary dict keyed by booking id. Secondary
+    indexes are maintained on every write so hot reads never scan the store:
+
+    - booking_code → id
+    - (date, district, time slot) → number of bookings holding the slot
+    - a list of (created_at, id) kept sorted for keyset pagination
+    - status → ids and district → ids membership sets for filtering
+    - a trigram index over codes, customer names, phones and addresses,
+      built on the first search (see ``index_for_search``) and kept up to
+      date from then on
+
+    ``slot_listener``, when set, is called with ``(slot, delta)`` whenever
+    the number of bookings holding a slot changes.
+    """
+
+    def __init__(self) -> None:
+        self._bookings: Dict[str, BookingRecord] = {}
+        self._code_index: Dict[str, str] = {}
+        self._slot_index: Dict[SlotKey, int] = {}
+        self._order: List[OrderKey] = []
+        self._status_index: Dict[BookingStatus, Set[str]] = {}
+        self._district_index: Dict[str, Set[str]] = {}
+        self._search_index: Optional[TrigramIndex] = None
+        # Ids still to be indexed while the search index is being built
+        self._search_backlog: List[str] = []
+        self.slot_listener: Optional[Callable[[SlotKey, int], None]] = None
+
+    def __len__(self) -> int:
+        return len(self._bookings)
+
+    def __contains__(self, booking_id: object) -> bool:
+        return booking_id in self._bookings
+
+    def __iter__(self) -> Iterator[BookingRecord]:
+        return iter(self._bookings.values())
+
+    def values(self) -> Iterator[BookingRecord]:
+        """Iterate over all stored bookings"""
+        return iter(self._bookings.values())
+
+    # ============================================
+    # READS
+    # ============================================
+
+    def get(self, booking_id: str) -> Optional[BookingRecord]:
+        """Get a booking by its id"""
+        return self._bookings.get(booking_id)
+
+    def get_by_code(self, booking_code: str) -> Optional[BookingRecord]:
+        """Get a booking by its booking code in O(1)"""
+        booking_id = self._code_index.get(booking_code)
+        if booking_id is None:
+            return None
+        return self._bookings[booking_id]
+
+    def slot_count(self, day: date, district: str, slot: TimeSlot) -> int:
+        """Number of active bookings holding a slot"""
+        return self._slot_index.get((day, district, slot), 0)
+
+    def slot_counts(self) -> Iterator[Tuple[SlotKey, int]]:
+        """(slot, active bookings) for every slot held by at least one booking"""
+        return iter(self._slot_index.items())
+
+    def booked_slots(self, day: date, district: str) -> List[TimeSlot]:
+        """Time slots already taken for a date and district"""
+        return [
+            slot for slot in TimeSlot
+            if (day, district, slot) in self._slot_index
+        ]
+
+    @staticmethod
+    def slot_of(booking: BookingRecord) -> SlotKey:
+        """The (date, district, time slot) a booking asks for"""
+        return (booking.preferred_date, booking.district, booking.preferred_time_slot)
+
+    @staticmethod
+    def order_key(booking: BookingRecord) -> OrderKey:
+        """Sort key of a booking in the created_at index"""
+        return (booking.created_at, booking.id)
+
+    def iter_newest_first(
+        self,
+        before: Optional[OrderKey] = None,
+        offset: int = 0,
+    ) -> Iterator[BookingRecord]:
+        """
+        Iterate bookings by created_at descending.
+
+        Starts strictly below the ``before`` key when given, then skips
+        ``offset`` entries; both are resolved on the index without a scan.
+        """
+        end = len(self._order) if before is None else bisect_left(self._order, before)
+        order = self._order
+        bookings = self._bookings
+        for i in range(end - offset - 1, -1, -1):
+            yield bookings[order[i][1]]
+
+    # ============================================
+    # FILTERED READS
+    # ============================================
+
+    def matching_ids(
+        self,
+        status: Optional[BookingStatus] = None,
+        district: Optional[str] = None,
+    ) -> Optional[Set[str]]:
+        """
+        Ids matching every given filter, by set intersection.
+
+        Returns None when no filter is given, meaning "all bookings".
+        """
+        sets = []
+        if status is not None:
+            sets.append(self._status_index.get(status, set()))
+        if district is not None:
+            sets.append(self._district_index.get(district, set()))
+
+        if not sets:
+            return None
+        if len(sets) == 1:
+            return sets[0]
+        # Intersection cost is bounded by the smaller set
+        smaller, larger = sorted(sets, key=len)
+        return smaller & larger
+
+    def count(
+        self,
+        status: Optional[BookingStatus] = None,
+        district: Optional[str] = None,
+    ) -> int:
+        """Number of bookings matching the filters"""
+        ids = self.matching_ids(status, district)
+        return len(self._bookings) if ids is None else len(ids)
+
+    def counts_by_district(self, status: Optional[BookingStatus] = None) -> Dict[str, int]:
+        """Booking counts per district, optionally restricted to a status"""
+        if status is None:
+            return {d: len(ids) for d, ids in self._district_index.items()}
+
+        status_ids = self._status_index.get(status, set())
+        counts = {}
+        for d, ids in self._district_index.items():
+            n = len(ids & status_ids)
+            if n:
+                counts[d] = n
+        return counts
+
+    def page(
+        self,
+        limit: int,
+        before: Optional[OrderKey] = None,
+        offset: int = 0,
+        status: Optional[BookingStatus] = None,
+        district: Optional[str] = None,
+    ) -> List[BookingRecord]:
+        """
+        Up to ``limit`` bookings matching the filters, newest first.
+
+        Dense filters walk the created_at index and skip non-members; sparse
+        filters rank only the matching ids with a bounded heap. The cheaper
+        path is picked from the set sizes.
+        """
+        ids = self.matching_ids(status, district)
+        if ids is None:
+            return list(islice(self.iter_newest_first(before, offset), limit))
+        if not ids:
+            return []
+
+        wanted = offset + limit
+        walk_cost = wanted * len(self._bookings) / len(ids)
+        if walk_cost <= len(ids):
+            matching = (
+                b for b in self.iter_newest_first(before) if b.id in ids
+            )
+            return list(islice(matching, offset, wanted))
+
+        bookings = self._bookings
+        keys = (self.order_key(bookings[i]) for i in ids)
+        if before is not None:
+            keys = (k for k in keys if k < before)
+        top = heapq.nlargest(wanted, keys)[offset:]
+        return [bookings[booking_id] for _, booking_id in top]
+
+    def scan(
+        self,
+        after: Optional[OrderKey],
+        limit: int,
+        max_scan: int,
+        status: Optional[BookingStatus] = None,
+        district: Optional[str] = None,
+        predicate: Optional[Callable[[BookingRecord], bool]] = None,
+    ) -> Tuple[List[BookingRecord], Optional[OrderKey]]:
+        """
+        Bounded oldest-first scan for streaming consumers.
+
+        Returns up to ``limit`` matching bookings created after ``after``,
+        looking at no more than ``max_scan`` index entries, together with the
+        key to resume from (None once the index is exhausted). Resuming by key
+        keeps the scan correct while other requests modify the store.
+        """
+        ids = self.matching_ids(status, district)
+        order = self._order
+        bookings = self._bookings
+        start = 0 if after is None else bisect_right(order, after)
+        stop = min(start + max_scan, len(order))
+
+        matches: List[BookingRecord] = []
+        for i in range(start, stop):
+            booking_id = order[i][1]
+            if ids is not None and booking_id not in ids:
+                continue
+            booking = bookings[booking_id]
+            if predicate is not None and not predicate(booking):
+                continue
+            matches.append(booking)
+            if len(matches) == limit:
+                return matches, order[i]
+
+        return matches, (order[stop - 1] if stop < len(order) else None)
+
+    # ============================================
+    # SEARCH
+    # ============================================
+
+    def index_for_search(self, budget: Optional[int] = None) -> bool:
+        """
+        Build the search index, indexing at most ``budget`` stored bookings
+        per call; True once it is complete.
+
+        Bookings written meanwhile are indexed as they change, so callers
+        can interleave these steps with other work.
+        """
+        if self._search_index is None:
+            self._search_index = TrigramIndex()
+            # Popped from the end: oldest first, so index ties favour newer bookings
+            self._search_backlog = [booking_id for _, booking_id in reversed(self._order)]
+        backlog = self._search_backlog
+        if budget is None:
+            budget = len(backlog)
+
+        index = self._search_index
+        bookings = self._bookings
+        for _ in range(min(budget, len(backlog))):
+            booking = bookings.get(backlog.pop())
+            if booking is not None and booking.id not in index:
+                index.add(booking.id, booking_trigrams(booking))
+        return not backlog
+
+    def search(self, query: str, limit: int, threshold: float = 0.5) -> List[BookingMatch]:
+        """
+        Up to ``limit`` bookings whose code, customer name, phone or address
+        contains at least ``threshold`` of the query's trigrams, best first.
+
+        The trigram index finds candidates by their trigrams over all fields
+        together; each candidate is then scored field by field, so a query
+        only half-matching two different fields is not reported.
+        """
+        variants = query_trigrams(query)
+        if not variants or limit <= 0:
+            return []
+        self.index_for_search()
+
+        bookings = self._bookings
+        seen: Set[str] = set()
+        # Min-heap of the best (score, -rank, match) so far
+        top: List[Tuple[float, int, BookingMatch]] = []
+        rank = 0
+        for grams in variants:
+            # Over-fetch: candidates scoring lower field by field drop out
+            candidates = self._search_index.lookup(
+                grams, required_shared(grams, threshold), limit * 2
+            )
+            for booking_id, shared in candidates:
+                # No field can share more trigrams than the whole booking
+                if len(top) == limit and shared / len(grams) <= top[0][0]:
+                    break
+                if booking_id in seen:
+                    continue
+                seen.add(booking_id)
+                booking = bookings[booking_id]
+                field, score = best_field(variants, booking_search_texts(booking))
+                if score < threshold:
+                    continue
+                rank += 1
+                entry = (score, -rank, BookingMatch(booking, field, score))
+                if len(top) < limit:
+                    heapq.heappush(top, entry)
+                elif entry > top[0]:
+                    heapq.heapreplace(top, entry)
+        return [match for _, _, match in sorted(top, reverse=True)]
+
+    # ============================================
+    # WRITES
+    # ============================================
+
+    def add(self, booking: BookingRecord) -> BookingRecord:
+        """Insert a new booking and index it"""
+        booking_id = booking.id
+        booking_code = booking.booking_code
+
+        if booking_id in self._bookings:
+            raise ValueError(f"Booking id already exists: {booking_id}")
+        if booking_code in self._code_index:
+            raise ValueError(f"Booking code already exists: {booking_code}")
+
+        self._bookings[booking_id] = booking
+        self._code_index[booking_code] = booking_id
+        self._index(booking)
+        self._index_order(booking)
+        if self._search_index is not None:
+            self._index_search(booking)
+        return booking
+
+    def load(self, bookings: Iterable[BookingRecord]) -> None:
+        """
+        Bulk-insert bookings into an empty store.
+
+        Builds every index in one pass with the per-record bookkeeping
+        inlined and sorts the created_at index once at the end; used to
+        restore large stores quickly.
+        """
+        if self._bookings:
+            raise ValueError("Bulk load requires an empty store")
+
+        primary = self._bookings
+        codes = self._code_index
+        slots = self._slot_index
+        statuses = self._status_index
+        districts = self._district_index
+        order = self._order
+
+        for booking in bookings:
+            booking_id = booking.id
+            if booking_id in primary or booking.booking_code in codes:
+                self._reset()
+                raise ValueError(f"Duplicate booking in bulk load: {booking_id}")
+
+            primary[booking_id] = booking
+            codes[booking.booking_code] = booking_id
+            order.append((booking.created_at, booking_id))
+
+            ids = statuses.get(booking.status)
+            if ids is None:
+                ids = statuses[booking.status] = set()
+            ids.add(booking_id)
+            ids = districts.get(booking.district)
+            if ids is None:
+                ids = districts[booking.district] = set()
+            ids.add(booking_id)
+
+            if booking.status not in SLOT_RELEASING_STATUSES:
+                key = (booking.preferred_date, booking.district, booking.preferred_time_slot)
+                slots[key] = slots.get(key, 0) + 1
+
+        order.sort()
+        if self.slot_listener is not None:
+            for key, n in slots.items():
+                self.slot_listener(key, n)
+
+    def update(self, booking_id: str, **changes: Any) -> BookingRecord:
+        """Apply field changes to a booking, keeping indexes in sync"""
+        booking = self._bookings.get(booking_id)
+        if booking is None:
+            raise KeyError(booking_id)
+
+        unknown = changes.keys() - BOOKING_RECORD_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown booking fields: {sorted(unknown)}")
+
+        new_code = changes.get("booking_code")
+        if new_code is not None and new_code != booking.booking_code:
+            if new_code in self._code_index:
+                raise ValueError(f"Booking code already exists: {new_code}")
+            del self._code_index[booking.booking_code]
+            self._code_index[new_code] = booking_id
+
+        reorder = "created_at" in changes
+        self._unindex(booking)
+        if reorder:
+            self._unindex_order(booking)
+        for field, value in changes.items():
+            setattr(booking, field, value)
+        self._index(booking)
+        if reorder:
+            self._index_order(booking)
+        if self._search_index is not None and not SEARCHED_FIELDS.isdisjoint(changes):
+            self._index_search(booking)
+        return booking
+
+    def delete(self, booking_id: str) -> Optional[BookingRecord]:
+        """Remove a booking and its index entries"""
+        booking = self._bookings.pop(booking_id, None)
+        if booking is None:
+            return None
+
+        self._code_index.pop(booking.booking_code, None)
+        self._unindex(booking)
+        self._unindex_order(booking)
+        if self._search_index is not None:
+            self._search_index.remove(booking_id)
+        return booking
+
+    def clear(self) -> None:
+        """Remove all bookings"""
+        if self.slot_listener is not None:
+            for key, n in self._slot_index.items():
+                self.slot_listener(key, -n)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._bookings.clear()
+        self._code_index.clear()
+        self._slot_index.clear()
+        self._order.clear()
+        self._status_index.clear()
+        self._district_index.clear()
+        self._search_index = None
+        self._search_backlog = []
+
+    # ============================================
+    # INDEX MAINTENANCE
+    # ============================================
+
+    @staticmethod
+    def _slot_key(booking: BookingRecord) -> Optional[SlotKey]:
+        if booking.status in SLOT_RELEASING_STATUSES:
+            return None
+        return BookingStore.slot_of(booking)
+
+    def _index(self, booking: BookingRecord) -> None:
+        booking_id = booking.id
+        self._status_index.setdefault(booking.status, set()).add(booking_id)
+        self._district_index.setdefault(booking.district, set()).add(booking_id)
+
+        key = self._slot_key(booking)
+        if key is not None:
+            self._slot_index[key] = self._slot_index.get(key, 0) + 1
+            if self.slot_listener is not None:
+                self.slot_listener(key, 1)
+
+    def _unindex(self, booking: BookingRecord) -> None:
+        booking_id = booking.id
+        self._discard(self._status_index, booking.status, booking_id)
+        self._discard(self._district_index, booking.district, booking_id)
+
+        key = self._slot_key(booking)
+        if key is not None:
+            remaining = self._slot_index[key] - 1
+            if remaining:
+                self._slot_index[key] = remaining
+            else:
+                del self._slot_index[key]
+            if self.slot_listener is not None:
+                self.slot_listener(key, -1)
+
+    @staticmethod
+    def _discard(index: Dict[Any, Set[str]], value: Any, booking_id: str) -> None:
+        ids = index.get(value)
+        if ids is not None:
+            ids.discard(booking_id)
+            if not ids:
+                del index[value]
+
+    def _index_order(self, booking: BookingRecord) -> None:
+        key = self.order_key(booking)
+        # New bookings almost always arrive in created_at order
+        if not self._order or self._order[-1] < key:
+            self._order.append(key)
+        else:
+            insort(self._order, key)
+
+    def _unindex_order(self, booking: BookingRecord) -> None:
+        key = self.order_key(booking)
+        i = bisect_left(self._order, key)
+        if i < len(self._order) and self._order[i] == key:
+            del self._order[i]
+
+    def _index_search(self, booking: BookingRecord) -> None:
+        self._search_index.add(booking.id, booking_trigrams(booking))
@@ -0,0 +1,261 @@
+"""
+İsmail Doğan Elektrik API - Slot Capacity
+Dense technician capacity and committed bookings per date, district and time slot
+"""
+
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from loguru import logger
+from pydantic import TypeAdapter
+
+from app.models import TechnicianShift, TimeSlot
+from app.services.booking_store import SlotKey
+
+# Time slot axis order
+SLOTS: Tuple[TimeSlot, ...] = tuple(TimeSlot)
+_SLOT_INDEX = {slot: i for i, slot in enumerate(SLOTS)}
+
+
+class CapacityMatrix:
+    """
+    Slot capacity over a rolling window of days.
+
+    Two ``(days, districts, slots)`` int32 arrays cover the window starting
+    at ``start``: technician capacity and committed bookings. Capacity is
+    the weekly shift pattern laid out over the window, so it is defined for
+    any date; committed counts are kept for window dates only and follow
+    the bookings through ``track`` (one cell per change) or ``sync`` (a
+    full recount). Range queries are slices of the two arrays.
+
+    Without technician shifts every cell gets ``default_capacity``, in
+    every district, including ones outside the configured district list.
+
+    For demand pricing, each district's capacity and committed bookings
+    over the first ``demand_days`` of the window are kept as running
+    totals, so district occupancy is read without summing the arrays.
+    """
+
+    def __init__(
+        self,
+        districts: Sequence[str],
+        days: int,
+        start: Optional[date] = None,
+        default_capacity: int = 1,
+        demand_days: int = 14,
+    ) -> None:
+        if days < 1:
+            raise ValueError("The capacity window needs at least one day")
+
+        self.districts: Tuple[str, ...] = tuple(districts)
+        self._district_index: Dict[str, int] = {d: i for i, d in enumerate(self.districts)}
+        self.days = days
+        self.demand_days = max(1, min(demand_days, days))
+        self.default_capacity = default_capacity
+        self.has_shifts = False
+
+        shape = (7, len(self.districts), len(SLOTS))
+        self.weekly = np.full(shape, default_capacity, dtype=np.int32)
+        self.start = start or date.today()
+        self.capacity = self._lay_out(self.start, days)
+        self.committed = np.zeros_like(self.capacity)
+        self._total_demand_window()
+
+    # ============================================
+    # SETUP
+    # ============================================
+
+    def set_shifts(self, shifts: Iterable[TechnicianShift]) -> None:
+        """
+        Derive capacity from technician shifts.
+
+        Each technician adds one booking of capacity to every (weekday,
+        district, time slot) their shifts cover. A technician can only be in
+        one district at a time; conflicting shifts raise ValueError.
+        """
+        seen: Set[Tuple[str, int, TimeSlot]] = set()
+        weekdays: List[int] = []
+        districts: List[int] = []
+        slots: List[int] = []
+
+        for shift in shifts:
+            d = self._district_index.get(shift.district)
+            if d is None:
+                logger.warning(f"Ignoring shift in unknown district: {shift.district}")
+                continue
+            for weekday in set(shift.weekdays):
+                for slot in set(shift.time_slots):
+                    key = (shift.technician_id, weekday, slot)
+                    if key in seen:
+                        raise ValueError(
+                            f"Technician {shift.technician_id} has overlapping shifts"
+                        )
+                    seen.add(key)
+                    weekdays.append(weekday)
+                    districts.append(d)
+                    slots.append(_SLOT_INDEX[slot])
+
+        weekly = np.zeros_like(self.weekly)
+        np.add.at(weekly, (weekdays, districts, slots), 1)
+        self.weekly = weekly
+        self.has_shifts = True
+        self.capacity = self._lay_out(self.start, self.days)
+        self._total_demand_window()
+
+    def rebase(self, start: date) -> bool:
+        """
+        Move the window to begin at ``start``.
+
+        Committed counts are reset; callers ``sync`` them afterwards. Returns
+        False when the window already starts there.
+        """
+        if start == self.start:
+            return False
+        self.start = start
+        self.capacity = self._lay_out(start, self.days)
+        self.committed = np.zeros_like(self.capacity)
+        self._total_demand_window()
+        return True
+
+    def sync(self, counts: Iterable[Tuple[SlotKey, int]]) -> None:
+        """Recount committed bookings from (slot, active bookings) pairs"""
+        rows: List[int] = []
+        districts: List[int] = []
+        slots: List[int] = []
+        values: List[int] = []
+
+        for key, n in counts:
+            cell = self._cell(key)
+            if cell is not None:
+                rows.append(cell[0])
+                districts.append(cell[1])
+                slots.append(cell[2])
+                values.append(n)
+
+        committed = np.zeros_like(self.capacity)
+        np.add.at(committed, (rows, districts, slots), values)
+        self.committed = committed
+        self._total_demand_window()
+
+    def track(self, key: SlotKey, delta: int) -> None:
+        """Record ``delta`` more active bookings in a slot"""
+        cell = self._cell(key)
+        if cell is not None:
+            self.committed[cell] += delta
+            if cell[0] < self.demand_days:
+                self.demand_committed[cell[1]] += delta
+
+    # ============================================
+    # QUERIES
+    # ============================================
+
+    @property
+    def end(self) -> date:
+        """Last date of the window"""
+        return self.start + timedelta(days=self.days - 1)
+
+    def tracks(self, district: str, date_from: date, date_to: date) -> bool:
+        """Whether committed bookings are counted for the district and range"""
+        return (
+            district in self._district_index
+            and self.start <= date_from <= date_to <= self.end
+        )
+
+    def capacity_at(self, key: SlotKey) -> int:
+        """Technician capacity of one slot, for any date"""
+        day, district, slot = key
+        d = self._district_index.get(district)
+        if d is None:
+            return 0 if self.has_shifts else self.default_capacity
+        return int(self.weekly[day.weekday(), d, _SLOT_INDEX[slot]])
+
+    def capacity_between(self, district: str, date_from: date, date_to: date) -> np.ndarray:
+        """Capacity of a district as a ``(days, slots)`` array, for any dates"""
+        days = (date_to - date_from).days + 1
+        d = self._district_index.get(district)
+        if d is None:
+            fill = 0 if self.has_shifts else self.default_capacity
+            return np.full((max(days, 0), len(SLOTS)), fill, dtype=np.int32)
+        weekdays = (date_from.weekday() + np.arange(days)) % 7
+        return self.weekly[weekdays, d, :]
+
+    def remaining(self, district: str, date_from: date, date_to: date) -> np.ndarray:
+        """
+        Free capacity of a district as a ``(days, slots)`` array.
+
+        Only for ranges the matrix ``tracks``. Overbooked cells read as 0.
+        """
+        if not self.tracks(district, date_from, date_to):
+            raise ValueError("District or date range is outside the capacity window")
+
+        first = (date_from - self.start).days
+        last = (date_to - self.start).days + 1
+        d = self._district_index[district]
+        free = self.capacity[first:last, d, :] - self.committed[first:last, d, :]
+        return np.maximum(free, 0)
+
+    def remaining_at(self, key: SlotKey) -> int:
+        """Free capacity of one tracked slot"""
+        day = key[0]
+        return int(self.remaining(key[1], day, day)[0, _SLOT_INDEX[key[2]]])
+
+    def occupancy_at(self, key: SlotKey) -> Optional[float]:
+        """
+        Committed share of one slot's capacity; None outside the window.
+        Slots without capacity read as full.
+        """
+        cell = self._cell(key)
+        if cell is None:
+            return None
+        capacity = self.capacity[cell]
+        return float(self.committed[cell] / capacity) if capacity > 0 else 1.0
+
+    def district_occupancy(self, district: str) -> Optional[float]:
+        """Committed share of a district's capacity over the demand window"""
+        d = self._district_index.get(district)
+        if d is None:
+            return None
+        capacity = self.demand_capacity[d]
+        return float(self.demand_committed[d] / capacity) if capacity > 0 else 1.0
+
+    def occupancy(self, days: int) -> np.ndarray:
+        """Committed share of capacity over the first ``days`` of the window"""
+        capacity = self.capacity[:days]
+        committed = self.committed[:days]
+        full = np.ones(capacity.shape, dtype=np.float64)
+        return np.divide(committed, capacity, out=full, where=capacity > 0)
+
+    # ============================================
+    # INTERNALS
+    # ============================================
+
+    def _total_demand_window(self) -> None:
+        """Recount the per-district totals of the demand window"""
+        n = self.demand_days
+        self.demand_capacity = self.capacity[:n].sum(axis=(0, 2), dtype=np.int64)
+        self.demand_committed = self.committed[:n].sum(axis=(0, 2), dtype=np.int64)
+
+    def _lay_out(self, start: date, days: int) -> np.ndarray:
+        """The weekly pattern repeated over ``days`` dates from ``start``"""
+        weekdays = (start.weekday() + np.arange(days)) % 7
+        return self.weekly[weekdays]
+
+    def _cell(self, key: SlotKey) -> Optional[Tuple[int, int, int]]:
+        day, district, slot = key
+        row = (day - self.start).days
+        d = self._district_index.get(district)
+        if d is None or not 0 <= row < self.days:
+            return None
+        return row, d, _SLOT_INDEX[slot]
+
+
+def slots_from_row(row: np.ndarray) -> List[TimeSlot]:
+    """Time slots with free capacity in one ``(slots,)`` row"""
+    return [SLOTS[i] for i in np.flatnonzero(row > 0)]
+
+
+def load_roster(path: str) -> List[TechnicianShift]:
+    """Read technician shifts from a JSON list of TechnicianShift objects"""
+    return TypeAdapter(List[TechnicianShift]).validate_json(Path(path).read_bytes())
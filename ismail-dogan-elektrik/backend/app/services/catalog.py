@@ -0,0 +1,77 @@
+"""
+İsmail Doğan Elektrik API - Service Catalog
+Immutable services catalog with lookup indexes and pre-encoded responses
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.models import ServiceCategory, ServiceListResponse, ServiceResponse
+from app.responses import StaticJSON
+from app.services.search import fold, query_trigrams, similarity, trigrams
+
+
+class ServiceCatalog:
+    """
+    The services offered, validated and encoded once at startup.
+
+    The catalog never changes while the process runs, so every response
+    it can produce (the full list, each service, each category) is built
+    up front as a ``StaticJSON`` with its gzipped body and ETag. Lookups
+    are dict hits instead of scans over the raw data.
+    """
+
+    def __init__(self, data: Iterable[Mapping[str, Any]], max_age: int = 0) -> None:
+        self.items: Tuple[ServiceResponse, ...] = tuple(ServiceResponse(**s) for s in data)
+        self.by_id: Dict[str, ServiceResponse] = {s.id: s for s in self.items}
+
+        by_category: Dict[str, List[ServiceResponse]] = {c.value: [] for c in ServiceCategory}
+        for service in self.items:
+            by_category[service.category.value].append(service)
+        self.by_category: Dict[str, Tuple[ServiceResponse, ...]] = {
+            category: tuple(services) for category, services in by_category.items()
+        }
+
+        self.list_json = self._encode_list(self.items, max_age)
+        self._service_json = {
+            service.id: StaticJSON.from_model(service, max_age) for service in self.items
+        }
+        self._category_json = {
+            category: self._encode_list(services, max_age)
+            for category, services in self.by_category.items()
+        }
+        # Unknown categories list nothing, like a known one without services
+        self._empty_json = self._encode_list((), max_age)
+        self._name_grams = [(service, trigrams(fold(service.name))) for service in self.items]
+
+    def get(self, service_id: str) -> Optional[ServiceResponse]:
+        """A service by ID"""
+        return self.by_id.get(service_id)
+
+    def service_json(self, service_id: str) -> Optional[StaticJSON]:
+        """Encoded response for one service; None if unknown"""
+        return self._service_json.get(service_id)
+
+    def category_json(self, category: str) -> StaticJSON:
+        """Encoded list response for one category"""
+        return self._category_json.get(category, self._empty_json)
+
+    def search(self, query: str, threshold: float) -> List[Tuple[ServiceResponse, float]]:
+        """Services whose name contains at least ``threshold`` of the query's trigrams"""
+        variants = query_trigrams(query)
+        matches = []
+        for service, grams in self._name_grams:
+            score = max((similarity(q, grams) for q in variants), default=0.0)
+            if score >= threshold:
+                matches.append((service, score))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @staticmethod
+    def _encode_list(services: Tuple[ServiceResponse, ...], max_age: int) -> StaticJSON:
+        return StaticJSON.from_model(
+            ServiceListResponse(items=list(services), total=len(services)),
+            max_age,
+        )
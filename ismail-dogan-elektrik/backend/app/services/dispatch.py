@@ -0,0 +1,236 @@
+"""
+İsmail Doğan Elektrik API - Technician Dispatch
+Min-cost assignment of pending bookings to technicians
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Set, Tuple
+
+import numpy as np
+
+from app.models import BookingRecord, ServiceCategory, TimeSlot, UrgencyLevel
+
+
+# ============================================
+# COST MODEL
+# ============================================
+
+# Cost of pairs that must not be matched; large but finite keeps the solver exact
+INFEASIBLE = 1e6
+
+# Sending a technician outside the district of their shift
+DISTRICT_MISMATCH_COST = 4.0
+# Technician without any shift data: district fit unknown
+UNKNOWN_DISTRICT_COST = 2.0
+# Per rating point below 5
+RATING_COST = 1.0
+# Per active booking already assigned to the technician
+LOAD_COST = 0.5
+
+# Subtracted from every pair of a booking, so urgent work wins scarce technicians
+URGENCY_PRIORITY = {
+    UrgencyLevel.NORMAL: 0.0,
+    UrgencyLevel.URGENT: 10.0,
+    UrgencyLevel.EMERGENCY: 20.0,
+}
+
+_CATEGORIES: Tuple[ServiceCategory, ...] = tuple(ServiceCategory)
+_CATEGORY_INDEX = {category: i for i, category in enumerate(_CATEGORIES)}
+
+# Technician district codes for one (weekday, slot)
+_OFF_SHIFT = -1
+_NO_SHIFTS = -2
+
+BusyKey = Tuple[str, date, TimeSlot]
+
+
+@dataclass(slots=True)
+class DispatchTechnician:
+    """
+    A technician as seen by the dispatcher.
+
+    ``specializations`` empty means every category. ``shifts`` maps
+    (weekday, time slot) to the district worked; a technician with shifts
+    is only dispatched during them, one without is dispatched anywhere.
+    """
+
+    id: str
+    phone: str
+    rating: float = 5.0
+    specializations: FrozenSet[ServiceCategory] = frozenset()
+    shifts: Dict[Tuple[int, TimeSlot], str] = field(default_factory=dict)
+    load: int = 0
+
+
+class Assignment(NamedTuple):
+    """One booking matched to one technician"""
+
+    booking_id: str
+    technician_id: str
+    cost: float
+
+
+# ============================================
+# SOLVER
+# ============================================
+
+def solve_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Minimum-cost assignment on a rectangular cost matrix.
+
+    Hungarian algorithm with potentials (shortest augmenting paths),
+    O(n²m) for n ≤ m; the scan over columns is vectorised. Returns
+    ``(rows, cols)`` index arrays matching every row of the smaller side.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty
+
+    # 1-based as in the textbook formulation; column 0 is the virtual start
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.intp)  # row matched to each column, 0 = none
+    way = np.zeros(m + 1, dtype=np.intp)
+
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            row = match[j0]
+            free = ~used
+            reduced = cost[row - 1] - u[row] - v[1:]
+            better = free[1:] & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+
+            candidates = np.where(free[1:], minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+
+            used_cols = np.flatnonzero(used)
+            u[match[used_cols]] += delta
+            v[used_cols] -= delta
+            minv[free] -= delta
+
+            j0 = j1
+            if match[j0] == 0:
+                break
+
+        # Flip the augmenting path
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    cols = np.flatnonzero(match[1:])
+    rows = match[cols + 1] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+# ============================================
+# PLANNING
+# ============================================
+
+def build_cost_matrix(
+    bookings: List[BookingRecord],
+    technicians: List[DispatchTechnician],
+    busy: Set[BusyKey],
+) -> np.ndarray:
+    """
+    Cost of every (booking, technician) pair for bookings sharing one date
+    and time slot, as a ``(bookings, technicians)`` array
+    """
+    day = bookings[0].preferred_date
+    slot = bookings[0].preferred_time_slot
+    weekday = day.weekday()
+
+    districts: Dict[str, int] = {}
+    booking_district = np.array(
+        [districts.setdefault(b.district, len(districts)) for b in bookings]
+    )
+    technician_district = np.array([
+        districts.setdefault(t.shifts[weekday, slot], len(districts))
+        if (weekday, slot) in t.shifts
+        else (_OFF_SHIFT if t.shifts else _NO_SHIFTS)
+        for t in technicians
+    ])
+
+    specialization = np.array([
+        [not t.specializations or c in t.specializations for c in _CATEGORIES]
+        for t in technicians
+    ]).reshape(len(technicians), len(_CATEGORIES))
+    category = np.array([_CATEGORY_INDEX[b.service_category] for b in bookings])
+
+    feasible = specialization[:, category].T
+    feasible &= (technician_district != _OFF_SHIFT)[None, :]
+    free = np.array([(t.id, day, slot) not in busy for t in technicians], dtype=bool)
+    feasible &= free[None, :]
+
+    same_district = booking_district[:, None] == technician_district[None, :]
+    district_cost = np.where(
+        same_district,
+        0.0,
+        np.where(technician_district == _NO_SHIFTS, UNKNOWN_DISTRICT_COST, DISTRICT_MISMATCH_COST),
+    )
+    rating = np.array([t.rating for t in technicians], dtype=np.float64)
+    load = np.array([t.load for t in technicians], dtype=np.float64)
+    priority = np.array([URGENCY_PRIORITY[b.urgency_level] for b in bookings])
+
+    cost = (
+        district_cost
+        + (RATING_COST * (5.0 - rating) + LOAD_COST * load)[None, :]
+        - priority[:, None]
+    )
+    return np.where(feasible, cost, INFEASIBLE)
+
+
+def plan_dispatch(
+    bookings: Iterable[BookingRecord],
+    technicians: List[DispatchTechnician],
+    busy: Iterable[BusyKey] = (),
+) -> List[Assignment]:
+    """
+    Assign technicians to bookings, one matching per date and time slot.
+
+    A technician takes at most one booking per slot and never one that
+    clashes with ``busy`` (technician, date, slot) commitments. Slots are
+    planned in date order and each assignment adds to the technician's
+    load, which later slots take into account. Technicians' ``load`` is
+    updated in place.
+    """
+    groups: Dict[Tuple[date, TimeSlot], List[BookingRecord]] = {}
+    for booking in bookings:
+        key = (booking.preferred_date, booking.preferred_time_slot)
+        groups.setdefault(key, []).append(booking)
+
+    busy = set(busy)
+    order = {slot: i for i, slot in enumerate(TimeSlot)}
+    assignments: List[Assignment] = []
+    if not technicians:
+        return assignments
+
+    for (day, slot), group in sorted(groups.items(), key=lambda g: (g[0][0], order[g[0][1]])):
+        cost = build_cost_matrix(group, technicians, busy)
+        rows, cols = solve_assignment(cost)
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            pair_cost = float(cost[row, col])
+            if pair_cost >= INFEASIBLE:
+                continue
+            technician = technicians[col]
+            technician.load += 1
+            busy.add((technician.id, day, slot))
+            assignments.append(Assignment(group[row].id, technician.id, pair_cost))
+
+    return assignments
@@ -0,0 +1,275 @@
+"""
+İsmail Doğan Elektrik API - Booking Events
+In-process publish/subscribe of booking status changes, streamed as Server-Sent Events
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Iterable, Optional, Set, Tuple
+
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.config import settings
+from app.models import BookingRecord, BookingStatusEvent
+
+# Record fields whose changes are published
+EVENT_FIELDS = frozenset({"status", "assigned_technician", "estimated_arrival"})
+
+STATUS_EVENT = "status"
+
+# Comment line keeping idle connections (and proxies in between) open
+HEARTBEAT = b": keepalive\n\n"
+
+
+class TooManySubscribers(Exception):
+    """The process already serves its maximum of event streams"""
+
+
+def encode_event(event_id: int, event: str, data: bytes) -> bytes:
+    """One SSE frame; ``data`` must be a single line (compact JSON is)"""
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, event.encode(), data)
+
+
+def status_payload(booking: BookingRecord) -> bytes:
+    """JSON body of a status event"""
+    event = BookingStatusEvent.model_construct(
+        booking_code=booking.booking_code,
+        status=booking.status,
+        assigned_technician=booking.assigned_technician,
+        estimated_arrival=booking.estimated_arrival,
+        updated_at=booking.updated_at,
+    )
+    return event.__pydantic_serializer__.to_json(event, by_alias=True)
+
+
+# ============================================
+# SUBSCRIPTIONS
+# ============================================
+
+class Subscription:
+    """Frames waiting to be written to one event stream"""
+
+    __slots__ = ("topic", "max_pending", "closed", "_frames", "_ready")
+
+    def __init__(self, topic: Optional[str], max_pending: int) -> None:
+        self.topic = topic
+        self.max_pending = max_pending
+        self.closed = False
+        self._frames: Deque[bytes] = deque()
+        self._ready = asyncio.Event()
+
+    def push(self, frame: bytes) -> bool:
+        """Queue a frame; closes the subscription and returns False when it is full"""
+        if len(self._frames) >= self.max_pending:
+            self.close()
+            return False
+        self._frames.append(frame)
+        self._ready.set()
+        return True
+
+    def close(self) -> None:
+        """End the stream once the queued frames are written"""
+        self.closed = True
+        self._ready.set()
+
+    async def receive(self, timeout: float) -> bytes:
+        """
+        Every queued frame, waiting up to ``timeout`` seconds for one.
+
+        Returns b"" when the wait times out or the subscription is closed.
+        """
+        if not self._frames and not self.closed:
+            self._ready.clear()
+            try:
+                async with asyncio.timeout(timeout):
+                    await self._ready.wait()
+            except TimeoutError:
+                return b""
+        frames = b"".join(self._frames)
+        self._frames.clear()
+        return frames
+
+
+# ============================================
+# BUS
+# ============================================
+
+class EventBus:
+    """
+    Fan-out of booking events to the event streams of this process.
+
+    A subscription follows one booking code, or every booking when its
+    topic is None (the admin firehose). Each event is encoded into its SSE
+    frame once, however many streams receive it. Publishing never waits:
+    a stream more than ``max_pending`` frames behind is closed, and its
+    client reconnects with Last-Event-ID to resume from the last
+    ``history`` events kept here.
+
+    Only changes made in this process are published, so every stream sees
+    every change when one API process owns the bookings (memory and
+    write-behind backends).
+    """
+
+    def __init__(
+        self,
+        history: int = 1024,
+        max_pending: int = 256,
+        max_subscribers: int = 20_000,
+    ) -> None:
+        self.max_pending = max_pending
+        self.max_subscribers = max_subscribers
+        self.last_id = 0
+        self._topics: Dict[Optional[str], Set[Subscription]] = {}
+        self._history: Deque[Tuple[int, str, bytes]] = deque(maxlen=history)
+        self._subscribers = 0
+
+        # Counters exposed for monitoring
+        self.published = 0
+        self.overflowed = 0
+
+    def subscribe(
+        self,
+        topic: Optional[str] = None,
+        last_event_id: Optional[int] = None,
+    ) -> Subscription:
+        """
+        Start receiving events of ``topic`` (None for every booking).
+
+        With ``last_event_id``, the kept events published after it are
+        queued first.
+        """
+        if self._subscribers >= self.max_subscribers:
+            raise TooManySubscribers()
+
+        subscription = Subscription(topic, self.max_pending)
+        if last_event_id is not None:
+            for event_id, event_topic, frame in self._history:
+                if event_id > last_event_id and topic in (None, event_topic):
+                    subscription.push(frame)
+
+        self._topics.setdefault(topic, set()).add(subscription)
+        self._subscribers += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._topics.get(subscription.topic)
+        if subscriptions is not None and subscription in subscriptions:
+            subscriptions.remove(subscription)
+            if not subscriptions:
+                del self._topics[subscription.topic]
+            self._subscribers -= 1
+        subscription.close()
+
+    def publish(self, topic: str, event: str, data: bytes) -> int:
+        """Send an event to the streams of ``topic`` and the firehose; returns its id"""
+        self.last_id += 1
+        frame = encode_event(self.last_id, event, data)
+        self._history.append((self.last_id, topic, frame))
+        self.published += 1
+
+        for subscriptions in (self._topics.get(topic), self._topics.get(None)):
+            if not subscriptions:
+                continue
+            for subscription in subscriptions:
+                if not subscription.closed and not subscription.push(frame):
+                    self.overflowed += 1
+        return self.last_id
+
+    def publish_status(self, bookings: Iterable[BookingRecord]) -> None:
+        """Publish the current status of changed bookings"""
+        for booking in bookings:
+            self.publish(booking.booking_code, STATUS_EVENT, status_payload(booking))
+
+    def status_frame(self, booking: BookingRecord) -> bytes:
+        """A booking's current status, as the first frame of its stream"""
+        return encode_event(self.last_id, STATUS_EVENT, status_payload(booking))
+
+    def __len__(self) -> int:
+        """Open subscriptions"""
+        return self._subscribers
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "subscribers": self._subscribers,
+            "topics": len(self._topics),
+            "last_event_id": self.last_id,
+            "published": self.published,
+            "overflowed": self.overflowed,
+        }
+
+
+_bus: Optional[EventBus] = None
+
+
+def get_event_bus() -> EventBus:
+    """The process-wide booking event bus"""
+    global _bus
+    if _bus is None:
+        _bus = EventBus(
+            history=settings.SSE_HISTORY,
+            max_pending=settings.SSE_MAX_PENDING,
+            max_subscribers=settings.SSE_MAX_SUBSCRIBERS,
+        )
+    return _bus
+
+
+# ============================================
+# STREAMING
+# ============================================
+
+async def event_stream(
+    bus: EventBus,
+    subscription: Subscription,
+    first: bytes = b"",
+) -> AsyncIterator[bytes]:
+    """
+    SSE body: ``first``, then the subscription's frames as they arrive.
+
+    Idle streams get a heartbeat comment every SSE_HEARTBEAT_SECONDS. The
+    stream ends after SSE_MAX_STREAM_SECONDS so connections do not outlive
+    a deploy; clients reconnect on their own after the ``retry`` delay.
+    """
+    heartbeat = settings.SSE_HEARTBEAT_SECONDS
+    deadline = time.monotonic() + settings.SSE_MAX_STREAM_SECONDS
+    try:
+        yield b"retry: %d\n\n" % settings.SSE_RETRY_MS + first
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            frames = await subscription.receive(min(heartbeat, remaining))
+            if frames:
+                yield frames
+            elif subscription.closed:
+                return
+            elif remaining > heartbeat:
+                yield HEARTBEAT
+    finally:
+        bus.unsubscribe(subscription)
+
+
+def event_stream_response(
+    bus: EventBus,
+    subscription: Subscription,
+    first: bytes = b"",
+) -> StreamingResponse:
+    """Serve a subscription as an event stream, without caching or proxy buffering"""
+    return StreamingResponse(
+        event_stream(bus, subscription, first),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also unsubscribes clients that leave before the stream starts
+        background=BackgroundTask(bus.unsubscribe, subscription),
+    )
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    """The Last-Event-ID header of a reconnecting client, if valid"""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
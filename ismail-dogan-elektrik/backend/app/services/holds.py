@@ -0,0 +1,115 @@
+"""
+İsmail Doğan Elektrik API - Slot Holds
+Short-lived claims on a slot while a customer completes the booking wizard
+"""
+
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from app.services.booking_store import SlotKey
+
+
+@dataclass(slots=True, eq=False)
+class SlotHold:
+    """One place in a slot, kept free for the holder until ``expires_at``"""
+
+    token: str
+    slot: SlotKey
+    expires_at: datetime
+
+
+class SlotHolds:
+    """
+    Live slot holds with expiry in O(1) amortized time.
+
+    Every hold lives for the same ``ttl``, so holds expire in the order
+    they were placed and the expiry queue is a plain FIFO instead of a
+    heap. ``expire`` pops expired holds from its head and stops at the
+    first live one; released holds are left in the queue and skipped when
+    they reach the head. Each hold is therefore queued and dequeued once,
+    and no call looks at live holds beyond the head.
+
+    ``listener`` is told of every change to a slot's hold count, like the
+    booking store's slot listener.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        listener: Optional[Callable[[SlotKey, int], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.listener = listener
+        self._clock = clock
+        self._holds: Dict[str, SlotHold] = {}
+        self._per_slot: Dict[SlotKey, int] = {}
+        # (deadline, hold) in placement order, hence deadline order
+        self._queue: Deque[Tuple[float, SlotHold]] = deque()
+
+    def place(self, slot: SlotKey) -> SlotHold:
+        """Hold a place in ``slot``; the caller checks capacity first"""
+        hold = SlotHold(
+            token=uuid.uuid4().hex,
+            slot=slot,
+            expires_at=datetime.utcnow() + timedelta(seconds=self.ttl),
+        )
+        self._holds[hold.token] = hold
+        self._queue.append((self._clock() + self.ttl, hold))
+        self._count(slot, 1)
+        return hold
+
+    def get(self, token: str) -> Optional[SlotHold]:
+        """A live hold by token"""
+        self.expire()
+        return self._holds.get(token)
+
+    def release(self, token: str) -> Optional[SlotHold]:
+        """Drop a hold (consumed by a booking or abandoned); None if not live"""
+        self.expire()
+        hold = self._holds.pop(token, None)
+        if hold is not None:
+            self._count(hold.slot, -1)
+        return hold
+
+    def count(self, slot: SlotKey) -> int:
+        """Live holds in a slot"""
+        self.expire()
+        return self._per_slot.get(slot, 0)
+
+    def counts(self) -> Iterator[Tuple[SlotKey, int]]:
+        """(slot, live holds) pairs, for capacity recounts"""
+        self.expire()
+        return iter(list(self._per_slot.items()))
+
+    def expire(self) -> List[SlotHold]:
+        """Drop every hold past its deadline; returns them"""
+        now = self._clock()
+        expired = []
+        queue = self._queue
+        while queue and queue[0][0] <= now:
+            _, hold = queue.popleft()
+            # Released holds were already removed
+            if self._holds.get(hold.token) is hold:
+                del self._holds[hold.token]
+                self._count(hold.slot, -1)
+                expired.append(hold)
+        return expired
+
+    def __len__(self) -> int:
+        """Live holds"""
+        self.expire()
+        return len(self._holds)
+
+    def _count(self, slot: SlotKey, delta: int) -> None:
+        n = self._per_slot.get(slot, 0) + delta
+        if n:
+            self._per_slot[slot] = n
+        else:
+            del self._per_slot[slot]
+        if self.listener is not None:
+            self.listener(slot, delta)
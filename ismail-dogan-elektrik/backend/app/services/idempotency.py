@@ -0,0 +1,459 @@
+"""
+İsmail Doğan Elektrik API - Idempotency Keys
+Replays stored responses for retried POST requests carrying an Idempotency-Key
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from app.config import settings
+
+# Longest accepted Idempotency-Key header value
+MAX_KEY_LENGTH = 255
+
+REPLAY_HEADER = b"idempotent-replayed"
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+class IdempotencyKeyReused(Exception):
+    """The key was already used for a request with a different body"""
+
+
+class IdempotencyInProgress(Exception):
+    """The first request with the key did not finish in time"""
+
+
+@dataclass(slots=True)
+class StoredResponse:
+    """A complete HTTP response kept for replay"""
+
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "status": self.status,
+            "headers": [[k.decode("latin-1"), v.decode("latin-1")] for k, v in self.headers],
+            "body": base64.b64encode(self.body).decode("ascii"),
+        })
+
+    @classmethod
+    def from_json(cls, data: str) -> "StoredResponse":
+        raw = json.loads(data)
+        return cls(
+            status=raw["status"],
+            headers=[(k.encode("latin-1"), v.encode("latin-1")) for k, v in raw["headers"]],
+            body=base64.b64decode(raw["body"]),
+        )
+
+
+# ============================================
+# CACHES
+# ============================================
+
+@dataclass(slots=True)
+class _Entry:
+    fingerprint: str
+    expires_at: float
+    owner: Optional[str] = None
+    response: Optional[StoredResponse] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class MemoryIdempotencyCache:
+    """
+    Per-process LRU of idempotency keys with a TTL.
+
+    ``begin`` claims a key or returns the response stored under it; callers
+    that find the key in flight wait for its owner to ``complete`` or
+    ``release`` it. At most ``max_entries`` keys are kept; the least
+    recently used are dropped first.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, wait_timeout: float) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.wait_timeout = wait_timeout
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+
+    async def begin(
+        self, key: str, fingerprint: str, owner: Optional[str] = None
+    ) -> Optional[StoredResponse]:
+        """
+        Claim ``key`` for a new request, or return the stored response.
+
+        Returns None when the caller owns the key and must run the request;
+        ``owner`` identifies the claim to ``release``.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            now = time.monotonic()
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self._entries[key] = _Entry(fingerprint, now + self.ttl, owner)
+                self._evict()
+                return None
+
+            self._entries.move_to_end(key)
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyKeyReused(key)
+            if entry.response is not None:
+                return entry.response
+
+            # In flight: wait for the owner, then look again
+            try:
+                await asyncio.wait_for(entry.done.wait(), deadline - now)
+            except asyncio.TimeoutError:
+                raise IdempotencyInProgress(key)
+
+    async def complete(
+        self, key: str, fingerprint: str, response: StoredResponse, owner: Optional[str] = None
+    ) -> None:
+        """Store the response of the request owning ``key``"""
+        entry = self._entries.get(key)
+        if entry is None:
+            # Evicted while running
+            entry = self._entries[key] = _Entry(fingerprint, 0.0, owner)
+            self._evict()
+        entry.response = response
+        entry.expires_at = time.monotonic() + self.ttl
+        entry.done.set()
+
+    async def release(self, key: str, owner: Optional[str] = None) -> None:
+        """Give up ``key`` without a response, so a retry runs again"""
+        entry = self._entries.get(key)
+        if entry is None or entry.response is not None or entry.owner != owner:
+            # Someone else's claim (or response) since ours was dropped
+            return
+        del self._entries[key]
+        entry.done.set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            _, entry = self._entries.popitem(last=False)
+            entry.done.set()
+
+
+class RedisIdempotencyCache:
+    """
+    Idempotency keys shared by every worker through Redis.
+
+    A key is claimed with ``SET NX`` holding the request fingerprint and
+    the owner's token, on a ``lease`` that the owner renews while the
+    request runs; a crashed owner stops renewing and frees the key. The
+    owner overwrites it with the response for ``ttl`` seconds. Renewing
+    and releasing only touch the key while it still holds the owner's
+    claim, so a claim taken over after a lost lease is left alone.
+    Waiters poll.
+    """
+
+    POLL_INTERVAL = 0.05
+    PREFIX = "idempotency:"
+
+    # KEYS[1] = key, ARGV[1] = the owner's claim, ARGV[2] = lease in ms
+    RENEW_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+    RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+    def __init__(self, client: Any, ttl: float, wait_timeout: float, lease: float) -> None:
+        self.client = client
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.lease = lease
+        # Claims held by this process and their renewal tasks, by (key, owner)
+        self._claims: Dict[Tuple[str, Optional[str]], Tuple[str, asyncio.Task]] = {}
+
+    async def begin(
+        self, key: str, fingerprint: str, owner: Optional[str] = None
+    ) -> Optional[StoredResponse]:
+        name = self.PREFIX + key
+        pending = self._claim(fingerprint, owner)
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            claimed = await self.client.set(
+                name, pending, nx=True, px=int(self.lease * 1000)
+            )
+            if claimed:
+                self._claims[(key, owner)] = (
+                    pending, asyncio.create_task(self._renew(name, pending))
+                )
+                return None
+
+            value = await self.client.get(name)
+            if value is not None:
+                data = json.loads(value)
+                if data["fingerprint"] != fingerprint:
+                    raise IdempotencyKeyReused(key)
+                if "response" in data:
+                    return StoredResponse.from_json(data["response"])
+
+            if time.monotonic() >= deadline:
+                raise IdempotencyInProgress(key)
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+    async def complete(
+        self, key: str, fingerprint: str, response: StoredResponse, owner: Optional[str] = None
+    ) -> None:
+        self._stop_renewing(key, owner)
+        await self.client.set(
+            self.PREFIX + key,
+            json.dumps({"fingerprint": fingerprint, "response": response.to_json()}),
+            px=int(self.ttl * 1000),
+        )
+
+    async def release(self, key: str, owner: Optional[str] = None) -> None:
+        pending = self._stop_renewing(key, owner)
+        if pending is not None:
+            await self.client.eval(self.RELEASE_SCRIPT, 1, self.PREFIX + key, pending)
+
+    @staticmethod
+    def _claim(fingerprint: str, owner: Optional[str]) -> str:
+        return json.dumps({"fingerprint": fingerprint, "owner": owner})
+
+    async def _renew(self, name: str, pending: str) -> None:
+        """Extend the lease of a claim until it is completed or released"""
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                renewed = await self.client.eval(
+                    self.RENEW_SCRIPT, 1, name, pending, int(self.lease * 1000)
+                )
+            except Exception as e:
+                logger.warning(f"Idempotency lease renewal failed for {name}: {e}")
+                continue
+            if not renewed:
+                logger.warning(f"Idempotency claim lost before the request finished: {name}")
+                return
+
+    def _stop_renewing(self, key: str, owner: Optional[str]) -> Optional[str]:
+        """Stop renewing a claim of this process; returns the claim value"""
+        claim = self._claims.pop((key, owner), None)
+        if claim is None:
+            return None
+        pending, task = claim
+        task.cancel()
+        return pending
+
+
+IdempotencyCache = Union[MemoryIdempotencyCache, RedisIdempotencyCache]
+
+_cache: Optional[IdempotencyCache] = None
+
+
+def get_idempotency_cache() -> IdempotencyCache:
+    """The idempotency cache in use; an in-process LRU until Redis is opened"""
+    global _cache
+    if _cache is None:
+        _cache = MemoryIdempotencyCache(
+            ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+            max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+            wait_timeout=settings.IDEMPOTENCY_WAIT_SECONDS,
+        )
+    return _cache
+
+
+async def open_idempotency_cache() -> IdempotencyCache:
+    """
+    Share idempotency keys through Redis when ``REDIS_URL`` answers,
+    else keep the per-process LRU
+    """
+    global _cache
+    try:
+        from redis import asyncio as aioredis
+
+        client = aioredis.from_url(settings.REDIS_URL, socket_timeout=1.0)
+        await client.ping()
+    except Exception as e:
+        logger.warning(f"Redis unavailable, idempotency keys are per process: {e}")
+        return get_idempotency_cache()
+
+    _cache = RedisIdempotencyCache(
+        client,
+        ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+        wait_timeout=settings.IDEMPOTENCY_WAIT_SECONDS,
+        lease=settings.IDEMPOTENCY_LEASE_SECONDS,
+    )
+    logger.info("Idempotency keys shared through Redis")
+    return _cache
+
+
+async def close_idempotency_cache() -> None:
+    """Close the Redis connection, if one was opened"""
+    global _cache
+    if isinstance(_cache, RedisIdempotencyCache):
+        await _cache.client.aclose()
+    _cache = None
+
+
+# ============================================
+# MIDDLEWARE
+# ============================================
+
+def _error(status: int, message: str) -> StoredResponse:
+    """A response in the shape of the application's error handlers"""
+    body = json.dumps(
+        {"success": False, "error": {"code": status, "message": message, "type": "http_error"}},
+        ensure_ascii=False,
+    ).encode()
+    return StoredResponse(
+        status,
+        [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        body,
+    )
+
+
+async def _send_stored(send: Send, response: StoredResponse, replayed: bool) -> None:
+    headers = list(response.headers)
+    if replayed:
+        headers.append((REPLAY_HEADER, b"true"))
+    await send({"type": "http.response.start", "status": response.status, "headers": headers})
+    await send({"type": "http.response.body", "body": response.body})
+
+
+class IdempotencyMiddleware:
+    """
+    Runs POST requests to ``paths`` at most once per ``Idempotency-Key``.
+
+    The first request with a key runs normally and its response is stored;
+    retries with the same key and body get the stored response back (with
+    an ``Idempotent-Replayed: true`` header) without reaching the endpoint,
+    so no booking is created and no notification is sent again. Retries
+    arriving while the first is still running wait for it. Server errors
+    (5xx) are not stored, so the client can retry them.
+    """
+
+    def __init__(self, app: ASGIApp, paths: Tuple[str, ...]) -> None:
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        key = dict(scope["headers"]).get(b"idempotency-key")
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _send_stored(send, _error(400, "Geçersiz Idempotency-Key"), False)
+            return
+
+        # Read the body up front: it identifies the request and is replayed
+        chunks = []
+        more = True
+        while more:
+            message = await receive()
+            if message["type"] != "http.request":
+                return
+            chunks.append(message.get("body", b""))
+            more = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        cache_key = f"{scope['path']}:{key.decode('latin-1')}"
+        fingerprint = hashlib.sha256(body).hexdigest()
+        owner = uuid.uuid4().hex
+        cache = get_idempotency_cache()
+        try:
+            stored = await cache.begin(cache_key, fingerprint, owner)
+        except IdempotencyKeyReused:
+            await _send_stored(
+                send,
+                _error(422, "Idempotency-Key farklı bir istek için kullanılmış"),
+                False,
+            )
+            return
+        except IdempotencyInProgress:
+            await _send_stored(send, _error(409, "Aynı istek hâlâ işleniyor"), False)
+            return
+
+        if stored is not None:
+            await _send_stored(send, stored, True)
+            return
+
+        await self._run(scope, receive, send, body, cache, cache_key, fingerprint, owner)
+
+    async def _run(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        body: bytes,
+        cache: IdempotencyCache,
+        key: str,
+        fingerprint: str,
+        owner: str,
+    ) -> None:
+        """Run the request once and store its response"""
+        delivered = False
+        stored = False
+
+        async def replay_body() -> Message:
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status = 500
+        headers: List[Tuple[bytes, bytes]] = []
+        parts: List[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal status, headers, stored
+            # Copy before sending: outer middleware (gzip) rewrites messages in place
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                parts.append(message.get("body", b""))
+            await send(message)
+
+            # Store as soon as the response is out; background tasks run after
+            finished = message["type"] == "http.response.body" and not message.get("more_body")
+            if finished and status < 500:
+                stored = True
+                await cache.complete(
+                    key, fingerprint, StoredResponse(status, headers, b"".join(parts)), owner
+                )
+
+        try:
+            await self.app(scope, replay_body, capture)
+        finally:
+            if not stored:
+                await cache.release(key, owner)
@@ -0,0 +1,53 @@
+"""
+İsmail Doğan Elektrik API - Sharded Locks
+Fixed pool of asyncio locks addressed by key
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Hashable, Iterable, List
+
+
+class ShardedLocks:
+    """
+    Striped asyncio locks.
+
+    Keys are hashed onto a fixed number of locks, so unrelated keys rarely
+    wait on each other and memory does not grow with the number of keys.
+    Two keys sharing a shard only costs some extra waiting, never safety.
+    """
+
+    def __init__(self, shards: int = 64) -> None:
+        if shards < 1:
+            raise ValueError("At least one lock shard is required")
+        self._locks: List[asyncio.Lock] = [asyncio.Lock() for _ in range(shards)]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def shard(self, key: Hashable) -> int:
+        """Index of the lock guarding ``key``"""
+        return hash(key) % len(self._locks)
+
+    def lock(self, key: Hashable) -> asyncio.Lock:
+        """The lock guarding ``key``"""
+        return self._locks[self.shard(key)]
+
+    @asynccontextmanager
+    async def hold(self, keys: Iterable[Hashable]) -> AsyncIterator[None]:
+        """
+        Hold the locks of every key for the duration of the block.
+
+        Shards are acquired in index order, so concurrent callers holding
+        overlapping key sets cannot deadlock.
+        """
+        shards = sorted({self.shard(key) for key in keys})
+        acquired: List[asyncio.Lock] = []
+        try:
+            for i in shards:
+                await self._locks[i].acquire()
+                acquired.append(self._locks[i])
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
@@ -0,0 +1,469 @@
+"""
+İsmail Doğan Elektrik API - Quote Pricing
+Compiled pricing rules and vectorized quotes over services, districts and urgency levels
+"""
+
+import time
+from bisect import bisect_right
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+from pydantic import ValidationError
+from pydantic_core import to_json
+
+from app.config import settings
+from app.models import (
+    DemandSurfaceResponse,
+    PriceMatrixResponse,
+    PriceQuoteRequest,
+    PriceQuoteResponse,
+    PricingRules,
+    UrgencyLevel,
+)
+from app.responses import StaticJSON
+from app.services.capacity import SLOTS, CapacityMatrix
+
+# Built-in district tiers, used when the rules do not list any
+CENTRAL_DISTRICTS = frozenset({
+    "Beşiktaş", "Şişli", "Kadıköy", "Üsküdar", "Fatih",
+    "Beyoğlu", "Bakırköy", "Ataşehir",
+})
+FAR_DISTRICTS = frozenset({
+    "Silivri", "Çatalca", "Şile", "Adalar", "Arnavutköy", "Büyükçekmece",
+})
+
+URGENCY_LEVELS: Tuple[str, ...] = tuple(u.value for u in UrgencyLevel)
+
+# JSON key of each PriceQuoteResponse field
+_QUOTE_ALIASES = {
+    name: field.alias or name for name, field in PriceQuoteResponse.model_fields.items()
+}
+
+
+class UnknownService(KeyError):
+    """A quote named a service that is not in the catalog"""
+
+    def __init__(self, service_id: str) -> None:
+        super().__init__(service_id)
+        self.service_id = service_id
+
+
+# ============================================
+# COMPILED RULES
+# ============================================
+
+class CompiledPricingRules:
+    """
+    Pricing rules flattened into lookup tables.
+
+    Tiers, defaults and the settings fallbacks are resolved once here, so
+    pricing a quote only looks values up: district -> multiplier, urgency
+    -> multiplier, per service its labor hours, materials ratio and urgency
+    multipliers, and the demand step of an occupancy level.
+    """
+
+    def __init__(
+        self,
+        rules: PricingRules,
+        labor_rate: float,
+        urgent_multiplier: float,
+        emergency_multiplier: float,
+    ) -> None:
+        self.rules = rules
+        self.labor_rate = labor_rate if rules.labor_rate is None else rules.labor_rate
+        self.quote_valid_days = rules.quote_valid_days
+
+        urgency = {"normal": 1.0, "urgent": urgent_multiplier, "emergency": emergency_multiplier}
+        urgency.update({level.value: m for level, m in rules.urgency_multipliers.items()})
+        self.urgency_multipliers: Dict[str, float] = {u: urgency[u] for u in URGENCY_LEVELS}
+
+        self.default_district_multiplier = rules.default_district_multiplier
+        if rules.district_tiers is None:
+            tiers = [(1.0, CENTRAL_DISTRICTS), (1.5, FAR_DISTRICTS)]
+        else:
+            tiers = [(tier.multiplier, tier.districts) for tier in rules.district_tiers]
+        self.district_multipliers: Dict[str, float] = {
+            district: multiplier for multiplier, districts in tiers for district in districts
+        }
+
+        self._service_terms: Dict[str, Tuple[float, float, Tuple[float, ...]]] = {}
+        for service_id, rule in rules.services.items():
+            urgency = dict(self.urgency_multipliers)
+            urgency.update({level.value: m for level, m in rule.urgency_multipliers.items()})
+            self._service_terms[service_id] = (
+                rules.labor_hours if rule.labor_hours is None else rule.labor_hours,
+                rules.materials_ratio if rule.materials_ratio is None else rule.materials_ratio,
+                tuple(urgency[u] for u in URGENCY_LEVELS),
+            )
+        self._default_terms = (
+            rules.labor_hours,
+            rules.materials_ratio,
+            tuple(self.urgency_multipliers[u] for u in URGENCY_LEVELS),
+        )
+
+        steps = sorted(rules.demand_steps, key=lambda step: step.occupancy)
+        self.demand_thresholds = [step.occupancy for step in steps]
+        # Index i is the multiplier with i thresholds reached
+        self.demand_multipliers = [1.0] + [step.multiplier for step in steps]
+
+    def district_multiplier(self, district: str) -> float:
+        """Distance multiplier of a district"""
+        return self.district_multipliers.get(district, self.default_district_multiplier)
+
+    def urgency_multiplier(self, urgency: str) -> float:
+        """General multiplier of an urgency level (1.0 when unknown)"""
+        return self.urgency_multipliers.get(urgency, 1.0)
+
+    def service_terms(self, service_id: str) -> Tuple[float, float, Tuple[float, ...]]:
+        """Labor hours, materials ratio and urgency multipliers of a service"""
+        return self._service_terms.get(service_id, self._default_terms)
+
+    def demand_multiplier(self, occupancy: float) -> float:
+        """Multiplier of the highest demand step reached"""
+        return self.demand_multipliers[bisect_right(self.demand_thresholds, occupancy)]
+
+    def demand_multiplier_array(self, occupancy: np.ndarray) -> np.ndarray:
+        """``demand_multiplier`` over an array of occupancy levels"""
+        steps = np.searchsorted(self.demand_thresholds, occupancy, side="right")
+        return np.asarray(self.demand_multipliers)[steps]
+
+
+# File stamp while the rules file cannot be read
+_MISSING = (-1, -1)
+
+
+class PricingRulesFile:
+    """
+    Pricing rules read from a JSON file and reloaded when it changes.
+
+    ``current`` looks at the file's modification time at most once per
+    ``check_interval``. A changed file is parsed and validated in full
+    before the new rules replace the old ones in a single assignment, so
+    callers see either the old rules or the new ones. A missing or invalid
+    file is logged and the last good rules stay in use.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        check_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.rules = PricingRules()
+        self.version = 0
+        self._clock = clock
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+
+    def current(self) -> PricingRules:
+        """The latest good rules, reloading the file if it changed"""
+        now = self._clock()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            self.reload()
+        return self.rules
+
+    def reload(self) -> bool:
+        """Load the file if it changed since the last load; True if swapped"""
+        try:
+            stat = self.path.stat()
+        except OSError as e:
+            if self._stamp != _MISSING:
+                logger.error(f"Pricing rules unavailable at {self.path}: {e}")
+            self._stamp = _MISSING
+            return False
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return False
+        # Remember bad files too, so each bad version is logged once
+        self._stamp = stamp
+
+        try:
+            rules = PricingRules.model_validate_json(self.path.read_bytes())
+        except (OSError, ValidationError) as e:
+            logger.error(f"Invalid pricing rules in {self.path}, keeping the previous rules: {e}")
+            return False
+
+        self.rules = rules
+        self.version += 1
+        logger.info(f"Pricing rules loaded from {self.path} (version {self.version})")
+        return True
+
+
+_BUILTIN_RULES = PricingRules()
+_rules_file: Optional[PricingRulesFile] = None
+_compiled: Optional[Tuple[Tuple[Any, ...], CompiledPricingRules]] = None
+
+
+def get_pricing_rules() -> CompiledPricingRules:
+    """
+    The compiled rules in effect: PRICING_RULES_PATH when set, else the
+    built-in rules. Rules are compiled again only after they change.
+    """
+    global _rules_file, _compiled
+
+    path = settings.PRICING_RULES_PATH
+    if path is None:
+        rules = _BUILTIN_RULES
+    else:
+        if _rules_file is None or _rules_file.path != Path(path):
+            _rules_file = PricingRulesFile(path, settings.PRICING_RULES_CHECK_SECONDS)
+        rules = _rules_file.current()
+
+    key = (
+        id(rules),
+        settings.BASE_LABOR_RATE,
+        settings.URGENT_MULTIPLIER,
+        settings.EMERGENCY_MULTIPLIER,
+    )
+    cached = _compiled
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    compiled = CompiledPricingRules(rules, *key[1:])
+    # Key and rules are swapped together; ``compiled.rules`` keeps the id in use
+    _compiled = (key, compiled)
+    return compiled
+
+
+def get_district_multiplier(district: str) -> float:
+    """Calculate distance multiplier based on district"""
+    return get_pricing_rules().district_multiplier(district)
+
+
+def get_urgency_multiplier(urgency: str) -> float:
+    """Get urgency price multiplier"""
+    return get_pricing_rules().urgency_multiplier(urgency)
+
+
+# ============================================
+# PRICING TABLE
+# ============================================
+
+class PricingTable:
+    """
+    Quote inputs as arrays, priced by broadcasting.
+
+    Every quote is ``subtotal[service] * urgency[service, urgency] *
+    distance[district] * demand``, so the full service x district x
+    urgency price cube (before demand) is one broadcast product. Batches
+    gather their rows from the same arrays, so a batch, the matrix and a
+    single quote agree to the cent when demand is 1.0.
+
+    Demand comes from the occupancy counters passed in: the booked share
+    of the requested slot when a date and time slot are given, else of the
+    district over the demand window. Each is a constant-time lookup.
+    """
+
+    def __init__(
+        self,
+        services: Sequence[Tuple[str, float]],
+        districts: Sequence[str],
+        rules: CompiledPricingRules,
+        valid_until: str,
+    ) -> None:
+        self.rules = rules
+        self.service_ids = [service_id for service_id, _ in services]
+        self.service_index = {service_id: i for i, service_id in enumerate(self.service_ids)}
+        self.districts = list(districts)
+        self.urgencies = list(URGENCY_LEVELS)
+        self.valid_until = valid_until
+
+        terms = [rules.service_terms(service_id) for service_id in self.service_ids]
+        self.base_prices = np.array([price for _, price in services], dtype=np.float64)
+        self.labor_costs = rules.labor_rate * np.array([t[0] for t in terms], dtype=np.float64)
+        self.materials_costs = self.base_prices * np.array([t[1] for t in terms], dtype=np.float64)
+        self.subtotals = self.base_prices + self.labor_costs + self.materials_costs
+
+        # One extra column of ones prices urgency levels the rules do not know
+        self._urgency_index = {u: i for i, u in enumerate(self.urgencies)}
+        self._urgency_factors = np.ones((len(services), len(self.urgencies) + 1))
+        self._urgency_factors[:, :-1] = [t[2] for t in terms]
+        self.urgency_multipliers = self._urgency_factors[:, :-1]
+        self.distance_multipliers = np.array(
+            [rules.district_multiplier(d) for d in self.districts], dtype=np.float64
+        )
+
+        # Same operand order as a single quote, so the floats match exactly
+        self.total_prices = np.round(
+            self.subtotals[:, None, None]
+            * self.urgency_multipliers[:, None, :]
+            * self.distance_multipliers[None, :, None],
+            2,
+        )
+        self._matrix_json: Optional[StaticJSON] = None
+
+    def quote_many(
+        self,
+        requests: Sequence[PriceQuoteRequest],
+        counters: Optional[CapacityMatrix] = None,
+    ) -> List[PriceQuoteResponse]:
+        """Price quote requests in order; raises UnknownService"""
+        return [PriceQuoteResponse(**fields) for fields in self._price(requests, counters)]
+
+    def quote(
+        self,
+        request: PriceQuoteRequest,
+        counters: Optional[CapacityMatrix] = None,
+    ) -> PriceQuoteResponse:
+        """Price one quote request; raises UnknownService"""
+        return self.quote_many([request], counters)[0]
+
+    def batch_json(
+        self,
+        requests: Sequence[PriceQuoteRequest],
+        counters: Optional[CapacityMatrix] = None,
+    ) -> bytes:
+        """
+        Encoded PriceQuoteBatchResponse for ``requests``; raises UnknownService.
+
+        Building a model per quote costs more than pricing it, so the batch
+        is encoded straight from plain dicts under the response aliases.
+        """
+        items = [
+            {_QUOTE_ALIASES[name]: value for name, value in fields.items()}
+            for fields in self._price(requests, counters)
+        ]
+        return to_json({"items": items, "total": len(items)})
+
+    def _price(
+        self,
+        requests: Sequence[PriceQuoteRequest],
+        counters: Optional[CapacityMatrix],
+    ) -> List[Dict[str, Any]]:
+        """Quote fields of each request, priced as one vector"""
+        rows = []
+        for request in requests:
+            row = self.service_index.get(request.service_id)
+            if row is None:
+                raise UnknownService(request.service_id)
+            rows.append(row)
+        unknown = len(self.urgencies)
+        columns = [self._urgency_index.get(r.urgency, unknown) for r in requests]
+        district_multiplier = self.rules.district_multiplier
+        distance = [district_multiplier(r.district) for r in requests]
+        demand_multiplier = self.rules.demand_multiplier
+        demand = [demand_multiplier(_occupancy(r, counters)) for r in requests]
+
+        index = np.array(rows, dtype=np.intp)
+        urgency = self._urgency_factors[index, columns]
+        totals = np.round(
+            self.subtotals[index] * urgency * np.array(distance) * np.array(demand), 2
+        )
+
+        return [
+            {
+                "base_price": base_price,
+                "labor_cost": labor_cost,
+                "materials_cost": materials_cost,
+                "urgency_multiplier": urgency_mult,
+                "distance_multiplier": distance_mult,
+                "demand_multiplier": demand_mult,
+                "total_price": total,
+                "currency": "TRY",
+                "valid_until": self.valid_until,
+            }
+            for (
+                base_price, labor_cost, materials_cost, urgency_mult, distance_mult, demand_mult, total
+            ) in zip(
+                self.base_prices[index].tolist(),
+                self.labor_costs[index].tolist(),
+                self.materials_costs[index].tolist(),
+                urgency.tolist(),
+                distance,
+                demand,
+                totals.tolist(),
+            )
+        ]
+
+    @property
+    def matrix_json(self) -> StaticJSON:
+        """The whole price cube, encoded once per table"""
+        if self._matrix_json is None:
+            self._matrix_json = StaticJSON.from_model(PriceMatrixResponse(
+                services=self.service_ids,
+                districts=self.districts,
+                urgencies=self.urgencies,
+                base_prices=self.base_prices.tolist(),
+                materials_costs=self.materials_costs.tolist(),
+                labor_costs=self.labor_costs.tolist(),
+                distance_multipliers=self.distance_multipliers.tolist(),
+                urgency_multipliers=self.urgency_multipliers.tolist(),
+                total_prices=self.total_prices.tolist(),
+                valid_until=self.valid_until,
+            ))
+        return self._matrix_json
+
+
+def _occupancy(request: PriceQuoteRequest, counters: Optional[CapacityMatrix]) -> float:
+    """Booked share of the requested slot, else of the district; 0 when unknown"""
+    if counters is None:
+        return 0.0
+    occupancy = None
+    if request.preferred_date is not None and request.preferred_time_slot is not None:
+        occupancy = counters.occupancy_at(
+            (request.preferred_date, request.district, request.preferred_time_slot)
+        )
+    if occupancy is None:
+        occupancy = counters.district_occupancy(request.district)
+    return 0.0 if occupancy is None else occupancy
+
+
+def demand_surface(counters: CapacityMatrix, days: int) -> DemandSurfaceResponse:
+    """Occupancy and demand multipliers per district and per slot"""
+    rules = get_pricing_rules()
+    days = max(1, min(days, counters.days))
+    district_occupancy = np.array(
+        [counters.district_occupancy(d) for d in counters.districts], dtype=np.float64
+    )
+    slot_occupancy = counters.occupancy(days)
+    return DemandSurfaceResponse(
+        window_start=counters.start,
+        demand_days=counters.demand_days,
+        days=days,
+        districts=list(counters.districts),
+        slots=list(SLOTS),
+        occupancy=district_occupancy.tolist(),
+        multipliers=rules.demand_multiplier_array(district_occupancy).tolist(),
+        slot_occupancy=slot_occupancy.tolist(),
+        slot_multipliers=rules.demand_multiplier_array(slot_occupancy).tolist(),
+    )
+
+
+# ============================================
+# CACHED TABLE
+# ============================================
+
+_table: Optional[Tuple[Tuple[Any, ...], PricingTable]] = None
+
+
+def get_pricing_table(services_data: Iterable[Mapping[str, Any]]) -> PricingTable:
+    """
+    The pricing table for the current services and pricing rules.
+
+    The table (and its encoded matrix) is rebuilt only when a service's
+    base price, the pricing rules, the district list or the date changes;
+    otherwise every call returns the same table.
+    """
+    global _table
+
+    services = tuple((s["id"], s["base_price"]) for s in services_data)
+    rules = get_pricing_rules()
+    today = date.today()
+    key = (services, id(rules), tuple(settings.SERVICE_DISTRICTS), today)
+
+    cached = _table
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    valid_until = (today + timedelta(days=rules.quote_valid_days)).strftime("%Y-%m-%d")
+    table = PricingTable(services, settings.SERVICE_DISTRICTS, rules, valid_until)
+    # Key and table are swapped together; the table keeps ``rules`` alive
+    _table = (key, table)
+    return table
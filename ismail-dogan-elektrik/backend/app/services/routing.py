@@ -0,0 +1,353 @@
+"""
+İsmail Doğan Elektrik API - Route Optimization
+District travel times and the order of each technician's daily visits
+"""
+
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from app.config import settings
+
+try:
+    import elektrik_engine
+except ImportError:
+    elektrik_engine = None
+
+
+# ============================================
+# TRAVEL MODEL
+# ============================================
+
+# Approximate centre of each district (latitude, longitude) and its side of
+# the Bosphorus ("E" European, "A" Asian)
+DISTRICT_COORDINATES: Dict[str, Tuple[float, float, str]] = {
+    "Adalar": (40.876, 29.091, "A"),
+    "Arnavutköy": (41.185, 28.740, "E"),
+    "Ataşehir": (40.983, 29.127, "A"),
+    "Avcılar": (40.979, 28.721, "E"),
+    "Bağcılar": (41.039, 28.856, "E"),
+    "Bahçelievler": (41.000, 28.862, "E"),
+    "Bakırköy": (40.981, 28.872, "E"),
+    "Başakşehir": (41.093, 28.802, "E"),
+    "Bayrampaşa": (41.046, 28.912, "E"),
+    "Beşiktaş": (41.043, 29.009, "E"),
+    "Beykoz": (41.134, 29.092, "A"),
+    "Beylikdüzü": (40.982, 28.640, "E"),
+    "Beyoğlu": (41.037, 28.977, "E"),
+    "Büyükçekmece": (41.020, 28.585, "E"),
+    "Çatalca": (41.143, 28.461, "E"),
+    "Çekmeköy": (41.035, 29.178, "A"),
+    "Esenler": (41.043, 28.876, "E"),
+    "Esenyurt": (41.034, 28.680, "E"),
+    "Eyüpsultan": (41.048, 28.933, "E"),
+    "Fatih": (41.019, 28.940, "E"),
+    "Gaziosmanpaşa": (41.063, 28.912, "E"),
+    "Güngören": (41.022, 28.873, "E"),
+    "Kadıköy": (40.990, 29.029, "A"),
+    "Kağıthane": (41.080, 28.973, "E"),
+    "Kartal": (40.889, 29.190, "A"),
+    "Küçükçekmece": (41.000, 28.780, "E"),
+    "Maltepe": (40.935, 29.131, "A"),
+    "Pendik": (40.877, 29.236, "A"),
+    "Sancaktepe": (40.990, 29.228, "A"),
+    "Sarıyer": (41.167, 29.051, "E"),
+    "Şile": (41.176, 29.613, "A"),
+    "Silivri": (41.074, 28.247, "E"),
+    "Şişli": (41.060, 28.987, "E"),
+    "Sultanbeyli": (40.960, 29.262, "A"),
+    "Sultangazi": (41.107, 28.868, "E"),
+    "Tuzla": (40.816, 29.301, "A"),
+    "Ümraniye": (41.016, 29.125, "A"),
+    "Üsküdar": (41.023, 29.015, "A"),
+    "Zeytinburnu": (40.994, 28.904, "E"),
+}
+
+EARTH_RADIUS_KM = 6371.0
+# Road distance over straight-line distance
+ROAD_FACTOR = 1.35
+# Average city driving speed
+DRIVING_SPEED_KMH = 30.0
+# Bridge traffic when a trip crosses the Bosphorus
+BOSPHORUS_CROSSING_MINUTES = 20
+# Ferry wait and crossing for trips to or from the islands
+FERRY_MINUTES = 45
+# Moving between two addresses in the same district; also the shortest trip
+SAME_DISTRICT_MINUTES = 10
+
+# Districts served by ferry only
+_FERRY_DISTRICTS = frozenset({"Adalar"})
+
+
+@lru_cache()
+def get_travel_matrix() -> np.ndarray:
+    """
+    Travel minutes between the service districts, in the order of
+    ``settings.SERVICE_DISTRICTS``, as a symmetric int32 array
+    """
+    districts = settings.SERVICE_DISTRICTS
+    missing = [d for d in districts if d not in DISTRICT_COORDINATES]
+    if missing:
+        raise ValueError(f"No coordinates for districts: {', '.join(missing)}")
+
+    lat, lon, side = zip(*(DISTRICT_COORDINATES[d] for d in districts))
+    lat = np.radians(lat)
+    lon = np.radians(lon)
+
+    # Haversine distance between every pair of district centres
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    km = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+    minutes = km * ROAD_FACTOR / DRIVING_SPEED_KMH * 60
+    side = np.array(side)
+    minutes += np.where(side[:, None] != side[None, :], BOSPHORUS_CROSSING_MINUTES, 0)
+    ferry = np.array([d in _FERRY_DISTRICTS for d in districts])
+    minutes += np.where(ferry[:, None] ^ ferry[None, :], FERRY_MINUTES, 0)
+    minutes = np.maximum(minutes, SAME_DISTRICT_MINUTES)
+
+    return np.rint(minutes).astype(np.int32)
+
+
+@lru_cache()
+def _district_index() -> Dict[str, int]:
+    return {d: i for i, d in enumerate(settings.SERVICE_DISTRICTS)}
+
+
+def district_index(district: str) -> int:
+    """Row of a district in the travel matrix; KeyError outside the service area"""
+    return _district_index()[district]
+
+
+# ============================================
+# SOLVER
+# ============================================
+
+# Upper bound on improvement rounds per route
+MAX_ROUNDS = 1000
+# Longest segment moved by Or-opt
+OR_OPT_MAX_SEGMENT = 3
+
+
+class RouteRequest(NamedTuple):
+    """
+    One technician's day to be ordered.
+
+    Locations are travel matrix rows. Stops are visited in ascending block
+    order (the booking's time slot rank); only the order inside a block is
+    optimised. Without a depot the route starts at its first stop.
+    """
+
+    depot: Optional[int]
+    stops: List[int]
+    blocks: List[int]
+
+
+class Route(NamedTuple):
+    """Stop indices (into the request's stops) in visiting order"""
+
+    order: List[int]
+    travel_minutes: int
+
+
+class _Tour:
+    """
+    Python mirror of the Rust engine's solver (rust-engine/src/routing.rs),
+    step for step, so both return the same routes
+    """
+
+    __slots__ = ("matrix", "depot", "stops", "blocks", "closed")
+
+    def __init__(self, matrix: List[List[int]], request: RouteRequest, closed: bool) -> None:
+        self.matrix = matrix
+        self.depot = request.depot
+        self.stops = request.stops
+        self.blocks = request.blocks
+        self.closed = closed
+
+    def node(self, seq: List[int], k: int) -> Optional[int]:
+        """Location at position ``k``; -1 is the depot, ``len(seq)`` the end"""
+        if k < 0:
+            return self.depot
+        if k < len(seq):
+            return self.stops[seq[k]]
+        return self.depot if self.closed else None
+
+    def dist(self, a: Optional[int], b: Optional[int]) -> int:
+        if a is None or b is None:
+            return 0
+        return self.matrix[a][b]
+
+    def cost(self, seq: List[int]) -> int:
+        return sum(self.dist(self.node(seq, k), self.node(seq, k + 1)) for k in range(-1, len(seq)))
+
+    def nearest_neighbour(self) -> List[int]:
+        order = sorted(range(len(self.stops)), key=self.blocks.__getitem__)
+        seq: List[int] = []
+        current = self.depot
+        start = 0
+        while start < len(order):
+            block = self.blocks[order[start]]
+            end = start
+            while end < len(order) and self.blocks[order[end]] == block:
+                end += 1
+            remaining = order[start:end]
+            while remaining:
+                best = 0
+                for i in range(1, len(remaining)):
+                    if self.dist(current, self.stops[remaining[i]]) < self.dist(
+                        current, self.stops[remaining[best]]
+                    ):
+                        best = i
+                stop = remaining.pop(best)
+                current = self.stops[stop]
+                seq.append(stop)
+            start = end
+        return seq
+
+    def two_opt(self, seq: List[int]) -> bool:
+        n = len(seq)
+        blocks = self.blocks
+        for i in range(n):
+            for j in range(i + 1, n):
+                if blocks[seq[i]] != blocks[seq[j]]:
+                    break
+                prev = self.node(seq, i - 1)
+                nxt = self.node(seq, j + 1)
+                first = self.node(seq, i)
+                last = self.node(seq, j)
+                delta = (
+                    self.dist(prev, last) + self.dist(first, nxt)
+                    - self.dist(prev, first) - self.dist(last, nxt)
+                )
+                if delta < 0:
+                    seq[i:j + 1] = seq[i:j + 1][::-1]
+                    return True
+        return False
+
+    def or_opt(self, seq: List[int]) -> bool:
+        n = len(seq)
+        blocks = self.blocks
+        for length in range(1, min(OR_OPT_MAX_SEGMENT, n) + 1):
+            for i in range(n - length + 1):
+                block = blocks[seq[i]]
+                if blocks[seq[i + length - 1]] != block:
+                    continue
+
+                prev = self.node(seq, i - 1)
+                nxt = self.node(seq, i + length)
+                first = self.node(seq, i)
+                last = self.node(seq, i + length - 1)
+                removal = self.dist(prev, nxt) - self.dist(prev, first) - self.dist(last, nxt)
+                rest = seq[:i] + seq[i + length:]
+
+                for t in range(len(rest) + 1):
+                    if t > 0 and blocks[rest[t - 1]] > block:
+                        break
+                    if t < len(rest) and blocks[rest[t]] < block:
+                        continue
+                    before = self.node(rest, t - 1)
+                    after = self.node(rest, t)
+                    gap = self.dist(before, after)
+
+                    for reversed_ in (False, True):
+                        if t == i and not reversed_:
+                            continue
+                        head, tail = (last, first) if reversed_ else (first, last)
+                        delta = removal + self.dist(before, head) + self.dist(tail, after) - gap
+                        if delta < 0:
+                            segment = seq[i:i + length]
+                            if reversed_:
+                                segment.reverse()
+                            seq[:] = rest[:t] + segment + rest[t:]
+                            return True
+        return False
+
+    def solve(self) -> Route:
+        seq = self.nearest_neighbour()
+        for _ in range(MAX_ROUNDS):
+            if not self.two_opt(seq) and not self.or_opt(seq):
+                break
+        return Route(seq, self.cost(seq))
+
+
+def _python_optimize_routes(
+    matrix: np.ndarray,
+    requests: Sequence[RouteRequest],
+    return_to_depot: bool,
+) -> List[Route]:
+    rows = matrix.tolist()
+    return [_Tour(rows, request, return_to_depot).solve() for request in requests]
+
+
+def _validate(matrix: np.ndarray, request: RouteRequest) -> None:
+    if len(request.stops) != len(request.blocks):
+        raise ValueError("Every stop needs a block")
+    size = matrix.shape[0]
+    locations = list(request.stops)
+    if request.depot is not None:
+        locations.append(request.depot)
+    if any(not 0 <= location < size for location in locations):
+        raise ValueError("Location outside the travel matrix")
+
+
+def is_rust_routing_available() -> bool:
+    """Whether the compiled engine with route optimization is importable"""
+    return (
+        settings.RUST_ENGINE_ENABLED
+        and elektrik_engine is not None
+        and hasattr(elektrik_engine, "optimize_routes")
+    )
+
+
+def optimize_routes(
+    requests: Sequence[RouteRequest],
+    return_to_depot: bool = False,
+    matrix: Optional[np.ndarray] = None,
+) -> Tuple[List[Route], str]:
+    """
+    Order many technicians' days.
+
+    Uses the Rust engine (technicians solved in parallel, GIL released)
+    when available, else the identical Python solver. Returns the routes
+    and the name of the engine that produced them. Raises ValueError for
+    locations outside the matrix.
+    """
+    if matrix is None:
+        matrix = get_travel_matrix()
+    for request in requests:
+        _validate(matrix, request)
+
+    if is_rust_routing_available():
+        try:
+            solved = elektrik_engine.optimize_routes(
+                matrix.tolist(),
+                [(r.depot, list(r.stops), list(r.blocks)) for r in requests],
+                return_to_depot,
+            )
+            return [Route(list(order), minutes) for order, minutes in solved], "rust"
+        except Exception as e:
+            logger.error(f"Rust route optimization failed, falling back to Python: {e}")
+
+    return _python_optimize_routes(matrix, requests, return_to_depot), "python"
+
+
+def route_minutes(
+    request: RouteRequest,
+    order: Sequence[int],
+    return_to_depot: bool = False,
+    matrix: Optional[np.ndarray] = None,
+) -> int:
+    """Travel minutes of visiting the stops in ``order``"""
+    if matrix is None:
+        matrix = get_travel_matrix()
+    locations = [request.stops[i] for i in order]
+    if request.depot is not None:
+        locations.insert(0, request.depot)
+        if return_to_depot:
+            locations.append(request.depot)
+    path = np.asarray(locations, dtype=np.intp)
+    return int(matrix[path[:-1], path[1:]].sum())
@@ -1,61 +1,22 @@
 """
 İsmail Doğan Elektrik API - Rust Engine Binding
-Python bridge to call Rust-compiled high-performance electrical calculation library
+Python bridge to the Rust-compiled elektrik_engine load calculation module
 """
 
-from typing import Dict, List, Any, Optional
+from collections import Counter
+from typing import Dict, List, Any, Tuple
 from loguru import logger
-import ctypes
-import os
-import json
 
 from app.config import settings
 
+try:
+    import elektrik_engine
+except ImportError:
+    elektrik_engine = None
 
-# ============================================
-# RUST LIBRARY LOADING
-# ============================================
-
-class RustEngineError(Exception):
-    """Exception raised when Rust engine encounters an error"""
-    pass
-
-
-def _load_rust_library() -> Optional[ctypes.CDLL]:
-    """
-    Load the Rust-compiled shared library.
-    Returns None if library is not available.
-    """
-    if not settings.RUST_ENGINE_ENABLED:
-        logger.warning("Rust engine is disabled in settings")
-        return None
-    
-    lib_path = settings.RUST_LIB_PATH
-    
-    # Check multiple possible library names/paths
-    possible_paths = [
-        lib_path,
-        lib_path.replace(".so", ".dylib"),  # macOS
-        lib_path.replace(".so", ".dll"),     # Windows
-        "./libelektrik_engine.so",
-        "./elektrik_engine.dll",
-    ]
-    
-    for path in possible_paths:
-        if os.path.exists(path):
-            try:
-                lib = ctypes.CDLL(path)
-                logger.info(f"Loaded Rust engine from: {path}")
-                return lib
-            except OSError as e:
-                logger.warning(f"Failed to load Rust library from {path}: {e}")
-    
-    logger.warning("Rust engine library not found, using Python fallback")
-    return None
 
-
-# Try to load Rust library at module import
-_rust_lib = _load_rust_library()
+# Load calculations served per engine in this process
+_engine_calls: Counter = Counter()
 
 
 # ============================================
@@ -256,13 +217,14 @@ def calculate_electrical_load(
     circuit_type: str,
     voltage_level: float,
     safety_factor: float
-) -> Dict[str, Any]:
+) -> Tuple[Dict[str, Any], str]:
     """
     Calculate electrical load using Rust engine (if available) or Python fallback.
     
-    This function serves as the bridge between Python and the high-performance
-    Rust calculation engine. The Rust engine provides optimized calculations
-    for complex electrical load analysis.
+    The devices are passed to the PyO3 module as typed tuples and the
+    calculation runs with the GIL released, so other threads keep running
+    meanwhile. Both engines take the configured electricity price and
+    produce the same fields.
     
     Args:
         devices: List of electrical devices with power specifications
@@ -271,47 +233,45 @@ def calculate_electrical_load(
         safety_factor: Safety margin multiplier (1.0 - 2.0)
     
     Returns:
-        Dictionary containing calculation results and recommendations
+        The calculation results and recommendations, and the name of the
+        engine that produced them ("rust" or "python")
     """
-    
-    if _rust_lib is not None:
+    if is_rust_engine_available():
         try:
-            # Prepare data for Rust
-            input_json = json.dumps({
-                "devices": devices,
-                "circuit_type": circuit_type,
-                "voltage_level": voltage_level,
-                "safety_factor": safety_factor,
-            }).encode('utf-8')
-            
-            # Call Rust function
-            # Note: This is a simplified example. In production, you would:
-            # 1. Define proper C-compatible function signatures
-            # 2. Handle memory allocation/deallocation properly
-            # 3. Use cffi or ctypes properly for struct passing
-            
-            # For now, we'll use Python fallback
-            logger.debug("Using Python fallback for load calculation")
-            return _python_calculate_load(
-                devices, circuit_type, voltage_level, safety_factor
+            result = elektrik_engine.calculate_electrical_load(
+                [
+                    (
+                        float(d["power_watts"]),
+                        int(d["quantity"]),
+                        float(d["usage_hours_per_day"]),
+                        float(d["power_factor"]),
+                    )
+                    for d in devices
+                ],
+                circuit_type,
+                float(voltage_level),
+                float(safety_factor),
+                float(settings.ELECTRICITY_PRICE_PER_KWH),
             )
-            
+            _engine_calls["rust"] += 1
+            return result, "rust"
         except Exception as e:
             logger.error(f"Rust engine error, falling back to Python: {e}")
-            return _python_calculate_load(
-                devices, circuit_type, voltage_level, safety_factor
-            )
-    else:
-        # Use Python fallback
-        logger.debug("Rust engine not available, using Python calculation")
-        return _python_calculate_load(
-            devices, circuit_type, voltage_level, safety_factor
-        )
+
+    result = _python_calculate_load(
+        devices, circuit_type, voltage_level, safety_factor
+    )
+    _engine_calls["python"] += 1
+    return result, "python"
 
 
 def is_rust_engine_available() -> bool:
-    """Check if Rust engine is available and loaded"""
-    return _rust_lib is not None
+    """Check if the Rust engine module is importable and enabled"""
+    return (
+        settings.RUST_ENGINE_ENABLED
+        and elektrik_engine is not None
+        and hasattr(elektrik_engine, "calculate_electrical_load")
+    )
 
 
 def get_engine_info() -> Dict[str, Any]:
@@ -319,7 +279,17 @@ def get_engine_info() -> Dict[str, Any]:
     return {
         "rust_available": is_rust_engine_available(),
         "rust_enabled": settings.RUST_ENGINE_ENABLED,
-        "rust_lib_path": settings.RUST_LIB_PATH,
+        "rust_version": _engine_version(),
         "fallback": "Python",
+        "calls": {"rust": _engine_calls["rust"], "python": _engine_calls["python"]},
         "electricity_rate": settings.ELECTRICITY_PRICE_PER_KWH,
     }
+
+
+def _engine_version() -> Any:
+    if elektrik_engine is None or not hasattr(elektrik_engine, "version"):
+        return None
+    try:
+        return elektrik_engine.version()
+    except Exception:
+        return None
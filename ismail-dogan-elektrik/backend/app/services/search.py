@@ -0,0 +1,259 @@
+"""
+İsmail Doğan Elektrik API - Trigram Search
+Turkish-aware text folding and an inverted trigram index for fuzzy lookups
+"""
+
+import re
+from array import array
+from math import ceil
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from app.models import BookingRecord
+
+
+# Turkish casing first (I → ı, İ → i), then the letters without diacritics,
+# so "IŞIK", "ışık" and "isik" fold to the same text. Kept in step with the
+# search_fold() SQL function in 01-schema.sql.
+_TURKISH_UPPER = str.maketrans({"I": "ı", "İ": "i"})
+_ASCII_FOLD = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+_NON_WORD = re.compile(r"[\W_]+")
+_NON_DIGIT = re.compile(r"\D+")
+# Queries made only of these characters may be (part of) a phone number
+_PHONE_LIKE = re.compile(r"[\d\s()+.-]+")
+
+# Booking fields searched, in the order matches are reported
+BOOKING_SEARCH_FIELDS = ("bookingCode", "customerName", "customerPhone", "address")
+
+
+def fold(text: str) -> str:
+    """Lowercase the Turkish way, drop diacritics and punctuation"""
+    text = text.translate(_TURKISH_UPPER).lower().translate(_ASCII_FOLD)
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def phone_digits(text: str) -> str:
+    """A phone number's national digits, without +90 or the trunk 0"""
+    digits = _NON_DIGIT.sub("", text)
+    if len(digits) > 10 and digits.startswith("90"):
+        digits = digits[2:]
+    return digits.lstrip("0")
+
+
+def trigrams(folded: str) -> Set[str]:
+    """
+    Trigrams of folded text, each word padded like pg_trgm does (two
+    spaces in front, one behind), so short words and word starts count
+    """
+    words = folded.split()
+    if not words:
+        return set()
+    # One pass over all words: joined by two spaces, the only extra
+    # trigrams are each word's last letter followed by those spaces
+    padded = "  " + "  ".join(words) + " "
+    grams = {padded[i:i + 3] for i in range(len(padded) - 2)}
+    grams.difference_update([word[-1] + "  " for word in words[:-1]])
+    return grams
+
+
+def phone_query(query: str) -> Optional[str]:
+    """A query's phone digits when it looks like (part of) a phone number"""
+    if not _PHONE_LIKE.fullmatch(query):
+        return None
+    digits = phone_digits(query)
+    return digits if len(digits) >= 3 else None
+
+
+def query_trigrams(query: str) -> List[Set[str]]:
+    """
+    Trigram sets a query is looked up by: its folded words, and its digits
+    as one phone number when it looks like (part of) one
+    """
+    variants = []
+    grams = trigrams(fold(query))
+    if grams:
+        variants.append(grams)
+    digits = phone_query(query)
+    if digits is not None:
+        grams = trigrams(digits)
+        if grams not in variants:
+            variants.append(grams)
+    return variants
+
+
+def similarity(query: Set[str], grams: Set[str]) -> float:
+    """Share of the query's trigrams found in the text's"""
+    return len(query & grams) / len(query) if query else 0.0
+
+
+def required_shared(query: Set[str], threshold: float) -> int:
+    """Query trigrams a text must contain to reach the threshold"""
+    return max(1, ceil(len(query) * threshold - 1e-9))
+
+
+def booking_search_texts(booking: BookingRecord) -> Tuple[str, ...]:
+    """Folded searchable fields of a booking, in BOOKING_SEARCH_FIELDS order"""
+    return (
+        fold(booking.booking_code),
+        fold(booking.customer_name),
+        phone_digits(booking.customer_phone),
+        fold(booking.address),
+    )
+
+
+def booking_trigrams(booking: BookingRecord) -> Set[str]:
+    """Trigrams of all searchable fields of a booking together"""
+    grams: Set[str] = set()
+    for text in booking_search_texts(booking):
+        grams |= trigrams(text)
+    return grams
+
+
+class BookingMatch(NamedTuple):
+    """A booking found by search and the field it matched best"""
+
+    booking: BookingRecord
+    field: str
+    score: float
+
+
+def best_field(
+    variants: List[Set[str]],
+    texts: Iterable[str],
+    fields: Tuple[str, ...] = BOOKING_SEARCH_FIELDS,
+) -> Tuple[str, float]:
+    """The field matching any query variant best and its similarity"""
+    best, best_score = fields[0], 0.0
+    for field, text in zip(fields, texts):
+        grams = trigrams(text)
+        for query in variants:
+            score = similarity(query, grams)
+            if score > best_score:
+                best, best_score = field, score
+    return best, best_score
+
+
+# ============================================
+# INVERTED INDEX
+# ============================================
+
+class TrigramIndex:
+    """
+    Inverted index from trigrams to the documents containing them.
+
+    Documents are numbered in insertion order and every trigram keeps an
+    append-only, ascending ``array('i')`` of document numbers, so adding
+    a document is one append per trigram and a lookup reads the postings
+    as NumPy views without copying. Removed documents are only marked
+    dead; their postings are dropped in one compaction pass once they
+    outnumber the live documents.
+
+    A document sharing ``m`` of a query's ``n`` trigrams contains at least
+    one of its ``n - m + 1`` rarest ones, so candidates come from those
+    short postings alone and are counted against the others by binary
+    search. Queries made only of common trigrams count every document
+    with a single ``bincount`` instead.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, array] = {}
+        self._keys: List[Optional[str]] = []
+        self._doc_of: Dict[str, int] = {}
+        self._alive = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._doc_of
+
+    def add(self, key: str, grams: Iterable[str]) -> None:
+        """Index a document's trigrams under key, replacing any earlier ones"""
+        if key in self._doc_of:
+            self.remove(key)
+        doc = len(self._keys)
+        self._keys.append(key)
+        self._alive.append(1)
+        self._doc_of[key] = doc
+
+        postings = self._postings
+        for gram in grams:
+            docs = postings.get(gram)
+            if docs is None:
+                docs = postings[gram] = array("i")
+            docs.append(doc)
+
+    def remove(self, key: str) -> bool:
+        """Drop a document; False if it was not indexed"""
+        doc = self._doc_of.pop(key, None)
+        if doc is None:
+            return False
+        self._keys[doc] = None
+        self._alive[doc] = 0
+        if len(self._keys) - len(self._doc_of) > len(self._doc_of):
+            self._compact()
+        return True
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._keys.clear()
+        self._doc_of.clear()
+        self._alive = bytearray()
+
+    def lookup(self, grams: Set[str], min_shared: int, limit: int) -> List[Tuple[str, int]]:
+        """
+        Up to ``limit`` documents sharing at least ``min_shared`` of the
+        trigrams, as ``(key, shared)`` with the most shared (then the most
+        recently added) first
+        """
+        min_shared = max(min_shared, 1)
+        postings = [self._postings.get(gram) for gram in grams]
+        views = sorted(
+            (np.frombuffer(docs, dtype=np.int32) for docs in postings if docs), key=len
+        )
+        if len(views) < min_shared or limit <= 0:
+            return []
+        alive = np.frombuffer(self._alive, dtype=np.bool_)
+
+        rare = views[:len(views) - min_shared + 1]
+        probes = sum(map(len, rare))
+        if probes * len(views) < sum(map(len, views)) + len(alive):
+            docs = np.unique(np.concatenate(rare))
+            shared = np.zeros(len(docs), dtype=np.intp)
+            for view in views:
+                at = np.searchsorted(view, docs)
+                np.minimum(at, len(view) - 1, out=at)
+                shared += view[at] == docs
+            found = (shared >= min_shared) & alive[docs]
+            docs, shared = docs[found], shared[found]
+        else:
+            counts = np.bincount(np.concatenate(views), minlength=len(alive))
+            docs = np.flatnonzero((counts >= min_shared) & alive)
+            shared = counts[docs]
+        del views, rare, alive
+
+        if len(docs) > limit:
+            top = np.argpartition(shared, len(docs) - limit)[-limit:]
+            docs, shared = docs[top], shared[top]
+        ranked = sorted(zip(shared.tolist(), docs.tolist()), reverse=True)
+        return [(self._keys[doc], n) for n, doc in ranked]
+
+    def _compact(self) -> None:
+        """Renumber the live documents and drop postings of removed ones"""
+        alive = np.frombuffer(self._alive, dtype=np.bool_)
+        renumber = np.cumsum(alive, dtype=np.int32) - 1
+        renumber[~alive] = -1
+        del alive
+
+        for gram, docs in list(self._postings.items()):
+            moved = renumber[np.frombuffer(docs, dtype=np.int32)]
+            moved = moved[moved >= 0]
+            if len(moved):
+                self._postings[gram] = array("i", moved.tobytes())
+            else:
+                del self._postings[gram]
+
+        self._keys = [key for key in self._keys if key is not None]
+        self._doc_of = {key: doc for doc, key in enumerate(self._keys)}
+        self._alive = bytearray(b"\x01" * len(self._keys))
@@ -0,0 +1,237 @@
+"""
+İsmail Doğan Elektrik API - Write-Behind Queue
+Batches booking changes from the in-memory store into the database
+"""
+
+import asyncio
+import time
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from app.models import BookingRecord
+
+# Fields changed since the last flush; None marks a booking not yet inserted
+_NEW = None
+
+Changed = Tuple[BookingRecord, FrozenSet[str]]
+_Entry = Tuple[BookingRecord, Optional[FrozenSet[str]], float]
+_Batch = List[Tuple[str, BookingRecord, Optional[FrozenSet[str]], float]]
+FlushFn = Callable[[List[BookingRecord], List[Changed]], Awaitable[None]]
+
+
+class WriteBehindQueue:
+    """
+    Dirty bookings waiting to be written to the database.
+
+    The in-memory store is updated first and the booking marked here; a
+    background task writes up to ``batch_size`` bookings per transaction
+    through ``flush``, as soon as a batch is full or ``interval`` seconds
+    after the oldest change. Repeated changes to a booking before a flush
+    are coalesced and written from its current state, so a flush is
+    idempotent and a failed batch is simply retried, with exponential
+    backoff up to ``max_backoff`` seconds.
+    """
+
+    def __init__(
+        self,
+        flush: FlushFn,
+        batch_size: int = 500,
+        interval: float = 0.2,
+        max_backoff: float = 30.0,
+    ) -> None:
+        self._flush = flush
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_backoff = max_backoff
+
+        # booking id -> (record, changed fields or _NEW, first marked at)
+        self._dirty: Dict[str, _Entry] = {}
+        self._in_flight = 0
+        self._in_flight_since = 0.0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._drained: Optional[asyncio.Condition] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        # Counters exposed for monitoring
+        self.rows_flushed = 0
+        self.batches_flushed = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.last_flush_at: Optional[float] = None
+        self.last_flush_ms = 0.0
+
+    # ============================================
+    # MARKING
+    # ============================================
+
+    def mark_new(self, bookings: Iterable[BookingRecord]) -> None:
+        """Queue inserted bookings"""
+        now = time.monotonic()
+        for booking in bookings:
+            self._dirty[booking.id] = (booking, _NEW, now)
+        self._notify()
+
+    def mark_changed(self, booking: BookingRecord, fields: Iterable[str]) -> None:
+        """Queue field changes of a stored booking"""
+        entry = self._dirty.get(booking.id)
+        if entry is None:
+            self._dirty[booking.id] = (booking, frozenset(fields), time.monotonic())
+        elif entry[1] is not _NEW:
+            self._dirty[booking.id] = (booking, entry[1] | frozenset(fields), entry[2])
+        self._notify()
+
+    # ============================================
+    # LIFECYCLE
+    # ============================================
+
+    async def start(self) -> None:
+        """Start the background flush task"""
+        if self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._drained = asyncio.Condition()
+        self._closing = False
+        self._task = asyncio.create_task(self._flush_loop())
+        if self._dirty:
+            self._wakeup.set()
+
+    async def close(self) -> None:
+        """Flush everything queued and stop"""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    async def wait_below(self, limit: int) -> None:
+        """Wait until fewer than ``limit`` bookings are unwritten"""
+        if len(self) < limit:
+            return
+        await self.start()
+        async with self._drained:
+            await self._drained.wait_for(lambda: len(self) < limit)
+
+    def __len__(self) -> int:
+        """Bookings queued or being written"""
+        return len(self._dirty) + self._in_flight
+
+    def metrics(self) -> Dict[str, Any]:
+        """Backlog and flush statistics"""
+        now = time.monotonic()
+        # Entries stay in the order they were first marked; a batch being
+        # written holds the oldest ones
+        if self._in_flight:
+            oldest = self._in_flight_since
+        elif self._dirty:
+            oldest = next(iter(self._dirty.values()))[2]
+        else:
+            oldest = None
+        return {
+            "pending": len(self),
+            "lag_seconds": round(now - oldest, 3) if oldest is not None else 0.0,
+            "rows_flushed": self.rows_flushed,
+            "batches_flushed": self.batches_flushed,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "seconds_since_flush": (
+                round(now - self.last_flush_at, 3) if self.last_flush_at is not None else None
+            ),
+        }
+
+    # ============================================
+    # FLUSHING
+    # ============================================
+
+    def _notify(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _flush_loop(self) -> None:
+        backoff = 0.0
+        while True:
+            if not self._dirty:
+                if self._closing:
+                    return
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            # Wait for a full batch or the oldest change to come due
+            if backoff:
+                await asyncio.sleep(backoff)
+            elif len(self._dirty) < self.batch_size and not self._closing:
+                oldest = next(iter(self._dirty.values()))[2]
+                delay = oldest + self.interval - time.monotonic()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wakeup.clear()
+                    continue
+
+            batch = self._take()
+            self._in_flight = len(batch)
+            self._in_flight_since = batch[0][3]
+            written = await self._write(batch)
+            self._in_flight = 0
+            if written:
+                backoff = 0.0
+            else:
+                self._restore(batch)
+                backoff = min(max(backoff * 2, 0.1), self.max_backoff)
+                if self._closing and self.consecutive_failures >= 5:
+                    logger.error(
+                        f"Write-behind stopped with {len(self._dirty)} bookings unwritten"
+                    )
+                    return
+
+            async with self._drained:
+                self._drained.notify_all()
+
+    def _take(self) -> _Batch:
+        """Remove the oldest ``batch_size`` entries"""
+        batch = []
+        for booking_id in list(islice(self._dirty, self.batch_size)):
+            booking, fields, marked = self._dirty.pop(booking_id)
+            batch.append((booking_id, booking, fields, marked))
+        return batch
+
+    def _restore(self, batch: _Batch) -> None:
+        """Put a failed batch back, merged with changes made meanwhile"""
+        restored = {}
+        for booking_id, booking, fields, marked in batch:
+            newer = self._dirty.get(booking_id)
+            if newer is not None and fields is not _NEW:
+                fields = _NEW if newer[1] is _NEW else fields | newer[1]
+            restored[booking_id] = (booking, fields, marked)
+        for booking_id, entry in self._dirty.items():
+            restored.setdefault(booking_id, entry)
+        self._dirty = restored
+
+    async def _write(self, batch: _Batch) -> bool:
+        new = [booking for _, booking, fields, _ in batch if fields is _NEW]
+        changed = [(booking, fields) for _, booking, fields, _ in batch if fields is not _NEW]
+        started = time.perf_counter()
+        try:
+            await self._flush(new, changed)
+        except Exception as e:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = str(e)
+            logger.error(f"Write-behind flush of {len(batch)} bookings failed: {e}")
+            return False
+
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+        self.last_flush_at = time.monotonic()
+        self.rows_flushed += len(batch)
+        self.batches_flushed += 1
+        self.consecutive_failures = 0
+        return True
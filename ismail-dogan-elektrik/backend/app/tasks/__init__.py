@@ -5,6 +5,7 @@ from app.tasks.notifications import (
     send_technician_assignment_notification,
     send_booking_status_update,
 )
+from app.tasks.dispatch import dispatch_pending_bookings
 from app.tasks.reports import (
     cleanup_expired_bookings,
     send_daily_report,
@@ -20,6 +21,8 @@ __all__ = [
     "send_booking_reminders",
     "send_technician_assignment_notification",
     "send_booking_status_update",
+    # Dispatch
+    "dispatch_pending_bookings",
     # Reports
     "cleanup_expired_bookings",
     "send_daily_report",
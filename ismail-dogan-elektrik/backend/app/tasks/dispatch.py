@@ -0,0 +1,102 @@
+import asyncio
+import time
+from collections import Counter
+from datetime import date, datetime
+
+from celery import shared_task
+from loguru import logger
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.repositories.bookings import SqlAlchemyBookingRepository
+from app.services.dispatch import plan_dispatch
+from app.tasks.notifications import send_technician_assignment_notification
+
+
+async def dispatch_once(repo) -> dict:
+    """
+    Plan and apply one dispatch round on ``repo``.
+
+    ``repo`` is a booking repository that can also list dispatch
+    technicians (the PostgreSQL or write-behind repository).
+    """
+    today = date.today()
+
+    bookings = await repo.unassigned(today, settings.DISPATCH_BATCH_SIZE)
+    if not bookings:
+        return {"pending": 0, "assigned": 0}
+    technicians = await repo.dispatch_technicians()
+    commitments = await repo.technician_commitments(today)
+
+    load = Counter(technician_id for technician_id, _, _ in commitments)
+    for technician in technicians:
+        technician.load = load[technician.id]
+
+    started = time.perf_counter()
+    plan = plan_dispatch(bookings, technicians, commitments)
+    solve_ms = (time.perf_counter() - started) * 1000
+
+    assigned = await repo.assign_technicians(
+        {a.booking_id: a.technician_id for a in plan},
+        datetime.utcnow(),
+    )
+
+    phones = {t.id: t.phone for t in technicians}
+    for booking in assigned:
+        send_technician_assignment_notification.delay(
+            booking.id, phones[booking.assigned_technician], booking.address
+        )
+
+    return {
+        "pending": len(bookings),
+        "technicians": len(technicians),
+        "assigned": len(assigned),
+        "solve_ms": round(solve_ms, 2),
+    }
+
+
+async def _dispatch() -> dict:
+    # The worker runs each batch in a fresh event loop, so it gets its own engine
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        repo = SqlAlchemyBookingRepository(async_sessionmaker(engine, expire_on_commit=False))
+        return await dispatch_once(repo)
+    finally:
+        await engine.dispose()
+
+
+async def dispatch_loop(repo) -> None:
+    """
+    Dispatch inside the API process every DISPATCH_INTERVAL_SECONDS.
+
+    Used in write-behind mode, where the API process holds the current
+    bookings and a Celery worker writing to the database would race it.
+    """
+    while True:
+        await asyncio.sleep(settings.DISPATCH_INTERVAL_SECONDS)
+        try:
+            result = await dispatch_once(repo)
+            logger.info(f"Dispatch completed: {result}")
+        except Exception as exc:
+            logger.error(f"Dispatch failed: {exc}")
+
+
+@shared_task
+def dispatch_pending_bookings():
+    """Bekleyen randevulara teknisyen ata"""
+    if settings.BOOKING_BACKEND != "postgres":
+        logger.info("Dispatch skipped: bookings are not stored in PostgreSQL")
+        return {"skipped": True}
+    if settings.BOOKING_WRITE_BEHIND:
+        logger.info("Dispatch skipped: the API process dispatches in write-behind mode")
+        return {"skipped": True}
+
+    logger.info("Dispatching pending bookings...")
+    try:
+        result = asyncio.run(_dispatch())
+        logger.info(f"Dispatch completed: {result}")
+        return {**result, "timestamp": datetime.now().isoformat()}
+    except Exception as exc:
+        logger.error(f"Dispatch failed: {exc}")
+        return {"error": str(exc)}
@@ -0,0 +1,4 @@
+"""
+İsmail Doğan Elektrik API - Benchmarks
+Run from the backend directory, e.g. ``python -m benchmarks.bench_booking_store``
+"""
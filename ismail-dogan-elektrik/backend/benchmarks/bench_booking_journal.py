@@ -0,0 +1,99 @@
+"""
+İsmail Doğan Elektrik API - Booking Journal Benchmark
+Measures restart-to-ready time from a snapshot plus log, and group commit throughput
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+from app.models import BookingStatus
+from app.repositories import InMemoryBookingRepository
+from app.services.booking_journal import BookingJournal
+from app.services.booking_store import BookingStore
+from benchmarks.common import make_booking, make_bookings
+
+
+async def open_repo(directory: str, fsync: bool) -> InMemoryBookingRepository:
+    journal = BookingJournal(directory, snapshot_every=10**12, fsync=fsync)
+    store = BookingStore()
+    journal.replay(store)
+    await journal.start()
+    return InMemoryBookingRepository(store, journal=journal)
+
+
+async def restart(size: int, log_events: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        repo = await open_repo(directory, fsync=False)
+        start = time.perf_counter()
+        for booking in make_bookings(size):
+            repo.store.add(booking)
+        await repo.journal.snapshot()
+        snapshot_s = time.perf_counter() - start
+
+        # Events logged after the snapshot must be replayed from the segment
+        ids = [b.id for b in repo.store.iter_newest_first()][:log_events]
+        for booking_id in ids:
+            await repo.cancel(booking_id, updated_at=datetime.utcnow())
+        await repo.journal.close()
+
+        disk = sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory))
+
+        start = time.perf_counter()
+        store = BookingStore()
+        journal = BookingJournal(directory)
+        journal.replay(store)
+        ready_s = time.perf_counter() - start
+        await journal.start()
+        await journal.close()
+
+        assert len(store) == size
+        assert store.count(status=BookingStatus.CANCELLED) >= log_events
+
+    print(
+        f"{size:>10,} bookings + {log_events:,} log events | "
+        f"{disk / 2**20:7.1f} MiB on disk | build+snapshot {snapshot_s:6.2f} s | "
+        f"restart-to-ready {ready_s:6.2f} s"
+    )
+
+
+async def group_commit(writers: int, per_writer: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        repo = await open_repo(directory, fsync=True)
+
+        async def writer(w: int) -> None:
+            for i in range(per_writer):
+                booking = make_booking(w * per_writer + i, rng)
+                await repo.add(booking)
+
+        rng = random.Random(1)
+        start = time.perf_counter()
+        await asyncio.gather(*(writer(w) for w in range(writers)))
+        elapsed = time.perf_counter() - start
+        journal = repo.journal
+        await journal.close()
+
+    print(
+        f"{writers:>4} writers | {journal.events_written / elapsed:10,.0f} durable writes/s | "
+        f"{journal.events_written / journal.batches_written:6.1f} events per fsync"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--log-events", type=int, default=50_000)
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 16, 256])
+    args = parser.parse_args()
+
+    asyncio.run(restart(args.size, args.log_events))
+    for writers in args.writers:
+        asyncio.run(group_commit(writers, max(1, 4000 // writers)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+İsmail Doğan Elektrik API - Booking Memory Benchmark
+Compares the memory held by slotted BookingRecords against per-booking dicts
+"""
+
+import argparse
+import gc
+import random
+import sys
+import tracemalloc
+from typing import Callable
+
+from benchmarks.common import make_booking, make_booking_dict
+
+
+def measure(build: Callable[[int, random.Random], object], size: int) -> float:
+    """Bytes allocated per booking for ``size`` bookings kept in an id map"""
+    gc.collect()
+    rng = random.Random(42)
+    tracemalloc.start()
+    held = {}
+    for i in range(size):
+        booking = build(i, rng)
+        held[i] = booking
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current / size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    container_dict = sys.getsizeof(make_booking_dict(0, rng)) + sys.getsizeof([])
+    container_record = sys.getsizeof(make_booking(0, rng))
+
+    dict_bytes = measure(make_booking_dict, args.size)
+    record_bytes = measure(make_booking, args.size)
+
+    print(f"{args.size:,} bookings")
+    print(f"  dict   {dict_bytes:8.0f} B/booking total | {container_dict:5d} B container")
+    print(f"  record {record_bytes:8.0f} B/booking total | {container_record:5d} B container")
+    print(
+        f"  saved  {dict_bytes - record_bytes:8.0f} B/booking "
+        f"({(1 - record_bytes / dict_bytes) * 100:.0f}%), "
+        f"{(dict_bytes - record_bytes) * args.size / 2**20:,.0f} MiB in total"
+    )
+
+
+if __name__ == "__main__":
+    main()
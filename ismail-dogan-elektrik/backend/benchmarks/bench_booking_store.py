@@ -0,0 +1,54 @@
+"""
+İsmail Doğan Elektrik API - Booking Lookup Benchmark
+Compares the BookingStore code index against a linear scan over all bookings
+"""
+
+import argparse
+import random
+
+from app.services.booking_store import BookingStore
+from benchmarks.common import make_bookings, time_per_call
+
+
+def linear_scan(bookings: dict, booking_code: str):
+    """The original lookup: walk every booking until the code matches"""
+    for b in bookings.values():
+        if b.booking_code == booking_code:
+            return b
+    return None
+
+
+def run(size: int, lookups: int) -> None:
+    bookings = make_bookings(size)
+    store = BookingStore()
+    plain: dict = {}
+    for b in bookings:
+        store.add(b)
+        plain[b.id] = b
+
+    rng = random.Random(7)
+    codes = [bookings[rng.randrange(size)].booking_code for _ in range(lookups)]
+    it = iter(codes * 2)
+
+    indexed_us = time_per_call(lambda: store.get_by_code(next(it)), lookups)
+    scan_repeat = max(1, min(lookups, 2_000_000 // size))
+    scan_us = time_per_call(lambda: linear_scan(plain, next(it)), scan_repeat)
+
+    print(
+        f"{size:>10,} bookings | index {indexed_us:8.3f} µs/lookup | "
+        f"scan {scan_us:12.1f} µs/lookup | x{scan_us / indexed_us:,.0f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.lookups)
+
+
+if __name__ == "__main__":
+    main()
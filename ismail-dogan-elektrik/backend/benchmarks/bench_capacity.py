@@ -0,0 +1,76 @@
+"""
+İsmail Doğan Elektrik API - Slot Capacity Benchmark
+Compares a month of availability from the capacity matrix against per-slot lookups
+"""
+
+import argparse
+import random
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.config import settings
+from app.repositories import InMemoryBookingRepository
+from app.services.booking_store import BookingStore
+from app.services.capacity import SLOTS, CapacityMatrix
+from benchmarks.bench_serialization import run_sync
+from benchmarks.common import make_booking, time_per_call
+
+
+def per_slot_month(repo: InMemoryBookingRepository, district: str, start: date, days: int) -> np.ndarray:
+    """Capacity minus slot count, one dictionary lookup per date and slot"""
+    free = np.zeros((days, len(SLOTS)), dtype=np.int32)
+    for row in range(days):
+        day = start + timedelta(days=row)
+        for i, slot in enumerate(SLOTS):
+            key = (day, district, slot)
+            free[row, i] = repo.capacity.capacity_at(key) - repo.store.slot_count(*key)
+    return np.maximum(free, 0)
+
+
+def run(size: int, days: int, repeat: int) -> None:
+    today = date.today()
+    rng = random.Random(42)
+    bookings = []
+    for i in range(size):
+        booking = make_booking(i, rng)
+        booking.preferred_date = today + timedelta(days=rng.randrange(90))
+        bookings.append(booking)
+
+    matrix = CapacityMatrix(settings.SERVICE_DISTRICTS, settings.BOOKING_HORIZON_DAYS, default_capacity=50)
+    repo = InMemoryBookingRepository(BookingStore(), capacity=matrix)
+    repo.store.load(bookings)
+
+    districts = iter(settings.SERVICE_DISTRICTS * (2 * repeat // len(settings.SERVICE_DISTRICTS) + 2))
+    matrix_us = time_per_call(
+        lambda: run_sync(repo.remaining_capacity(next(districts), today, today + timedelta(days=days - 1))),
+        repeat,
+    )
+    lookup_us = time_per_call(lambda: per_slot_month(repo, next(districts), today, days), repeat)
+
+    district = settings.SERVICE_DISTRICTS[0]
+    end = today + timedelta(days=days - 1)
+    assert np.array_equal(
+        run_sync(repo.remaining_capacity(district, today, end)),
+        per_slot_month(repo, district, today, days),
+    )
+
+    print(
+        f"{size:>10,} bookings | {days} days | matrix {matrix_us:8.1f} µs/query | "
+        f"per-slot {lookup_us:8.1f} µs/query | x{lookup_us / matrix_us:,.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--repeat", type=int, default=2_000)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.days, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
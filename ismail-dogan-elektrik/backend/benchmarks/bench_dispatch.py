@@ -0,0 +1,64 @@
+"""
+İsmail Doğan Elektrik API - Dispatch Benchmark
+Times technician dispatch planning for batches of pending bookings
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from app.config import settings
+from app.models import ServiceCategory, TimeSlot
+from app.services.dispatch import DispatchTechnician, plan_dispatch
+from benchmarks.common import make_booking
+
+
+def make_technicians(n: int, rng: random.Random) -> list:
+    categories = list(ServiceCategory)
+    technicians = []
+    for i in range(n):
+        district = rng.choice(settings.SERVICE_DISTRICTS)
+        technicians.append(DispatchTechnician(
+            id=f"t{i}",
+            phone="05320000000",
+            rating=rng.uniform(3.0, 5.0),
+            specializations=frozenset(rng.sample(categories, 3)),
+            shifts={(day, slot): district for day in range(7) for slot in TimeSlot},
+        ))
+    return technicians
+
+
+def run(bookings: int, technicians: int, days: int, repeat: int) -> None:
+    rng = random.Random(42)
+    start = date.today() + timedelta(days=1)
+    batch = []
+    for i in range(bookings):
+        booking = make_booking(i, rng)
+        booking.preferred_date = start + timedelta(days=rng.randrange(days))
+        batch.append(booking)
+
+    best = float("inf")
+    for _ in range(repeat):
+        crew = make_technicians(technicians, random.Random(7))
+        began = time.perf_counter()
+        plan = plan_dispatch(batch, crew)
+        best = min(best, time.perf_counter() - began)
+
+    print(
+        f"{bookings:>6,} bookings x {technicians:>3} technicians over {days} day(s) | "
+        f"{len(plan):>5,} assigned | {best * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for bookings, technicians, days in [(300, 30, 1), (300, 30, 7), (1000, 60, 1), (1000, 60, 7)]:
+        run(bookings, technicians, days, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+İsmail Doğan Elektrik API - Event Fan-Out Benchmark
+Times delivering booking status events to 10k open streams, against polling
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.repositories import InMemoryBookingRepository
+from app.responses import model_json_response
+from app.services.events import EventBus, status_payload
+from benchmarks.common import make_bookings, time_per_call
+
+
+async def consume(subscription, received: list, index: int, done: asyncio.Event, target: int):
+    """A stream's writer loop, minus the socket"""
+    while not subscription.closed:
+        frames = await subscription.receive(15.0)
+        received[index] += frames.count(b"\n\n")
+        if received[index] >= target:
+            done.set()
+            return
+
+
+async def fan_out(subscribers: int, events: int, firehose: bool) -> None:
+    bookings = make_bookings(subscribers)
+    bus = EventBus(max_pending=events + 1, max_subscribers=subscribers)
+    topics = [None if firehose else b.booking_code for b in bookings]
+    subscriptions = [bus.subscribe(topic) for topic in topics]
+
+    # Each firehose stream gets every event; a booking stream gets its own
+    rng = random.Random(7)
+    changed = bookings if not firehose else [rng.choice(bookings) for _ in range(events)]
+    per_stream = events if firehose else 1
+    received = [0] * subscribers
+    finished = [asyncio.Event() for _ in range(subscribers)]
+    tasks = [
+        asyncio.create_task(consume(s, received, i, finished[i], per_stream))
+        for i, s in enumerate(subscriptions)
+    ]
+    await asyncio.sleep(0)
+
+    began = time.perf_counter()
+    for booking in changed:
+        bus.publish(booking.booking_code, "status", status_payload(booking))
+    published = time.perf_counter() - began
+    for event in finished:
+        await event.wait()
+    delivered = time.perf_counter() - began
+
+    frames = sum(received)
+    label = "firehose" if firehose else "per booking"
+    print(
+        f"{subscribers:>6,} streams ({label:<11}) | {len(changed):>6,} events -> "
+        f"{frames:>9,} frames | publish {published * 1000:7.1f} ms | "
+        f"all delivered {delivered * 1000:7.1f} ms | "
+        f"{frames / delivered:>10,.0f} frames/s"
+    )
+    for task in tasks:
+        task.cancel()
+
+
+def polling_cost(clients: int, interval: float, changes_per_second: float) -> None:
+    """CPU per second of answering polls, against publishing the same changes"""
+    bookings = make_bookings(10_000)
+    repo = InMemoryBookingRepository()
+    repo.store.load(bookings)
+    codes = [b.booking_code for b in bookings]
+
+    def poll():
+        # What GET /bookings/{code} does per request, before any HTTP overhead
+        booking = repo.store.get_by_code(random.choice(codes))
+        model_json_response(booking.to_response())
+
+    bus = EventBus()
+    subscription = bus.subscribe(bookings[0].booking_code)
+
+    def publish():
+        bus.publish(bookings[0].booking_code, "status", status_payload(bookings[0]))
+        subscription._frames.clear()
+
+    poll_us = time_per_call(poll, 5_000)
+    publish_us = time_per_call(publish, 20_000)
+
+    polls = clients / interval
+    print(
+        f"{clients:,} clients polling every {interval:g}s: {polls:,.0f} req/s x "
+        f"{poll_us:.1f} us = {polls * poll_us / 1000:,.1f} ms CPU/s (handler only)"
+    )
+    print(
+        f"{clients:,} open streams, {changes_per_second:g} changes/s: "
+        f"{changes_per_second:g} x {publish_us:.1f} us = "
+        f"{changes_per_second * publish_us / 1000:,.2f} ms CPU/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--events", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(fan_out(args.subscribers, args.events, firehose=False))
+    asyncio.run(fan_out(args.subscribers, args.events, firehose=True))
+    polling_cost(args.subscribers, interval=5.0, changes_per_second=5.0)
+
+
+if __name__ == "__main__":
+    main()
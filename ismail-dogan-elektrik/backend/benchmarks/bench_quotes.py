@@ -0,0 +1,86 @@
+"""
+İsmail Doğan Elektrik API - Price Quote Benchmark
+Times sequential single quotes against the batch and matrix pricing paths
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.models import PriceQuoteRequest, PriceQuoteResponse
+from app.routers.services import SERVICES_DATA
+from app.services import pricing
+from app.services.pricing import (
+    URGENCY_LEVELS,
+    get_district_multiplier,
+    get_pricing_table,
+    get_urgency_multiplier,
+)
+from benchmarks.common import time_per_call
+
+
+def single_quote(request: PriceQuoteRequest) -> PriceQuoteResponse:
+    """What one POST /quotes did per call before the pricing table (unencoded)"""
+    service = next(s for s in SERVICES_DATA if s["id"] == request.service_id)
+    urgency_mult = get_urgency_multiplier(request.urgency)
+    distance_mult = get_district_multiplier(request.district)
+    base_price = service["base_price"]
+    labor_cost = settings.BASE_LABOR_RATE * 2
+    materials_cost = base_price * 0.3
+    total = (base_price + labor_cost + materials_cost) * urgency_mult * distance_mult
+    return PriceQuoteResponse(
+        base_price=base_price,
+        labor_cost=labor_cost,
+        materials_cost=materials_cost,
+        urgency_multiplier=urgency_mult,
+        distance_multiplier=distance_mult,
+        total_price=round(total, 2),
+        currency="TRY",
+        valid_until=(datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d"),
+    )
+
+
+def run(batch_size: int, repeat: int) -> None:
+    rng = random.Random(7)
+    requests = [
+        PriceQuoteRequest(
+            service_id=rng.choice(SERVICES_DATA)["id"],
+            district=rng.choice(settings.SERVICE_DISTRICTS),
+            urgency=rng.choice(URGENCY_LEVELS),
+        )
+        for _ in range(batch_size)
+    ]
+
+    sequential_us = time_per_call(lambda: [single_quote(r) for r in requests], repeat)
+    batch_us = time_per_call(lambda: get_pricing_table(SERVICES_DATA).batch_json(requests), repeat)
+    print(
+        f"{batch_size} quotes | sequential {sequential_us:9.1f} µs | "
+        f"batch {batch_us:9.1f} µs | x{sequential_us / batch_us:.1f}"
+    )
+
+    table = get_pricing_table(SERVICES_DATA)
+    cells = table.total_prices.size
+
+    def cold_matrix():
+        pricing._table = None
+        get_pricing_table(SERVICES_DATA).matrix_json
+
+    matrix_us = time_per_call(cold_matrix, repeat)
+    cached_us = time_per_call(lambda: get_pricing_table(SERVICES_DATA).matrix_json, repeat)
+    print(
+        f"matrix ({cells} cells) | built and encoded {matrix_us:9.1f} µs | "
+        f"cached {cached_us:6.1f} µs"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    run(args.batch_size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+İsmail Doğan Elektrik API - Route Optimization Benchmark
+Times ordering technicians' daily visits and the travel time saved
+"""
+
+import argparse
+import random
+import time
+
+from app.services.routing import (
+    RouteRequest,
+    get_travel_matrix,
+    optimize_routes,
+    route_minutes,
+)
+
+
+def make_requests(technicians: int, stops: int, rng: random.Random) -> list:
+    size = len(get_travel_matrix())
+    return [
+        RouteRequest(
+            depot=rng.randrange(size),
+            stops=[rng.randrange(size) for _ in range(stops)],
+            blocks=sorted(rng.randrange(3) for _ in range(stops)),
+        )
+        for _ in range(technicians)
+    ]
+
+
+def run(technicians: int, stops: int, repeat: int) -> None:
+    requests = make_requests(technicians, stops, random.Random(42))
+
+    best = float("inf")
+    for _ in range(repeat):
+        began = time.perf_counter()
+        routes, engine = optimize_routes(requests)
+        best = min(best, time.perf_counter() - began)
+
+    baseline = sum(route_minutes(r, range(len(r.stops))) for r in requests)
+    optimized = sum(route.travel_minutes for route in routes)
+    print(
+        f"{technicians:>4} technicians x {stops:>2} stops | {engine:<6} | "
+        f"{baseline:>7,} -> {optimized:>7,} min ({1 - optimized / baseline:5.1%} saved) | "
+        f"{best * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for technicians, stops in [(30, 6), (60, 12), (200, 12), (60, 30)]:
+        run(technicians, stops, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
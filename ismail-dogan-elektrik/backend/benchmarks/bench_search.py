@@ -0,0 +1,74 @@
+"""
+İsmail Doğan Elektrik API - Search Benchmark
+Times trigram index lookups against a folded substring scan of the store
+"""
+
+import argparse
+import random
+import time
+from dataclasses import replace
+
+from app.services.booking_store import BookingStore
+from app.services.search import fold
+from benchmarks.common import make_bookings, time_per_call
+
+FIRST_NAMES = ["Ahmet", "Ayşe", "Mehmet", "Fatma", "Mustafa", "Emine", "Ali", "Hatice",
+               "Hüseyin", "Zeynep", "İbrahim", "Elif", "Işıl", "Murat", "Özge", "Çağrı"]
+LAST_NAMES = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Yıldırım", "Öztürk",
+              "Aydın", "Özdemir", "Arslan", "Doğan", "Kılıç", "Aslan", "Çetin", "Kara"]
+STREETS = ["Moda Caddesi", "Bağdat Caddesi", "İstiklal Caddesi", "Halaskargazi Caddesi",
+           "Barbaros Bulvarı", "Fahrettin Kerim Gökay Caddesi", "Ihlamurdere Caddesi"]
+
+
+def build_store(n: int) -> BookingStore:
+    rng = random.Random(3)
+    store = BookingStore()
+    store.load(
+        replace(
+            booking,
+            customer_name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i % 997}",
+            address=f"{rng.choice(STREETS)} No:{rng.randrange(1, 300)} Daire:{rng.randrange(1, 40)}",
+        )
+        for i, booking in enumerate(make_bookings(n))
+    )
+    return store
+
+
+def scan(store: BookingStore, query: str, limit: int):
+    """Folded substring match over every booking (exact spelling only)"""
+    needle = fold(query)
+    found = []
+    for booking in store.values():
+        if needle in fold(booking.customer_name) or needle in fold(booking.address):
+            found.append(booking)
+            if len(found) == limit:
+                break
+    return found
+
+
+def run(n: int, repeat: int) -> None:
+    store = build_store(n)
+    start = time.perf_counter()
+    store.search("warm up", 1)
+    print(f"{n} bookings | index built in {time.perf_counter() - start:.1f} s")
+
+    for query in ["işil yildirim 41", "Isıl Yldırım 41", "ELK-240101-0000BEEF", "0532 000 4242", "bagdat cd no 17"]:
+        indexed_us = time_per_call(lambda: store.search(query, 20), repeat)
+        hits = len(store.search(query, 20))
+        scan_us = time_per_call(lambda: scan(store, query, 20), 1)
+        print(
+            f"{query!r:24} | index {indexed_us / 1000:7.2f} ms ({hits:2} hits) | "
+            f"substring scan {scan_us / 1000:8.1f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bookings", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.bookings, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+İsmail Doğan Elektrik API - Response Serialization Benchmark
+Compares FastAPI's validated response path against the pre-encoded fast path
+"""
+
+import argparse
+from typing import List
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models import (
+    BookingListResponse,
+    BookingResponse,
+    ServiceListResponse,
+    ServiceResponse,
+    TestimonialResponse,
+)
+from app.responses import model_json_response
+from app.routers.services import (
+    SERVICE_CATALOG,
+    SERVICES_DATA,
+    TESTIMONIALS_DATA,
+    TESTIMONIALS_JSON,
+)
+from benchmarks.common import make_bookings, time_per_call
+
+
+def run_sync(coro):
+    """Drive a coroutine that never suspends without an event loop"""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("coroutine suspended")
+
+
+def validated_response(field, build) -> JSONResponse:
+    """The original path: validated model, response_model re-validation, stdlib json"""
+    content = run_sync(serialize_response(
+        field=field, response_content=build(), is_coroutine=True
+    ))
+    return JSONResponse(content)
+
+
+def make_request(**headers: str) -> Request:
+    """A bare GET request carrying ``headers``"""
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()],
+    })
+
+
+def run(repeat: int) -> None:
+    bookings = make_bookings(20)
+    booking = bookings[0]
+
+    booking_field = create_response_field("response", BookingResponse)
+    list_field = create_response_field("response", BookingListResponse)
+    testimonials_field = create_response_field("response", List[TestimonialResponse])
+    services_field = create_response_field("response", ServiceListResponse)
+    services_list = lambda: validated_response(services_field, lambda: ServiceListResponse(
+        items=[ServiceResponse(**s) for s in SERVICES_DATA],
+        total=len(SERVICES_DATA),
+    ))
+    gzip_request = make_request(accept_encoding="gzip")
+    revalidate_request = make_request(
+        accept_encoding="gzip", if_none_match=SERVICE_CATALOG.list_json.gzip_etag,
+    )
+
+    cases = [
+        (
+            "get_booking",
+            lambda: validated_response(booking_field, lambda: BookingResponse.model_validate(booking)),
+            lambda: model_json_response(booking.to_response()),
+        ),
+        (
+            "list_bookings (20)",
+            lambda: validated_response(list_field, lambda: BookingListResponse(
+                items=[BookingResponse.model_validate(b) for b in bookings],
+                total=20, page=1, page_size=20, total_pages=1,
+            )),
+            lambda: model_json_response(BookingListResponse.model_construct(
+                items=[b.to_response() for b in bookings],
+                total=20, page=1, page_size=20, total_pages=1, next_cursor=None,
+            )),
+        ),
+        (
+            "get_testimonials",
+            lambda: validated_response(
+                testimonials_field,
+                lambda: [TestimonialResponse(**t) for t in TESTIMONIALS_DATA],
+            ),
+            TESTIMONIALS_JSON.response,
+        ),
+        (
+            "list_services (gzip)",
+            services_list,
+            lambda: SERVICE_CATALOG.list_json.response(gzip_request),
+        ),
+        (
+            "list_services (304)",
+            services_list,
+            lambda: SERVICE_CATALOG.list_json.response(revalidate_request),
+        ),
+    ]
+
+    for name, slow, fast in cases:
+        slow_us = time_per_call(slow, repeat)
+        fast_us = time_per_call(fast, repeat)
+        print(
+            f"{name:<20} | validated {slow_us:8.1f} µs | fast {fast_us:8.1f} µs | "
+            f"x{slow_us / fast_us:.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=2_000)
+    args = parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+İsmail Doğan Elektrik API - Benchmark Helpers
+Synthetic booking generation shared by the benchmark scripts
+"""
+
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, List
+
+from app.config import settings
+from app.models import BookingRecord, BookingStatus, ServiceCategory, TimeSlot, UrgencyLevel
+
+
+def make_booking_dict(i: int, rng: random.Random) -> dict:
+    """Build a synthetic booking as the plain dict the router used to store"""
+    created_at = datetime(2024, 1, 1) + timedelta(seconds=i)
+    return {
+        "id": f"{i:032x}",
+        "booking_code": f"ELK-240101-{i:08X}",
+        "status": rng.choice(list(BookingStatus)),
+        "service_category": rng.choice(list(ServiceCategory)),
+        "problem_description": "Sigorta sürekli atıyor, prizlerde kısa devre var.",
+        "urgency_level": rng.choice(list(UrgencyLevel)),
+        "district": rng.choice(settings.SERVICE_DISTRICTS),
+        "address": "Caferağa Mahallesi, Moda Caddesi No:15 Daire:3",
+        "preferred_date": date(2024, 1, 1) + timedelta(days=rng.randrange(90)),
+        "preferred_time_slot": rng.choice(list(TimeSlot)),
+        "estimated_arrival": None,
+        "customer_name": f"Müşteri {i}",
+        "customer_phone": f"05{i % 10**9:09d}",
+        "customer_email": f"musteri{i}@example.com",
+        "additional_notes": None,
+        "photos": [],
+        "assigned_technician": None,
+        "created_at": created_at,
+        "updated_at": None,
+    }
+
+
+def make_booking(i: int, rng: random.Random) -> BookingRecord:
+    """Build a synthetic booking record with the same shape the router stores"""
+    fields = make_booking_dict(i, rng)
+    fields["photos"] = ()
+    return BookingRecord(**fields)
+
+
+def make_bookings(n: int, seed: int = 42) -> List[BookingRecord]:
+    """Build ``n`` synthetic bookings deterministically"""
+    rng = random.Random(seed)
+    return [make_booking(i, rng) for i in range(n)]
+
+
+def time_per_call(fn: Callable[[], object], repeat: int) -> float:
+    """Average wall time of ``fn`` in microseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
@@ -0,0 +1,72 @@
+"""
+İsmail Doğan Elektrik API - Test Helpers
+Shared fixtures, booking factory and fake clock for the test suite
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.models import (
+    BookingRecord,
+    BookingStatus,
+    ServiceCategory,
+    TimeSlot,
+    UrgencyLevel,
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def client():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+class FakeClock:
+    """A clock that only moves when a test sets ``now``"""
+
+    def __init__(self, now: Any = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> Any:
+        return self.now
+
+
+def make_booking(n: int, **overrides) -> BookingRecord:
+    """Booking number ``n`` for tomorrow morning; any field can be overridden"""
+    fields = dict(
+        id=f"id-{n}",
+        booking_code=f"ELK-240101-{n:06X}",
+        status=BookingStatus.PENDING,
+        service_category=ServiceCategory.TESISAT,
+        problem_description="Sigorta sürekli atıyor.",
+        urgency_level=UrgencyLevel.NORMAL,
+        district="Kadıköy",
+        address="Test Mahallesi No:1",
+        preferred_date=date.today() + timedelta(days=1),
+        preferred_time_slot=TimeSlot.MORNING,
+        customer_name=f"Müşteri {n}",
+        customer_phone="5321234567",
+        customer_email=f"musteri{n}@example.com",
+        created_at=datetime(2024, 1, 1) + timedelta(minutes=n),
+    )
+    fields.update(overrides)
+    return BookingRecord(**fields)
+
+
+def spread_booking(n: int, **overrides) -> BookingRecord:
+    """Booking number ``n``, three a day from tomorrow, one per time slot"""
+    fields = dict(
+        preferred_date=date.today() + timedelta(days=1 + n // 3),
+        preferred_time_slot=list(TimeSlot)[n % 3],
+    )
+    fields.update(overrides)
+    return make_booking(n, **fields)
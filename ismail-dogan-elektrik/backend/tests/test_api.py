@@ -3,6 +3,9 @@
 Comprehensive API tests using pytest
 """
 
+import asyncio
+import base64
+import json
 import pytest
 from datetime import date, timedelta
 from httpx import AsyncClient, ASGITransport
@@ -161,6 +164,322 @@ async def test_create_booking_past_date(client: AsyncClient):
     assert response.status_code == 422
 
 
+@pytest.mark.anyio
+async def test_get_and_cancel_booking_by_code(client: AsyncClient):
+    """Test looking up and cancelling a booking by its code"""
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    
+    booking_data = {
+        "service_category": "bakim",
+        "problem_description": "Pano bakımı ve topraklama ölçümü yapılması gerekiyor.",
+        "urgency_level": "normal",
+        "district": "Üsküdar",
+        "address": "Altunizade Mah. Kuşbakışı Cad. No:7",
+        "preferred_date": tomorrow,
+        "preferred_time_slot": "afternoon",
+        "customer_name": "Test Müşteri",
+        "customer_phone": "5321234567",
+        "customer_email": "test@example.com",
+    }
+    
+    created = (await client.post("/api/v1/bookings", json=booking_data)).json()
+    code = created["bookingCode"]
+    
+    response = await client.get(f"/api/v1/bookings/{code}")
+    assert response.status_code == 200
+    assert response.json()["id"] == created["id"]
+    
+    response = await client.delete(f"/api/v1/bookings/{code}")
+    assert response.status_code == 200
+    
+    response = await client.get(f"/api/v1/bookings/{code}")
+    assert response.json()["status"] == "cancelled"
+    
+    # Cancelling twice is rejected
+    response = await client.delete(f"/api/v1/bookings/{code}")
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_fast_read_responses_match_validated_ones(client: AsyncClient):
+    """Test that pre-encoded read responses match the validated create response"""
+    booking_data = {
+        "service_category": "tesisat",
+        "problem_description": "Bahçe aydınlatması için 6 adet armatür montajı gerekiyor.",
+        "urgency_level": "normal",
+        "district": "Beykoz",
+        "address": "Kavacık Mah. Öğretmen Cad. No:3",
+        "preferred_date": (date.today() + timedelta(days=3)).isoformat(),
+        "preferred_time_slot": "afternoon",
+        "customer_name": "Test Müşteri",
+        "customer_phone": "5321234567",
+        "customer_email": "test@example.com",
+    }
+    created = (await client.post("/api/v1/bookings", json=booking_data)).json()
+    
+    response = await client.get(f"/api/v1/bookings/{created['bookingCode']}")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == created
+    
+    response = await client.get("/api/v1/bookings", params={"district": "Beykoz", "pageSize": 1})
+    data = response.json()
+    assert data["items"] == [created]
+    assert data["pageSize"] == 1
+    
+    first = await client.get("/api/v1/testimonials")
+    second = await client.get("/api/v1/testimonials")
+    assert first.content == second.content
+    assert len(first.json()) > 0
+
+
+@pytest.mark.anyio
+async def test_available_slots(client: AsyncClient):
+    """Test that booked slots are excluded until the booking is cancelled"""
+    day = (date.today() + timedelta(days=3)).isoformat()
+    params = {"date": day, "district": "Sarıyer"}
+    
+    response = await client.get("/api/v1/bookings/available-slots", params=params)
+    assert response.status_code == 200
+    assert response.json()["availableSlots"] == ["morning", "afternoon", "evening"]
+    
+    booking_data = {
+        "service_category": "ariza",
+        "problem_description": "Salondaki aydınlatma hattında sürekli kesinti oluyor.",
+        "urgency_level": "normal",
+        "district": "Sarıyer",
+        "address": "Tarabya Mah. Haydar Aliyev Cad. No:12",
+        "preferred_date": day,
+        "preferred_time_slot": "afternoon",
+        "customer_name": "Test Müşteri",
+        "customer_phone": "5321234567",
+        "customer_email": "test@example.com",
+    }
+    code = (await client.post("/api/v1/bookings", json=booking_data)).json()["bookingCode"]
+    
+    response = await client.get("/api/v1/bookings/available-slots", params=params)
+    assert response.json()["availableSlots"] == ["morning", "evening"]
+    
+    await client.delete(f"/api/v1/bookings/{code}")
+    response = await client.get("/api/v1/bookings/available-slots", params=params)
+    assert response.json()["availableSlots"] == ["morning", "afternoon", "evening"]
+
+
+@pytest.mark.anyio
+async def test_availability_range(client: AsyncClient):
+    """Test that a month of availability is answered in one call"""
+    start = date.today() + timedelta(days=20)
+    params = {"district": "Tuzla", "dateFrom": start.isoformat()}
+    
+    booking_data = {
+        "service_category": "ariza",
+        "problem_description": "Mutfaktaki prizlerde zaman zaman elektrik kesiliyor.",
+        "urgency_level": "normal",
+        "district": "Tuzla",
+        "address": "Aydınlı Mah. Sahil Yolu Cad. No:4",
+        "preferred_date": (start + timedelta(days=2)).isoformat(),
+        "preferred_time_slot": "evening",
+        "customer_name": "Test Müşteri",
+        "customer_phone": "5321234567",
+        "customer_email": "test@example.com",
+    }
+    assert (await client.post("/api/v1/bookings", json=booking_data)).status_code == 201
+    
+    response = await client.get("/api/v1/bookings/availability", params=params)
+    assert response.status_code == 200
+    days = response.json()["days"]
+    assert len(days) == 31
+    assert days[0]["availableSlots"] == ["morning", "afternoon", "evening"]
+    assert days[2]["date"] == booking_data["preferred_date"]
+    assert days[2]["availableSlots"] == ["morning", "afternoon"]
+    assert days[2]["remaining"] == {"morning": 1, "afternoon": 1, "evening": 0}
+    
+    params["dateTo"] = (start + timedelta(days=120)).isoformat()
+    response = await client.get("/api/v1/bookings/availability", params=params)
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_list_bookings_cursor_pagination(client: AsyncClient):
+    """Test that cursor pages walk every booking exactly once, newest first"""
+    created = []
+    for i in range(5):
+        booking_data = {
+            "service_category": "tesisat",
+            "problem_description": f"Yeni dairenin komple elektrik tesisatı yapılacak ({i}).",
+            "urgency_level": "normal",
+            "district": "Adalar",
+            "address": "Büyükada Nizam Mah. Çınar Cad. No:3",
+            "preferred_date": (date.today() + timedelta(days=1 + i)).isoformat(),
+            "preferred_time_slot": "morning",
+            "customer_name": "Test Müşteri",
+            "customer_phone": "5321234567",
+            "customer_email": "test@example.com",
+        }
+        response = await client.post("/api/v1/bookings", json=booking_data)
+        created.append(response.json()["bookingCode"])
+    
+    params = {"district": "Adalar", "pageSize": 2}
+    seen = []
+    cursor = None
+    while True:
+        if cursor:
+            params["cursor"] = cursor
+        data = (await client.get("/api/v1/bookings", params=params)).json()
+        assert data["total"] == 5
+        assert data["totalPages"] == 3
+        seen.extend(item["bookingCode"] for item in data["items"])
+        cursor = data["nextCursor"]
+        if cursor is None:
+            break
+    
+    assert seen == list(reversed(created))
+    
+    # Offset pages remain available for compatibility
+    data = (await client.get(
+        "/api/v1/bookings", params={"district": "Adalar", "pageSize": 2, "page": 3}
+    )).json()
+    assert [item["bookingCode"] for item in data["items"]] == [created[0]]
+    
+    response = await client.get("/api/v1/bookings", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    
+    # A well-formed cursor whose id is not a booking id is rejected the same way
+    forged = base64.urlsafe_b64encode(b"2024-01-01T00:00:00|x").decode("ascii")
+    response = await client.get("/api/v1/bookings", params={"cursor": forged})
+    assert response.status_code == 400
+    assert response.json()["error"]["message"] == "Geçersiz sayfa imleci"
+
+
+@pytest.mark.anyio
+async def test_create_bookings_batch(client: AsyncClient):
+    """Test batch creation reports per-item results and errors"""
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    
+    def item(name: str, phone: str, slot: str = "morning") -> dict:
+        return {
+            "serviceCategory": "bakim",
+            "problemDescription": "Ofis katındaki panoların periyodik bakımı yapılacak.",
+            "urgencyLevel": "normal",
+            "district": "Ataşehir",
+            "address": "Barbaros Mah. Begonya Sok. No:1 Kat:5",
+            "preferredDate": tomorrow,
+            "preferredTimeSlot": slot,
+            "customerName": name,
+            "customerPhone": phone,
+            "customerEmail": "kurumsal@example.com",
+        }
+    
+    batch = {"items": [
+        item("Şube 1", "5321234567"),
+        item("Şube 2", "invalid"),
+        item("Şube 3", "05329876543", "evening"),
+        item("Şube 4", "05329876543"),
+    ]}
+    response = await client.post("/api/v1/bookings/batch", json=batch)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 2
+    
+    results = data["items"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert [r["success"] for r in results] == [True, False, True, False]
+    assert results[1]["errors"][0]["field"] == "customerPhone"
+    assert results[3]["errors"][0]["type"] == "slot_unavailable"
+    
+    codes = {r["booking"]["bookingCode"] for r in results if r["success"]}
+    assert len(codes) == 2
+    for code in codes:
+        response = await client.get(f"/api/v1/bookings/{code}")
+        assert response.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_concurrent_creates_never_double_book(client: AsyncClient):
+    """Test that thousands of concurrent creates fill each slot exactly once"""
+    days = [(date.today() + timedelta(days=d)).isoformat() for d in (8, 9)]
+    slots = ["morning", "afternoon", "evening"]
+    
+    def booking_data(i: int) -> dict:
+        return {
+            "service_category": "ariza",
+            "problem_description": "Dairede elektrik kesintisi var, sigorta kutusu kontrol edilmeli.",
+            "urgency_level": "urgent",
+            "district": "Esenyurt",
+            "address": "Cumhuriyet Mah. 1998 Sok. No:4",
+            "preferred_date": days[i % 2],
+            "preferred_time_slot": slots[i % 3],
+            "customer_name": f"Müşteri {i}",
+            "customer_phone": "5321234567",
+            "customer_email": f"musteri{i}@example.com",
+        }
+    
+    responses = await asyncio.gather(
+        *(client.post("/api/v1/bookings", json=booking_data(i)) for i in range(2000))
+    )
+    codes = [r.status_code for r in responses]
+    assert codes.count(201) == 6
+    assert codes.count(409) == 1994
+    
+    created = [r.json() for r in responses if r.status_code == 201]
+    taken = {(b["preferredDate"], b["preferredTimeSlot"]) for b in created}
+    assert len(taken) == 6
+    
+    # Concurrent cancels of one booking succeed exactly once
+    code = created[0]["bookingCode"]
+    cancels = await asyncio.gather(
+        *(client.delete(f"/api/v1/bookings/{code}") for _ in range(50))
+    )
+    assert [r.status_code for r in cancels].count(200) == 1
+
+
+@pytest.mark.anyio
+async def test_export_bookings(client: AsyncClient):
+    """Test streaming CSV and NDJSON exports with filters"""
+    day = date.today() + timedelta(days=5)
+    
+    for i, slot in enumerate(["morning", "evening"]):
+        booking_data = {
+            "service_category": "guvenlik",
+            "problem_description": "Binanın topraklama ölçümü ve paratoner kontrolü gerekli.",
+            "urgency_level": "normal",
+            "district": "Çatalca",
+            "address": "Ferhatpaşa Mah. İstasyon Cad. No:21",
+            "preferred_date": (day + timedelta(days=i)).isoformat(),
+            "preferred_time_slot": slot,
+            "customer_name": "Test Müşteri",
+            "customer_phone": "5321234567",
+            "customer_email": "test@example.com",
+        }
+        await client.post("/api/v1/bookings", json=booking_data)
+    
+    response = await client.get(
+        "/api/v1/bookings/export", params={"district": "Çatalca", "format": "csv"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.strip().splitlines()
+    assert lines[0].split(",")[:2] == ["id", "bookingCode"]
+    assert len(lines) == 3
+    
+    response = await client.get(
+        "/api/v1/bookings/export",
+        params={"district": "Çatalca", "format": "ndjson", "dateFrom": (day + timedelta(days=1)).isoformat()},
+    )
+    rows = [json.loads(line) for line in response.text.strip().splitlines()]
+    assert len(rows) == 1
+    assert rows[0]["preferredTimeSlot"] == "evening"
+    assert rows[0]["district"] == "Çatalca"
+
+
+@pytest.mark.anyio
+async def test_get_booking_not_found(client: AsyncClient):
+    """Test getting a non-existent booking"""
+    response = await client.get("/api/v1/bookings/ELK-000000-XXXXXX")
+    assert response.status_code == 404
+
+
 # ============================================
 # PRICING TESTS
 # ============================================
@@ -321,3 +640,99 @@ async def test_list_testimonials(client: AsyncClient):
     if len(data) > 0:
         assert "customer_name" in data[0]
         assert "rating" in data[0]
+
+
+# ============================================
+# ADMIN TESTS
+# ============================================
+
+@pytest.mark.anyio
+async def test_admin_requires_key(client: AsyncClient, monkeypatch):
+    """Test that admin endpoints are closed without the configured key"""
+    from app.config import settings
+    
+    url = f"/api/v1/admin/routes?date={date.today().isoformat()}"
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", None)
+    assert (await client.get(url)).status_code == 403
+    
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "test-admin-key")
+    assert (await client.get(url, headers={"X-Admin-Key": "wrong"})).status_code == 401
+    assert (await client.get(url, headers={"X-Admin-Key": "test-admin-key"})).status_code == 200
+
+
+@pytest.mark.anyio
+async def test_optimize_routes(client: AsyncClient, monkeypatch):
+    """Test ordering a technician's visits within time slots"""
+    from app.config import settings
+    
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "test-admin-key")
+    payload = {
+        "routes": [{
+            "technicianId": "t-01",
+            "startDistrict": "Kadıköy",
+            "stops": [
+                {"id": "b-1", "district": "Beşiktaş", "timeSlot": "morning"},
+                {"id": "b-2", "district": "Maltepe", "timeSlot": "morning"},
+                {"id": "b-3", "district": "Üsküdar", "timeSlot": "morning"},
+                {"id": "b-4", "district": "Kartal", "timeSlot": "afternoon"},
+            ],
+        }],
+    }
+    
+    response = await client.post(
+        "/api/v1/admin/routes/optimize",
+        json=payload,
+        headers={"X-Admin-Key": "test-admin-key"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    route = data["routes"][0]
+    assert [stop["id"] for stop in route["stops"]][-1] == "b-4"
+    assert route["travelMinutes"] <= route["baselineMinutes"]
+    assert data["engine"] in ("rust", "python")
+    
+    payload["routes"][0]["stops"][0]["district"] = "Ankara"
+    response = await client.post(
+        "/api/v1/admin/routes/optimize",
+        json=payload,
+        headers={"X-Admin-Key": "test-admin-key"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_day_routes_from_assigned_bookings(client: AsyncClient, monkeypatch):
+    """Test that the day's routes are built from assigned bookings"""
+    from app.config import settings
+    from app.repositories import get_booking_repository
+    
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "test-admin-key")
+    day = date.today() + timedelta(days=41)
+    repo = get_booking_repository()
+    
+    for district, slot in [("Sarıyer", "morning"), ("Beykoz", "morning"), ("Sarıyer", "evening")]:
+        booking_data = {
+            "service_category": "ariza",
+            "problem_description": "Salondaki avize ve prizler çalışmıyor.",
+            "urgency_level": "normal",
+            "district": district,
+            "address": "Merkez Mah. Çarşı Sok. No:7",
+            "preferred_date": day.isoformat(),
+            "preferred_time_slot": slot,
+            "customer_name": "Test Müşteri",
+            "customer_phone": "5321234567",
+            "customer_email": "test@example.com",
+        }
+        response = await client.post("/api/v1/bookings", json=booking_data)
+        assert response.status_code == 201
+        await repo.update(response.json()["id"], assigned_technician="t-route")
+    
+    response = await client.get(
+        "/api/v1/admin/routes",
+        params={"date": day.isoformat()},
+        headers={"X-Admin-Key": "test-admin-key"},
+    )
+    assert response.status_code == 200
+    routes = [r for r in response.json()["routes"] if r["technicianId"] == "t-route"]
+    assert len(routes) == 1
+    assert [stop["timeSlot"] for stop in routes[0]["stops"]] == ["morning", "morning", "evening"]
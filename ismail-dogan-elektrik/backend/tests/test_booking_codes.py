@@ -0,0 +1,119 @@
+"""
+İsmail Doğan Elektrik API - Booking Code Tests
+Tests for the worker-partitioned booking code generator
+"""
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from app.services.booking_codes import (
+    ALPHABET,
+    BookingCodeGenerator,
+    DATABASE_WORKER_ID,
+    claim_worker_id,
+    encode_base32,
+)
+from tests.conftest import FakeClock
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(datetime(2024, 3, 15, 10, 30))
+
+
+def test_code_format(clock: FakeClock):
+    """Test the ELK-YYMMDD-WWTTTTTT layout"""
+    code = BookingCodeGenerator(5, clock).next()
+
+    assert code.startswith("ELK-240315-05")
+    assert len(code) == 19
+    assert all(c in ALPHABET for c in code.split("-")[2])
+
+
+def test_codes_unique_within_one_tick(clock: FakeClock):
+    """Test that a frozen clock still yields increasing codes"""
+    generator = BookingCodeGenerator(1, clock)
+    codes = [generator.next() for _ in range(1000)]
+    codes += generator.reserve(500)
+
+    assert len(set(codes)) == 1500
+    assert codes == sorted(codes)
+
+
+def test_reserve_is_contiguous(clock: FakeClock):
+    """Test that a reservation is one consecutive block"""
+    generator = BookingCodeGenerator(1, clock)
+    before = generator.next()
+    block = generator.reserve(3)
+    after = generator.next()
+
+    assert [before, *block, after] == sorted([before, *block, after])
+    assert len({before, *block, after}) == 5
+    assert generator.reserve(0) == []
+
+
+def test_restart_does_not_reuse_codes(clock: FakeClock):
+    """Test that a restarted worker continues past its earlier codes"""
+    issued = set(BookingCodeGenerator(7, clock).reserve(100))
+
+    clock.now += timedelta(seconds=1)
+    restarted = BookingCodeGenerator(7, clock)
+    assert not issued & set(restarted.reserve(100))
+
+
+def test_workers_never_collide(clock: FakeClock):
+    """Test that workers sharing a clock issue disjoint codes"""
+    a = BookingCodeGenerator(1, clock).reserve(200)
+    b = BookingCodeGenerator(2, clock).reserve(200)
+    assert not set(a) & set(b)
+
+
+def test_day_rollover(clock: FakeClock):
+    """Test that the counter restarts with the date prefix"""
+    generator = BookingCodeGenerator(3, clock)
+    generator.reserve(10)
+
+    clock.now = datetime(2024, 3, 16, 0, 0)
+    assert generator.next() == "ELK-240316-03000000"
+
+
+def test_concurrent_generation_unique(clock: FakeClock):
+    """Test uniqueness when many threads share one generator"""
+    generator = BookingCodeGenerator(9, clock)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        batches = list(pool.map(lambda _: generator.reserve(50), range(200)))
+
+    codes = [code for batch in batches for code in batch]
+    assert len(set(codes)) == len(codes) == 10_000
+
+
+def test_worker_id_range():
+    """Test that the database's worker id is reserved"""
+    with pytest.raises(ValueError):
+        BookingCodeGenerator(DATABASE_WORKER_ID)
+    with pytest.raises(ValueError):
+        BookingCodeGenerator(-1)
+
+
+def test_encode_base32():
+    """Test fixed-width base32 encoding"""
+    assert encode_base32(0, 6) == "000000"
+    assert encode_base32(32 ** 6 - 1, 6) == "ZZZZZZ"
+    with pytest.raises(ValueError):
+        encode_base32(32 ** 2, 2)
+
+
+def test_claim_worker_id_slots(tmp_path):
+    """Test that processes on one node claim distinct worker ids"""
+    first, first_lock = claim_worker_id(2, str(tmp_path))
+    second, second_lock = claim_worker_id(2, str(tmp_path))
+    assert (first, second) == (64, 65)
+
+    # A released slot is reused
+    first_lock.close()
+    third, third_lock = claim_worker_id(2, str(tmp_path))
+    assert third == 64
+
+    second_lock.close()
+    third_lock.close()
@@ -0,0 +1,142 @@
+"""
+İsmail Doğan Elektrik API - Booking Journal Tests
+Tests for write-ahead logging, snapshots and replay of the booking store
+"""
+
+import asyncio
+import os
+import pytest
+from datetime import datetime
+
+from app.models import BookingStatus
+from app.repositories import InMemoryBookingRepository
+from app.services.booking_journal import BookingJournal, decode_record, encode_record
+from app.services.booking_store import BookingStore
+from tests.conftest import make_booking, spread_booking
+
+
+async def open_repo(path, **options) -> InMemoryBookingRepository:
+    journal = BookingJournal(str(path), **options)
+    store = BookingStore()
+    journal.replay(store)
+    await journal.start()
+    return InMemoryBookingRepository(store, journal=journal)
+
+
+def replayed(path) -> BookingStore:
+    store = BookingStore()
+    journal = BookingJournal(str(path))
+    journal.replay(store)
+    journal._file.close()
+    journal._dir_lock.close()
+    return store
+
+
+def state(store: BookingStore):
+    return sorted(encode_record(b) for b in store.values())
+
+
+def test_record_encoding_roundtrip():
+    """Test that every field survives encoding"""
+    booking = make_booking(
+        1,
+        estimated_arrival=datetime(2030, 1, 2, 9, 30),
+        additional_notes="Kapı kodu 1234",
+        photos=("a.jpg", "b.jpg"),
+        assigned_technician="İsmail Doğan",
+        updated_at=datetime(2024, 1, 2, 8, 0),
+    )
+    assert encode_record(decode_record(encode_record(booking))) == encode_record(booking)
+
+
+@pytest.mark.anyio
+async def test_replay_restores_writes(tmp_path):
+    """Test that creates, updates and cancels are restored after a restart"""
+    repo = await open_repo(tmp_path)
+    assert await repo.reserve_many([spread_booking(n) for n in range(5)], capacity=1) == [True] * 5
+    await repo.add(spread_booking(9))
+    await repo.update("id-1", status=BookingStatus.CONFIRMED, assigned_technician="Usta Ali")
+    await repo.cancel("id-2", updated_at=datetime(2024, 2, 1))
+    await repo.journal.close()
+
+    store = replayed(tmp_path)
+    assert state(store) == state(repo.store)
+    assert store.get("id-1").status == BookingStatus.CONFIRMED
+    assert store.count(status=BookingStatus.CANCELLED) == 1
+
+
+@pytest.mark.anyio
+async def test_snapshots_compact_the_log(tmp_path):
+    """Test that snapshots replace older segments without losing events"""
+    repo = await open_repo(tmp_path, snapshot_every=10)
+    for n in range(35):
+        await repo.add(spread_booking(n))
+        if n % 4 == 0:
+            await repo.update(f"id-{n}", status=BookingStatus.CONFIRMED)
+    await repo.journal.close(snapshot=True)
+
+    files = sorted(os.listdir(tmp_path))
+    assert len([f for f in files if f.startswith("snapshot-")]) == 1
+    assert len([f for f in files if f.startswith("journal-")]) == 1
+    assert state(replayed(tmp_path)) == state(repo.store)
+
+
+@pytest.mark.anyio
+async def test_torn_tail_is_discarded(tmp_path):
+    """Test that a partially written frame from a crash is cut off on replay"""
+    repo = await open_repo(tmp_path)
+    await repo.add_many([spread_booking(n) for n in range(3)])
+    await repo.journal.close()
+
+    segment = next(f for f in os.listdir(tmp_path) if f.startswith("journal-"))
+    with open(tmp_path / segment, "ab") as f:
+        f.write(b"\x40\x00\x00\x00\x99\x99")
+
+    repo = await open_repo(tmp_path)
+    assert len(repo.store) == 3
+    await repo.add(spread_booking(3))
+    await repo.journal.close()
+    assert len(replayed(tmp_path)) == 4
+
+
+@pytest.mark.anyio
+async def test_group_commit_batches_concurrent_writes(tmp_path):
+    """Test that concurrent writers share fsyncs"""
+    repo = await open_repo(tmp_path)
+    await asyncio.gather(*(repo.add(spread_booking(n)) for n in range(300)))
+
+    assert repo.journal.events_written == 300
+    assert repo.journal.batches_written < 300
+    await repo.journal.close()
+    assert len(replayed(tmp_path)) == 300
+
+
+@pytest.mark.anyio
+async def test_failed_write_reverts_change(tmp_path, monkeypatch):
+    """Test that a change is rolled back when it cannot be journaled"""
+    repo = await open_repo(tmp_path)
+    await repo.add(spread_booking(1))
+
+    def fail(data: bytes) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(repo.journal, "_write", fail)
+    with pytest.raises(OSError):
+        await repo.reserve(spread_booking(2), capacity=1)
+    with pytest.raises(OSError):
+        await repo.cancel("id-1", updated_at=datetime(2024, 2, 1))
+
+    assert "id-2" not in repo.store
+    assert repo.store.get("id-1").status == BookingStatus.PENDING
+    monkeypatch.undo()
+    await repo.journal.close()
+    assert state(replayed(tmp_path)) == state(repo.store)
+
+
+@pytest.mark.anyio
+async def test_journal_directory_is_exclusive(tmp_path):
+    """Test that a second process cannot open the same journal"""
+    repo = await open_repo(tmp_path)
+    with pytest.raises(RuntimeError):
+        BookingJournal(str(tmp_path)).replay(BookingStore())
+    await repo.journal.close()
@@ -0,0 +1,191 @@
+"""
+İsmail Doğan Elektrik API - Booking Store Tests
+Unit tests for the in-memory booking store and its indexes
+"""
+
+import pytest
+from datetime import date, timedelta
+
+from app.models import (
+    BookingStatus,
+    TimeSlot,
+)
+from app.services.booking_store import BookingStore
+from tests.conftest import make_booking
+
+
+# ============================================
+# HELPERS
+# ============================================
+
+@pytest.fixture
+def store():
+    return BookingStore()
+
+
+# ============================================
+# CODE INDEX TESTS
+# ============================================
+
+def test_get_by_code(store: BookingStore):
+    """Test lookup by booking code through the hash index"""
+    for n in range(100):
+        store.add(make_booking(n))
+
+    booking = store.get_by_code("ELK-240101-00002A")
+    assert booking is not None
+    assert booking.id == "id-42"
+    assert store.get_by_code("ELK-000000-XXXXXX") is None
+    assert len(store) == 100
+
+
+def test_add_duplicate_code_rejected(store: BookingStore):
+    """Test that a booking code can only be indexed once"""
+    store.add(make_booking(1))
+    with pytest.raises(ValueError):
+        store.add(make_booking(2, booking_code=make_booking(1).booking_code))
+    assert len(store) == 1
+
+
+def test_update_reindexes_code(store: BookingStore):
+    """Test that changing a booking code moves its index entry"""
+    store.add(make_booking(1))
+    store.update("id-1", booking_code="ELK-NEW", status=BookingStatus.CONFIRMED)
+
+    assert store.get_by_code(make_booking(1).booking_code) is None
+    assert store.get_by_code("ELK-NEW").status == BookingStatus.CONFIRMED
+
+
+def test_update_unknown_field_rejected(store: BookingStore):
+    """Test that updates are limited to booking record fields"""
+    store.add(make_booking(1))
+    with pytest.raises(ValueError):
+        store.update("id-1", status=BookingStatus.CONFIRMED, colour="red")
+    assert store.get("id-1").status == BookingStatus.PENDING
+
+
+def test_delete_removes_index(store: BookingStore):
+    """Test that deleting a booking drops it from the code index"""
+    booking = store.add(make_booking(1))
+    assert store.delete("id-1") is booking
+    assert store.get_by_code(booking.booking_code) is None
+    assert store.delete("id-1") is None
+    assert len(store) == 0
+
+
+# ============================================
+# SLOT OCCUPANCY INDEX TESTS
+# ============================================
+
+def test_booked_slots_follow_writes(store: BookingStore):
+    """Test that the occupancy index tracks create, cancel and delete"""
+    day = date.today() + timedelta(days=1)
+    store.add(make_booking(1, preferred_time_slot=TimeSlot.MORNING))
+    store.add(make_booking(2, preferred_time_slot=TimeSlot.MORNING))
+    store.add(make_booking(3, preferred_time_slot=TimeSlot.EVENING))
+    store.add(make_booking(4, district="Şişli", preferred_time_slot=TimeSlot.AFTERNOON))
+
+    assert store.booked_slots(day, "Kadıköy") == [TimeSlot.MORNING, TimeSlot.EVENING]
+    assert store.slot_count(day, "Kadıköy", TimeSlot.MORNING) == 2
+
+    store.update("id-1", status=BookingStatus.CANCELLED)
+    assert store.slot_count(day, "Kadıköy", TimeSlot.MORNING) == 1
+
+    store.delete("id-2")
+    store.delete("id-1")
+    assert store.booked_slots(day, "Kadıköy") == [TimeSlot.EVENING]
+    assert store.booked_slots(day, "Şişli") == [TimeSlot.AFTERNOON]
+
+
+def test_update_moves_slot(store: BookingStore):
+    """Test that rescheduling a booking releases the old slot"""
+    day = date.today() + timedelta(days=1)
+    store.add(make_booking(1))
+    store.update("id-1", preferred_time_slot=TimeSlot.EVENING)
+
+    assert store.booked_slots(day, "Kadıköy") == [TimeSlot.EVENING]
+
+
+# ============================================
+# CREATED_AT ORDER INDEX TESTS
+# ============================================
+
+def test_iter_newest_first(store: BookingStore):
+    """Test newest-first iteration with keyset and offset positioning"""
+    for n in [3, 1, 4, 0, 2]:
+        store.add(make_booking(n))
+
+    ids = [b.id for b in store.iter_newest_first()]
+    assert ids == ["id-4", "id-3", "id-2", "id-1", "id-0"]
+
+    before = store.order_key(store.get("id-3"))
+    assert [b.id for b in store.iter_newest_first(before=before)] == ["id-2", "id-1", "id-0"]
+    assert [b.id for b in store.iter_newest_first(offset=3)] == ["id-1", "id-0"]
+    assert list(store.iter_newest_first(offset=10)) == []
+
+    store.delete("id-2")
+    assert [b.id for b in store.iter_newest_first(before=before)] == ["id-1", "id-0"]
+
+
+# ============================================
+# FILTER INDEX TESTS
+# ============================================
+
+def test_filtered_counts(store: BookingStore):
+    """Test counts by status and district come from the membership sets"""
+    for n in range(30):
+        store.add(make_booking(
+            n,
+            district="Şişli" if n % 3 == 0 else "Kadıköy",
+            status=BookingStatus.CONFIRMED if n % 2 == 0 else BookingStatus.PENDING,
+        ))
+
+    assert store.count() == 30
+    assert store.count(district="Şişli") == 10
+    assert store.count(status=BookingStatus.CONFIRMED) == 15
+    assert store.count(status=BookingStatus.CONFIRMED, district="Şişli") == 5
+    assert store.count(district="Beykoz") == 0
+    assert store.counts_by_district(BookingStatus.PENDING) == {"Şişli": 5, "Kadıköy": 10}
+
+    store.update("id-0", status=BookingStatus.CANCELLED)
+    assert store.count(status=BookingStatus.CONFIRMED, district="Şişli") == 4
+    store.delete("id-3")
+    assert store.counts_by_district() == {"Şişli": 9, "Kadıköy": 20}
+
+
+@pytest.mark.parametrize("every", [3, 50])
+def test_filtered_page_matches_scan(store: BookingStore, every: int):
+    """Test that both page strategies agree with a sort-and-filter scan"""
+    for n in range(600):
+        store.add(make_booking(n, district="Şişli" if n % every == 0 else "Kadıköy"))
+
+    for district in ["Şişli", "Kadıköy"]:
+        expected = sorted(
+            (b for b in store.values() if b.district == district),
+            key=store.order_key,
+            reverse=True,
+        )
+        assert store.page(5, district=district) == expected[:5]
+        assert store.page(5, offset=1, district=district) == expected[1:6]
+
+        before = store.order_key(expected[1])
+        assert store.page(3, before=before, district=district) == expected[2:5]
+
+
+def test_scan_resumes_by_key(store: BookingStore):
+    """Test bounded oldest-first scans resume correctly across writes"""
+    for n in range(10):
+        store.add(make_booking(n, district="Şişli" if n % 2 else "Kadıköy"))
+
+    chunk, after = store.scan(None, limit=2, max_scan=100, district="Şişli")
+    assert [b.id for b in chunk] == ["id-1", "id-3"]
+
+    # Writes between chunks do not disturb the resume position
+    store.delete("id-5")
+    store.add(make_booking(20, district="Şişli"))
+
+    seen = [b.id for b in chunk]
+    while after is not None:
+        chunk, after = store.scan(after, limit=2, max_scan=3, district="Şişli")
+        seen.extend(b.id for b in chunk)
+    assert seen == ["id-1", "id-3", "id-7", "id-9", "id-20"]
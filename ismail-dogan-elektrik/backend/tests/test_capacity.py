@@ -0,0 +1,146 @@
+"""
+İsmail Doğan Elektrik API - Capacity Tests
+Tests for the technician capacity matrix and repository availability
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.models import (
+    BookingStatus,
+    TechnicianShift,
+    TimeSlot,
+)
+from app.repositories import InMemoryBookingRepository
+from app.services.capacity import CapacityMatrix, slots_from_row
+from tests.conftest import make_booking
+
+# A Monday, so weekday offsets line up with dates
+START = date(2030, 1, 7)
+DISTRICTS = ["Kadıköy", "Şişli"]
+
+
+def shift(technician: str, district: str, weekdays, slots) -> TechnicianShift:
+    return TechnicianShift(
+        technician_id=technician,
+        district=district,
+        weekdays=weekdays,
+        time_slots=slots,
+    )
+
+
+@pytest.fixture
+def matrix() -> CapacityMatrix:
+    matrix = CapacityMatrix(DISTRICTS, days=28, start=START)
+    matrix.set_shifts([
+        shift("t1", "Kadıköy", [0, 1, 2, 3, 4], [TimeSlot.MORNING, TimeSlot.AFTERNOON]),
+        shift("t2", "Kadıköy", [0], [TimeSlot.MORNING]),
+        shift("t2", "Şişli", [1, 2], [TimeSlot.EVENING]),
+    ])
+    return matrix
+
+
+def test_capacity_follows_weekly_shifts(matrix: CapacityMatrix):
+    """Test that capacity counts the technicians on shift per weekday and slot"""
+    week = matrix.remaining("Kadıköy", START, START + timedelta(days=6))
+    assert week.shape == (7, 3)
+    assert week[0].tolist() == [2, 1, 0]
+    assert week[1].tolist() == [1, 1, 0]
+    assert week[5].tolist() == [0, 0, 0]
+
+    # The pattern repeats, also beyond the window
+    later = START + timedelta(days=70)
+    assert matrix.capacity_at((later, "Kadıköy", TimeSlot.MORNING)) == 2
+    assert matrix.capacity_at((later, "Beykoz", TimeSlot.MORNING)) == 0
+    assert matrix.capacity_between("Şişli", later, later + timedelta(days=2)).tolist() == [
+        [0, 0, 0], [0, 0, 1], [0, 0, 1],
+    ]
+
+
+def test_overlapping_shifts_are_rejected():
+    """Test that a technician cannot cover two districts at the same time"""
+    matrix = CapacityMatrix(DISTRICTS, days=7, start=START)
+    with pytest.raises(ValueError):
+        matrix.set_shifts([
+            shift("t1", "Kadıköy", [0], [TimeSlot.MORNING]),
+            shift("t1", "Şişli", [0], [TimeSlot.MORNING]),
+        ])
+
+
+def test_track_and_sync_agree(matrix: CapacityMatrix):
+    """Test that incremental updates match a full recount"""
+    key = (START, "Kadıköy", TimeSlot.MORNING)
+    matrix.track(key, 1)
+    assert matrix.remaining_at(key) == 1
+    matrix.track(key, 2)
+    assert matrix.remaining_at(key) == 0  # overbooked cells read as 0
+
+    incremental = matrix.committed.copy()
+    matrix.sync([(key, 3), ((START - timedelta(days=1), "Kadıköy", TimeSlot.MORNING), 5)])
+    assert np.array_equal(matrix.committed, incremental)
+
+
+def test_demand_totals_follow_track_and_sync():
+    """Test that district occupancy counts only the demand window and matches a recount"""
+    matrix = CapacityMatrix(DISTRICTS, days=28, start=START, default_capacity=2, demand_days=7)
+    # 7 days x 3 slots x 2 places
+    assert matrix.demand_capacity.tolist() == [42, 42]
+
+    inside = (START + timedelta(days=6), "Kadıköy", TimeSlot.EVENING)
+    outside = (START + timedelta(days=7), "Kadıköy", TimeSlot.EVENING)
+    matrix.track(inside, 2)
+    matrix.track(outside, 1)
+    assert matrix.district_occupancy("Kadıköy") == 2 / 42
+    assert matrix.district_occupancy("Şişli") == 0
+    assert matrix.district_occupancy("Beykoz") is None
+    assert matrix.occupancy_at(inside) == 1.0
+    assert matrix.occupancy_at(outside) == 0.5
+    assert matrix.occupancy_at((START - timedelta(days=1), "Kadıköy", TimeSlot.EVENING)) is None
+
+    incremental = matrix.demand_committed.copy()
+    matrix.sync([(inside, 2), (outside, 1)])
+    assert np.array_equal(matrix.demand_committed, incremental)
+    assert matrix.occupancy(7)[6, 0].tolist() == [0, 0, 1.0]
+
+
+def test_rebase_moves_the_window(matrix: CapacityMatrix):
+    """Test that rebasing lays the weekly pattern out from the new start"""
+    assert matrix.rebase(START + timedelta(days=1))
+    assert not matrix.rebase(START + timedelta(days=1))
+    assert matrix.remaining("Kadıköy", matrix.start, matrix.start)[0].tolist() == [1, 1, 0]
+    assert slots_from_row(np.array([0, 2, 1])) == [TimeSlot.AFTERNOON, TimeSlot.EVENING]
+
+
+@pytest.mark.anyio
+async def test_repository_availability_follows_bookings():
+    """Test that reservations, cancellations and restores update availability"""
+    today = date.today()
+    matrix = CapacityMatrix(DISTRICTS, days=14, start=today, default_capacity=2)
+    repo = InMemoryBookingRepository(capacity=matrix)
+
+    first = make_booking(0, preferred_date=today, district="Şişli")
+    second = make_booking(1, preferred_date=today, district="Şişli")
+    third = make_booking(2, preferred_date=today, district="Şişli")
+    assert await repo.reserve_many([first, second, third]) == [True, True, False]
+
+    remaining = await repo.remaining_capacity("Şişli", today, today + timedelta(days=1))
+    assert remaining.tolist() == [[0, 2, 2], [2, 2, 2]]
+
+    await repo.cancel(first.id, first.created_at)
+    remaining = await repo.remaining_capacity("Şişli", today, today)
+    assert remaining.tolist() == [[1, 2, 2]]
+
+    # Bulk restores go through the same bookkeeping
+    bookings = list(repo.store.values())
+    repo.store.clear()
+    assert not matrix.committed.any()
+    repo.store.load(bookings)
+    assert (await repo.remaining_capacity("Şişli", today, today)).tolist() == [[1, 2, 2]]
+
+    # Beyond the window the slot index is consulted directly
+    far = today + timedelta(days=60)
+    await repo.reserve(make_booking(3, preferred_date=far, district="Şişli"))
+    assert (await repo.remaining_capacity("Şişli", far, far)).tolist() == [[1, 2, 2]]
+    assert first.status == BookingStatus.CANCELLED
@@ -0,0 +1,103 @@
+"""
+İsmail Doğan Elektrik API - Service Catalog Tests
+Tests for the precomputed catalog responses and conditional GETs
+"""
+
+import gzip
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.responses import StaticJSON
+from app.routers.services import SERVICES_DATA, SERVICE_CATALOG
+from app.services.catalog import ServiceCatalog
+
+
+# ============================================
+# CATALOG TESTS
+# ============================================
+
+def test_catalog_indexes_match_data():
+    """Test that the id and category indexes cover every service"""
+    catalog = ServiceCatalog(SERVICES_DATA)
+    assert len(catalog) == len(SERVICES_DATA)
+    for raw in SERVICES_DATA:
+        assert catalog.get(raw["id"]).base_price == raw["base_price"]
+        assert catalog.get(raw["id"]) in catalog.by_category[raw["category"]]
+    assert sum(len(s) for s in catalog.by_category.values()) == len(SERVICES_DATA)
+    assert catalog.get("missing") is None
+
+
+def test_static_json_etag_is_stable():
+    """Test that equal bodies get equal ETags and gzip round-trips"""
+    body = json.dumps({"items": ["x" * 40] * 40}).encode()
+    first, second = StaticJSON(body), StaticJSON(body)
+    assert first.etag == second.etag
+    assert first.gzipped == second.gzipped
+    assert gzip.decompress(first.gzipped) == body
+    assert StaticJSON(b"{}").gzipped is None
+
+
+# ============================================
+# ENDPOINT TESTS
+# ============================================
+
+@pytest.mark.anyio
+async def test_list_services_conditional_get(client: AsyncClient):
+    """Test that a matching If-None-Match gets 304 without a body"""
+    response = await client.get("/api/v1/services", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.content == SERVICE_CATALOG.list_json.body
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"].startswith("public, max-age=")
+
+    response = await client.get(
+        "/api/v1/services",
+        headers={"Accept-Encoding": "identity", "If-None-Match": f'W/"other", {etag}'},
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = await client.get(
+        "/api/v1/services",
+        headers={"Accept-Encoding": "identity", "If-None-Match": '"stale"'},
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_list_services_sends_pregzipped_body(client: AsyncClient):
+    """Test that gzip clients get the precompressed bytes and their own ETag"""
+    response = await client.get("/api/v1/services", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == SERVICE_CATALOG.list_json.gzip_etag
+    assert response.json()["total"] == len(SERVICES_DATA)
+
+    response = await client.get(
+        "/api/v1/services",
+        headers={"Accept-Encoding": "gzip;q=0", "If-None-Match": SERVICE_CATALOG.list_json.gzip_etag},
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == SERVICE_CATALOG.list_json.etag
+
+
+@pytest.mark.anyio
+async def test_service_and_category_responses(client: AsyncClient):
+    """Test single-service and category lookups, known and unknown"""
+    response = await client.get("/api/v1/services/ariza")
+    assert response.status_code == 200
+    assert response.json()["basePrice"] == SERVICE_CATALOG.get("ariza").base_price
+    assert "etag" in response.headers
+
+    assert (await client.get("/api/v1/services/missing")).status_code == 404
+
+    response = await client.get("/api/v1/services/category/ariza")
+    assert [s["category"] for s in response.json()["items"]] == ["ariza"]
+
+    response = await client.get("/api/v1/services/category/unknown")
+    assert response.status_code == 200
+    assert response.json() == {"items": [], "total": 0}
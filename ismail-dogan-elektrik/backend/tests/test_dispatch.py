@@ -0,0 +1,143 @@
+"""
+İsmail Doğan Elektrik API - Dispatch Tests
+Tests for the assignment solver and technician dispatch planning
+"""
+
+import itertools
+from functools import partial
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.models import (
+    BookingStatus,
+    ServiceCategory,
+    TimeSlot,
+    UrgencyLevel,
+)
+from app.repositories import InMemoryBookingRepository
+from app.services.dispatch import DispatchTechnician, plan_dispatch, solve_assignment
+from tests import conftest
+
+# A Monday
+DAY = date(2030, 1, 7)
+
+# Fault calls on DAY unless a test says otherwise
+make_booking = partial(conftest.make_booking, service_category=ServiceCategory.ARIZA, preferred_date=DAY)
+
+
+def test_solver_matches_brute_force():
+    """Test that the Hungarian solver finds the optimum on random rectangles"""
+    rng = np.random.default_rng(3)
+    for _ in range(200):
+        n, m = int(rng.integers(1, 6)), int(rng.integers(1, 6))
+        cost = rng.integers(-5, 20, (n, m)).astype(float)
+        rows, cols = solve_assignment(cost)
+
+        k = min(n, m)
+        best = min(
+            sum(cost[i, j] for i, j in zip(r, c))
+            for r in itertools.combinations(range(n), k)
+            for c in itertools.permutations(range(m), k)
+        )
+        assert len(rows) == k
+        assert len(set(rows.tolist())) == len(set(cols.tolist())) == k
+        assert cost[rows, cols].sum() == pytest.approx(best)
+
+
+def test_plan_respects_specialization_shift_and_busy():
+    """Test that infeasible pairs are never planned"""
+    bookings = [
+        make_booking(0, service_category=ServiceCategory.PROJE),
+        make_booking(1, district="Şişli"),
+        make_booking(2, preferred_time_slot=TimeSlot.EVENING),
+    ]
+    technicians = [
+        DispatchTechnician("proje", "0", specializations=frozenset({ServiceCategory.PROJE})),
+        DispatchTechnician("sisli", "0", shifts={(0, TimeSlot.MORNING): "Şişli"}),
+        DispatchTechnician("busy", "0"),
+    ]
+    plan = plan_dispatch(bookings, technicians, busy=[("busy", DAY, TimeSlot.MORNING)])
+
+    assert sorted((a.booking_id, a.technician_id) for a in plan) == [
+        ("id-0", "proje"),
+        ("id-1", "sisli"),
+        ("id-2", "busy"),
+    ]
+    assert technicians[2].load == 1
+
+
+def test_plan_prefers_urgent_bookings_and_better_technicians():
+    """Test that scarce technicians go to urgent work, best rated first"""
+    bookings = [
+        make_booking(0),
+        make_booking(1, urgency_level=UrgencyLevel.EMERGENCY),
+        make_booking(2, urgency_level=UrgencyLevel.URGENT),
+    ]
+    technicians = [
+        DispatchTechnician("average", "0", rating=3.5),
+        DispatchTechnician("top", "0", rating=5.0),
+    ]
+    plan = {a.booking_id: a.technician_id for a in plan_dispatch(bookings, technicians)}
+    assert set(plan) == {"id-1", "id-2"}
+
+    # Load spreads work when ratings tie
+    technicians = [DispatchTechnician("a", "0", load=3), DispatchTechnician("b", "0")]
+    plan = plan_dispatch([make_booking(0)], technicians)
+    assert plan[0].technician_id == "b"
+
+
+def test_plan_handles_hundreds_of_bookings():
+    """Test a realistic batch: every slot filled up to the available technicians"""
+    rng = np.random.default_rng(5)
+    districts = ["Kadıköy", "Şişli", "Üsküdar", "Beşiktaş"]
+    slots = list(TimeSlot)
+    bookings = [
+        make_booking(
+            i,
+            district=districts[int(rng.integers(len(districts)))],
+            preferred_date=DAY + timedelta(days=int(rng.integers(3))),
+            preferred_time_slot=slots[int(rng.integers(3))],
+            urgency_level=list(UrgencyLevel)[int(rng.integers(3))],
+        )
+        for i in range(400)
+    ]
+    technicians = [
+        DispatchTechnician(f"t{i}", "0", rating=float(rng.uniform(3, 5)))
+        for i in range(40)
+    ]
+    plan = plan_dispatch(bookings, technicians)
+
+    per_slot = {}
+    for a in plan:
+        booking = bookings[int(a.booking_id.split("-")[1])]
+        key = (a.technician_id, booking.preferred_date, booking.preferred_time_slot)
+        assert key not in per_slot
+        per_slot[key] = a.booking_id
+    groups = {(b.preferred_date, b.preferred_time_slot) for b in bookings}
+    expected = sum(
+        min(40, sum(1 for b in bookings if (b.preferred_date, b.preferred_time_slot) == g))
+        for g in groups
+    )
+    assert len(plan) == expected
+
+
+@pytest.mark.anyio
+async def test_in_memory_assignment_skips_changed_bookings():
+    """Test that only pending unassigned bookings are assigned and confirmed"""
+    repo = InMemoryBookingRepository()
+    today = date.today()
+    bookings = [make_booking(i, preferred_date=today + timedelta(days=1)) for i in range(3)]
+    await repo.add_many(bookings)
+    await repo.cancel("id-1", datetime.utcnow())
+
+    assert [b.id for b in await repo.unassigned(today, 10)] == ["id-0", "id-2"]
+    assigned = await repo.assign_technicians({"id-0": "t1", "id-1": "t2"}, datetime.utcnow())
+
+    assert [b.id for b in assigned] == ["id-0"]
+    assert bookings[0].status == BookingStatus.CONFIRMED
+    assert bookings[1].assigned_technician is None
+    assert await repo.technician_commitments(today) == [
+        ("t1", today + timedelta(days=1), TimeSlot.MORNING)
+    ]
@@ -0,0 +1,165 @@
+"""
+İsmail Doğan Elektrik API - Booking Event Tests
+Tests for the booking event bus and the Server-Sent Events streams
+"""
+
+import asyncio
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from app.config import settings
+from app.repositories import InMemoryBookingRepository
+from app.services.events import EventBus
+from tests.conftest import spread_booking
+
+
+def parse_events(body: bytes) -> list:
+    """(id, event, data) of every event frame in an SSE body"""
+    events = []
+    for frame in body.decode().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in frame.splitlines() if not line.startswith(":")
+        )
+        if "event" in fields:
+            events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+# ============================================
+# BUS TESTS
+# ============================================
+
+@pytest.mark.anyio
+async def test_bus_routes_events_to_topic_and_firehose():
+    """Test that a booking's stream gets only its events and the firehose gets all"""
+    bus = EventBus()
+    first = bus.subscribe("ELK-A")
+    firehose = bus.subscribe(None)
+
+    bus.publish("ELK-A", "status", b'{"n":1}')
+    bus.publish("ELK-B", "status", b'{"n":2}')
+
+    assert [data["n"] for _, _, data in parse_events(await first.receive(1))] == [1]
+    assert [data["n"] for _, _, data in parse_events(await firehose.receive(1))] == [1, 2]
+    assert await first.receive(0.01) == b""
+
+    bus.unsubscribe(first)
+    bus.unsubscribe(firehose)
+    assert len(bus) == 0
+    assert bus.metrics()["topics"] == 0
+
+
+@pytest.mark.anyio
+async def test_slow_stream_is_closed_instead_of_blocking():
+    """Test that a stream too far behind is dropped while others keep up"""
+    bus = EventBus(max_pending=3)
+    slow = bus.subscribe("ELK-A")
+    fast = bus.subscribe("ELK-A")
+
+    for n in range(5):
+        bus.publish("ELK-A", "status", b"{}")
+        if n < 2:
+            await fast.receive(1)
+
+    assert slow.closed
+    assert not fast.closed
+    assert bus.metrics()["overflowed"] == 1
+    # The slow stream still sends what it holds before ending
+    assert len(parse_events(await slow.receive(1))) == 3
+
+
+@pytest.mark.anyio
+async def test_firehose_resumes_after_last_event_id():
+    """Test that a reconnecting client gets the events it missed"""
+    bus = EventBus(history=3)
+    ids = [bus.publish(f"ELK-{n}", "status", b"{}") for n in range(5)]
+
+    resumed = bus.subscribe(None, last_event_id=ids[2])
+    assert [event_id for event_id, _, _ in parse_events(await resumed.receive(1))] == ids[3:]
+
+
+@pytest.mark.anyio
+async def test_repository_publishes_status_changes():
+    """Test that cancels and assignments are published, other edits are not"""
+    bus = EventBus()
+    repo = InMemoryBookingRepository(events=bus)
+    await repo.add_many([spread_booking(1), spread_booking(2)])
+    firehose = bus.subscribe(None)
+
+    await repo.update("id-1", additional_notes="Zil çalışmıyor")
+    await repo.cancel("id-1", updated_at=datetime(2024, 1, 2))
+    await repo.assign_technicians({"id-2": "tech-7"}, updated_at=datetime(2024, 1, 2))
+
+    events = [data for _, _, data in parse_events(await firehose.receive(1))]
+    assert events == [
+        {
+            "bookingCode": spread_booking(1).booking_code,
+            "status": "cancelled",
+            "assignedTechnician": None,
+            "estimatedArrival": None,
+            "updatedAt": "2024-01-02T00:00:00",
+        },
+        {
+            "bookingCode": spread_booking(2).booking_code,
+            "status": "confirmed",
+            "assignedTechnician": "tech-7",
+            "estimatedArrival": None,
+            "updatedAt": "2024-01-02T00:00:00",
+        },
+    ]
+
+
+# ============================================
+# ENDPOINT TESTS
+# ============================================
+
+@pytest.mark.anyio
+async def test_booking_stream_sends_state_then_changes(client: AsyncClient, monkeypatch):
+    """Test that a booking's stream starts with its status and follows a cancel"""
+    monkeypatch.setattr(settings, "SSE_MAX_STREAM_SECONDS", 0.3)
+    created = await client.post("/api/v1/bookings", json={
+        "service_category": "ariza",
+        "problem_description": "Mutfaktaki prizlerden yanık kokusu geliyor.",
+        "urgency_level": "normal",
+        "district": "Beyoğlu",
+        "address": "Cihangir Mah. Sıraselviler Cad. No:40",
+        "preferred_date": (date.today() + timedelta(days=45)).isoformat(),
+        "preferred_time_slot": "evening",
+        "customer_name": "Test Müşteri",
+        "customer_phone": "5321234567",
+        "customer_email": "test@example.com",
+    })
+    code = created.json()["bookingCode"]
+
+    stream = asyncio.create_task(client.get(f"/api/v1/bookings/{code}/events"))
+    await asyncio.sleep(0.05)
+    assert (await client.delete(f"/api/v1/bookings/{code}")).status_code == 200
+
+    response = await stream
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert "content-encoding" not in response.headers
+    events = parse_events(response.content)
+    assert [data["status"] for _, _, data in events] == ["pending", "cancelled"]
+    assert {data["bookingCode"] for _, _, data in events} == {code}
+
+
+@pytest.mark.anyio
+async def test_booking_stream_not_found(client: AsyncClient):
+    """Test that unknown booking codes get 404 instead of a stream"""
+    response = await client.get("/api/v1/bookings/ELK-000000-XXXXXX/events")
+    assert response.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_admin_firehose_requires_key(client: AsyncClient, monkeypatch):
+    """Test that the firehose is behind the admin key"""
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "test-admin-key")
+    monkeypatch.setattr(settings, "SSE_MAX_STREAM_SECONDS", 0.05)
+    assert (await client.get("/api/v1/admin/events")).status_code == 401
+
+    response = await client.get("/api/v1/admin/events", headers={"X-Admin-Key": "test-admin-key"})
+    assert response.status_code == 200
+    assert response.content.startswith(b"retry: ")
@@ -0,0 +1,184 @@
+"""
+İsmail Doğan Elektrik API - Slot Hold Tests
+Tests for holding slots during the booking form and consuming holds
+"""
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+
+from app.models import TimeSlot
+from app.repositories import InMemoryBookingRepository
+from app.services.booking_store import BookingStore
+from app.services.holds import SlotHolds
+from tests.conftest import FakeClock, make_booking
+
+
+SLOT = BookingStore.slot_of(make_booking(0))
+
+
+def make_repo(clock: FakeClock, ttl: float = 60) -> InMemoryBookingRepository:
+    repo = InMemoryBookingRepository()
+    repo.holds = SlotHolds(ttl, listener=repo.capacity.track, clock=clock)
+    return repo
+
+
+# ============================================
+# HOLD TABLE TESTS
+# ============================================
+
+def test_holds_expire_in_placement_order():
+    """Test that expiry pops due holds and skips released ones"""
+    clock = FakeClock()
+    changes = []
+    holds = SlotHolds(10, listener=lambda slot, delta: changes.append(delta), clock=clock)
+
+    first = holds.place(SLOT)
+    clock.now = 4
+    second = holds.place(SLOT)
+    third = holds.place(SLOT)
+    holds.release(second.token)
+    assert holds.count(SLOT) == 2
+
+    clock.now = 10
+    assert holds.expire() == [first]
+    assert holds.get(third.token) is third
+
+    clock.now = 14
+    assert holds.expire() == [third]
+    assert holds.count(SLOT) == 0
+    assert len(holds._queue) == 0
+    assert sum(changes) == 0
+
+
+def test_release_unknown_or_expired_hold():
+    """Test that only live holds can be released"""
+    clock = FakeClock()
+    holds = SlotHolds(10, clock=clock)
+    hold = holds.place(SLOT)
+    assert holds.release("missing") is None
+
+    clock.now = 11
+    assert holds.release(hold.token) is None
+    assert len(holds) == 0
+
+
+# ============================================
+# REPOSITORY TESTS
+# ============================================
+
+@pytest.mark.anyio
+async def test_held_place_goes_to_the_hold_owner():
+    """Test that a hold blocks other bookings and is consumed by its owner"""
+    repo = make_repo(FakeClock())
+    hold = await repo.hold_slot(SLOT, capacity=1)
+    assert hold is not None
+    assert await repo.hold_slot(SLOT, capacity=1) is None
+
+    # Someone else loses the slot to the hold
+    assert not await repo.reserve(make_booking(1), capacity=1)
+    # A token for another slot does not help either
+    other = make_booking(2, preferred_time_slot=TimeSlot.EVENING)
+    assert await repo.reserve(other, capacity=1, hold_token=hold.token)
+
+    assert await repo.reserve(make_booking(3), capacity=1, hold_token=hold.token)
+    assert len(repo.holds) == 0
+    assert repo.store.slot_count(*SLOT) == 1
+
+
+@pytest.mark.anyio
+async def test_expired_hold_frees_the_slot():
+    """Test that an expired hold no longer counts, and its token falls back"""
+    clock = FakeClock()
+    repo = make_repo(clock, ttl=60)
+    hold = await repo.hold_slot(SLOT)
+    day = SLOT[0]
+    assert (await repo.remaining_capacity("Kadıköy", day, day))[0, 0] == 0
+
+    clock.now = 61
+    assert (await repo.remaining_capacity("Kadıköy", day, day))[0, 0] == 1
+    assert not await repo.release_hold(hold.token)
+    # The booking is checked like any other, and the slot is free
+    assert await repo.reserve(make_booking(1), hold_token=hold.token)
+    assert (await repo.remaining_capacity("Kadıköy", day, day))[0, 0] == 0
+
+
+@pytest.mark.anyio
+async def test_hold_survives_a_failed_booking_write():
+    """Test that the hold is kept when the booking that consumes it is not persisted"""
+    async def fail(bookings) -> None:
+        raise OSError("disk full")
+
+    repo = make_repo(FakeClock())
+    repo.journal = SimpleNamespace(append_put=fail)
+    hold = await repo.hold_slot(SLOT, capacity=1)
+
+    with pytest.raises(OSError):
+        await repo.reserve(make_booking(1), capacity=1, hold_token=hold.token)
+    assert repo.store.slot_count(*SLOT) == 0
+    assert repo.holds.get(hold.token) is hold
+
+    # Two bookings cannot share one hold within a batch either
+    repo.journal = None
+    assert await repo.reserve_many(
+        [make_booking(2), make_booking(3)], capacity=1, hold_tokens=[hold.token, hold.token]
+    ) == [True, False]
+    assert len(repo.holds) == 0
+
+
+# ============================================
+# ENDPOINT TESTS
+# ============================================
+
+@pytest.mark.anyio
+async def test_hold_then_book_through_api(client: AsyncClient):
+    """Test the booking form flow: hold, competing booking refused, book with token"""
+    day = (date.today() + timedelta(days=70)).isoformat()
+    hold_request = {"district": "Sarıyer", "preferredDate": day, "preferredTimeSlot": "afternoon"}
+    booking = {
+        "serviceCategory": "bakim",
+        "problemDescription": "Yıllık elektrik tesisatı bakımı yapılacak.",
+        "urgencyLevel": "normal",
+        "district": "Sarıyer",
+        "address": "Tarabya Mah. Haydar Aliyev Cad. No:5",
+        "preferredDate": day,
+        "preferredTimeSlot": "afternoon",
+        "customerName": "Test Müşteri",
+        "customerPhone": "5321234567",
+        "customerEmail": "test@example.com",
+    }
+
+    response = await client.post("/api/v1/bookings/holds", json=hold_request)
+    assert response.status_code == 201
+    hold = response.json()
+    assert hold["preferredTimeSlot"] == "afternoon"
+    assert hold["expiresAt"]
+
+    assert (await client.post("/api/v1/bookings/holds", json=hold_request)).status_code == 409
+    assert (await client.post("/api/v1/bookings", json=booking)).status_code == 409
+
+    response = await client.post(
+        "/api/v1/bookings", json={**booking, "holdToken": hold["holdToken"]}
+    )
+    assert response.status_code == 201
+
+    # The hold was used up by the booking
+    response = await client.delete(f"/api/v1/bookings/holds/{hold['holdToken']}")
+    assert response.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_released_hold_frees_slot_through_api(client: AsyncClient):
+    """Test that releasing a hold makes the slot available again"""
+    day = (date.today() + timedelta(days=71)).isoformat()
+    hold_request = {"district": "Sarıyer", "preferredDate": day, "preferredTimeSlot": "morning"}
+
+    token = (await client.post("/api/v1/bookings/holds", json=hold_request)).json()["holdToken"]
+    slots = await client.get(f"/api/v1/bookings/available-slots?date={day}&district=Sarıyer")
+    assert "morning" not in slots.json()["availableSlots"]
+
+    assert (await client.delete(f"/api/v1/bookings/holds/{token}")).status_code == 200
+    slots = await client.get(f"/api/v1/bookings/available-slots?date={day}&district=Sarıyer")
+    assert "morning" in slots.json()["availableSlots"]
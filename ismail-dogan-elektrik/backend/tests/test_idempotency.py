@@ -0,0 +1,215 @@
+"""
+İsmail Doğan Elektrik API - Idempotency Tests
+Tests for Idempotency-Key replay on booking and contact POSTs
+"""
+
+import asyncio
+import time
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.idempotency import (
+    IdempotencyInProgress,
+    IdempotencyKeyReused,
+    MemoryIdempotencyCache,
+    RedisIdempotencyCache,
+    StoredResponse,
+)
+
+
+def booking_payload(district: str, days_ahead: int) -> dict:
+    return {
+        "service_category": "ariza",
+        "problem_description": "Banyodaki aydınlatma ve priz devresi çalışmıyor.",
+        "urgency_level": "normal",
+        "district": district,
+        "address": "Merkez Mah. İstasyon Cad. No:12",
+        "preferred_date": (date.today() + timedelta(days=days_ahead)).isoformat(),
+        "preferred_time_slot": "morning",
+        "customer_name": "Test Müşteri",
+        "customer_phone": "5321234567",
+        "customer_email": "test@example.com",
+    }
+
+
+class FakeRedis:
+    """The few Redis commands the idempotency cache uses, with expiry"""
+
+    def __init__(self) -> None:
+        self.values = {}
+
+    def _live(self, name):
+        value, expires_at = self.values.get(name, (None, 0.0))
+        if value is not None and expires_at <= time.monotonic():
+            del self.values[name]
+            return None
+        return value
+
+    async def set(self, name, value, nx=False, px=None):
+        if nx and self._live(name) is not None:
+            return None
+        self.values[name] = (value, time.monotonic() + px / 1000)
+        return True
+
+    async def get(self, name):
+        return self._live(name)
+
+    async def eval(self, script, numkeys, name, claim, *args):
+        if self._live(name) != claim:
+            return 0
+        if script == RedisIdempotencyCache.RENEW_SCRIPT:
+            self.values[name] = (claim, time.monotonic() + int(args[0]) / 1000)
+        else:
+            del self.values[name]
+        return 1
+
+
+# ============================================
+# CACHE TESTS
+# ============================================
+
+@pytest.mark.anyio
+async def test_cache_waits_for_in_flight_key():
+    """Test that a duplicate waits for the first request's response"""
+    cache = MemoryIdempotencyCache(ttl=60, max_entries=10, wait_timeout=5)
+    assert await cache.begin("k", "fp") is None
+
+    waiter = asyncio.create_task(cache.begin("k", "fp"))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    response = StoredResponse(201, [], b"{}")
+    await cache.complete("k", "fp", response)
+    assert await waiter is response
+
+    with pytest.raises(IdempotencyKeyReused):
+        await cache.begin("k", "other")
+
+
+@pytest.mark.anyio
+async def test_cache_release_lets_retry_run():
+    """Test that a released key is claimed again and old keys are evicted"""
+    cache = MemoryIdempotencyCache(ttl=60, max_entries=2, wait_timeout=5)
+    assert await cache.begin("k", "fp") is None
+    await cache.release("k")
+    assert await cache.begin("k", "fp") is None
+
+    for key in ("a", "b", "c"):
+        await cache.begin(key, "fp")
+    assert len(cache) == 2
+
+
+@pytest.mark.anyio
+async def test_cache_entries_expire():
+    """Test that responses are only replayed within the TTL"""
+    cache = MemoryIdempotencyCache(ttl=0.01, max_entries=10, wait_timeout=5)
+    await cache.begin("k", "fp")
+    await cache.complete("k", "fp", StoredResponse(200, [], b""))
+    await asyncio.sleep(0.02)
+    assert await cache.begin("k", "fp") is None
+
+
+@pytest.mark.anyio
+async def test_redis_claim_outlives_its_lease_while_running():
+    """Test that a running request keeps its key past the lease and only frees its own claim"""
+    redis = FakeRedis()
+    cache = RedisIdempotencyCache(redis, ttl=60, wait_timeout=0.05, lease=0.06)
+    assert await cache.begin("k", "fp", "first") is None
+
+    # Renewed while the first request runs: a retry cannot claim the key
+    await asyncio.sleep(0.2)
+    with pytest.raises(IdempotencyInProgress):
+        await cache.begin("k", "fp", "retry")
+
+    await cache.complete("k", "fp", StoredResponse(201, [], b"{}"), "first")
+    assert (await cache.begin("k", "fp", "retry")).status == 201
+
+
+@pytest.mark.anyio
+async def test_redis_release_leaves_other_claims_alone():
+    """Test that an owner whose lease was lost does not release the new owner's claim"""
+    redis = FakeRedis()
+    cache = RedisIdempotencyCache(redis, ttl=60, wait_timeout=1, lease=60)
+    assert await cache.begin("k", "fp", "first") is None
+
+    # The first claim's lease runs out; another worker claims the key
+    redis.values.clear()
+    other = RedisIdempotencyCache(redis, ttl=60, wait_timeout=1, lease=60)
+    assert await other.begin("k", "fp", "second") is None
+
+    await cache.release("k", "first")
+    assert await redis.get("idempotency:k") is not None
+    await other.release("k", "second")
+    assert await redis.get("idempotency:k") is None
+
+
+# ============================================
+# API TESTS
+# ============================================
+
+@pytest.mark.anyio
+async def test_booking_retry_is_replayed(client: AsyncClient):
+    """Test that a retried booking returns the first booking"""
+    payload = booking_payload("Arnavutköy", 33)
+    headers = {"Idempotency-Key": "booking-retry-1"}
+
+    first = await client.post("/api/v1/bookings", json=payload, headers=headers)
+    assert first.status_code == 201
+    assert "idempotent-replayed" not in first.headers
+
+    retry = await client.post("/api/v1/bookings", json=payload, headers=headers)
+    assert retry.status_code == 201
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+
+    # Without the key the same slot is taken by the first booking
+    again = await client.post("/api/v1/bookings", json=payload)
+    assert again.status_code == 409
+
+
+@pytest.mark.anyio
+async def test_concurrent_duplicates_create_one_booking(client: AsyncClient):
+    """Test that simultaneous retries wait for the first request"""
+    payload = booking_payload("Çatalca", 34)
+    headers = {"Idempotency-Key": "booking-concurrent-1"}
+
+    responses = await asyncio.gather(*(
+        client.post("/api/v1/bookings", json=payload, headers=headers) for _ in range(5)
+    ))
+    assert {r.status_code for r in responses} == {201}
+    assert len({r.json()["id"] for r in responses}) == 1
+    assert sum("idempotent-replayed" in r.headers for r in responses) == 4
+
+
+@pytest.mark.anyio
+async def test_key_reused_with_other_body(client: AsyncClient):
+    """Test that a key cannot be reused for a different request"""
+    headers = {"Idempotency-Key": "booking-reused-1"}
+    first = await client.post(
+        "/api/v1/bookings", json=booking_payload("Silivri", 35), headers=headers
+    )
+    assert first.status_code == 201
+
+    other = await client.post(
+        "/api/v1/bookings", json=booking_payload("Silivri", 36), headers=headers
+    )
+    assert other.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_contact_retry_is_replayed(client: AsyncClient):
+    """Test that the contact form honours the key too"""
+    contact = {
+        "name": "Test Kullanıcı",
+        "email": "test@example.com",
+        "phone": "5321234567",
+        "subject": "Teklif talebi",
+        "message": "Dükkanımız için elektrik tesisatı yenileme teklifi istiyoruz.",
+    }
+    headers = {"Idempotency-Key": "contact-retry-1"}
+    first = await client.post("/api/v1/contact", json=contact, headers=headers)
+    retry = await client.post("/api/v1/contact", json=contact, headers=headers)
+    assert first.status_code == retry.status_code == 200
+    assert retry.headers["idempotent-replayed"] == "true"
@@ -0,0 +1,49 @@
+"""
+İsmail Doğan Elektrik API - Lock Tests
+Tests for the striped asyncio locks used by the booking repository
+"""
+
+import asyncio
+import pytest
+
+from app.services.locks import ShardedLocks
+
+
+@pytest.mark.anyio
+async def test_hold_serialises_read_modify_write():
+    """Test that a critical section with awaits is not interleaved per key"""
+    locks = ShardedLocks(8)
+    counters = {key: 0 for key in range(16)}
+
+    async def increment(key: int) -> None:
+        async with locks.hold([key]):
+            value = counters[key]
+            await asyncio.sleep(0)
+            counters[key] = value + 1
+
+    await asyncio.gather(*(increment(i % 16) for i in range(3200)))
+    assert all(value == 200 for value in counters.values())
+
+
+@pytest.mark.anyio
+async def test_hold_many_keys_does_not_deadlock():
+    """Test overlapping multi-key holds acquired in opposite orders"""
+    locks = ShardedLocks(4)
+
+    async def worker(keys) -> None:
+        async with locks.hold(keys):
+            await asyncio.sleep(0)
+
+    await asyncio.wait_for(
+        asyncio.gather(*(worker([i, i + 1, i + 2][:: 1 if i % 2 else -1]) for i in range(500))),
+        timeout=5,
+    )
+
+
+def test_shard_is_stable():
+    """Test that a key always maps to the same lock"""
+    locks = ShardedLocks(16)
+    assert locks.lock(("2024-01-01", "Kadıköy")) is locks.lock(("2024-01-01", "Kadıköy"))
+    assert len(locks) == 16
+    with pytest.raises(ValueError):
+        ShardedLocks(0)
@@ -0,0 +1,288 @@
+"""
+İsmail Doğan Elektrik API - Price Quote Tests
+Tests for batch quotes, the price matrix and the pricing table cache
+"""
+
+import json
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from app.config import settings
+from app.models import (
+    PriceQuoteRequest,
+    TimeSlot,
+)
+from app.repositories import InMemoryBookingRepository
+from app.routers.services import SERVICES_DATA
+from app.services.pricing import (
+    PricingRulesFile,
+    get_district_multiplier,
+    get_pricing_rules,
+    get_pricing_table,
+    get_urgency_multiplier,
+)
+from tests.conftest import FakeClock, spread_booking
+
+
+def write_rules(path, rules: dict, mtime: int) -> None:
+    """Write a rules file with a distinct modification time"""
+    path.write_text(json.dumps(rules))
+    os.utime(path, (mtime, mtime))
+
+
+def reference_total(service_id: str, district: str, urgency: str) -> float:
+    """The single-quote formula, written out with plain floats"""
+    base_price = next(s["base_price"] for s in SERVICES_DATA if s["id"] == service_id)
+    subtotal = base_price + settings.BASE_LABOR_RATE * 2 + base_price * 0.3
+    total = subtotal * get_urgency_multiplier(urgency) * get_district_multiplier(district)
+    return round(total, 2)
+
+
+# ============================================
+# PRICING TABLE TESTS
+# ============================================
+
+def test_matrix_matches_single_quote_formula():
+    """Test that every cell of the broadcast matrix equals the scalar formula"""
+    table = get_pricing_table(SERVICES_DATA)
+    for s, service_id in enumerate(table.service_ids):
+        for d, district in enumerate(table.districts):
+            for u, urgency in enumerate(table.urgencies):
+                expected = reference_total(service_id, district, urgency)
+                assert table.total_prices[s, d, u] == expected
+
+
+def test_batch_handles_unlisted_districts_and_urgencies():
+    """Test that free-text districts and urgencies price like a single quote"""
+    table = get_pricing_table(SERVICES_DATA)
+    requests = [
+        PriceQuoteRequest(service_id="tesisat", district="Gebze", urgency="emergency"),
+        PriceQuoteRequest(service_id="bakim", district="Kadıköy", urgency="someday"),
+    ]
+    quotes = table.quote_many(requests)
+    assert [q.distance_multiplier for q in quotes] == [1.2, 1.0]
+    assert [q.urgency_multiplier for q in quotes] == [settings.EMERGENCY_MULTIPLIER, 1.0]
+    assert quotes[0].total_price == reference_total("tesisat", "Gebze", "emergency")
+
+
+def test_table_rebuilt_only_when_pricing_changes(monkeypatch):
+    """Test that the cached table survives calls and follows setting changes"""
+    table = get_pricing_table(SERVICES_DATA)
+    assert get_pricing_table(SERVICES_DATA) is table
+
+    monkeypatch.setattr(settings, "URGENT_MULTIPLIER", 1.75)
+    changed = get_pricing_table(SERVICES_DATA)
+    assert changed is not table
+    assert changed.urgency_multipliers[0].tolist() == [1.0, 1.75, settings.EMERGENCY_MULTIPLIER]
+
+    repriced = [{**s, "base_price": s["base_price"] + 100} for s in SERVICES_DATA]
+    assert get_pricing_table(repriced).base_prices[0] == SERVICES_DATA[0]["base_price"] + 100
+
+
+# ============================================
+# PRICING RULES TESTS
+# ============================================
+
+def test_rules_file_compiles_tiers_and_overrides(tmp_path, monkeypatch):
+    """Test that tiers, defaults and per-service overrides reach the prices"""
+    path = tmp_path / "pricing_rules.json"
+    write_rules(path, {
+        "laborRate": 400,
+        "districtTiers": [{"multiplier": 0.9, "districts": ["Kadıköy"]}],
+        "defaultDistrictMultiplier": 1.1,
+        "urgencyMultipliers": {"urgent": 1.25},
+        "services": {"proje": {"laborHours": 5, "materialsRatio": 0, "urgencyMultipliers": {"emergency": 1.0}}},
+    }, mtime=1_000)
+    monkeypatch.setattr(settings, "PRICING_RULES_PATH", str(path))
+
+    rules = get_pricing_rules()
+    assert rules.district_multiplier("Kadıköy") == 0.9
+    assert rules.district_multiplier("Silivri") == 1.1
+    assert rules.urgency_multipliers == {
+        "normal": 1.0, "urgent": 1.25, "emergency": settings.EMERGENCY_MULTIPLIER,
+    }
+
+    table = get_pricing_table(SERVICES_DATA)
+    proje, bakim = table.service_index["proje"], table.service_index["bakim"]
+    assert table.labor_costs[proje] == 2_000
+    assert table.materials_costs[proje] == 0
+    assert table.urgency_multipliers[proje].tolist() == [1.0, 1.25, 1.0]
+    assert table.labor_costs[bakim] == 800
+
+    quote = table.quote(PriceQuoteRequest(service_id="proje", district="Kadıköy", urgency="emergency"))
+    base_price = table.base_prices[proje]
+    assert quote.total_price == round((base_price + 2_000) * 1.0 * 0.9, 2)
+
+
+def test_rules_file_hot_reload(tmp_path):
+    """Test that changes are picked up after the check interval and bad files are ignored"""
+    clock = FakeClock()
+    path = tmp_path / "pricing_rules.json"
+    write_rules(path, {"laborHours": 3}, mtime=1_000)
+    source = PricingRulesFile(str(path), check_interval=5, clock=clock)
+    first = source.current()
+    assert first.labor_hours == 3
+
+    write_rules(path, {"laborHours": 4}, mtime=2_000)
+    clock.now = 1
+    assert source.current() is first
+    clock.now = 5
+    second = source.current()
+    assert second.labor_hours == 4
+    assert source.version == 2
+
+    # Invalid and missing files keep the last good rules
+    write_rules(path, {"laborHours": -1}, mtime=3_000)
+    clock.now = 10
+    assert source.current() is second
+    path.unlink()
+    clock.now = 15
+    assert source.current() is second
+
+
+@pytest.mark.anyio
+async def test_quote_follows_rules_file_without_restart(client: AsyncClient, tmp_path, monkeypatch):
+    """Test that editing the rules file changes quotes on the next request"""
+    path = tmp_path / "pricing_rules.json"
+    write_rules(path, {"laborHours": 2}, mtime=1_000)
+    monkeypatch.setattr(settings, "PRICING_RULES_PATH", str(path))
+    monkeypatch.setattr(settings, "PRICING_RULES_CHECK_SECONDS", 0)
+    item = {"serviceId": "ariza", "district": "Şişli", "urgency": "normal"}
+
+    before = (await client.post("/api/v1/quotes", json=item)).json()
+    write_rules(path, {"laborHours": 3}, mtime=2_000)
+    after = (await client.post("/api/v1/quotes", json=item)).json()
+    assert after["laborCost"] - before["laborCost"] == settings.BASE_LABOR_RATE
+
+
+# ============================================
+# DEMAND TESTS
+# ============================================
+
+@pytest.mark.anyio
+async def test_quotes_follow_district_and_slot_demand(tmp_path, monkeypatch):
+    """Test that bookings raise the demand multiplier and cancellations lower it"""
+    repo = InMemoryBookingRepository()
+    counters = repo.capacity
+    request = PriceQuoteRequest(service_id="ariza", district="Kartal", urgency="normal")
+
+    # Fill the first 8 days of the 14-day window: 24 of 42 places
+    bookings = [spread_booking(n, district="Kartal") for n in range(24)]
+    await repo.add_many(bookings)
+    assert counters.district_occupancy("Kartal") == 24 / 42
+    full = request.model_copy(update={
+        "preferred_date": bookings[0].preferred_date,
+        "preferred_time_slot": bookings[0].preferred_time_slot,
+    })
+    # Without demand steps in the rules file, occupancy does not change prices
+    table = get_pricing_table(SERVICES_DATA)
+    assert [q.demand_multiplier for q in table.quote_many([request, full], counters)] == [1.0, 1.0]
+    base = table.quote(request, counters)
+
+    path = tmp_path / "pricing_rules.json"
+    write_rules(path, {"demandSteps": [
+        {"occupancy": 0.5, "multiplier": 1.1},
+        {"occupancy": 0.8, "multiplier": 1.25},
+        {"occupancy": 1.0, "multiplier": 1.5},
+    ]}, mtime=1_000)
+    monkeypatch.setattr(settings, "PRICING_RULES_PATH", str(path))
+    monkeypatch.setattr(settings, "PRICING_RULES_CHECK_SECONDS", 0)
+    table = get_pricing_table(SERVICES_DATA)
+    busy = table.quote(request, await repo.occupancy_counters())
+    assert busy.demand_multiplier == 1.1
+    assert busy.total_price == round(base.total_price * 1.1, 2)
+
+    # A full slot is priced at the top step, a free one not at all
+    free = request.model_copy(update={
+        "preferred_date": date.today() + timedelta(days=12),
+        "preferred_time_slot": TimeSlot.MORNING,
+    })
+    assert [q.demand_multiplier for q in table.quote_many([full, free], counters)] == [1.5, 1.0]
+
+    await repo.cancel(bookings[0].id, updated_at=datetime.utcnow())
+    assert table.quote(full, counters).demand_multiplier == 1.0
+
+
+@pytest.mark.anyio
+async def test_admin_demand_surface(client: AsyncClient, monkeypatch):
+    """Test that the demand surface is behind the admin key and matches its counters"""
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "test-admin-key")
+    assert (await client.get("/api/v1/admin/demand")).status_code == 401
+
+    response = await client.get(
+        "/api/v1/admin/demand?days=3", headers={"X-Admin-Key": "test-admin-key"}
+    )
+    assert response.status_code == 200
+    surface = response.json()
+    assert surface["districts"] == settings.SERVICE_DISTRICTS
+    assert surface["slots"] == ["morning", "afternoon", "evening"]
+    assert surface["demandDays"] == settings.DEMAND_WINDOW_DAYS
+    assert len(surface["slotOccupancy"]) == 3
+    assert len(surface["multipliers"]) == len(settings.SERVICE_DISTRICTS)
+    for occupancy, multiplier in zip(surface["occupancy"], surface["multipliers"]):
+        assert multiplier == get_pricing_rules().demand_multiplier(occupancy)
+
+
+# ============================================
+# ENDPOINT TESTS
+# ============================================
+
+@pytest.mark.anyio
+async def test_batch_quotes_match_single_quotes(client: AsyncClient):
+    """Test that a batch returns, in order, what single quotes return"""
+    items = [
+        {"serviceId": "ariza", "district": "Şişli", "urgency": "urgent"},
+        {"serviceId": "proje", "district": "Silivri", "urgency": "normal"},
+        {"serviceId": "ariza", "district": "Tuzla", "urgency": "emergency"},
+    ]
+    response = await client.post("/api/v1/quotes/batch", json={"items": items})
+    assert response.status_code == 200
+    batch = response.json()
+    assert batch["total"] == 3
+
+    for item, quote in zip(items, batch["items"]):
+        single = (await client.post("/api/v1/quotes", json=item)).json()
+        assert quote == single
+
+
+@pytest.mark.anyio
+async def test_batch_quotes_unknown_service(client: AsyncClient):
+    """Test that an unknown service fails the batch with 404"""
+    items = [
+        {"serviceId": "ariza", "district": "Şişli", "urgency": "normal"},
+        {"serviceId": "missing", "district": "Şişli", "urgency": "normal"},
+    ]
+    response = await client.post("/api/v1/quotes/batch", json={"items": items})
+    assert response.status_code == 404
+    assert "missing" in response.json()["error"]["message"]
+
+    response = await client.post("/api/v1/quotes/batch", json={"items": []})
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_price_matrix_endpoint(client: AsyncClient):
+    """Test the matrix shape, a cell against a quote, and revalidation"""
+    response = await client.get("/api/v1/quotes/matrix")
+    assert response.status_code == 200
+    matrix = response.json()
+    assert matrix["services"] == [s["id"] for s in SERVICES_DATA]
+    assert matrix["districts"] == settings.SERVICE_DISTRICTS
+    assert matrix["urgencies"] == ["normal", "urgent", "emergency"]
+    assert len(matrix["totalPrices"]) == len(SERVICES_DATA)
+    assert len(matrix["totalPrices"][0]) == len(settings.SERVICE_DISTRICTS)
+
+    s = matrix["services"].index("bakim")
+    d = matrix["districts"].index("Kadıköy")
+    quote = await client.post(
+        "/api/v1/quotes", json={"serviceId": "bakim", "district": "Kadıköy", "urgency": "urgent"}
+    )
+    assert matrix["totalPrices"][s][d][1] == quote.json()["totalPrice"]
+
+    response = await client.get(
+        "/api/v1/quotes/matrix", headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert response.status_code == 304
@@ -0,0 +1,70 @@
+"""
+İsmail Doğan Elektrik API - Repository Tests
+Tests for the booking repository layer
+"""
+
+import asyncio
+import pytest
+from datetime import date, datetime, timedelta
+
+from app.config import settings
+from app.models import (
+    BookingStatus,
+    TimeSlot,
+)
+from app.repositories import (
+    BookingRepository,
+    InMemoryBookingRepository,
+    get_booking_repository,
+)
+from app.repositories.bookings import SqlAlchemyBookingRepository
+from tests.conftest import make_booking
+
+
+@pytest.mark.anyio
+async def test_in_memory_repository_roundtrip():
+    """Test the in-memory repository through the async interface"""
+    repo = InMemoryBookingRepository()
+    for n in range(4):
+        await repo.add(make_booking(n))
+
+    booking = await repo.get_by_code(make_booking(2).booking_code)
+    assert booking.id == "id-2"
+
+    await repo.update("id-2", status=BookingStatus.CANCELLED)
+    assert await repo.count(status=BookingStatus.CANCELLED) == 1
+    assert await repo.booked_slots(date.today() + timedelta(days=1), "Kadıköy") == [TimeSlot.MORNING]
+
+    page = await repo.page(2, district="Kadıköy")
+    assert [b.id for b in page] == ["id-3", "id-2"]
+
+
+def test_repository_dependency_follows_settings(monkeypatch):
+    """Test that BOOKING_BACKEND selects the repository implementation"""
+    assert isinstance(get_booking_repository(), InMemoryBookingRepository)
+
+    monkeypatch.setattr(settings, "BOOKING_BACKEND", "postgres")
+    repo = get_booking_repository()
+    assert isinstance(repo, SqlAlchemyBookingRepository)
+    assert isinstance(repo, BookingRepository)
+    assert get_booking_repository() is repo
+
+
+@pytest.mark.anyio
+async def test_in_memory_reserve_and_cancel_are_atomic():
+    """Test that concurrent reserves fill a slot once and cancels apply once"""
+    repo = InMemoryBookingRepository()
+    results = await asyncio.gather(*(repo.reserve(make_booking(n), capacity=1) for n in range(200)))
+    assert results.count(True) == 1
+    assert await repo.count() == 1
+
+    assert await repo.reserve_many([make_booking(300), make_booking(301)], capacity=3) == [True, True]
+    assert await repo.reserve_many([make_booking(302)], capacity=3) == [False]
+
+    winner = results.index(True)
+    cancels = await asyncio.gather(
+        *(repo.cancel(f"id-{winner}", updated_at=datetime.utcnow()) for _ in range(20))
+    )
+    assert sum(c is not None for c in cancels) == 1
+    assert await repo.count(status=BookingStatus.CANCELLED) == 1
+    assert await repo.reserve(make_booking(400), capacity=3) is True
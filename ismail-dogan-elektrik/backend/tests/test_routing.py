@@ -0,0 +1,95 @@
+"""
+İsmail Doğan Elektrik API - Route Optimization Tests
+Tests for the district travel matrix and the technician route solver
+"""
+
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services import routing
+from app.services.routing import (
+    RouteRequest,
+    district_index,
+    get_travel_matrix,
+    optimize_routes,
+    route_minutes,
+)
+
+
+def line_matrix(points):
+    """Locations on a line, one minute apart per unit"""
+    points = np.asarray(points)
+    return np.abs(points[:, None] - points[None, :]).astype(np.int32)
+
+
+def test_travel_matrix_covers_service_districts():
+    """Test that the matrix is symmetric and reflects the Bosphorus"""
+    matrix = get_travel_matrix()
+    n = len(settings.SERVICE_DISTRICTS)
+    assert matrix.shape == (n, n)
+    assert (matrix == matrix.T).all()
+    assert (matrix > 0).all()
+
+    kadikoy = district_index("Kadıköy")
+    # Üsküdar is next door; Beşiktaş is closer as the crow flies but across the water
+    assert matrix[kadikoy, district_index("Üsküdar")] < matrix[kadikoy, district_index("Beşiktaş")]
+    assert matrix[district_index("Silivri"), district_index("Şile")] == matrix.max()
+
+
+def test_blocks_keep_time_slot_order():
+    """Test that a far stop in an earlier block is still visited first"""
+    matrix = line_matrix([0, 1, 10])
+    (route,), _ = optimize_routes([RouteRequest(0, [1, 2], [1, 0])], matrix=matrix)
+    assert route.order == [1, 0]
+    assert route.travel_minutes == 19
+
+
+def test_closed_route_returns_to_depot():
+    """Test that returning to the depot is part of the travel time"""
+    matrix = line_matrix([0, 3, 1, 2])
+    request = RouteRequest(0, [1, 2, 3], [0, 0, 0])
+    (route,), _ = optimize_routes([request], return_to_depot=True, matrix=matrix)
+    assert route.travel_minutes == 6
+    assert route_minutes(request, route.order, True, matrix) == 6
+
+
+def test_routes_are_close_to_optimal():
+    """Test solver routes against exhaustive search on small days"""
+    matrix = get_travel_matrix()
+    rng = random.Random(7)
+    ratios = []
+    for _ in range(30):
+        stops = [rng.randrange(len(matrix)) for _ in range(6)]
+        request = RouteRequest(rng.randrange(len(matrix)), stops, [0] * 6)
+        (route,), _ = optimize_routes([request], matrix=matrix)
+
+        assert sorted(route.order) == list(range(6))
+        assert route_minutes(request, route.order, matrix=matrix) == route.travel_minutes
+        best = min(
+            route_minutes(request, order, matrix=matrix)
+            for order in itertools.permutations(range(6))
+        )
+        ratios.append(route.travel_minutes / best)
+
+    # Local search can stop short of the optimum, but not by much
+    assert max(ratios) <= 1.2
+    assert sum(ratios) / len(ratios) <= 1.02
+
+
+def test_python_fallback_when_engine_disabled(monkeypatch):
+    """Test that the Python solver serves calls when the engine is off"""
+    monkeypatch.setattr(routing.settings, "RUST_ENGINE_ENABLED", False)
+    routes, engine = optimize_routes([RouteRequest(None, [3, 1, 2], [0, 0, 0])])
+    assert engine == "python"
+    assert len(routes[0].order) == 3
+
+
+def test_location_outside_matrix_is_rejected():
+    """Test that invalid locations raise before solving"""
+    matrix = line_matrix([0, 1])
+    with pytest.raises(ValueError):
+        optimize_routes([RouteRequest(None, [0, 5], [0, 0])], matrix=matrix)
@@ -0,0 +1,106 @@
+"""
+İsmail Doğan Elektrik API - Rust Binding Tests
+Tests for the elektrik_engine module bridge and its Python fallback
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+
+from app.config import settings
+from app.services import rust_binding
+from app.services.rust_binding import (
+    _python_calculate_load,
+    calculate_electrical_load,
+    get_engine_info,
+)
+
+
+DEVICES = [
+    {"name": "Klima", "power_watts": 2500, "quantity": 2, "usage_hours_per_day": 8, "power_factor": 0.9},
+    {"name": "Fırın", "power_watts": 3000, "quantity": 1, "usage_hours_per_day": 2, "power_factor": 1.0},
+]
+
+
+def fake_engine(calls):
+    """A stand-in for the PyO3 module that records its arguments"""
+    def calculate(devices, circuit_type, voltage_level, safety_factor, electricity_price):
+        calls.append((devices, circuit_type, voltage_level, safety_factor, electricity_price))
+        return dict(_python_calculate_load(DEVICES, circuit_type, voltage_level, safety_factor))
+
+    return SimpleNamespace(calculate_electrical_load=calculate, version=lambda: "9.9.9")
+
+
+# ============================================
+# ENGINE SELECTION TESTS
+# ============================================
+
+def test_python_fallback_when_engine_missing_or_disabled(monkeypatch):
+    """Test that the Python implementation serves calls without the module"""
+    monkeypatch.setattr(rust_binding, "elektrik_engine", None)
+    result, engine = calculate_electrical_load(DEVICES, "single_phase", 220, 1.2)
+    assert engine == "python"
+    assert result == _python_calculate_load(DEVICES, "single_phase", 220, 1.2)
+
+    monkeypatch.setattr(rust_binding, "elektrik_engine", fake_engine([]))
+    monkeypatch.setattr(settings, "RUST_ENGINE_ENABLED", False)
+    assert calculate_electrical_load(DEVICES, "single_phase", 220, 1.2)[1] == "python"
+
+
+def test_rust_engine_gets_typed_inputs(monkeypatch):
+    """Test that devices go to the module as typed tuples with the configured price"""
+    calls = []
+    monkeypatch.setattr(rust_binding, "elektrik_engine", fake_engine(calls))
+    monkeypatch.setattr(settings, "RUST_ENGINE_ENABLED", True)
+    monkeypatch.setattr(settings, "ELECTRICITY_PRICE_PER_KWH", 3.5)
+    before = get_engine_info()["calls"]["rust"]
+
+    result, engine = calculate_electrical_load(DEVICES, "three_phase", 380, 1.25)
+    assert engine == "rust"
+    assert result["recommended_breaker_amps"] > 0
+
+    [(devices, circuit_type, voltage, factor, price)] = calls
+    assert devices == [(2500.0, 2, 8.0, 0.9), (3000.0, 1, 2.0, 1.0)]
+    assert type(devices[0][1]) is int and type(devices[0][0]) is float
+    assert (circuit_type, voltage, factor, price) == ("three_phase", 380.0, 1.25, 3.5)
+
+    info = get_engine_info()
+    assert info["rust_available"] and info["rust_version"] == "9.9.9"
+    assert info["calls"]["rust"] == before + 1
+
+
+def test_python_fallback_when_engine_fails(monkeypatch):
+    """Test that an engine error falls back to Python instead of failing the call"""
+    def broken(*args):
+        raise ValueError("Unknown circuit type")
+
+    monkeypatch.setattr(rust_binding, "elektrik_engine", SimpleNamespace(calculate_electrical_load=broken))
+    monkeypatch.setattr(settings, "RUST_ENGINE_ENABLED", True)
+    result, engine = calculate_electrical_load(DEVICES, "single_phase", 220, 1.2)
+    assert engine == "python"
+    assert result["total_load_kw"] > 0
+
+
+# ============================================
+# ENDPOINT TESTS
+# ============================================
+
+@pytest.mark.anyio
+async def test_load_endpoint_reports_engine(client: AsyncClient, monkeypatch):
+    """Test that the load calculation response names the engine that served it"""
+    body = {
+        "devices": DEVICES,
+        "circuit_type": "single_phase",
+        "voltage_level": 220,
+        "safety_factor": 1.2,
+    }
+    monkeypatch.setattr(rust_binding, "elektrik_engine", None)
+    response = await client.post("/api/v1/calculations/load", json=body)
+    assert response.status_code == 200
+    assert response.json()["engine"] == "python"
+
+    monkeypatch.setattr(rust_binding, "elektrik_engine", fake_engine([]))
+    monkeypatch.setattr(settings, "RUST_ENGINE_ENABLED", True)
+    response = await client.post("/api/v1/calculations/load", json=body)
+    assert response.json()["engine"] == "rust"
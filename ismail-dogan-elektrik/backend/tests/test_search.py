@@ -0,0 +1,170 @@
+"""
+İsmail Doğan Elektrik API - Search Tests
+Tests for Turkish folding, the trigram index and the search endpoint
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from app.config import settings
+from app.models import BookingStatus
+from app.services.booking_store import BookingStore
+from app.services.search import TrigramIndex, fold, phone_digits, trigrams
+from tests.conftest import make_booking
+
+
+# ============================================
+# FOLDING TESTS
+# ============================================
+
+def test_fold_is_turkish_aware():
+    """Test that dotted and dotless I fold the Turkish way, diacritics dropped"""
+    assert fold("IŞIK") == fold("ışık") == fold("isik") == "isik"
+    assert fold("İSTANBUL") == "istanbul"
+    assert fold("Çağrı Öztürk, Üsküdar/Şile") == "cagri ozturk uskudar sile"
+    assert phone_digits("+90 (532) 123-45-67") == phone_digits("0532 123 45 67") == "5321234567"
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+# ============================================
+# INDEX TESTS
+# ============================================
+
+def test_index_lookup_counts_shared_trigrams():
+    """Test that lookups rank by shared trigrams and skip removed documents"""
+    index = TrigramIndex()
+    index.add("a", trigrams("kadikoy"))
+    index.add("b", trigrams("kadir"))
+    index.add("c", trigrams("moda"))
+
+    grams = trigrams("kadikoy")
+    found = index.lookup(grams, 3, 10)
+    assert [key for key, _ in found] == ["a", "b"]
+    assert found[0][1] == len(grams)
+
+    index.remove("a")
+    assert [key for key, _ in index.lookup(grams, 3, 10)] == ["b"]
+    assert index.lookup(grams, 3, 0) == []
+
+
+def test_index_compacts_removed_documents():
+    """Test that compaction renumbers live documents without losing any"""
+    index = TrigramIndex()
+    for n in range(100):
+        index.add(f"k{n}", trigrams(f"ad{n:03d}"))
+    for n in range(60):
+        index.remove(f"k{n}")
+
+    assert len(index) == 40
+    assert len(index._keys) < 60
+    assert index.lookup(trigrams("ad007"), 5, 5) == []
+    assert index.lookup(trigrams("ad077"), 6, 5) == [("k77", 6)]
+
+
+# ============================================
+# STORE SEARCH TESTS
+# ============================================
+
+def test_store_search_fields_and_typos():
+    """Test that codes, names, phones and addresses match, typos included"""
+    store = BookingStore()
+    for n in range(50):
+        store.add(make_booking(n, address=f"Moda Caddesi No:{n}", customer_phone=f"0532 {n:07d}"))
+    store.add(make_booking(100, customer_name="Ahmet Yılmaz", address="Bağdat Caddesi No:5"))
+
+    [match] = store.search("ahmet yilmaz", 5)
+    assert (match.booking.id, match.field, match.score) == ("id-100", "customerName", 1.0)
+    assert store.search("Ahmte Yılmaz", 5)[0].booking.id == "id-100"
+    assert store.search("BAĞDAT", 5)[0].field == "address"
+
+    match = store.search("+90 532 000 0042", 5)[0]
+    assert (match.booking.id, match.field) == ("id-42", "customerPhone")
+    match = store.search("elk-240101-00002a", 5)[0]
+    assert (match.booking.id, match.field) == ("id-42", "bookingCode")
+
+    assert store.search("zzzz", 5) == []
+    assert len(store.search("moda caddesi", 10)) == 10
+
+
+def test_store_search_index_follows_writes():
+    """Test that bookings added, changed and removed after the first search are found"""
+    store = BookingStore()
+    store.add(make_booking(1, customer_name="Zeynep Arslan"))
+    assert store.search("zeynep", 5)[0].booking.id == "id-1"
+
+    store.add(make_booking(2, customer_name="Zeynep Kaplan"))
+    assert {m.booking.id for m in store.search("zeynep", 5)} == {"id-1", "id-2"}
+
+    store.update("id-1", customer_name="Elif Arslan")
+    assert [m.booking.id for m in store.search("zeynep", 5)] == ["id-2"]
+    assert store.search("elif", 5)[0].booking.id == "id-1"
+
+    # Changes outside the searched fields do not re-index
+    store.update("id-2", status=BookingStatus.CONFIRMED)
+    store.delete("id-1")
+    assert store.search("elif", 5) == []
+
+    store.clear()
+    assert store.search("zeynep", 5) == []
+
+
+def test_store_search_index_builds_in_slices():
+    """Test that writes between build steps are neither lost nor duplicated"""
+    store = BookingStore()
+    for n in range(10):
+        store.add(make_booking(n))
+
+    assert not store.index_for_search(4)
+    store.update("id-8", customer_name="Kemal Sunal")
+    store.delete("id-9")
+    store.add(make_booking(10, customer_name="Kemal Tahir"))
+    while not store.index_for_search(4):
+        pass
+
+    assert len(store._search_index) == 10
+    assert store.search("kemal sunal", 5)[0].booking.id == "id-8"
+    assert store.search("musteri 9", 5)[0].booking.id != "id-9"
+
+
+# ============================================
+# ENDPOINT TESTS
+# ============================================
+
+@pytest.mark.anyio
+async def test_search_endpoint(client: AsyncClient, monkeypatch):
+    """Test that search is behind the admin key and finds bookings and services"""
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "test-admin-key")
+    headers = {"X-Admin-Key": "test-admin-key"}
+    assert (await client.get("/api/v1/search", params={"q": "ariza"})).status_code == 401
+
+    response = await client.post("/api/v1/bookings", json={
+        "service_category": "ariza",
+        "problem_description": "Mutfaktaki prizlerden kıvılcım çıkıyor.",
+        "urgency_level": "normal",
+        "district": "Beşiktaş",
+        "address": "Ihlamurdere Cad. No:12",
+        "preferred_date": (date.today() + timedelta(days=43)).isoformat(),
+        "preferred_time_slot": "morning",
+        "customer_name": "Işıl Güneşdoğdu",
+        "customer_phone": "5559876543",
+        "customer_email": "isil@example.com",
+    })
+    assert response.status_code == 201
+    booking = response.json()
+
+    response = await client.get("/api/v1/search", params={"q": "isil gunesdogdu"}, headers=headers)
+    assert response.status_code == 200
+    hits = response.json()["items"]
+    assert hits[0]["kind"] == "booking"
+    assert hits[0]["id"] == booking["id"]
+    assert hits[0]["title"] == booking["bookingCode"]
+    assert hits[0]["matchedField"] == "customerName"
+
+    response = await client.get("/api/v1/search", params={"q": "ARIZA TESPİT"}, headers=headers)
+    hits = response.json()["items"]
+    assert {"kind": "service", "id": "ariza", "matchedField": "name"}.items() <= hits[0].items()
+
+    response = await client.get("/api/v1/search", params={"q": "x"}, headers=headers)
+    assert response.status_code == 422
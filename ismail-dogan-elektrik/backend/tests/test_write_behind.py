@@ -0,0 +1,154 @@
+"""
+İsmail Doğan Elektrik API - Write-Behind Tests
+Tests for batched background persistence of bookings
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.models import BookingStatus
+from app.repositories import WriteBehindBookingRepository
+from app.repositories.bookings import default_capacity_matrix
+from app.services.write_behind import WriteBehindQueue
+from tests.conftest import spread_booking
+
+
+class FakeDatabase:
+    """Stands in for SqlAlchemyBookingRepository: records what is written"""
+
+    def __init__(self, stored=(), fail=0, delay=0.0):
+        self.capacity = default_capacity_matrix()
+        self.stored = {b.id: b for b in stored}
+        self.batches = []
+        self.fail = fail
+        self.delay = delay
+
+    async def write_back(self, new, changed):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError("database unavailable")
+        self.batches.append(([b.id for b in new], [(b.id, set(f)) for b, f in changed]))
+        for booking in new:
+            self.stored.setdefault(booking.id, booking)
+
+    async def stream(self, chunk_size=1000):
+        for booking in self.stored.values():
+            yield booking
+
+
+# ============================================
+# QUEUE TESTS
+# ============================================
+
+@pytest.mark.anyio
+async def test_queue_batches_by_size_and_coalesces_changes():
+    """Test that a full batch is written at once and changes are merged"""
+    db = FakeDatabase()
+    queue = WriteBehindQueue(db.write_back, batch_size=4, interval=60)
+    await queue.start()
+
+    bookings = [spread_booking(n) for n in range(4)]
+    queue.mark_new(bookings[:3])
+    queue.mark_changed(bookings[0], ["status"])
+    queue.mark_changed(bookings[3], ["status"])
+    queue.mark_changed(bookings[3], ["assigned_technician"])
+
+    # Four dirty bookings fill a batch long before the interval
+    await asyncio.wait_for(queue.wait_below(1), 1)
+    assert db.batches == [
+        (["id-0", "id-1", "id-2"], [("id-3", {"status", "assigned_technician"})])
+    ]
+    await queue.close()
+
+
+@pytest.mark.anyio
+async def test_queue_flushes_partial_batch_after_interval():
+    """Test that a lone change is written once the interval passes"""
+    db = FakeDatabase()
+    queue = WriteBehindQueue(db.write_back, batch_size=100, interval=0.05)
+    await queue.start()
+    queue.mark_new([spread_booking(1)])
+    assert queue.metrics()["pending"] == 1
+
+    await asyncio.sleep(0.2)
+    assert db.batches == [(["id-1"], [])]
+    assert queue.metrics()["pending"] == 0
+    assert queue.metrics()["rows_flushed"] == 1
+    await queue.close()
+
+
+@pytest.mark.anyio
+async def test_queue_retries_failed_batches():
+    """Test that failed flushes are retried without losing later changes"""
+    db = FakeDatabase(fail=2)
+    queue = WriteBehindQueue(db.write_back, batch_size=1, interval=0, max_backoff=0.05)
+    await queue.start()
+    booking = spread_booking(1)
+    queue.mark_new([booking])
+    queue.mark_changed(booking, ["status"])
+
+    await asyncio.wait_for(queue.wait_below(1), 2)
+    assert queue.metrics()["failures"] == 2
+    assert queue.metrics()["consecutive_failures"] == 0
+    # Still one insert: the change was merged into the pending insert
+    assert db.batches == [(["id-1"], [])]
+    await queue.close()
+
+
+@pytest.mark.anyio
+async def test_close_writes_everything_queued():
+    """Test that shutdown drains the queue"""
+    db = FakeDatabase()
+    queue = WriteBehindQueue(db.write_back, batch_size=2, interval=60)
+    await queue.start()
+    queue.mark_new([spread_booking(n) for n in range(5)])
+    await queue.close()
+    assert len(db.stored) == 5
+    assert len(queue) == 0
+
+
+# ============================================
+# REPOSITORY TESTS
+# ============================================
+
+@pytest.mark.anyio
+async def test_repository_answers_before_database_commit():
+    """Test that reservations return without waiting for the database"""
+    loaded = spread_booking(0, created_at=datetime(2023, 12, 31))
+    db = FakeDatabase(stored=[loaded], delay=0.2)
+    repo = WriteBehindBookingRepository(db, batch_size=100, interval=0.01)
+    assert await repo.load() == 1
+    await repo.start()
+
+    started = asyncio.get_running_loop().time()
+    results = await repo.reserve_many([spread_booking(n) for n in range(1, 7)], capacity=1)
+    assert asyncio.get_running_loop().time() - started < 0.1
+    assert results == [True] * 6
+
+    # The loaded booking holds its slot
+    assert not await repo.reserve(spread_booking(100, preferred_date=loaded.preferred_date), capacity=1)
+
+    await repo.update("id-1", status=BookingStatus.CONFIRMED)
+    assert (await repo.get_by_code(spread_booking(1).booking_code)).status == BookingStatus.CONFIRMED
+    assert repo.flush_metrics()["pending"] > 0
+
+    await repo.close()
+    assert len(db.stored) == 7
+    assert repo.flush_metrics()["pending"] == 0
+
+
+@pytest.mark.anyio
+async def test_repository_waits_when_backlog_is_full():
+    """Test that writes fall back to the database's pace beyond max_pending"""
+    db = FakeDatabase(delay=0.05)
+    repo = WriteBehindBookingRepository(db, batch_size=2, interval=0, max_pending=2)
+    await repo.start()
+
+    for n in range(6):
+        await repo.add(spread_booking(n))
+        assert len(repo.queue) <= 2
+    await repo.close()
+    assert len(db.stored) == 6
@@ -96,6 +96,23 @@ CREATE INDEX idx_bookings_customer ON bookings(customer_id);
 CREATE INDEX idx_bookings_status ON bookings(status);
 CREATE INDEX idx_bookings_date ON bookings(preferred_date);
 CREATE INDEX idx_bookings_district ON bookings(district);
+CREATE INDEX idx_bookings_created ON bookings(created_at DESC, id DESC);
+-- Dispatch queue: pending bookings still waiting for a technician
+CREATE INDEX idx_bookings_unassigned ON bookings(preferred_date, created_at)
+    WHERE status = 'pending' AND assigned_technician IS NULL;
+
+-- Slot holds: a place kept free while a customer completes the booking form
+CREATE TABLE slot_holds (
+    token UUID PRIMARY KEY,
+    preferred_date DATE NOT NULL,
+    district VARCHAR(50) NOT NULL,
+    preferred_time_slot time_slot NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+CREATE INDEX idx_slot_holds_slot ON slot_holds(preferred_date, district, preferred_time_slot);
+-- Expired holds are deleted from the front of this index
+CREATE INDEX idx_slot_holds_expires ON slot_holds(expires_at);
 
 -- Booking photos
 CREATE TABLE booking_photos (
@@ -176,9 +193,23 @@ CREATE TABLE technicians (
     email VARCHAR(255),
     specialization service_category[],
     is_active BOOLEAN DEFAULT TRUE,
+    rating REAL DEFAULT 5.0,
+    total_jobs INTEGER DEFAULT 0,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Weekly technician shifts: one row per district, weekday (0 = Monday) and time slot
+CREATE TABLE technician_shifts (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    technician_id UUID NOT NULL REFERENCES technicians(id) ON DELETE CASCADE,
+    district VARCHAR(50) NOT NULL,
+    weekday SMALLINT NOT NULL CHECK (weekday BETWEEN 0 AND 6),
+    time_slot time_slot NOT NULL,
+    UNIQUE (technician_id, weekday, time_slot)
+);
+
+CREATE INDEX idx_technician_shifts_technician ON technician_shifts(technician_id);
+
 -- Audit log
 CREATE TABLE audit_log (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -210,17 +241,50 @@ END;
 $$ LANGUAGE plpgsql;
 
 -- Booking code generator function
+-- Same ELK-YYMMDD-WWTTTTTT format as the API (app/services/booking_codes.py).
+-- Uses the reserved worker id ZZ, which API workers never take, with a
+-- sequence as the counter, so codes are unique without a lookup.
+CREATE SEQUENCE booking_code_seq MINVALUE 0 MAXVALUE 1073741823 START 0 CYCLE;
+
 CREATE OR REPLACE FUNCTION generate_booking_code()
 RETURNS TEXT AS $$
 DECLARE
-    code TEXT;
+    alphabet CONSTANT TEXT := '0123456789ABCDEFGHJKMNPQRSTVWXYZ';
+    n BIGINT := nextval('booking_code_seq');
+    suffix TEXT := '';
 BEGIN
-    code := 'ELK-' || TO_CHAR(CURRENT_DATE, 'YYMMDD') || '-' || 
-            UPPER(SUBSTRING(MD5(RANDOM()::TEXT) FROM 1 FOR 6));
-    RETURN code;
+    FOR i IN 1..6 LOOP
+        suffix := SUBSTRING(alphabet FROM (n % 32)::INT + 1 FOR 1) || suffix;
+        n := n / 32;
+    END LOOP;
+    RETURN 'ELK-' || TO_CHAR(CURRENT_DATE, 'YYMMDD') || '-ZZ' || suffix;
 END;
 $$ LANGUAGE plpgsql;
 
+-- Search folding, the same as fold() and phone_digits() in the API
+-- (app/services/search.py): Turkish I/İ casing and diacritics folded away,
+-- phone numbers reduced to their national digits
+CREATE OR REPLACE FUNCTION search_fold(value TEXT)
+RETURNS TEXT AS $$
+    SELECT lower(translate(value, 'İIıÇçĞğÖöŞşÜüÂâÎîÛû', 'iiiccggoossuuaaiiuu'));
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE OR REPLACE FUNCTION search_digits(value TEXT)
+RETURNS TEXT AS $$
+    SELECT ltrim(CASE WHEN length(d) > 10 AND d LIKE '90%' THEN substr(d, 3) ELSE d END, '0')
+    FROM (SELECT regexp_replace(value, '\D', '', 'g') AS d) AS digits;
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- ============================================
+-- SEARCH INDEXES
+-- ============================================
+
+-- GET /search matches word_similarity (<%) on the folded columns
+CREATE INDEX idx_bookings_code_trgm ON bookings USING gin (search_fold(booking_code) gin_trgm_ops);
+CREATE INDEX idx_bookings_address_trgm ON bookings USING gin (search_fold(address) gin_trgm_ops);
+CREATE INDEX idx_customers_name_trgm ON customers USING gin (search_fold(name) gin_trgm_ops);
+CREATE INDEX idx_customers_phone_trgm ON customers USING gin (search_digits(phone) gin_trgm_ops);
+
 -- ============================================
 -- TRIGGERS
 -- ============================================
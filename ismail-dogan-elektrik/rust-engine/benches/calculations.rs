@@ -3,7 +3,10 @@
 //! Run with: cargo bench
 
 use criterion::{black_box, criterion_group, criterion_main, Criterion};
-use elektrik_engine::{calculate_load, CircuitType, Device, LoadCalculationInput};
+use elektrik_engine::{
+    calculate_load, solve_routes, CircuitType, Device, LoadCalculationInput, RouteRequest,
+    TravelMatrix,
+};
 
 fn create_test_devices(count: usize) -> Vec<Device> {
     (0..count)
@@ -118,11 +121,39 @@ fn benchmark_industrial_load(c: &mut Criterion) {
     });
 }
 
+fn benchmark_routes(c: &mut Criterion) {
+    // 39 districts on a pseudo-random grid, 60 technicians with 12 stops each
+    let points: Vec<(i64, i64)> = (0..39).map(|i| ((i * 37) % 61, (i * 53) % 47)).collect();
+    let rows = points
+        .iter()
+        .map(|a| {
+            points
+                .iter()
+                .map(|b| ((a.0 - b.0).abs() + (a.1 - b.1).abs()) as u32)
+                .collect()
+        })
+        .collect();
+    let matrix = TravelMatrix::new(rows).unwrap();
+    let requests: Vec<RouteRequest> = (0..60)
+        .map(|t| RouteRequest {
+            depot: Some(t % 39),
+            stops: (0..12).map(|s| (t * 7 + s * 11) % 39).collect(),
+            blocks: (0..12).map(|s| (s % 3) as u32).collect(),
+            return_to_depot: false,
+        })
+        .collect();
+
+    c.bench_function("routes_60_technicians_12_stops", |b| {
+        b.iter(|| solve_routes(black_box(&matrix), black_box(&requests)))
+    });
+}
+
 criterion_group!(
     benches,
     benchmark_small_load,
     benchmark_medium_load,
     benchmark_large_load,
-    benchmark_industrial_load
+    benchmark_industrial_load,
+    benchmark_routes
 );
 criterion_main!(benches);
@@ -8,17 +8,22 @@
 //! - Breaker selection
 //! - Safety assessments
 //! - Energy consumption estimates
+//! - Technician route optimization
 //!
 //! ## Architecture
 //!
 //! The library is designed to be called from Python via PyO3 bindings,
 //! providing significant performance improvements for complex calculations.
 
+use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
 use pyo3::types::PyDict;
 use rayon::prelude::*;
 use serde::{Deserialize, Serialize};
-use std::collections::HashMap;
+
+pub mod routing;
+
+pub use routing::{solve_route, solve_routes, validate_request, Route, RouteRequest, TravelMatrix};
 
 // ============================================
 // CONSTANTS
@@ -43,7 +48,7 @@ const CABLE_SECTIONS: &[(f64, f64)] = &[
     (120.0, 240.0),
 ];
 
-/// Electricity price per kWh (TRY)
+/// Default electricity price per kWh (TRY); the API passes its configured price
 const ELECTRICITY_PRICE: f64 = 3.5;
 
 /// Safety thresholds
@@ -94,6 +99,12 @@ pub struct LoadCalculationInput {
     pub circuit_type: CircuitType,
     pub voltage_level: f64,
     pub safety_factor: f64,
+    #[serde(default = "default_electricity_price")]
+    pub electricity_price: f64,
+}
+
+fn default_electricity_price() -> f64 {
+    ELECTRICITY_PRICE
 }
 
 /// Result of load calculation
@@ -201,19 +212,19 @@ fn assess_safety(
     
     let load_factor = current_amps / breaker_amps as f64;
     
-    // Check load factor thresholds
+    // Check load factor thresholds (same messages as the API's Python fallback)
+    if load_factor > LOAD_WARNING_THRESHOLD {
+        status = SafetyStatus::Warning;
+        warnings.push("Sistem kapasitesi yüksek kullanım seviyesinde (%80+)".to_string());
+        recommendations
+            .push("Daha yüksek kapasiteli sigorta ve kablo kullanımı önerilir".to_string());
+    }
+
     if load_factor > LOAD_DANGER_THRESHOLD {
         status = SafetyStatus::Danger;
         warnings.push("KRİTİK: Sistem aşırı yüklü durumda".to_string());
         warnings.push("Aşırı ısınma ve yangın riski mevcut".to_string());
         recommendations.push("ACİL: Elektrik sistemini yeniden boyutlandırın".to_string());
-    } else if load_factor > LOAD_WARNING_THRESHOLD {
-        status = SafetyStatus::Warning;
-        warnings.push(format!(
-            "Sistem kapasitesi yüksek kullanım seviyesinde ({:.0}%)",
-            load_factor * 100.0
-        ));
-        recommendations.push("Daha yüksek kapasiteli sigorta ve kablo kullanımı önerilir".to_string());
     }
     
     // High load recommendations
@@ -257,7 +268,7 @@ pub fn calculate_load(input: LoadCalculationInput) -> LoadCalculationResult {
     
     // Calculate energy consumption
     let monthly_kwh = calculate_monthly_energy(&input.devices);
-    let monthly_cost = monthly_kwh * ELECTRICITY_PRICE;
+    let monthly_cost = monthly_kwh * input.electricity_price;
     
     // Assess safety
     let (safety_status, warnings, recommendations) =
@@ -281,71 +292,115 @@ pub fn calculate_load(input: LoadCalculationInput) -> LoadCalculationResult {
 // ============================================
 
 /// Calculate electrical load from Python
+///
+/// `devices` holds one `(power_watts, quantity, usage_hours_per_day,
+/// power_factor)` tuple per device, converted once at the boundary; the
+/// calculation itself runs with the GIL released.
 #[pyfunction]
-#[pyo3(signature = (devices, circuit_type, voltage_level, safety_factor=1.2))]
+#[pyo3(signature = (
+    devices,
+    circuit_type,
+    voltage_level,
+    safety_factor = 1.2,
+    electricity_price = ELECTRICITY_PRICE,
+))]
 fn calculate_electrical_load(
     py: Python,
-    devices: Vec<HashMap<String, PyObject>>,
+    devices: Vec<(f64, u32, f64, f64)>,
     circuit_type: &str,
     voltage_level: f64,
     safety_factor: f64,
+    electricity_price: f64,
 ) -> PyResult<PyObject> {
-    // Parse devices
-    let parsed_devices: Vec<Device> = devices
-        .iter()
-        .map(|d| {
-            Device {
-                name: d.get("name")
-                    .and_then(|v| v.extract::<String>(py).ok())
-                    .unwrap_or_default(),
-                power_watts: d.get("power_watts")
-                    .and_then(|v| v.extract::<f64>(py).ok())
-                    .unwrap_or(0.0),
-                quantity: d.get("quantity")
-                    .and_then(|v| v.extract::<u32>(py).ok())
-                    .unwrap_or(1),
-                usage_hours_per_day: d.get("usage_hours_per_day")
-                    .and_then(|v| v.extract::<f64>(py).ok())
-                    .unwrap_or(8.0),
-                power_factor: d.get("power_factor")
-                    .and_then(|v| v.extract::<f64>(py).ok())
-                    .unwrap_or(0.9),
-            }
-        })
-        .collect();
-    
-    // Parse circuit type
     let circuit = match circuit_type {
+        "single_phase" => CircuitType::SinglePhase,
         "three_phase" => CircuitType::ThreePhase,
-        _ => CircuitType::SinglePhase,
+        other => {
+            return Err(PyValueError::new_err(format!(
+                "Unknown circuit type: {}",
+                other
+            )))
+        }
     };
-    
-    // Create input
+
     let input = LoadCalculationInput {
-        devices: parsed_devices,
+        devices: devices
+            .into_iter()
+            .map(
+                |(power_watts, quantity, usage_hours_per_day, power_factor)| Device {
+                    name: String::new(),
+                    power_watts,
+                    quantity,
+                    usage_hours_per_day,
+                    power_factor,
+                },
+            )
+            .collect(),
         circuit_type: circuit,
         voltage_level,
         safety_factor,
+        electricity_price,
     };
-    
-    // Calculate
-    let result = calculate_load(input);
-    
+
+    // Calculate without holding the GIL
+    let result = py.allow_threads(|| calculate_load(input));
+
     // Convert to Python dict
-    let dict = PyDict::new(py);
+    let dict = PyDict::new_bound(py);
     dict.set_item("total_load_kw", result.total_load_kw)?;
     dict.set_item("total_current_amps", result.total_current_amps)?;
     dict.set_item("recommended_breaker_amps", result.recommended_breaker_amps)?;
-    dict.set_item("recommended_cable_section", result.recommended_cable_section)?;
+    dict.set_item(
+        "recommended_cable_section",
+        result.recommended_cable_section,
+    )?;
     dict.set_item("monthly_consumption_kwh", result.monthly_consumption_kwh)?;
     dict.set_item("estimated_monthly_cost", result.estimated_monthly_cost)?;
-    dict.set_item("safety_status", format!("{:?}", result.safety_status).to_lowercase())?;
+    dict.set_item(
+        "safety_status",
+        format!("{:?}", result.safety_status).to_lowercase(),
+    )?;
     dict.set_item("warnings", result.warnings)?;
     dict.set_item("recommendations", result.recommendations)?;
-    
+
     Ok(dict.into())
 }
 
+/// Order technicians' daily visits from Python
+///
+/// `routes` holds one `(depot, stops, blocks)` tuple per technician day,
+/// with locations as indices into `matrix`. Returns `(order, minutes)` per
+/// route, `order` indexing into that route's stops. Routes are solved in
+/// parallel with the GIL released.
+#[pyfunction]
+#[pyo3(signature = (matrix, routes, return_to_depot=false))]
+fn optimize_routes(
+    py: Python,
+    matrix: Vec<Vec<u32>>,
+    routes: Vec<(Option<usize>, Vec<usize>, Vec<u32>)>,
+    return_to_depot: bool,
+) -> PyResult<Vec<(Vec<usize>, u32)>> {
+    let matrix = TravelMatrix::new(matrix).map_err(PyValueError::new_err)?;
+    let requests: Vec<RouteRequest> = routes
+        .into_iter()
+        .map(|(depot, stops, blocks)| RouteRequest {
+            depot,
+            stops,
+            blocks,
+            return_to_depot,
+        })
+        .collect();
+    for request in &requests {
+        validate_request(&matrix, request).map_err(PyValueError::new_err)?;
+    }
+
+    let solved = py.allow_threads(|| solve_routes(&matrix, &requests));
+    Ok(solved
+        .into_iter()
+        .map(|route| (route.order, route.travel_minutes))
+        .collect())
+}
+
 /// Get library version
 #[pyfunction]
 fn version() -> &'static str {
@@ -362,6 +417,7 @@ fn health_check() -> bool {
 #[pymodule]
 fn elektrik_engine(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(calculate_electrical_load, m)?)?;
+    m.add_function(wrap_pyfunction!(optimize_routes, m)?)?;
     m.add_function(wrap_pyfunction!(version, m)?)?;
     m.add_function(wrap_pyfunction!(health_check, m)?)?;
     Ok(())
@@ -439,6 +495,7 @@ mod tests {
             circuit_type: CircuitType::SinglePhase,
             voltage_level: 220.0,
             safety_factor: 1.2,
+            electricity_price: ELECTRICITY_PRICE,
         };
         
         let result = calculate_load(input);
@@ -461,9 +518,9 @@ mod tests {
         assert_eq!(status, SafetyStatus::Warning);
         assert!(!warnings.is_empty());
         
-        // Test danger condition (>95%)
+        // Test danger condition (>95%): the high-load warning is kept
         let (status, warnings, _) = assess_safety(31.0, 32, 6.82);
         assert_eq!(status, SafetyStatus::Danger);
-        assert!(!warnings.is_empty());
+        assert_eq!(warnings.len(), 3);
     }
 }
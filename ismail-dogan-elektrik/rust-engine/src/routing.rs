@@ -0,0 +1,409 @@
+//! # Route Optimization
+//!
+//! Orders each technician's visits for a day to minimise travel time.
+//!
+//! Stops carry a block (the booking's time slot rank); blocks are visited
+//! in ascending order and only the order inside a block is optimised. A
+//! route is seeded with nearest-neighbour and improved with 2-opt and
+//! Or-opt moves until no move shortens it. Days are solved in parallel.
+
+use rayon::prelude::*;
+use serde::{Deserialize, Serialize};
+
+/// Upper bound on improvement rounds per route
+const MAX_ROUNDS: usize = 1000;
+
+/// Longest segment moved by Or-opt
+const OR_OPT_MAX_SEGMENT: usize = 3;
+
+// ============================================
+// DATA STRUCTURES
+// ============================================
+
+/// Symmetric travel times in whole minutes between locations
+#[derive(Debug, Clone)]
+pub struct TravelMatrix {
+    size: usize,
+    minutes: Vec<u32>,
+}
+
+impl TravelMatrix {
+    /// Build from rows; fails unless the matrix is square and symmetric
+    pub fn new(rows: Vec<Vec<u32>>) -> Result<Self, String> {
+        let size = rows.len();
+        let mut minutes = Vec::with_capacity(size * size);
+        for row in &rows {
+            if row.len() != size {
+                return Err("Travel matrix must be square".to_string());
+            }
+            minutes.extend_from_slice(row);
+        }
+        for a in 0..size {
+            for b in 0..a {
+                if minutes[a * size + b] != minutes[b * size + a] {
+                    return Err("Travel matrix must be symmetric".to_string());
+                }
+            }
+        }
+        Ok(TravelMatrix { size, minutes })
+    }
+
+    pub fn size(&self) -> usize {
+        self.size
+    }
+
+    #[inline]
+    fn get(&self, a: usize, b: usize) -> i64 {
+        self.minutes[a * self.size + b] as i64
+    }
+}
+
+/// One technician's day to be ordered
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct RouteRequest {
+    /// Start location; None starts at the first stop
+    pub depot: Option<usize>,
+    /// Location of every stop
+    pub stops: Vec<usize>,
+    /// Block of every stop; lower blocks are visited first
+    pub blocks: Vec<u32>,
+    /// Whether the route ends back at the depot
+    pub return_to_depot: bool,
+}
+
+/// An ordered route
+#[derive(Debug, Clone, PartialEq, Eq, Serialize, Deserialize)]
+pub struct Route {
+    /// Stop indices (into the request's stops) in visiting order
+    pub order: Vec<usize>,
+    /// Total travel time in minutes
+    pub travel_minutes: u32,
+}
+
+// ============================================
+// ROUTE EVALUATION
+// ============================================
+
+/// Read-only view of a route under construction
+struct Tour<'a> {
+    matrix: &'a TravelMatrix,
+    request: &'a RouteRequest,
+}
+
+impl<'a> Tour<'a> {
+    /// Location at sequence position `k`, where -1 is the depot and
+    /// `seq.len()` is the end (the depot for closed routes)
+    #[inline]
+    fn node(&self, seq: &[usize], k: isize) -> Option<usize> {
+        if k < 0 {
+            self.request.depot
+        } else if (k as usize) < seq.len() {
+            Some(self.request.stops[seq[k as usize]])
+        } else if self.request.return_to_depot {
+            self.request.depot
+        } else {
+            None
+        }
+    }
+
+    /// Travel time between two locations; legs to "nowhere" are free
+    #[inline]
+    fn dist(&self, a: Option<usize>, b: Option<usize>) -> i64 {
+        match (a, b) {
+            (Some(a), Some(b)) => self.matrix.get(a, b),
+            _ => 0,
+        }
+    }
+
+    #[inline]
+    fn block(&self, seq: &[usize], k: usize) -> u32 {
+        self.request.blocks[seq[k]]
+    }
+
+    fn cost(&self, seq: &[usize]) -> i64 {
+        (-1..seq.len() as isize)
+            .map(|k| self.dist(self.node(seq, k), self.node(seq, k + 1)))
+            .sum()
+    }
+}
+
+/// Nearest-neighbour seed that visits blocks in order
+fn nearest_neighbour(tour: &Tour, order_by_block: &[usize]) -> Vec<usize> {
+    let request = tour.request;
+    let mut seq = Vec::with_capacity(order_by_block.len());
+    let mut current = request.depot;
+    let mut start = 0;
+
+    while start < order_by_block.len() {
+        let block = request.blocks[order_by_block[start]];
+        let mut end = start;
+        while end < order_by_block.len() && request.blocks[order_by_block[end]] == block {
+            end += 1;
+        }
+
+        let mut remaining: Vec<usize> = order_by_block[start..end].to_vec();
+        while !remaining.is_empty() {
+            let mut best = 0;
+            for i in 1..remaining.len() {
+                let candidate = tour.dist(current, Some(request.stops[remaining[i]]));
+                if candidate < tour.dist(current, Some(request.stops[remaining[best]])) {
+                    best = i;
+                }
+            }
+            let stop = remaining.remove(best);
+            current = Some(request.stops[stop]);
+            seq.push(stop);
+        }
+        start = end;
+    }
+    seq
+}
+
+/// First improving 2-opt move inside one block; returns whether one was applied
+fn two_opt(tour: &Tour, seq: &mut Vec<usize>) -> bool {
+    let n = seq.len();
+    for i in 0..n {
+        for j in (i + 1)..n {
+            if tour.block(seq, i) != tour.block(seq, j) {
+                break;
+            }
+            let prev = tour.node(seq, i as isize - 1);
+            let next = tour.node(seq, j as isize + 1);
+            let first = tour.node(seq, i as isize);
+            let last = tour.node(seq, j as isize);
+            let delta = tour.dist(prev, last) + tour.dist(first, next)
+                - tour.dist(prev, first)
+                - tour.dist(last, next);
+            if delta < 0 {
+                seq[i..=j].reverse();
+                return true;
+            }
+        }
+    }
+    false
+}
+
+/// First improving Or-opt move (segments of 1-3 stops, forward or reversed,
+/// relocated inside their block); returns whether one was applied
+fn or_opt(tour: &Tour, seq: &mut Vec<usize>) -> bool {
+    let n = seq.len();
+    for length in 1..=OR_OPT_MAX_SEGMENT.min(n) {
+        for i in 0..=(n - length) {
+            let block = tour.block(seq, i);
+            if tour.block(seq, i + length - 1) != block {
+                continue;
+            }
+
+            let prev = tour.node(seq, i as isize - 1);
+            let next = tour.node(seq, (i + length) as isize);
+            let first = tour.node(seq, i as isize);
+            let last = tour.node(seq, (i + length - 1) as isize);
+            let removal = tour.dist(prev, next) - tour.dist(prev, first) - tour.dist(last, next);
+
+            let mut rest: Vec<usize> = Vec::with_capacity(n - length);
+            rest.extend_from_slice(&seq[..i]);
+            rest.extend_from_slice(&seq[i + length..]);
+
+            for t in 0..=rest.len() {
+                if t > 0 && tour.block(&rest, t - 1) > block {
+                    break;
+                }
+                if t < rest.len() && tour.block(&rest, t) < block {
+                    continue;
+                }
+                let before = tour.node(&rest, t as isize - 1);
+                let after = tour.node(&rest, t as isize);
+                let gap = tour.dist(before, after);
+
+                for reversed in [false, true] {
+                    if t == i && !reversed {
+                        continue;
+                    }
+                    let (head, tail) = if reversed {
+                        (last, first)
+                    } else {
+                        (first, last)
+                    };
+                    let delta = removal + tour.dist(before, head) + tour.dist(tail, after) - gap;
+                    if delta < 0 {
+                        let mut segment = seq[i..i + length].to_vec();
+                        if reversed {
+                            segment.reverse();
+                        }
+                        rest.splice(t..t, segment);
+                        *seq = rest;
+                        return true;
+                    }
+                }
+            }
+        }
+    }
+    false
+}
+
+// ============================================
+// SOLVER
+// ============================================
+
+/// Order one technician's day
+pub fn solve_route(matrix: &TravelMatrix, request: &RouteRequest) -> Route {
+    let tour = Tour { matrix, request };
+
+    let mut order_by_block: Vec<usize> = (0..request.stops.len()).collect();
+    order_by_block.sort_by_key(|&i| request.blocks[i]);
+
+    let mut seq = nearest_neighbour(&tour, &order_by_block);
+    for _ in 0..MAX_ROUNDS {
+        if !two_opt(&tour, &mut seq) && !or_opt(&tour, &mut seq) {
+            break;
+        }
+    }
+
+    let travel_minutes = tour.cost(&seq) as u32;
+    Route {
+        order: seq,
+        travel_minutes,
+    }
+}
+
+/// Validate a request against the matrix
+pub fn validate_request(matrix: &TravelMatrix, request: &RouteRequest) -> Result<(), String> {
+    if request.stops.len() != request.blocks.len() {
+        return Err("Every stop needs a block".to_string());
+    }
+    let in_range = |location: usize| location < matrix.size();
+    if !request.stops.iter().copied().all(in_range) || !request.depot.map_or(true, in_range) {
+        return Err("Location outside the travel matrix".to_string());
+    }
+    Ok(())
+}
+
+/// Order many technicians' days in parallel
+pub fn solve_routes(matrix: &TravelMatrix, requests: &[RouteRequest]) -> Vec<Route> {
+    requests
+        .par_iter()
+        .map(|request| solve_route(matrix, request))
+        .collect()
+}
+
+// ============================================
+// TESTS
+// ============================================
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    /// Locations on a line, one minute apart per unit
+    fn line(points: &[i64]) -> TravelMatrix {
+        let rows = points
+            .iter()
+            .map(|a| {
+                points
+                    .iter()
+                    .map(|b| (a - b).unsigned_abs() as u32)
+                    .collect()
+            })
+            .collect();
+        TravelMatrix::new(rows).unwrap()
+    }
+
+    fn request(
+        depot: Option<usize>,
+        stops: Vec<usize>,
+        blocks: Vec<u32>,
+        closed: bool,
+    ) -> RouteRequest {
+        RouteRequest {
+            depot,
+            stops,
+            blocks,
+            return_to_depot: closed,
+        }
+    }
+
+    #[test]
+    fn test_matrix_must_be_symmetric() {
+        assert!(TravelMatrix::new(vec![vec![0, 1], vec![2, 0]]).is_err());
+        assert!(TravelMatrix::new(vec![vec![0, 1]]).is_err());
+    }
+
+    #[test]
+    fn test_line_is_visited_in_order() {
+        let matrix = line(&[0, 5, 1, 4, 2, 3]);
+        let route = solve_route(
+            &matrix,
+            &request(Some(0), vec![1, 2, 3, 4, 5], vec![0; 5], false),
+        );
+        assert_eq!(route.travel_minutes, 5);
+        assert_eq!(route.order, vec![1, 3, 4, 2, 0]);
+    }
+
+    #[test]
+    fn test_closed_route_returns_to_depot() {
+        let matrix = line(&[0, 3, 1, 2]);
+        let route = solve_route(&matrix, &request(Some(0), vec![1, 2, 3], vec![0; 3], true));
+        assert_eq!(route.travel_minutes, 6);
+    }
+
+    #[test]
+    fn test_blocks_are_visited_in_order() {
+        let matrix = line(&[0, 1, 10]);
+        // The far stop is in the first block, so it must come first
+        let route = solve_route(&matrix, &request(Some(0), vec![1, 2], vec![1, 0], false));
+        assert_eq!(route.order, vec![1, 0]);
+        assert_eq!(route.travel_minutes, 19);
+    }
+
+    #[test]
+    fn test_improvement_never_worse_than_seed() {
+        let points: Vec<i64> = (0..12).map(|i| (i * 37 % 23) as i64).collect();
+        let rows: Vec<Vec<u32>> = points
+            .iter()
+            .enumerate()
+            .map(|(a, pa)| {
+                points
+                    .iter()
+                    .enumerate()
+                    .map(|(b, pb)| {
+                        ((pa - pb).unsigned_abs() + ((a as i64 - b as i64).unsigned_abs() % 5))
+                            as u32
+                    })
+                    .collect()
+            })
+            .collect();
+        let matrix = TravelMatrix::new(rows).unwrap();
+        let req = request(None, (0..12).collect(), vec![0; 12], false);
+
+        let tour = Tour {
+            matrix: &matrix,
+            request: &req,
+        };
+        let seed = nearest_neighbour(&tour, &(0..12).collect::<Vec<_>>());
+        let route = solve_route(&matrix, &req);
+        assert!(route.travel_minutes as i64 <= tour.cost(&seed));
+
+        let mut visited = route.order.clone();
+        visited.sort();
+        assert_eq!(visited, (0..12).collect::<Vec<_>>());
+    }
+
+    #[test]
+    fn test_parallel_matches_sequential() {
+        let matrix = line(&[0, 9, 2, 7, 4, 5, 3, 8]);
+        let requests: Vec<RouteRequest> = (0..32)
+            .map(|i| {
+                request(
+                    Some(i % 8),
+                    vec![1, 2, 3, 4, 5, 6, 7],
+                    vec![0, 0, 1, 1, 1, 2, 2],
+                    i % 2 == 0,
+                )
+            })
+            .collect();
+        let parallel = solve_routes(&matrix, &requests);
+        for (req, route) in requests.iter().zip(&parallel) {
+            assert_eq!(route, &solve_route(&matrix, req));
+        }
+    }
+}